@@ -22,7 +22,9 @@ from agentic_rag.executor.adapters import (
     RetrieverAdapter,
 )
 from agentic_rag.graph import make_agent_graph
+from agentic_rag.llm_clients import BATCH, llm_priority
 from agentic_rag.model import get_default_model
+from agentic_rag.usage import UsageReport, ledger_totals
 from scripts.case_utils import get_case_id, resolve_cases
 from tests.intent_eval.json_utils import write_artifact
 
@@ -62,8 +64,8 @@ def run_single_case(
     run_id: str,
     max_retries: int,
     llm,
-) -> None:
-    """Run agent graph for a single case."""
+) -> Dict[str, Any]:
+    """Run agent graph for a single case; returns the final state."""
     case_id = get_case_id(case_path, case)
 
     # Instantiate adapters (using mocks for lightweight verification unless configured otherwise)
@@ -98,12 +100,15 @@ def run_single_case(
         print(f"  ⚠ Produced errors: {out['errors']}")
 
     print(f"  ➡ Final Answer: {out.get('final_answer')[:100]}...")
+    usage = ledger_totals(out.get("token_ledger"))
+    print(f"  Tokens: {usage['input_tokens']} in / {usage['output_tokens']} out over {usage['calls']} LLM call(s)")
 
     artifacts_dir = Path("artifacts/agent_eval")
     write_artifact(artifacts_dir, run_id, case_id, "input", case)
     write_artifact(artifacts_dir, run_id, case_id, "final_state", out)
 
     print(f"Artifacts written to: {artifacts_dir / run_id / case_id}")
+    return out
 
 
 def main():
@@ -130,19 +135,26 @@ def main():
     print(f"Found {len(cases)} case(s) to process")
 
     llm = get_default_model()
-
-    for i, (case_path, case_data) in enumerate(cases, 1):
-        try:
-            run_single_case(
-                case_path,
-                case_data,
-                run_id=args.run_id,
-                max_retries=args.max_retries,
-                llm=llm,
-            )
-        except Exception as e:
-            print(f"\n❌ Error processing {case_path.name}: {e}")
-            raise
+    usage = UsageReport()
+
+    # Eval traffic yields to interactive requests sharing the process's LLM rate limits
+    with llm_priority(BATCH):
+        for i, (case_path, case_data) in enumerate(cases, 1):
+            try:
+                out = run_single_case(
+                    case_path,
+                    case_data,
+                    run_id=args.run_id,
+                    max_retries=args.max_retries,
+                    llm=llm,
+                )
+                usage.add(out)
+            except Exception as e:
+                print(f"\n❌ Error processing {case_path.name}: {e}")
+                raise
+
+    print("\nToken usage per node:")
+    print(usage.format())
 
 
 if __name__ == "__main__":
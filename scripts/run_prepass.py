@@ -0,0 +1,43 @@
+# scripts/run_prepass.py
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from scripts.case_utils import get_case_id, resolve_cases
+
+from agentic_rag.intent.prepass import run_prepass_batch
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run the local PII/language pre-pass over eval cases (no LLM).\n\n"
+        "  python -m scripts.run_prepass --case 'tests/intent_eval/cases/**/*.json' --out prepass.jsonl",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--case", required=True, help="Case file path or glob pattern")
+    parser.add_argument("--out", help="Write JSONL here instead of stdout")
+
+    args = parser.parse_args()
+
+    cases = resolve_cases(args.case)
+    results = run_prepass_batch(case for _, case in cases)
+
+    out = Path(args.out).open("w", encoding="utf-8") if args.out else sys.stdout
+    try:
+        for (case_path, case), result in zip(cases, results):
+            out.write(
+                json.dumps({"case_id": get_case_id(case_path, case), **result.to_dict()}, ensure_ascii=False) + "\n"
+            )
+    finally:
+        if args.out:
+            out.close()
+
+    with_pii = sum(r.pii_present for r in results)
+    detected = sum(r.language is not None for r in results)
+    print(f"{len(results)} case(s): {with_pii} with PII, language detected for {detected}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# scripts/train_intent_classifier.py
+
+import argparse
+import random
+from pathlib import Path
+
+from agentic_rag.intent.classifier import (
+    DEFAULT_DIM,
+    DEFAULT_THRESHOLD,
+    IntentClassifier,
+    load_case_examples,
+    load_logged_examples,
+)
+
+
+def evaluate(clf: IntentClassifier, examples, threshold: float) -> None:
+    """Print per-field accuracy and how often the fast path would fire at ``threshold``."""
+    if not examples:
+        print("No held-out examples")
+        return
+    fired = 0
+    correct_when_fired = 0
+    for ex in examples:
+        pred = clf.predict(ex.text)
+        if pred.min_confidence >= threshold:
+            fired += 1
+            correct_when_fired += all(pred.labels.get(k) == v for k, v in ex.labels.items())
+    for name in clf.fields:
+        labelled = [ex for ex in examples if name in ex.labels]
+        if labelled:
+            acc = sum(clf.predict(ex.text).labels[name] == ex.labels[name] for ex in labelled) / len(labelled)
+            print(f"  {name}: accuracy={acc:.2f} (n={len(labelled)})")
+    print(f"  fast path rate @ {threshold}: {fired / len(examples):.2f}")
+    if fired:
+        print(f"  fast path exact-match accuracy: {correct_when_fired / fired:.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Train the local intake classifier from intent_eval cases and logged intake outputs.\n\n"
+        "  --logs 'artifacts/intent_eval/**/final_state' --logs 'logs/intake/*.jsonl'",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--cases", default="tests/intent_eval/cases/intake_v1", help="Case JSON directory")
+    parser.add_argument("--expected", default="tests/intent_eval/expected/intake_v1", help="Expected labels directory")
+    parser.add_argument(
+        "--logs", action="append", default=[], help="Glob of logged IntakeState JSON/JSONL (repeatable)"
+    )
+    parser.add_argument("--out", required=True, help="Output model file (.npz)")
+    parser.add_argument("--dim", type=int, default=DEFAULT_DIM, help="Hashed feature dimension")
+    parser.add_argument("--epochs", type=int, default=200, help="Gradient descent epochs")
+    parser.add_argument("--holdout", type=float, default=0.0, help="Fraction held out for evaluation")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Fast-path confidence threshold")
+    parser.add_argument("--seed", type=int, default=0, help="Shuffle seed for the holdout split")
+
+    args = parser.parse_args()
+
+    examples = load_case_examples(args.cases, args.expected) + load_logged_examples(args.logs)
+    print(f"Loaded {len(examples)} example(s)")
+    if not examples:
+        raise SystemExit("No training examples found")
+
+    random.Random(args.seed).shuffle(examples)
+    n_holdout = int(len(examples) * args.holdout)
+    train, holdout = examples[n_holdout:], examples[:n_holdout]
+
+    clf = IntentClassifier(dim=args.dim).fit(train, epochs=args.epochs)
+    clf.save(Path(args.out))
+    print(f"Saved {', '.join(clf.fields)} heads to {args.out}")
+
+    print("Train:")
+    evaluate(clf, train, args.threshold)
+    if holdout:
+        print("Holdout:")
+        evaluate(clf, holdout, args.threshold)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+# src/agentic_rag/aio.py
+"""Sync and async execution of node I/O from one node body.
+
+Nodes that call an LLM or an adapter are written once, as generators. They yield the calls they
+need and receive the results back:
+
+    def _rerank_steps(reranker, state):
+        ...
+        reranked = yield adapter_call(reranker, "rerank", query=query, candidates=merged, ...)
+        return {"round_candidates_reranked": reranked}
+
+``run_sync`` performs each call with ``invoke``/``search``/... exactly as the nodes always have.
+``run_async`` awaits ``ainvoke``/``asearch``/... and frees the worker thread for the whole LLM or
+retrieval latency. Adapters without an ``async def`` counterpart run in a worker thread instead.
+
+Yielding a list of calls runs them concurrently under ``run_async`` (in order under ``run_sync``)
+and sends back the list of results. An exception raised by a call is thrown into the generator at
+the ``yield``, so each node's own try/except error handling is unchanged.
+
+Node factories return the sync node, as they always have, with its async twin attached as
+``node.afunc`` (``with_async``). ``dual_node`` turns such a node into one graph node: ``invoke``
+runs the sync function and ``ainvoke`` the async one.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Generator, List, Optional, Tuple, Union
+
+from langchain_core.runnables import RunnableLambda
+
+
+@dataclass(frozen=True)
+class Call:
+    """One blocking call a node needs, with its optional native async counterpart."""
+
+    func: Callable[..., Any]
+    afunc: Optional[Callable[..., Awaitable[Any]]] = None
+    args: Tuple[Any, ...] = ()
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+
+    def run(self) -> Any:
+        return self.func(*self.args, **self.kwargs)
+
+    async def arun(self) -> Any:
+        if self.afunc is not None:
+            return await self.afunc(*self.args, **self.kwargs)
+        return await asyncio.to_thread(self.func, *self.args, **self.kwargs)
+
+
+Request = Union[Call, List[Call]]
+Steps = Generator[Request, Any, Dict[str, Any]]
+
+
+def _native_async(obj: Any, name: str) -> Optional[Callable[..., Awaitable[Any]]]:
+    afunc = getattr(obj, name, None)
+    return afunc if inspect.iscoroutinefunction(afunc) else None
+
+
+def invoke_call(runnable: Any, value: Any) -> Call:
+    """``runnable.invoke(value)`` / ``await runnable.ainvoke(value)``."""
+    return Call(runnable.invoke, _native_async(runnable, "ainvoke"), (value,))
+
+
+def adapter_call(adapter: Any, method: str, **kwargs: Any) -> Call:
+    """``adapter.<method>(**kwargs)`` / ``await adapter.a<method>(**kwargs)`` when the adapter defines it."""
+    return Call(getattr(adapter, method), _native_async(adapter, f"a{method}"), kwargs=kwargs)
+
+
+def run_sync(steps: Steps) -> Dict[str, Any]:
+    """Drive a node body, performing its calls on the current thread."""
+    try:
+        request = next(steps)
+        while True:
+            try:
+                result = [c.run() for c in request] if isinstance(request, list) else request.run()
+            except Exception as e:
+                request = steps.throw(e)
+            else:
+                request = steps.send(result)
+    except StopIteration as stop:
+        return stop.value
+
+
+async def run_async(steps: Steps) -> Dict[str, Any]:
+    """Drive a node body, awaiting its calls (lists of calls run concurrently)."""
+    try:
+        request = next(steps)
+        while True:
+            try:
+                if isinstance(request, list):
+                    result = list(await asyncio.gather(*(c.arun() for c in request)))
+                else:
+                    result = await request.arun()
+            except Exception as e:
+                request = steps.throw(e)
+            else:
+                request = steps.send(result)
+    except StopIteration as stop:
+        return stop.value
+
+
+def with_async(func: Callable[..., Any], afunc: Callable[..., Awaitable[Any]]) -> Callable[..., Any]:
+    """Attach ``afunc`` to the sync node ``func`` as its async variant; returns ``func``."""
+    func.afunc = afunc
+    return func
+
+
+def dual_node(node: Callable[..., Any]) -> Any:
+    """Graph node for ``node``: ``ainvoke`` uses ``node.afunc`` when present (else ``node`` unchanged)."""
+    afunc = getattr(node, "afunc", None)
+    if afunc is None:
+        return node
+    return RunnableLambda(node, afunc=afunc, name=getattr(node, "__name__", None))
@@ -0,0 +1,171 @@
+# src/agentic_rag/answer/compression.py
+"""Extractive evidence compression for the composer prompt.
+
+compose_answer used to receive the full text of every ``final_evidence`` chunk. Most of those
+sentences do not bear on the question. ``compress_evidence`` splits each chunk into sentences and
+scores them against the query terms: the normalized query, plan goal, subquestions, entities,
+literal terms and query variants. Scoring is a vectorised TF-IDF match, with IDF computed over
+the sentences of the whole evidence pack. Each chunk keeps its best sentences up to
+``keep_ratio`` of its estimated tokens, and always at least one. Kept sentences stay in their
+original order.
+
+Compressed items are EvidenceItem dicts whose ``text`` joins the kept spans with ``SEPARATOR``.
+``provenance["compression"]["spans"]`` lists the kept ``[start, end)`` character offsets in the
+original chunk. ``original_span`` maps an offset range in the compressed text back to the chunk,
+which is how postprocess_answer anchors citation quotes in the original evidence. Short chunks
+pass through unchanged.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from agentic_rag.answer.state import EvidenceItem
+from agentic_rag.index.bm25 import tokenize
+from agentic_rag.tokens import estimate_tokens
+
+SEPARATOR = " … "
+
+DEFAULT_KEEP_RATIO = 0.4
+DEFAULT_MIN_CHUNK_TOKENS = 60
+
+# Sentence ends: terminal punctuation followed by whitespace, or a line break
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?。！？])\s+|\s*\n\s*")
+
+
+def sentence_spans(text: str) -> List[Tuple[int, int]]:
+    """``[start, end)`` offsets of the non-empty sentences/lines of ``text``."""
+    spans: List[Tuple[int, int]] = []
+    start = 0
+    for m in _SENTENCE_END_RE.finditer(text):
+        if m.start() > start:
+            spans.append((start, m.start()))
+        start = m.end()
+    if start < len(text.rstrip()):
+        spans.append((start, len(text.rstrip())))
+    return spans
+
+
+def query_terms(state: Dict[str, Any]) -> List[str]:
+    """Texts the evidence is scored against: query, plan goal, subquestions, entities, literals, variants."""
+    plan = state.get("plan") or {}
+    criteria = plan.get("acceptance_criteria") or {}
+    literals = plan.get("literal_constraints") or {}
+    texts: List[str] = [state.get("normalized_query") or "", plan.get("goal") or ""]
+    texts += criteria.get("must_answer_subquestions") or []
+    texts += criteria.get("must_cover_entities") or []
+    texts += literals.get("must_preserve_terms") or []
+    for r in plan.get("retrieval_rounds") or []:
+        texts += (r or {}).get("query_variants") or []
+    return [t for t in texts if isinstance(t, str) and t.strip()]
+
+
+def _score_sentences(sentences: Sequence[str], queries: Sequence[str]) -> np.ndarray:
+    """TF-IDF weighted query-term overlap per sentence, normalised by sentence length."""
+    vocab: Dict[str, int] = {}
+    for q in queries:
+        for tok in tokenize(q):
+            vocab.setdefault(tok, len(vocab))
+    if not vocab or not sentences:
+        return np.zeros(len(sentences))
+
+    tf = np.zeros((len(sentences), len(vocab)))
+    lengths = np.ones(len(sentences))
+    for i, sentence in enumerate(sentences):
+        tokens = tokenize(sentence)
+        lengths[i] = max(1, len(tokens))
+        for tok in tokens:
+            j = vocab.get(tok)
+            if j is not None:
+                tf[i, j] += 1
+    df = (tf > 0).sum(axis=0)
+    idf = np.log((len(sentences) + 1) / (df + 1)) + 1.0
+    weights = np.log1p(tf) * idf
+    return weights.sum(axis=1) / np.sqrt(lengths)
+
+
+def _select(spans: Sequence[Tuple[int, int]], scores: np.ndarray, budget: int, text: str) -> List[Tuple[int, int]]:
+    order = np.argsort(-scores, kind="stable")
+    kept: List[int] = []
+    used = 0
+    for i in order:
+        if kept and (scores[i] <= 0 or used >= budget):
+            break
+        kept.append(int(i))
+        s, e = spans[i]
+        used += estimate_tokens(text[s:e])
+    merged: List[Tuple[int, int]] = []
+    for i in sorted(kept):
+        s, e = spans[i]
+        if merged and not text[merged[-1][1] : s].strip():  # adjacent sentences: one span
+            merged[-1] = (merged[-1][0], e)
+        else:
+            merged.append((s, e))
+    return merged
+
+
+def original_span(info: Dict[str, Any], start: int, end: int) -> Optional[Tuple[int, int]]:
+    """Map ``[start, end)`` in a compressed text back to offsets in the original chunk."""
+    spans = info.get("spans") or []
+    pos = 0
+    mapped: List[int] = []
+    targets = [start, max(start, end - 1)]
+    for s, e in spans:
+        length = e - s
+        while targets and targets[0] < pos + length:
+            if targets[0] < pos:
+                return None  # inside a separator
+            mapped.append(s + targets.pop(0) - pos)
+        pos += length + len(SEPARATOR)
+    if targets:
+        return None
+    return mapped[0], mapped[1] + 1
+
+
+def compress_item(
+    item: EvidenceItem,
+    spans: Sequence[Tuple[int, int]],
+    scores: np.ndarray,
+    *,
+    keep_ratio: float,
+    min_chunk_tokens: int,
+) -> Dict[str, Any]:
+    text = item.text
+    tokens = estimate_tokens(text)
+    if tokens < min_chunk_tokens or len(spans) < 2:
+        return item.model_dump()
+    kept = _select(spans, scores, int(tokens * keep_ratio), text)
+    compressed = SEPARATOR.join(text[s:e] for s, e in kept)
+    if len(compressed) >= len(text):
+        return item.model_dump()
+    info = {
+        "spans": [[s, e] for s, e in kept],
+        "original_chars": len(text),
+        "ratio": round(len(compressed) / len(text), 3),
+    }
+    return {**item.model_dump(), "text": compressed, "provenance": {**item.provenance, "compression": info}}
+
+
+def compress_evidence(
+    items: Iterable[EvidenceItem],
+    queries: Sequence[str],
+    *,
+    keep_ratio: float = DEFAULT_KEEP_RATIO,
+    min_chunk_tokens: int = DEFAULT_MIN_CHUNK_TOKENS,
+) -> List[Dict[str, Any]]:
+    """Compressed EvidenceItem dicts, in input order (IDF is shared across the whole pack)."""
+    items = list(items)
+    per_item = [sentence_spans(item.text) for item in items]
+    sentences = [item.text[s:e] for item, spans in zip(items, per_item) for s, e in spans]
+    scores = _score_sentences(sentences, queries)
+
+    out: List[Dict[str, Any]] = []
+    offset = 0
+    for item, spans in zip(items, per_item):
+        item_scores = scores[offset : offset + len(spans)]
+        offset += len(spans)
+        out.append(compress_item(item, spans, item_scores, keep_ratio=keep_ratio, min_chunk_tokens=min_chunk_tokens))
+    return out
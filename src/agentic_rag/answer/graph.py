@@ -1,26 +1,119 @@
 # src/agentic_rag/answer/graph.py
 from __future__ import annotations
 
+import os
+from typing import Optional
+
 from langgraph.graph import END, START, StateGraph
 from langgraph.types import RetryPolicy
 
+from agentic_rag.aio import dual_node
+from agentic_rag.answer.nodes.answer_budget import make_answer_budget_node
 from agentic_rag.answer.nodes.answer_gate import make_answer_gate_node
-from agentic_rag.answer.nodes.compose_answer import make_compose_answer_node
+from agentic_rag.answer.map_reduce import evidence_tokens, map_reduce_threshold
+from agentic_rag.answer.nodes.compose_answer import _coerce_evidence, composer_evidence, make_compose_answer_node
+from agentic_rag.answer.nodes.compress_evidence import make_compress_evidence_node
+from agentic_rag.answer.nodes.map_evidence import make_map_evidence_node
 from agentic_rag.answer.nodes.postprocess_answer import make_postprocess_answer_node
 from agentic_rag.answer.state import AnswerState
+from agentic_rag.answer.streaming import make_streaming_compose_answer_node, make_streaming_postprocess_answer_node
+from agentic_rag.usage import budget_remaining, with_usage
+
+
+def answer_streaming_enabled() -> bool:
+    """Default for ``make_answer_graph(streaming=None)``; set ANSWER_STREAMING=1."""
+    return os.getenv("ANSWER_STREAMING", "0") == "1"
+
+
+def evidence_compression_enabled() -> bool:
+    """Default for ``make_answer_graph(compress=None)``; set ANSWER_EVIDENCE_COMPRESSION=1."""
+    return os.getenv("ANSWER_EVIDENCE_COMPRESSION", "0") == "1"
+
 
+def use_map_reduce(state: AnswerState, min_tokens: int, enforce_budget: bool = False) -> bool:
+    """Map-reduce composition for answer mode when the composer's evidence exceeds ``min_tokens``.
 
-def make_answer_graph(llm, max_retries: int = 2):
+    With ``enforce_budget`` it is skipped when the map calls alone would not fit the remaining
+    token budget; answer_budget then trims the evidence for a single compose call instead.
+    """
+    if min_tokens <= 0 or state.get("answer_mode", "answer") != "answer" or state.get("speculative_answer"):
+        return False
+    items = _coerce_evidence(composer_evidence(state))
+    if len(items) <= 1:
+        return False
+    tokens = evidence_tokens(items)
+    remaining = budget_remaining(state) if enforce_budget else None
+    if remaining is not None and remaining < 2 * tokens:
+        return False
+    return tokens >= min_tokens
+
+
+def make_answer_graph(
+    llm,
+    max_retries: int = 2,
+    streaming: Optional[bool] = None,
+    compress: Optional[bool] = None,
+    map_llm=None,
+    map_reduce_min_tokens: Optional[int] = None,
+    enforce_budget: bool = False,
+):
+    """Build the answer subgraph.
+
+    ``streaming`` streams ``final_answer`` tokens as custom stream events and ends with an
+    ``answer_final`` event (``None`` = ANSWER_STREAMING env switch; see answer/streaming.py).
+    ``compress`` passes the composer only the evidence sentences that match the query, with offsets
+    back into the original chunks (``None`` = ANSWER_EVIDENCE_COMPRESSION env switch; see
+    answer/compression.py).
+    Evidence of ``map_reduce_min_tokens`` or more estimated tokens is first condensed by concurrent
+    ``map_llm`` calls (default ``llm``) and the composer reduces the findings (``None`` =
+    ANSWER_MAP_REDUCE_MIN_TOKENS, default 6000; 0 disables; see answer/map_reduce.py).
+    ``enforce_budget`` fits composition into the plan's remaining token budget (answer_budget node:
+    evidence is trimmed, or the graph ends with a ``budget_exceeded`` error; see agentic_rag/usage.py).
+    """
+    if streaming is None:
+        streaming = answer_streaming_enabled()
+    if compress is None:
+        compress = evidence_compression_enabled()
+    if map_reduce_min_tokens is None:
+        map_reduce_min_tokens = map_reduce_threshold()
     retry_policy = RetryPolicy(max_attempts=max(1, int(max_retries)))
 
+    if streaming:
+        compose, postprocess = make_streaming_compose_answer_node(llm), make_streaming_postprocess_answer_node()
+    else:
+        compose, postprocess = make_compose_answer_node(llm), make_postprocess_answer_node()
+
     g = StateGraph(AnswerState)
 
     g.add_node("answer_gate", make_answer_gate_node())
-    g.add_node("compose_answer", make_compose_answer_node(llm), retry=retry_policy)
-    g.add_node("postprocess_answer", make_postprocess_answer_node())
+    g.add_node("compose_answer", dual_node(with_usage(compose, "compose_answer")), retry=retry_policy)
+    g.add_node("postprocess_answer", postprocess)
 
     g.add_edge(START, "answer_gate")
-    g.add_edge("answer_gate", "compose_answer")
+    before_compose = "answer_gate"
+    if compress:
+        g.add_node("compress_evidence", make_compress_evidence_node())
+        g.add_edge("answer_gate", "compress_evidence")
+        before_compose = "compress_evidence"
+    compose_entry = "compose_answer"
+    if enforce_budget:
+        g.add_node("answer_budget", make_answer_budget_node())
+        g.add_conditional_edges(
+            "answer_budget",
+            lambda state: END if (state.get("answer_meta") or {}).get("budget_exceeded") else "compose_answer",
+            ["compose_answer", END],
+        )
+        compose_entry = "answer_budget"
+    if map_reduce_min_tokens > 0:
+        g.add_node("map_evidence", dual_node(with_usage(make_map_evidence_node(map_llm or llm), "map_evidence")))
+
+        def route_compose(state: AnswerState) -> str:
+            return "map_evidence" if use_map_reduce(state, map_reduce_min_tokens, enforce_budget) else compose_entry
+
+        g.add_conditional_edges(before_compose, route_compose, ["map_evidence", compose_entry])
+        g.add_edge("map_evidence", compose_entry)
+    else:
+        g.add_edge(before_compose, compose_entry)
     g.add_edge("compose_answer", "postprocess_answer")
     g.add_edge("postprocess_answer", END)
 
@@ -0,0 +1,97 @@
+# src/agentic_rag/answer/map_reduce.py
+"""Map-reduce composition for large evidence packs.
+
+A single compose_answer call over a large pack (``max_total_docs`` up to 30 for summarize or
+compare requests) pays long-context latency. Above ``min_tokens`` estimated evidence tokens, the
+answer graph runs ``map_evidence`` before the composer:
+
+- map: evidence is grouped by document and packed into groups of about ``group_tokens``. Each
+  group goes concurrently (``batch``/``abatch``) to a cheaper model, which returns per-item
+  findings (PartialAnswerModel): a point, a verbatim quote and the subquestion it answers.
+- reduce: the findings replace the evidence text for compose_answer, one condensed item per
+  evidence_id. The composer writes the final ComposeAnswerModel over those items, so citations
+  keep their original evidence ids and the quotes still anchor in the original chunks.
+
+Items without findings are dropped from the composer's view. If every map call fails or nothing
+is found, the composer gets the evidence unchanged.
+"""
+
+from __future__ import annotations
+
+import os
+from collections import OrderedDict
+from typing import Any, Dict, List
+
+from agentic_rag.answer.state import EvidenceItem, Finding
+from agentic_rag.tokens import estimate_tokens
+
+DEFAULT_MIN_TOKENS = 6000
+DEFAULT_GROUP_TOKENS = 1500
+DEFAULT_MAX_CONCURRENCY = 8
+
+
+def map_reduce_threshold() -> int:
+    """Evidence token count that selects map-reduce composition (ANSWER_MAP_REDUCE_MIN_TOKENS; 0 disables)."""
+    return int(os.getenv("ANSWER_MAP_REDUCE_MIN_TOKENS", str(DEFAULT_MIN_TOKENS)))
+
+
+def evidence_tokens(items: List[EvidenceItem]) -> int:
+    return sum(estimate_tokens(i.text) for i in items)
+
+
+def group_evidence(items: List[EvidenceItem], group_tokens: int = DEFAULT_GROUP_TOKENS) -> List[List[EvidenceItem]]:
+    """Group items by document, then pack documents into groups of about ``group_tokens``.
+
+    A document larger than ``group_tokens`` is split across groups at item boundaries.
+    """
+    by_doc: "OrderedDict[str, List[EvidenceItem]]" = OrderedDict()
+    for item in items:
+        by_doc.setdefault(item.doc_id or item.evidence_id, []).append(item)
+
+    groups: List[List[EvidenceItem]] = []
+    current: List[EvidenceItem] = []
+    used = 0
+    for doc_items in by_doc.values():
+        doc_tokens = evidence_tokens(doc_items)
+        if current and used + doc_tokens > group_tokens:
+            groups.append(current)
+            current, used = [], 0
+        for item in doc_items:
+            tokens = estimate_tokens(item.text)
+            if current and used + tokens > group_tokens:
+                groups.append(current)
+                current, used = [], 0
+            current.append(item)
+            used += tokens
+    if current:
+        groups.append(current)
+    return groups
+
+
+def condensed_evidence(items: List[EvidenceItem], findings: List[Finding]) -> List[Dict[str, Any]]:
+    """One EvidenceItem dict per evidence_id with findings, in evidence order; text lists the findings."""
+    by_id: Dict[str, List[Finding]] = {}
+    for f in findings:
+        by_id.setdefault(f.evidence_id, []).append(f)
+
+    out: List[Dict[str, Any]] = []
+    for item in items:
+        found = by_id.get(item.evidence_id)
+        if not found:
+            continue
+        lines = []
+        for f in found:
+            line = f"[{f.subquestion}] {f.point}" if f.subquestion else f.point
+            lines.append(f'{line} Quote: "{f.quote}"' if f.quote else line)
+        out.append(
+            {
+                **item.model_dump(),
+                "text": "\n".join(lines),
+                # compression offsets describe the excerpt this text replaced; quotes anchor in the original
+                "provenance": {
+                    **{k: v for k, v in item.provenance.items() if k != "compression"},
+                    "map_reduce": {"findings": len(found)},
+                },
+            }
+        )
+    return out
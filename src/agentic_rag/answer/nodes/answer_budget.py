@@ -0,0 +1,86 @@
+# src/agentic_rag/answer/nodes/answer_budget.py
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict, List
+
+from agentic_rag.answer.nodes.compose_answer import _coerce_evidence, compose_payload, composer_evidence
+from agentic_rag.answer.prompts.compose_answer import COMPOSE_ANSWER_PROMPT
+from agentic_rag.answer.state import AnswerState, EvidenceItem
+from agentic_rag.context import message_tokens
+from agentic_rag.prompt_layout import render_inputs
+from agentic_rag.tokens import estimate_tokens
+from agentic_rag.usage import budget_remaining, budget_spent, plan_budget
+
+logger = logging.getLogger(__name__)
+
+ANSWER_OUTPUT_RESERVE = 1000  # tokens kept for the composer's output
+
+
+def compose_tokens(state: AnswerState, evidence: List[EvidenceItem]) -> int:
+    """Estimated tokens of a compose_answer call over ``evidence`` (prompt plus output reserve)."""
+    payload = compose_payload({**state, "compressed_evidence": [e.model_dump() for e in evidence]})
+    messages = payload.pop("messages")
+    return (
+        estimate_tokens(COMPOSE_ANSWER_PROMPT)
+        + estimate_tokens(render_inputs(payload))
+        + sum(message_tokens(m) for m in messages)
+        + ANSWER_OUTPUT_RESERVE
+    )
+
+
+def make_answer_budget_node():
+    """Fit the composer call into what is left of ``plan.budget.max_tokens``.
+
+    - fits: no update;
+    - too large: the lowest-ranked evidence items are dropped (``compressed_evidence``) until it fits;
+    - nothing fits (or answer mode would be left without evidence): a ``budget_exceeded`` error and
+      ``answer_meta["budget_exceeded"]``; the answer graph then ends without composing.
+    """
+
+    def answer_budget(state: AnswerState) -> Dict[str, Any]:
+        remaining = budget_remaining(state)
+        if remaining is None or state.get("speculative_answer"):
+            return {}
+
+        evidence = _coerce_evidence(composer_evidence(state))
+        needed = compose_tokens(state, evidence)
+        if needed <= remaining:
+            return {}
+
+        kept = list(evidence)
+        while kept and needed > remaining:
+            kept.pop()
+            needed = compose_tokens(state, kept)
+
+        answering = state.get("answer_mode", "answer") == "answer"
+        if needed <= remaining and (kept or not answering or not evidence):
+            logger.info(f"Token budget: composing over {len(kept)}/{len(evidence)} evidence items ({remaining} left)")
+            return {
+                "compressed_evidence": [e.model_dump() for e in kept],
+                "answer_meta": {
+                    **(state.get("answer_meta") or {}),
+                    "budget_degraded": True,
+                    "budget_dropped_evidence": len(evidence) - len(kept),
+                },
+            }
+
+        logger.warning(f"Token budget exceeded: {remaining} tokens left, compose needs about {needed}")
+        return {
+            "answer_meta": {**(state.get("answer_meta") or {}), "budget_exceeded": True},
+            "errors": [
+                {
+                    "node": "answer_budget",
+                    "type": "budget_exceeded",
+                    "message": "The plan's token budget does not cover composing an answer.",
+                    "retryable": False,
+                    "details": {
+                        "max_tokens": plan_budget(state),
+                        "spent": budget_spent(state),
+                        "estimated_compose_tokens": compose_tokens(state, evidence[:1]),
+                    },
+                }
+            ],
+        }
+
+    return answer_budget
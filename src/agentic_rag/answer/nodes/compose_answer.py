@@ -2,13 +2,18 @@
 from __future__ import annotations
 
 import logging
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
-from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+from langchain_core.prompts import ChatPromptTemplate
 from pydantic import ValidationError
 
+from agentic_rag.aio import Steps, invoke_call, run_async, run_sync, with_async
 from agentic_rag.answer.prompts.compose_answer import COMPOSE_ANSWER_PROMPT
 from agentic_rag.answer.state import AnswerState, ComposeAnswerModel, CoverageModel, EvidenceItem
+from agentic_rag.context import window_messages
+from agentic_rag.model import routed_chains
+from agentic_rag.prompt_layout import prefix_cached_messages
+from agentic_rag.repair import structured_data, validate_with_repair
 
 # Optional langfuse decorator - safe when disabled
 try:
@@ -43,59 +48,112 @@ def _coerce_coverage(raw: Any) -> CoverageModel:
         return CoverageModel(confidence=0.0, covered=[], missing=[], contradictions=[])
 
 
-def make_compose_answer_node(llm):
-    prompt = ChatPromptTemplate.from_messages(
-        [
-            ("system", COMPOSE_ANSWER_PROMPT),
-            MessagesPlaceholder("messages"),
+def speculative_update(state: AnswerState) -> Optional[Dict[str, Any]]:
+    """The accepted speculative draft (answer/speculative.py) as a compose update, if usable."""
+    draft = state.get("speculative_answer")
+    if not draft or state.get("answer_mode", "answer") != "answer":
+        return None
+    return {
+        **draft,
+        "answer_meta": {**(state.get("answer_meta") or {}), **(draft.get("answer_meta") or {})},
+    }
+
+
+def missing_messages_error(state: AnswerState) -> Optional[Dict[str, Any]]:
+    msgs = state.get("messages") or []
+    if isinstance(msgs, list) and msgs:
+        return None
+    return {
+        "errors": [
+            {
+                "node": "compose_answer",
+                "type": "schema_validation",
+                "message": "Missing or invalid 'messages' in state (expected non-empty list).",
+                "retryable": False,
+                "details": {"messages_type": str(type(msgs))},
+            }
         ]
-    )
+    }
+
+
+def composer_evidence(state: AnswerState) -> Any:
+    """Evidence shown to the composer: ``compressed_evidence`` when present, else ``final_evidence``."""
+    compressed = state.get("compressed_evidence")
+    return compressed if compressed is not None else state.get("final_evidence")
+
+
+# compose_payload fields sent in the trailing inputs message (agentic_rag/prompt_layout.py)
+COMPOSE_INPUTS = (
+    "answer_mode",
+    "plan",
+    "constraints",
+    "guardrails",
+    "normalized_query",
+    "final_evidence",
+    "coverage",
+    "language",
+    "locale",
+)
+
+
+def compose_payload(state: AnswerState) -> Dict[str, Any]:
+    """Prompt variables for the composer: the conversation window plus ``COMPOSE_INPUTS``."""
+    evidence = _coerce_evidence(composer_evidence(state))
+    coverage = _coerce_coverage(state.get("coverage"))
+
+    # If gate decided clarify/refuse, we still use the composer to produce the user-facing text
+    # but provide mode explicitly so it doesn't try to answer.
+    return {
+        "messages": window_messages(state, "compose_answer"),
+        "answer_mode": state.get("answer_mode", "answer"),
+        "plan": state.get("plan") or {},
+        "constraints": state.get("constraints") or {},
+        "guardrails": state.get("guardrails") or {},
+        "normalized_query": state.get("normalized_query", ""),
+        "final_evidence": [e.model_dump() for e in evidence],
+        "coverage": coverage.model_dump(),
+        "language": state.get("language", None),
+        "locale": state.get("locale", None),
+    }
+
+
+def compose_update(out: ComposeAnswerModel, state: AnswerState) -> Dict[str, Any]:
+    """State update for a validated composer output."""
+    return {
+        "final_answer": out.final_answer,
+        "citations": [c.model_dump() for c in out.citations],
+        "followups": out.followups,
+        "answer_meta": {
+            **(state.get("answer_meta") or {}),
+            "used_evidence_ids": out.used_evidence_ids,
+            "asked_clarification": bool(out.asked_clarification),
+            "refusal": bool(out.refusal),
+        },
+    }
 
-    model = llm.with_structured_output(ComposeAnswerModel, method="function_calling")
-    chain = prompt | model
 
-    @observe
-    def compose_answer(state: AnswerState) -> Dict[str, Any]:
-        mode = state.get("answer_mode", "answer")
-        plan = state.get("plan") or {}
-        constraints = state.get("constraints") or {}
-        guardrails = state.get("guardrails") or {}
+def make_compose_answer_node(llm):
+    prompt = ChatPromptTemplate.from_messages(prefix_cached_messages(COMPOSE_ANSWER_PROMPT, COMPOSE_INPUTS))
 
-        msgs = state.get("messages") or []
-        if not isinstance(msgs, list) or not msgs:
-            return {
-                "errors": [
-                    {
-                        "node": "compose_answer",
-                        "type": "schema_validation",
-                        "message": "Missing or invalid 'messages' in state (expected non-empty list).",
-                        "retryable": False,
-                        "details": {"messages_type": str(type(msgs))},
-                    }
-                ]
-            }
+    chains = routed_chains(
+        llm,
+        "composer",
+        lambda m: prompt | m.with_structured_output(ComposeAnswerModel, method="function_calling", include_raw=True),
+    )
 
-        evidence = _coerce_evidence(state.get("final_evidence"))
-        coverage = _coerce_coverage(state.get("coverage"))
-
-        # If gate decided clarify/refuse, we still use the composer to produce the user-facing text
-        # but provide mode explicitly so it doesn't try to answer.
-        payload = {
-            "messages": msgs,
-            "answer_mode": mode,
-            "plan": plan,
-            "constraints": constraints,
-            "guardrails": guardrails,
-            "normalized_query": state.get("normalized_query", ""),
-            "final_evidence": [e.model_dump() for e in evidence],
-            "coverage": coverage.model_dump(),
-            "language": state.get("language", None),
-            "locale": state.get("locale", None),
-        }
+    def steps(state: AnswerState) -> Steps:
+        draft = speculative_update(state)
+        if draft is not None:
+            logger.info("Using speculative answer draft")
+            return draft
+
+        missing = missing_messages_error(state)
+        if missing is not None:
+            return missing
 
         try:
-            raw = chain.invoke(payload)
-            out = ComposeAnswerModel.model_validate(raw)
+            raw = structured_data((yield invoke_call(chains.for_state(state), compose_payload(state))))
+            out = validate_with_repair(ComposeAnswerModel, raw, node="compose_answer")
         except ValidationError as e:
             return {
                 "errors": [
@@ -121,16 +179,14 @@ def make_compose_answer_node(llm):
                 ]
             }
 
-        return {
-            "final_answer": out.final_answer,
-            "citations": [c.model_dump() for c in out.citations],
-            "followups": out.followups,
-            "answer_meta": {
-                **(state.get("answer_meta") or {}),
-                "used_evidence_ids": out.used_evidence_ids,
-                "asked_clarification": bool(out.asked_clarification),
-                "refusal": bool(out.refusal),
-            },
-        }
-
-    return compose_answer
+        return compose_update(out, state)
+
+    @observe
+    def compose_answer(state: AnswerState) -> Dict[str, Any]:
+        return run_sync(steps(state))
+
+    @observe
+    async def acompose_answer(state: AnswerState) -> Dict[str, Any]:
+        return await run_async(steps(state))
+
+    return with_async(compose_answer, acompose_answer)
@@ -0,0 +1,55 @@
+# src/agentic_rag/answer/nodes/compress_evidence.py
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict
+
+from agentic_rag.answer.compression import (
+    DEFAULT_KEEP_RATIO,
+    DEFAULT_MIN_CHUNK_TOKENS,
+    compress_evidence,
+    query_terms,
+)
+from agentic_rag.answer.nodes.compose_answer import _coerce_evidence
+from agentic_rag.answer.state import AnswerState
+
+# Optional langfuse decorator - safe when disabled
+try:
+    from langfuse import observe  # type: ignore
+except Exception:  # pragma: no cover
+
+    def observe(func=None, **kwargs):
+        if func is None:
+            return lambda f: f
+        return func
+
+
+logger = logging.getLogger(__name__)
+
+
+def make_compress_evidence_node(
+    *, keep_ratio: float = DEFAULT_KEEP_RATIO, min_chunk_tokens: int = DEFAULT_MIN_CHUNK_TOKENS
+):
+    """Extractive compression of ``final_evidence`` into ``compressed_evidence`` for the composer.
+
+    ``final_evidence`` is left untouched; citations are still validated and anchored against it.
+    Only runs when the answer gate chose ``answer`` mode.
+    """
+
+    @observe
+    def compress_evidence_node(state: AnswerState) -> Dict[str, Any]:
+        if state.get("answer_mode", "answer") != "answer":
+            return {}
+        items = _coerce_evidence(state.get("final_evidence"))
+        if not items:
+            return {}
+
+        compressed = compress_evidence(
+            items, query_terms(state), keep_ratio=keep_ratio, min_chunk_tokens=min_chunk_tokens
+        )
+        before = sum(len(i.text) for i in items)
+        after = sum(len(c["text"]) for c in compressed)
+        logger.info(f"Compressed {len(items)} evidence chunks from {before} to {after} chars")
+        return {"compressed_evidence": compressed}
+
+    return compress_evidence_node
@@ -0,0 +1,104 @@
+# src/agentic_rag/answer/nodes/map_evidence.py
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict, List
+
+from langchain_core.prompts import ChatPromptTemplate
+
+from agentic_rag.aio import Call, Steps, run_async, run_sync, with_async
+from agentic_rag.answer.map_reduce import (
+    DEFAULT_GROUP_TOKENS,
+    DEFAULT_MAX_CONCURRENCY,
+    condensed_evidence,
+    group_evidence,
+)
+from agentic_rag.answer.nodes.compose_answer import _coerce_evidence, composer_evidence
+from agentic_rag.answer.prompts.map_evidence import MAP_EVIDENCE_PROMPT
+from agentic_rag.answer.state import AnswerState, Finding, PartialAnswerModel
+from agentic_rag.model import routed_chains
+from agentic_rag.prompt_layout import prefix_cached_messages
+from agentic_rag.repair import structured_data, validate_with_repair
+
+logger = logging.getLogger(__name__)
+
+MAP_EVIDENCE_INPUTS = ("normalized_query", "goal", "subquestions", "evidence")
+
+
+def make_map_evidence_node(
+    llm, *, group_tokens: int = DEFAULT_GROUP_TOKENS, max_concurrency: int = DEFAULT_MAX_CONCURRENCY
+):
+    """Map step of map-reduce composition (answer/map_reduce.py).
+
+    Groups of evidence go concurrently to ``llm`` (typically a cheaper model than the composer's).
+    The findings are written to ``compressed_evidence``, which compose_answer then reduces into the
+    final answer.
+    """
+    # Every group shares the static system prompt; only the trailing inputs message differs
+    prompt = ChatPromptTemplate.from_messages(
+        prefix_cached_messages(MAP_EVIDENCE_PROMPT, MAP_EVIDENCE_INPUTS, messages=False)
+    )
+    chains = routed_chains(
+        llm,
+        "map",
+        lambda m: prompt | m.with_structured_output(PartialAnswerModel, method="function_calling", include_raw=True),
+    )
+
+    def steps(state: AnswerState) -> Steps:
+        items = _coerce_evidence(composer_evidence(state))
+        if not items:
+            return {}
+        plan = state.get("plan") or {}
+        subquestions = (plan.get("acceptance_criteria") or {}).get("must_answer_subquestions") or []
+        groups = group_evidence(items, group_tokens)
+        payloads = [
+            {
+                "normalized_query": state.get("normalized_query", ""),
+                "goal": plan.get("goal", ""),
+                "subquestions": subquestions,
+                "evidence": [{"evidence_id": i.evidence_id, "source": i.source, "text": i.text} for i in group],
+            }
+            for group in groups
+        ]
+
+        chain = chains.for_state(state)
+        try:
+            results = yield Call(
+                chain.batch,
+                chain.abatch,
+                (payloads,),
+                {"config": {"max_concurrency": max_concurrency}, "return_exceptions": True},
+            )
+        except Exception as e:
+            logger.warning(f"map_evidence failed; composing over the full evidence: {e}")
+            return {"map_reduce_report": {"groups": len(groups), "failed_groups": len(groups), "applied": False}}
+
+        valid_ids = {i.evidence_id for i in items}
+        findings: List[Finding] = []
+        failed = 0
+        for result in results:
+            try:
+                if isinstance(result, Exception):
+                    raise result
+                partial = validate_with_repair(PartialAnswerModel, structured_data(result), node="map_evidence")
+            except Exception as e:
+                failed += 1
+                logger.warning(f"map_evidence group failed: {e}")
+                continue
+            findings += [f for f in partial.findings if f.evidence_id in valid_ids]
+
+        report = {"groups": len(groups), "failed_groups": failed, "findings": len(findings)}
+        condensed = condensed_evidence(items, findings)
+        if not condensed:
+            logger.info(f"map_evidence produced no findings ({report}); composing over the full evidence")
+            return {"map_reduce_report": {**report, "applied": False}}
+        logger.info(f"map_evidence condensed {len(items)} evidence items to {len(condensed)} ({report})")
+        return {"compressed_evidence": condensed, "map_reduce_report": {**report, "applied": True}}
+
+    def map_evidence(state: AnswerState) -> Dict[str, Any]:
+        return run_sync(steps(state))
+
+    async def amap_evidence(state: AnswerState) -> Dict[str, Any]:
+        return await run_async(steps(state))
+
+    return with_async(map_evidence, amap_evidence)
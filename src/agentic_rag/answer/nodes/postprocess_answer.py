@@ -2,8 +2,9 @@
 from __future__ import annotations
 
 import re
-from typing import Any, Dict, List, Set
+from typing import Any, Dict, List, Optional, Set, Tuple
 
+from agentic_rag.answer.compression import original_span
 from agentic_rag.answer.state import AnswerState, EvidenceItem
 
 # Optional langfuse decorator - safe when disabled
@@ -20,7 +21,7 @@ except Exception:  # pragma: no cover
 _CODE_FENCE_RE = re.compile(r"```.*?```", re.DOTALL)
 
 
-def _has_no_code(constraints: Dict[str, Any], plan: Dict[str, Any]) -> bool:
+def has_no_code(constraints: Dict[str, Any], plan: Dict[str, Any]) -> bool:
     fmt = (constraints or {}).get("format") or []
     req_fmt = ((plan or {}).get("answer_requirements") or {}).get("format") or []
     return ("no_code" in fmt) or ("no_code" in req_fmt)
@@ -39,6 +40,42 @@ def _valid_evidence_ids(final_evidence: Any) -> Set[str]:
     return ids
 
 
+def _evidence_texts(raw: Any) -> Dict[str, Tuple[str, Dict[str, Any]]]:
+    """evidence_id -> (text, compression info) for valid evidence dicts."""
+    out: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+    for x in raw if isinstance(raw, list) else []:
+        if isinstance(x, dict) and isinstance(x.get("evidence_id"), str) and isinstance(x.get("text"), str):
+            out[x["evidence_id"]] = (x["text"], (x.get("provenance") or {}).get("compression") or {})
+    return out
+
+
+def _chunk_span(
+    quote: str, original: Optional[str], compressed: Optional[Tuple[str, Dict[str, Any]]]
+) -> Optional[Tuple[int, int]]:
+    """Offsets of a citation quote in the original chunk, via the compressed text when it was compressed."""
+    if compressed is not None and compressed[1]:
+        pos = compressed[0].find(quote)
+        if pos >= 0:
+            return original_span(compressed[1], pos, pos + len(quote))
+    pos = original.find(quote) if original else -1
+    return (pos, pos + len(quote)) if pos >= 0 else None
+
+
+def anchor_citations(citations: List[Dict[str, Any]], state: AnswerState) -> List[Dict[str, Any]]:
+    """Add ``chunk_start``/``chunk_end`` (offsets in the original evidence text) to quoted citations."""
+    originals = _evidence_texts(state.get("final_evidence"))
+    compressed = _evidence_texts(state.get("compressed_evidence"))
+    out = []
+    for c in citations:
+        quote = (c.get("text") or "").strip()
+        span = None
+        if quote:
+            original = originals.get(c["evidence_id"])
+            span = _chunk_span(quote, original[0] if original else None, compressed.get(c["evidence_id"]))
+        out.append({**c, "chunk_start": span[0], "chunk_end": span[1]} if span else c)
+    return out
+
+
 def make_postprocess_answer_node():
     @observe
     def postprocess_answer(state: AnswerState) -> Dict[str, Any]:
@@ -48,7 +85,7 @@ def make_postprocess_answer_node():
         citations = state.get("citations") or []
 
         # Enforce no_code by removing fenced blocks (cheap deterministic safety)
-        if _has_no_code(constraints, plan):
+        if has_no_code(constraints, plan):
             answer = _CODE_FENCE_RE.sub("", answer).strip()
 
         # Drop citations that reference unknown evidence_ids
@@ -66,7 +103,7 @@ def make_postprocess_answer_node():
 
         return {
             "final_answer": answer if answer else "(No answer produced.)",
-            "citations": filtered,
+            "citations": anchor_citations(filtered, state),
             "answer_meta": meta,
         }
 
@@ -1,14 +1,14 @@
 COMPOSE_ANSWER_PROMPT = """You are the Answer composer in an agentic RAG system.
 
-You will receive:
-- answer_mode: {answer_mode}
-- plan: {plan}
-- constraints: {constraints}
-- guardrails: {guardrails}
-- final_evidence: {final_evidence}
-- coverage: {coverage}
-- normalized_query: {normalized_query}
-- language/locale: {language} / {locale}
+You will receive the conversation messages, then the inputs as JSON in the final system message:
+- answer_mode
+- plan
+- constraints
+- guardrails
+- final_evidence
+- coverage
+- normalized_query
+- language / locale
 
 You must output ONLY a JSON object matching the ComposeAnswerModel schema.
 
@@ -28,10 +28,11 @@ Citations:
 - If citations are requested by answer_requirements.format OR constraints.format includes "citations":
   - Provide citations referencing evidence_id values you used.
   - Never cite an evidence_id that is not present in final_evidence.
+  - Evidence text may be excerpted: " … " marks omitted passages. Quote only text between the marks.
 
 Output fields:
 - final_answer: user-facing response
-- citations: list of {{evidence_id, optional span_start/span_end, optional note}}
+- citations: list of {{evidence_id, optional text (short verbatim quote), optional span_start/span_end, optional note}}
 - used_evidence_ids: list of evidence_id actually used
 - followups: optional, non-blocking follow-up questions
 - asked_clarification: true if you ask clarifying questions in final_answer
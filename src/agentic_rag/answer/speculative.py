@@ -0,0 +1,257 @@
+# src/agentic_rag/answer/speculative.py
+"""Speculative answer drafting for requests that will most likely be answered directly.
+
+When intake says a request needs no retrieval (``retrieval_intent == "none"`` or
+``answerability == "reasoning_only"``), the planner nearly always returns ``direct_answer``. The
+composer would then run with no evidence. ``SpeculativeComposer`` starts that compose call on
+a worker thread while the planner is still deciding.
+
+The speculation gate after the planner keeps the draft only if the plan is a direct answer with
+the answer requirements (format, tone, length, citation style) and sensitivity the draft assumed.
+Any other plan discards the draft and the request continues unchanged. Only the draft's LLM cost
+is wasted, never latency.
+
+The prediction reuses TemplatePlanner's direct-answer rule, including the clean-intake
+conditions. The draft is composed against the plan that rule would produce.
+
+Drafts are metered like the compose_answer node: an accepted draft carries its ``token_ledger``
+entries into compose_answer's update, and the gate records discarded (or failed) drafts under the
+``speculative_draft`` node. A draft still running when it is discarded is not waited for; its
+tokens are only counted in ``stats.discarded_tokens`` once it finishes.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from agentic_rag.aio import with_async
+from agentic_rag.answer.nodes.compose_answer import make_compose_answer_node
+from agentic_rag.planner.state import AnswerRequirements
+from agentic_rag.planner.templates import TemplatePlanner
+from agentic_rag.usage import ledger_totals, with_usage
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_WORKERS = 4
+
+# token_ledger node for drafts that were composed but not used
+DRAFT_NODE = "speculative_draft"
+
+
+def _answer_requirements(plan: Dict[str, Any]) -> Dict[str, Any]:
+    """``plan.answer_requirements`` with defaults filled in and ``format`` order ignored."""
+    requirements = AnswerRequirements.model_validate(plan.get("answer_requirements") or {}).model_dump()
+    requirements["format"] = sorted(requirements["format"])
+    return requirements
+
+
+@dataclass
+class SpeculationStats:
+    speculated: int = 0  # drafts started alongside the planner
+    accepted: int = 0  # drafts used as the answer
+    discarded: int = 0  # drafts dropped because the plan chose another path (or the draft failed)
+    saved_ms: float = 0.0  # total draft time that overlapped with planning, over accepted drafts
+    discarded_tokens: int = 0  # tokens spent on discarded or failed drafts
+
+    @property
+    def acceptance_rate(self) -> float:
+        return self.accepted / self.speculated if self.speculated else 0.0
+
+    @property
+    def mean_saved_ms(self) -> float:
+        return self.saved_ms / self.accepted if self.accepted else 0.0
+
+
+class SpeculativeComposer:
+    """Runs compose_answer for likely direct answers in parallel with the planner.
+
+    Share one instance across requests. Pending drafts are keyed by the ``speculation_id``
+    stored in graph state, so state never holds a Future. Stats are thread-safe.
+    """
+
+    def __init__(self, llm, *, max_workers: int = DEFAULT_MAX_WORKERS):
+        # Runs on a pool thread, which does not inherit the caller's usage meter: meter it there
+        self._compose = with_usage(make_compose_answer_node(llm), "compose_answer")
+        self._predictor = TemplatePlanner(templates=(), direct_answer=True)
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="answer-draft")
+        self._pending: Dict[str, Tuple[Future, Dict[str, Any], float]] = {}
+        self._lock = threading.Lock()
+        self.stats = SpeculationStats()
+
+    def _draft(self, state: Dict[str, Any]) -> Tuple[Dict[str, Any], float]:
+        out = self._compose(state)
+        return out, time.perf_counter()
+
+    def start(self, state: Dict[str, Any]) -> Optional[str]:
+        """Start a draft when intake predicts ``direct_answer``; returns its id (or ``None``)."""
+        plan = self._predictor.plan(state)
+        if plan is None:
+            return None
+        provisional = plan.model_dump()
+        draft_state = {
+            **state,
+            "plan": provisional,
+            "answer_mode": "answer",
+            "final_evidence": [],
+            "coverage": {},
+            "answer_meta": {},
+        }
+        speculation_id = uuid.uuid4().hex
+        future = self._pool.submit(self._draft, draft_state)
+        with self._lock:
+            self._pending[speculation_id] = (future, provisional, time.perf_counter())
+            self.stats.speculated += 1
+        return speculation_id
+
+    @staticmethod
+    def accepts(provisional: Dict[str, Any], plan: Dict[str, Any]) -> bool:
+        """Whether a draft composed for ``provisional`` is valid for the planner's ``plan``."""
+        if plan.get("strategy") != "direct_answer":
+            return False
+        if _answer_requirements(plan) != _answer_requirements(provisional):
+            return False
+        return ((plan.get("safety") or {}).get("sensitivity") or "normal") == "normal"
+
+    def _accepted(
+        self, speculation_id: Optional[str], plan: Dict[str, Any]
+    ) -> Tuple[Optional[Tuple[Future, float]], List[Dict[str, Any]]]:
+        """Pop the pending draft: ``((future, started_at), [])`` if the plan accepts it, else discard it.
+
+        A discarded draft that already finished returns its ledger entries (as ``speculative_draft``).
+        """
+        if not speculation_id:
+            return None, []
+        with self._lock:
+            pending = self._pending.pop(speculation_id, None)
+        if pending is None:
+            return None, []
+        future, provisional, started_at = pending
+
+        if not self.accepts(provisional, plan or {}):
+            future.cancel()  # only prevents drafts that have not started yet
+            self._record(accepted=False)
+            logger.debug(f"Discarded speculative draft: strategy={(plan or {}).get('strategy')}")
+            if future.done():
+                return None, self._discarded_usage(future)
+            future.add_done_callback(self._discarded_usage)
+            return None, []
+        return (future, started_at), []
+
+    def _discarded_usage(self, future: Future) -> List[Dict[str, Any]]:
+        """Ledger entries of a discarded draft under ``speculative_draft``; counted in the stats."""
+        if future.cancelled() or future.exception() is not None:
+            return []
+        out, _ = future.result()
+        return self._as_discarded((out or {}).get("token_ledger"))
+
+    def _as_discarded(self, ledger: Optional[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        entries = [{**e, "node": DRAFT_NODE} for e in ledger or []]
+        with self._lock:
+            self.stats.discarded_tokens += ledger_totals(entries)["total_tokens"]
+        return entries
+
+    def _settle(
+        self, out: Optional[Dict[str, Any]], done_at: float, planned_at: float, started_at: float
+    ) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+        if not out or out.get("errors"):
+            self._record(accepted=False)
+            return None, self._as_discarded((out or {}).get("token_ledger"))
+
+        saved_ms = (min(done_at, planned_at) - started_at) * 1000
+        self._record(accepted=True, saved_ms=saved_ms)
+        logger.debug(f"Accepted speculative draft, saved {saved_ms:.0f} ms")
+        return out, []
+
+    def resolve_with_usage(
+        self, speculation_id: Optional[str], plan: Dict[str, Any]
+    ) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+        """``(draft, discarded_usage)``: the accepted draft's compose_answer update (its ``token_ledger``
+        included) or ``None``, plus ledger entries of a discarded draft.
+
+        Waits for an accepted draft that is still running. By then the planner's latency has
+        already been overlapped.
+        """
+        accepted, usage = self._accepted(speculation_id, plan)
+        if accepted is None:
+            return None, usage
+        future, started_at = accepted
+        planned_at = time.perf_counter()
+        try:
+            out, done_at = future.result()
+        except Exception as e:
+            logger.warning(f"Speculative draft failed: {e}")
+            out, done_at = None, planned_at
+        return self._settle(out, done_at, planned_at, started_at)
+
+    async def aresolve_with_usage(
+        self, speculation_id: Optional[str], plan: Dict[str, Any]
+    ) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+        """``resolve_with_usage`` that awaits a still-running draft instead of blocking a thread on it."""
+        accepted, usage = self._accepted(speculation_id, plan)
+        if accepted is None:
+            return None, usage
+        future, started_at = accepted
+        planned_at = time.perf_counter()
+        try:
+            out, done_at = await asyncio.wrap_future(future)
+        except Exception as e:
+            logger.warning(f"Speculative draft failed: {e}")
+            out, done_at = None, planned_at
+        return self._settle(out, done_at, planned_at, started_at)
+
+    def resolve(self, speculation_id: Optional[str], plan: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Return the compose_answer update for an accepted draft, or ``None`` after discarding it."""
+        return self.resolve_with_usage(speculation_id, plan)[0]
+
+    async def aresolve(self, speculation_id: Optional[str], plan: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """``resolve`` that awaits a still-running draft instead of blocking a thread on it."""
+        return (await self.aresolve_with_usage(speculation_id, plan))[0]
+
+    def _record(self, *, accepted: bool, saved_ms: float = 0.0) -> None:
+        with self._lock:
+            if accepted:
+                self.stats.accepted += 1
+                self.stats.saved_ms += max(0.0, saved_ms)
+            else:
+                self.stats.discarded += 1
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+def make_speculate_answer_node(composer: SpeculativeComposer):
+    """Start a speculative draft before the planner runs; sets ``speculation_id``."""
+
+    def speculate_answer(state: Dict[str, Any]) -> Dict[str, Any]:
+        return {"speculation_id": composer.start(state), "speculative_answer": None}
+
+    return speculate_answer
+
+
+def make_speculation_gate_node(composer: SpeculativeComposer):
+    """Keep or discard the draft once the plan is known; sets ``speculative_answer``.
+
+    The usage of a discarded draft is added to ``token_ledger`` here; an accepted draft's usage
+    is recorded by compose_answer, which returns the draft as its update.
+    """
+
+    def _update(draft: Optional[Dict[str, Any]], usage: List[Dict[str, Any]]) -> Dict[str, Any]:
+        update: Dict[str, Any] = {"speculation_id": None, "speculative_answer": draft}
+        if usage:
+            update["token_ledger"] = usage
+        return update
+
+    def speculation_gate(state: Dict[str, Any]) -> Dict[str, Any]:
+        return _update(*composer.resolve_with_usage(state.get("speculation_id"), state.get("plan") or {}))
+
+    async def aspeculation_gate(state: Dict[str, Any]) -> Dict[str, Any]:
+        return _update(*await composer.aresolve_with_usage(state.get("speculation_id"), state.get("plan") or {}))
+
+    return with_async(speculation_gate, aspeculation_gate)
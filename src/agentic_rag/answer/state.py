@@ -1,10 +1,12 @@
 # src/agentic_rag/answer/state.py
 from __future__ import annotations
 
-from typing import Any, Dict, List, Literal, Optional, TypedDict
+from typing import Annotated, Any, Dict, List, Literal, Optional, TypedDict
 
 from pydantic import BaseModel, ConfigDict, Field, confloat, conint
 
+from agentic_rag.usage import add_ledger
+
 AnswerMode = Literal["answer", "clarify", "refuse"]
 
 CitationStyle = Literal["none", "inline", "footnote"]
@@ -86,6 +88,23 @@ class ComposeAnswerModel(BaseModel):
     refusal: bool = False
 
 
+class Finding(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    evidence_id: str = Field(..., min_length=1)
+    point: str = Field(..., min_length=1)  # what this evidence says about the question
+    quote: Optional[str] = None  # short verbatim supporting quote
+    subquestion: Optional[str] = None  # the plan subquestion it answers, if any
+
+
+class PartialAnswerModel(BaseModel):
+    """Structured output of one map_evidence call over a group of evidence items."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    findings: List[Finding] = Field(default_factory=list)
+
+
 # -------------------------
 # LangGraph state
 # -------------------------
@@ -94,6 +113,9 @@ class ComposeAnswerModel(BaseModel):
 class AnswerState(TypedDict, total=False):
     # From intake
     messages: list
+    conversation_summary: Optional[str]
+    summarized_turns: int
+    model_tier: Optional[str]
     normalized_query: str
     constraints: Dict[str, Any]
     guardrails: Dict[str, Any]
@@ -108,6 +130,14 @@ class AnswerState(TypedDict, total=False):
     coverage: Dict[str, Any]  # CoverageModel-like dict
     retrieval_report: Dict[str, Any]
 
+    # Extractive compression of final_evidence for the composer prompt (answer/compression.py)
+    compressed_evidence: Optional[List[Dict[str, Any]]]
+    # Map step of map-reduce composition for large evidence packs (answer/map_reduce.py)
+    map_reduce_report: Dict[str, Any]
+
+    # Draft composed in parallel with the planner and accepted by the speculation gate
+    speculative_answer: Optional[Dict[str, Any]]
+
     # Answer stage outputs
     answer_mode: AnswerMode
     final_answer: str
@@ -115,5 +145,8 @@ class AnswerState(TypedDict, total=False):
     followups: List[str]
     answer_meta: Dict[str, Any]
 
+    # Per-call token usage (agentic_rag/usage.py)
+    token_ledger: Annotated[List[Dict[str, Any]], add_ledger]
+
     # Shared error channel
     errors: List[Dict[str, Any]]
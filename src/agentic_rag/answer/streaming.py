@@ -0,0 +1,333 @@
+# src/agentic_rag/answer/streaming.py
+"""Token-streaming answer output.
+
+``compose_answer`` normally returns once the whole ComposeAnswerModel JSON has been generated.
+The streaming composer streams the ComposeAnswerModel tool call instead. It decodes the
+``final_answer`` string as it arrives and emits the text through LangGraph's custom stream
+(``stream_mode="custom"``):
+
+- ``{"event": "answer_delta", "text": ...}``: new answer text, already passed through the
+  postprocess_answer formatting rules (no_code fence stripping and trimming) incrementally.
+- ``{"event": "answer_reset", "reason": ...}``: the streamed text is void. The output failed
+  validation and the node reports its usual retryable error.
+- ``{"event": "answer_final", ...}``: emitted after postprocess_answer, with the final answer,
+  filtered citations, followups and answer_meta.
+
+The state update is the same as the blocking composer's, so postprocess_answer and every caller
+using ``invoke`` see no difference. ``stream_answer_events`` runs a graph and yields these
+events, including those from subgraphs.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from langchain_core.prompts import ChatPromptTemplate
+from langgraph.config import get_stream_writer
+from pydantic import ValidationError
+
+from agentic_rag.aio import with_async
+from agentic_rag.answer.nodes.compose_answer import (
+    COMPOSE_INPUTS,
+    compose_payload,
+    compose_update,
+    missing_messages_error,
+    speculative_update,
+)
+from agentic_rag.answer.nodes.postprocess_answer import has_no_code, make_postprocess_answer_node
+from agentic_rag.answer.prompts.compose_answer import COMPOSE_ANSWER_PROMPT
+from agentic_rag.answer.state import AnswerState, ComposeAnswerModel
+from agentic_rag.model import routed_chains
+from agentic_rag.planner.streaming import PartialJSONScanner, tool_call_args
+from agentic_rag.prompt_layout import prefix_cached_messages
+from agentic_rag.repair import validate_with_repair
+
+logger = logging.getLogger(__name__)
+
+_FENCE = "```"
+
+
+def stream_writer() -> Callable[[Any], None]:
+    """LangGraph's custom stream writer, or a no-op when the node runs outside a graph."""
+    try:
+        return get_stream_writer()
+    except RuntimeError:
+        return lambda _chunk: None
+
+
+class JSONStringDecoder:
+    """Incrementally decodes a JSON string literal whose raw text is still growing.
+
+    ``feed`` takes the whole raw literal so far, starting at its opening quote, and returns only
+    the newly decoded text. Escape sequences split across chunks, including surrogate pairs,
+    are held back until they are complete.
+    """
+
+    def __init__(self) -> None:
+        self._pos = 1  # raw index after the opening quote
+        self.closed = False
+
+    def feed(self, raw: str) -> str:
+        if self.closed or not raw.startswith('"'):
+            return ""
+        i, safe, n = self._pos, self._pos, len(raw)
+        while i < n:
+            c = raw[i]
+            if c == '"':
+                self.closed = True
+                break
+            if c == "\\":
+                if i + 1 >= n:
+                    break
+                if raw[i + 1] == "u":
+                    try:
+                        code = int(raw[i + 2 : i + 6], 16) if i + 6 <= n else None
+                    except ValueError:
+                        break
+                    if code is None:
+                        break
+                    step = 12 if 0xD800 <= code < 0xDC00 else 6  # high surrogate needs its pair
+                    if i + step > n:
+                        break
+                    i += step
+                else:
+                    i += 2
+            else:
+                i += 1
+            safe = i
+        if safe <= self._pos:
+            return ""
+        segment, self._pos = raw[self._pos : safe], safe
+        return json.loads(f'"{segment}"')
+
+
+class AnswerTextFilter:
+    """Streaming equivalent of postprocess_answer's text rules.
+
+    With ``no_code``, fenced code blocks are removed exactly as
+    ``_CODE_FENCE_RE.sub("", answer).strip()`` would remove them on the full text. Up to two
+    trailing backticks are held back until it is clear whether they open a fence. Leading
+    whitespace is dropped, and trailing whitespace is held until more text follows. A fence that
+    never closes is kept, as the regex would keep it. Without ``no_code`` the text passes through
+    unchanged.
+    """
+
+    def __init__(self, no_code: bool) -> None:
+        self.no_code = no_code
+        self._pending = ""
+        self._in_fence = False
+        self._started = False
+        self._space = ""
+
+    def _trim(self, text: str) -> str:
+        if not self._started:
+            text = text.lstrip()
+            if not text:
+                return ""
+            self._started = True
+        body = text.rstrip()
+        if not body:
+            self._space += text
+            return ""
+        out = self._space + body
+        self._space = text[len(body) :]
+        return out
+
+    def feed(self, text: str) -> str:
+        if not self.no_code:
+            return text
+        self._pending += text
+        out: List[str] = []
+        while True:
+            if not self._in_fence:
+                i = self._pending.find(_FENCE)
+                if i < 0:
+                    break
+                out.append(self._pending[:i])
+                self._pending = self._pending[i:]  # keep the opener until the fence closes
+                self._in_fence = True
+            i = self._pending.find(_FENCE, len(_FENCE))
+            if i < 0:
+                break
+            self._pending = self._pending[i + len(_FENCE) :]
+            self._in_fence = False
+        if not self._in_fence:
+            body = self._pending.rstrip("`")
+            hold = min(len(self._pending) - len(body), len(_FENCE) - 1)
+            cut = len(self._pending) - hold
+            out.append(self._pending[:cut])
+            self._pending = self._pending[cut:]
+        return self._trim("".join(out))
+
+    def finish(self) -> str:
+        """Flush held text once the answer is complete."""
+        if not self.no_code:
+            return ""
+        rest, self._pending = self._pending, ""
+        self._in_fence = False
+        return self._trim(rest)
+
+
+def _no_code(state: AnswerState) -> bool:
+    return has_no_code(state.get("constraints") or {}, state.get("plan") or {})
+
+
+class _AnswerStream:
+    """Per-call decoding state of the streaming composer."""
+
+    def __init__(self, state: AnswerState, emit: Callable[[Any], None]) -> None:
+        self.emit = emit
+        self.scanner = PartialJSONScanner()
+        self.decoder = JSONStringDecoder()
+        self.text_filter = AnswerTextFilter(_no_code(state))
+        self.streamed = 0
+
+    def _send(self, text: str) -> None:
+        if text:
+            self.emit({"event": "answer_delta", "text": text})
+            self.streamed += len(text)
+
+    def feed(self, chunk: Any) -> None:
+        for part in tool_call_args(chunk):
+            self.scanner.feed(part)
+        raw_answer = self.scanner.raw_value("final_answer")
+        if raw_answer is not None:
+            self._send(self.text_filter.feed(self.decoder.feed(raw_answer)))
+
+    def finish(self, state: AnswerState) -> Dict[str, Any]:
+        self._send(self.text_filter.finish())
+        out = validate_with_repair(ComposeAnswerModel, self.scanner.parse(), node="compose_answer")
+        update = compose_update(out, state)
+        update["answer_meta"]["streamed"] = True
+        return update
+
+    def error(self, e: Exception) -> Dict[str, Any]:
+        if isinstance(e, ValidationError):
+            error = {
+                "node": "compose_answer",
+                "type": "model_output_parse",
+                "message": "Answer structured output failed validation.",
+                "retryable": True,
+                "details": {"validation_errors": e.errors()},
+            }
+        elif isinstance(e, json.JSONDecodeError):
+            error = {
+                "node": "compose_answer",
+                "type": "model_output_parse",
+                "message": "Answer tool call arguments are not valid JSON.",
+                "retryable": True,
+                "details": {"error": str(e), "received_chars": len(self.scanner.text)},
+            }
+        else:
+            error = {
+                "node": "compose_answer",
+                "type": "runtime_error",
+                "message": str(e),
+                "retryable": True,
+                "details": None,
+            }
+        if self.streamed:
+            self.emit({"event": "answer_reset", "reason": error["type"]})
+        return {"errors": [error]}
+
+
+def _draft_update(state: AnswerState, draft: Dict[str, Any], emit: Callable[[Any], None]) -> Dict[str, Any]:
+    logger.info("Using speculative answer draft")
+    text_filter = AnswerTextFilter(_no_code(state))
+    text = text_filter.feed(draft.get("final_answer") or "") + text_filter.finish()
+    if text:
+        emit({"event": "answer_delta", "text": text})
+    return {**draft, "answer_meta": {**draft["answer_meta"], "streamed": True}}
+
+
+def make_streaming_compose_answer_node(llm):
+    """compose_answer node that streams ``final_answer`` as ``answer_delta`` custom events.
+
+    It returns the same update as make_compose_answer_node, plus ``answer_meta["streamed"]``.
+    The async variant (``node.afunc``) consumes ``astream``.
+    """
+    prompt = ChatPromptTemplate.from_messages(prefix_cached_messages(COMPOSE_ANSWER_PROMPT, COMPOSE_INPUTS))
+    chains = routed_chains(
+        llm, "composer", lambda m: prompt | m.bind_tools([ComposeAnswerModel], tool_choice=ComposeAnswerModel.__name__)
+    )
+
+    def compose_answer(state: AnswerState) -> Dict[str, Any]:
+        emit = stream_writer()
+        draft = speculative_update(state)
+        if draft is not None:
+            return _draft_update(state, draft, emit)
+        missing = missing_messages_error(state)
+        if missing is not None:
+            return missing
+
+        stream = _AnswerStream(state, emit)
+        try:
+            for chunk in chains.for_state(state).stream(compose_payload(state)):
+                stream.feed(chunk)
+            return stream.finish(state)
+        except Exception as e:
+            return stream.error(e)
+
+    async def acompose_answer(state: AnswerState) -> Dict[str, Any]:
+        emit = stream_writer()
+        draft = speculative_update(state)
+        if draft is not None:
+            return _draft_update(state, draft, emit)
+        missing = missing_messages_error(state)
+        if missing is not None:
+            return missing
+
+        stream = _AnswerStream(state, emit)
+        try:
+            async for chunk in chains.for_state(state).astream(compose_payload(state)):
+                stream.feed(chunk)
+            return stream.finish(state)
+        except Exception as e:
+            return stream.error(e)
+
+    return with_async(compose_answer, acompose_answer)
+
+
+def final_event(state: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "event": "answer_final",
+        "final_answer": state.get("final_answer") or "",
+        "citations": state.get("citations") or [],
+        "followups": state.get("followups") or [],
+        "answer_meta": state.get("answer_meta") or {},
+    }
+
+
+def make_streaming_postprocess_answer_node():
+    """postprocess_answer that also emits the trailing ``answer_final`` event."""
+    postprocess = make_postprocess_answer_node()
+
+    def postprocess_answer(state: AnswerState) -> Dict[str, Any]:
+        update = postprocess(state)
+        stream_writer()(final_event({**state, **update}))
+        return update
+
+    return postprocess_answer
+
+
+def stream_answer_events(graph, inputs: Dict[str, Any], config: Optional[Dict[str, Any]] = None) -> Iterator[Dict]:
+    """Run ``graph`` and yield answer events as they are emitted.
+
+    Subgraph events are included. Template answers (clarify/refuse short circuits) and
+    non-streaming composers emit no deltas. For those, an ``answer_final`` event is built from
+    the final state so that every run ends with exactly one.
+    """
+    final_seen = False
+    last_values: Optional[Dict[str, Any]] = None
+    for namespace, mode, chunk in graph.stream(inputs, config, stream_mode=["custom", "values"], subgraphs=True):
+        if mode == "values":
+            if not namespace:
+                last_values = chunk
+            continue
+        if isinstance(chunk, dict) and chunk.get("event") == "answer_final":
+            final_seen = True
+        yield chunk
+    if not final_seen and last_values is not None:
+        yield final_event(last_values)
@@ -0,0 +1,304 @@
+# src/agentic_rag/answer/templates.py
+"""Deterministic clarify/refuse responses.
+
+A blocking clarification or a hard refusal does not need the planner or the composer: the text
+is fully determined by ``clarification.reasons``, ``guardrails`` and the detected language.
+make_agent_graph routes those paths to the nodes below instead of making one to two LLM calls.
+
+Strings are localised for en/de/fr/es/it/pt/nl (keyed by the intake ``language``); anything else
+falls back to English.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict, List, Optional
+
+from agentic_rag.answer.state import AnswerMeta
+from agentic_rag.planner.state import ClarifyingQuestion, PlannerState
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LANGUAGE = "en"
+
+# Reason -> question. "{term}" is filled from intake signals when available; "<reason>:generic"
+# is used when no term is known.
+_STRINGS: Dict[str, Dict[str, str]] = {
+    "en": {
+        "clarify_intro": "Before I look into this, I need a bit more detail:",
+        "missing_version": "Which version or release are you asking about?",
+        "missing_timeframe": "Which time period should the answer cover?",
+        "missing_scope": "Which system, team or area does this apply to?",
+        "ambiguous_acronym": "What does “{term}” stand for in this context?",
+        "ambiguous_acronym:generic": "Could you spell out the acronym you used?",
+        "ambiguous_entity": "Which “{term}” do you mean?",
+        "ambiguous_entity:generic": "Which specific product, component or document do you mean?",
+        "conflicting_constraints": "Some of your requirements conflict. Which one should take priority?",
+        "unclear_success_criteria": "What should a good answer contain for you (steps, a comparison, a yes/no)?",
+        "context_reference_unresolved": "Which earlier message or document are you referring to?",
+        "generic": "Could you add a little more detail about what you need?",
+        "refuse_restricted": "I can't help with this request because it involves restricted information.",
+        "refuse_defer": (
+            "I'm not able to answer this request here. Please reach out to the responsible team or use the "
+            "official channel."
+        ),
+        "pii_note": "Please avoid sharing personal data such as email addresses, phone or account numbers.",
+    },
+    "de": {
+        "clarify_intro": "Bevor ich nachsehe, brauche ich noch ein paar Details:",
+        "missing_version": "Um welche Version oder welches Release geht es?",
+        "missing_timeframe": "Welchen Zeitraum soll die Antwort abdecken?",
+        "missing_scope": "Für welches System, Team oder welchen Bereich gilt das?",
+        "ambiguous_acronym": "Wofür steht „{term}“ in diesem Zusammenhang?",
+        "ambiguous_acronym:generic": "Kannst du die verwendete Abkürzung ausschreiben?",
+        "ambiguous_entity": "Welches „{term}“ meinst du?",
+        "ambiguous_entity:generic": "Welches Produkt, welche Komponente oder welches Dokument meinst du genau?",
+        "conflicting_constraints": "Einige Anforderungen widersprechen sich. Welche hat Vorrang?",
+        "unclear_success_criteria": "Was soll eine gute Antwort enthalten (Schritte, einen Vergleich, ja/nein)?",
+        "context_reference_unresolved": "Auf welche frühere Nachricht oder welches Dokument beziehst du dich?",
+        "generic": "Kannst du etwas genauer beschreiben, was du brauchst?",
+        "refuse_restricted": "Bei dieser Anfrage kann ich nicht helfen, da sie vertrauliche Informationen betrifft.",
+        "refuse_defer": (
+            "Diese Anfrage kann ich hier nicht beantworten. Bitte wende dich an das zuständige Team oder den "
+            "offiziellen Kanal."
+        ),
+        "pii_note": "Bitte teile keine personenbezogenen Daten wie E-Mail-Adressen, Telefon- oder Kontonummern.",
+    },
+    "fr": {
+        "clarify_intro": "Avant de chercher, j'ai besoin de quelques précisions :",
+        "missing_version": "De quelle version ou de quelle release s'agit-il ?",
+        "missing_timeframe": "Quelle période la réponse doit-elle couvrir ?",
+        "missing_scope": "À quel système, quelle équipe ou quel périmètre cela s'applique-t-il ?",
+        "ambiguous_acronym": "Que signifie « {term} » dans ce contexte ?",
+        "ambiguous_acronym:generic": "Pouvez-vous préciser l'acronyme utilisé ?",
+        "ambiguous_entity": "De quel « {term} » parlez-vous ?",
+        "ambiguous_entity:generic": "De quel produit, composant ou document parlez-vous précisément ?",
+        "conflicting_constraints": "Certaines exigences se contredisent. Laquelle est prioritaire ?",
+        "unclear_success_criteria": "Que doit contenir une bonne réponse (étapes, comparaison, oui/non) ?",
+        "context_reference_unresolved": "À quel message ou document précédent faites-vous référence ?",
+        "generic": "Pouvez-vous préciser un peu votre besoin ?",
+        "refuse_restricted": "Je ne peux pas traiter cette demande car elle concerne des informations restreintes.",
+        "refuse_defer": (
+            "Je ne peux pas répondre à cette demande ici. Merci de contacter l'équipe responsable ou le canal "
+            "officiel."
+        ),
+        "pii_note": (
+            "Merci de ne pas partager de données personnelles comme des adresses e-mail, numéros de téléphone "
+            "ou de compte."
+        ),
+    },
+    "es": {
+        "clarify_intro": "Antes de buscarlo, necesito algunos detalles más:",
+        "missing_version": "¿A qué versión o release te refieres?",
+        "missing_timeframe": "¿Qué periodo de tiempo debe cubrir la respuesta?",
+        "missing_scope": "¿A qué sistema, equipo o área se aplica?",
+        "ambiguous_acronym": "¿Qué significa «{term}» en este contexto?",
+        "ambiguous_acronym:generic": "¿Puedes escribir completo el acrónimo que usaste?",
+        "ambiguous_entity": "¿A qué «{term}» te refieres?",
+        "ambiguous_entity:generic": "¿A qué producto, componente o documento te refieres exactamente?",
+        "conflicting_constraints": "Algunos requisitos se contradicen. ¿Cuál tiene prioridad?",
+        "unclear_success_criteria": "¿Qué debería incluir una buena respuesta (pasos, una comparación, sí/no)?",
+        "context_reference_unresolved": "¿A qué mensaje o documento anterior te refieres?",
+        "generic": "¿Puedes dar un poco más de detalle sobre lo que necesitas?",
+        "refuse_restricted": "No puedo ayudar con esta solicitud porque involucra información restringida.",
+        "refuse_defer": (
+            "No puedo responder a esta solicitud aquí. Contacta con el equipo responsable o usa el canal oficial."
+        ),
+        "pii_note": "Evita compartir datos personales como correos electrónicos, teléfonos o números de cuenta.",
+    },
+    "it": {
+        "clarify_intro": "Prima di cercare, mi servono alcuni dettagli:",
+        "missing_version": "A quale versione o release ti riferisci?",
+        "missing_timeframe": "Quale periodo deve coprire la risposta?",
+        "missing_scope": "A quale sistema, team o ambito si applica?",
+        "ambiguous_acronym": "Cosa significa «{term}» in questo contesto?",
+        "ambiguous_acronym:generic": "Puoi scrivere per esteso l'acronimo che hai usato?",
+        "ambiguous_entity": "A quale «{term}» ti riferisci?",
+        "ambiguous_entity:generic": "A quale prodotto, componente o documento ti riferisci esattamente?",
+        "conflicting_constraints": "Alcuni requisiti sono in conflitto. Quale ha la priorità?",
+        "unclear_success_criteria": "Cosa dovrebbe contenere una buona risposta (passaggi, un confronto, sì/no)?",
+        "context_reference_unresolved": "A quale messaggio o documento precedente ti riferisci?",
+        "generic": "Puoi dare qualche dettaglio in più su ciò che ti serve?",
+        "refuse_restricted": "Non posso aiutarti con questa richiesta perché riguarda informazioni riservate.",
+        "refuse_defer": (
+            "Non posso rispondere a questa richiesta qui. Contatta il team responsabile o usa il canale ufficiale."
+        ),
+        "pii_note": "Evita di condividere dati personali come indirizzi e-mail, numeri di telefono o di conto.",
+    },
+    "pt": {
+        "clarify_intro": "Antes de pesquisar, preciso de mais alguns detalhes:",
+        "missing_version": "A qual versão ou release você se refere?",
+        "missing_timeframe": "Que período a resposta deve cobrir?",
+        "missing_scope": "A qual sistema, equipe ou área isso se aplica?",
+        "ambiguous_acronym": "O que significa “{term}” neste contexto?",
+        "ambiguous_acronym:generic": "Você pode escrever por extenso a sigla que usou?",
+        "ambiguous_entity": "A qual “{term}” você se refere?",
+        "ambiguous_entity:generic": "A qual produto, componente ou documento você se refere exatamente?",
+        "conflicting_constraints": "Alguns requisitos são conflitantes. Qual deles tem prioridade?",
+        "unclear_success_criteria": "O que uma boa resposta deve conter (passos, uma comparação, sim/não)?",
+        "context_reference_unresolved": "A qual mensagem ou documento anterior você se refere?",
+        "generic": "Você pode dar um pouco mais de detalhe sobre o que precisa?",
+        "refuse_restricted": "Não posso ajudar com esta solicitação porque envolve informações restritas.",
+        "refuse_defer": (
+            "Não consigo responder a esta solicitação aqui. Entre em contato com a equipe responsável ou use o "
+            "canal oficial."
+        ),
+        "pii_note": "Evite compartilhar dados pessoais como e-mails, telefones ou números de conta.",
+    },
+    "nl": {
+        "clarify_intro": "Voordat ik dit opzoek, heb ik wat meer details nodig:",
+        "missing_version": "Over welke versie of release gaat het?",
+        "missing_timeframe": "Welke periode moet het antwoord beslaan?",
+        "missing_scope": "Op welk systeem, team of gebied is dit van toepassing?",
+        "ambiguous_acronym": "Waar staat „{term}” in deze context voor?",
+        "ambiguous_acronym:generic": "Kun je de afkorting die je gebruikte voluit schrijven?",
+        "ambiguous_entity": "Welke „{term}” bedoel je?",
+        "ambiguous_entity:generic": "Welk product, welke component of welk document bedoel je precies?",
+        "conflicting_constraints": "Sommige eisen spreken elkaar tegen. Welke heeft voorrang?",
+        "unclear_success_criteria": "Wat moet een goed antwoord bevatten (stappen, een vergelijking, ja/nee)?",
+        "context_reference_unresolved": "Naar welk eerder bericht of document verwijs je?",
+        "generic": "Kun je iets meer vertellen over wat je nodig hebt?",
+        "refuse_restricted": "Ik kan je hier niet mee helpen, omdat het om vertrouwelijke informatie gaat.",
+        "refuse_defer": (
+            "Ik kan deze vraag hier niet beantwoorden. Neem contact op met het verantwoordelijke team of gebruik "
+            "het officiële kanaal."
+        ),
+        "pii_note": "Deel liever geen persoonsgegevens zoals e-mailadressen, telefoon- of rekeningnummers.",
+    },
+}
+
+_MAX_QUESTIONS = 3
+
+
+def _strings(language: Optional[str]) -> Dict[str, str]:
+    lang = (language or DEFAULT_LANGUAGE).split("-")[0].lower()
+    return _STRINGS.get(lang, _STRINGS[DEFAULT_LANGUAGE])
+
+
+def _terms(state: Dict[str, Any], reason: str) -> List[str]:
+    signals = state.get("signals") or {}
+    if reason == "ambiguous_acronym":
+        return [a.get("text") for a in signals.get("acronyms") or [] if a.get("text") and not a.get("expansion")]
+    if reason == "ambiguous_entity":
+        return [e.get("text") for e in signals.get("entities") or [] if e.get("text") and e.get("confidence") == "low"]
+    return []
+
+
+def clarifying_questions(state: Dict[str, Any]) -> List[ClarifyingQuestion]:
+    """One localised question per clarification reason (at most three), blocking as flagged by intake."""
+    strings = _strings(state.get("language"))
+    clarification = state.get("clarification") or {}
+    blocking = bool(clarification.get("blocking", True))
+
+    questions: List[ClarifyingQuestion] = []
+    for reason in clarification.get("reasons") or []:
+        if reason not in strings:
+            continue
+        terms = _terms(state, reason)
+        if terms:
+            text = strings[reason].format(term=terms[0])
+        else:
+            text = strings.get(f"{reason}:generic", strings[reason])
+        questions.append(ClarifyingQuestion(question=text, reason=reason, blocking=blocking))
+        if len(questions) >= _MAX_QUESTIONS:
+            break
+    return questions
+
+
+def clarify_message(state: Dict[str, Any]) -> str:
+    """User-facing clarification text: questions from the plan if present, else from intake reasons."""
+    strings = _strings(state.get("language"))
+    plan_questions = [q.get("question") for q in (state.get("plan") or {}).get("clarifying_questions") or []]
+    questions = [q for q in plan_questions if q] or [q.question for q in clarifying_questions(state)]
+    if not questions:
+        return strings["generic"]
+    return "\n".join([strings["clarify_intro"], *(f"- {q}" for q in questions)])
+
+
+def refusal_message(state: Dict[str, Any]) -> str:
+    """User-facing refusal text chosen from guardrails (restricted vs. deferred) plus a PII note."""
+    strings = _strings(state.get("language"))
+    guardrails = state.get("guardrails") or {}
+    plan_sensitivity = ((state.get("plan") or {}).get("safety") or {}).get("sensitivity")
+    restricted = (plan_sensitivity or guardrails.get("sensitivity")) == "restricted"
+    parts = [strings["refuse_restricted" if restricted else "refuse_defer"]]
+    if guardrails.get("pii_present"):
+        parts.append(strings["pii_note"])
+    return " ".join(parts)
+
+
+def _goal(state: Dict[str, Any], fallback: str) -> str:
+    goal = (state.get("normalized_query") or "").strip()
+    return goal if len(goal) >= 5 else fallback
+
+
+def _answer(state: Dict[str, Any], mode: str, text: str) -> Dict[str, Any]:
+    meta = AnswerMeta(mode=mode, refusal=mode == "refuse", asked_clarification=mode == "clarify")
+    return {
+        "answer_mode": mode,
+        "final_answer": text,
+        "citations": [],
+        "followups": [],
+        "answer_meta": meta.model_dump(),
+    }
+
+
+def intake_short_circuit(state: Dict[str, Any]) -> Optional[str]:
+    """``"clarify"`` when intake alone decides the outcome (planner not needed).
+
+    Restricted requests are not refused here: the planner may still find them clearly safe and
+    allowed by constraints, so refusals come from ``plan_short_circuit``.
+    """
+    if state.get("errors"):
+        return None
+    if (state.get("clarification") or {}).get("blocking"):
+        return "clarify"
+    return None
+
+
+def plan_short_circuit(state: Dict[str, Any]) -> Optional[str]:
+    """``"refuse"``/``"clarify"`` when the plan already fixes the answer mode (mirrors answer_gate)."""
+    plan = state.get("plan") or {}
+    sensitivity = (plan.get("safety") or {}).get("sensitivity") or (state.get("guardrails") or {}).get("sensitivity")
+    if plan.get("strategy") == "defer_or_refuse" or sensitivity == "restricted":
+        return "refuse"
+    if plan.get("strategy") == "clarify_then_retrieve":
+        return "clarify"
+    return None
+
+
+def make_clarify_template_node():
+    """Answer a blocking clarification without the planner or composer LLM calls.
+
+    Also records a clarify_then_retrieve plan (unless the planner already produced one) so
+    downstream consumers see the same shape as the LLM path.
+    """
+
+    def clarify_template(state: Dict[str, Any]) -> Dict[str, Any]:
+        out = _answer(state, "clarify", clarify_message(state))
+        if not state.get("plan"):
+            plan = PlannerState(
+                goal=_goal(state, "Clarify the request"),
+                strategy="clarify_then_retrieve",
+                clarifying_questions=clarifying_questions(state),
+            )
+            plan.planner_meta.rationale_tags = ["template:clarify"]
+            out["plan"] = plan.model_dump()
+        return out
+
+    return clarify_template
+
+
+def make_refuse_template_node():
+    """Answer a hard refusal without the composer (and, for restricted intake, planner) LLM calls."""
+
+    def refuse_template(state: Dict[str, Any]) -> Dict[str, Any]:
+        out = _answer(state, "refuse", refusal_message(state))
+        if not state.get("plan"):
+            plan = PlannerState(goal=_goal(state, "Decline the request"), strategy="defer_or_refuse")
+            plan.safety.sensitivity = (state.get("guardrails") or {}).get("sensitivity", "normal")
+            plan.planner_meta.rationale_tags = ["template:refuse"]
+            out["plan"] = plan.model_dump()
+        return out
+
+    return refuse_template
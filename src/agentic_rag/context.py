@@ -0,0 +1,336 @@
+# src/agentic_rag/context.py
+"""Conversation windowing for LLM prompts.
+
+The LLM nodes used to pass the whole ``messages`` list to ``MessagesPlaceholder("messages")``, so
+prompt size and latency grew with conversation length. ``window_messages(state, node)`` gives each
+node a bounded view instead:
+
+- turns already folded into ``conversation_summary`` (the first ``summarized_turns`` turns) are
+  replaced by one system message holding the summary;
+- the remaining messages are kept verbatim, newest first, up to the node's token cap
+  (``node_token_cap``). The last message is always kept, and the window never starts in the middle
+  of a turn.
+
+A turn is a user message plus the assistant/tool messages that follow it. Without a summary the
+view is the full conversation trimmed to the cap, which is the full conversation for all but very
+long chats.
+
+``ConversationSummarizer`` maintains the summary. It keeps the last ``keep_turns`` turns out of the
+summary and folds older turns in incrementally: only turns that fell out of the window since the
+previous summary go to the LLM. Summaries are cached by a hash chain over the turns, so callers
+that resend the full history without the previous summary reuse earlier work (and an update
+resumes from the longest cached prefix). With ``make_agent_graph(summarizer=...)`` the
+``summarize_context`` node runs before intake; it makes no LLM call while the conversation fits
+the window or the summary is cached.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from langchain_core.messages import SystemMessage
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.prompts import ChatPromptTemplate
+
+from agentic_rag.aio import Steps, invoke_call, run_async, run_sync, with_async
+from agentic_rag.model import routed_chains
+from agentic_rag.tokens import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_PROMPT_VERSION = "conversation_summary_v1"
+
+DEFAULT_KEEP_TURNS = 3
+DEFAULT_MAX_SUMMARY_TOKENS = 400
+DEFAULT_MAX_CACHED = 2048
+DEFAULT_TOKEN_CAP = 4000
+MAX_SUMMARY_MESSAGE_CHARS = 2000  # per message, when rendering turns for the summarizer
+
+# Estimated-token cap on the conversation part of each node's prompt (summary + verbatim messages).
+# Override with CONTEXT_TOKEN_CAPS="planner=3000,compose_answer=6000".
+NODE_TOKEN_CAPS: Dict[str, int] = {
+    "normalize_gate": 3000,
+    "extract_signals": 3000,
+    "intake_fused": 3000,
+    "planner": 4000,
+    "compose_answer": 6000,
+}
+
+SUMMARY_HEADER = "Summary of the earlier conversation (older turns are not repeated below):"
+
+SUMMARY_PROMPT = """You maintain a running summary of a conversation between a user and an assistant.
+
+Fold the new turns into the previous summary and return the updated summary.
+
+Keep:
+- the user's goals and the questions already answered (with the gist of the answer),
+- names, versions, identifiers, error codes, file paths and other literal terms,
+- constraints and preferences the user stated (language, format, scope),
+- open questions and pending clarifications.
+
+Drop greetings, pleasantries and repeated content. Write in the conversation's language.
+Use at most {max_words} words. Output only the summary text."""
+
+SUMMARY_INPUT = """Previous summary:
+{previous_summary}
+
+New turns:
+{turns}"""
+
+_USER_ROLES = ("user", "human")
+
+
+# -------------------------
+# Messages and turns
+# -------------------------
+
+
+def _role(message: Any) -> str:
+    if isinstance(message, dict):
+        return message.get("role") or message.get("type") or "user"
+    return getattr(message, "type", "user")
+
+
+def message_text(message: Any) -> str:
+    content = message.get("content", "") if isinstance(message, dict) else getattr(message, "content", "")
+    if isinstance(content, str):
+        return content
+    return json.dumps(content, sort_keys=True, ensure_ascii=False, default=str)
+
+
+def message_tokens(message: Any) -> int:
+    return estimate_tokens(message_text(message)) + 4  # role and separators
+
+
+def split_turns(messages: Sequence[Any]) -> List[List[Any]]:
+    """Group messages into turns; each user message starts a new turn."""
+    turns: List[List[Any]] = []
+    for m in messages:
+        if _role(m) in _USER_ROLES or not turns:
+            turns.append([m])
+        else:
+            turns[-1].append(m)
+    return turns
+
+
+def turn_keys(turns: Sequence[Sequence[Any]]) -> List[str]:
+    """Hash chain over ``turns``: ``keys[i]`` identifies the first ``i + 1`` turns."""
+    keys: List[str] = []
+    prev = SUMMARY_PROMPT_VERSION
+    for turn in turns:
+        blob = json.dumps([prev, [(_role(m), message_text(m)) for m in turn]], ensure_ascii=False)
+        prev = hashlib.sha256(blob.encode("utf-8")).hexdigest()
+        keys.append(prev)
+    return keys
+
+
+def render_turns(turns: Sequence[Sequence[Any]]) -> str:
+    lines = []
+    for turn in turns:
+        for m in turn:
+            text = message_text(m)
+            if len(text) > MAX_SUMMARY_MESSAGE_CHARS:
+                text = text[:MAX_SUMMARY_MESSAGE_CHARS] + " [...]"
+            lines.append(f"{_role(m)}: {text}")
+    return "\n".join(lines)
+
+
+# -------------------------
+# Windowing
+# -------------------------
+
+
+def _env_token_caps() -> Dict[str, int]:
+    caps: Dict[str, int] = {}
+    for item in os.getenv("CONTEXT_TOKEN_CAPS", "").split(","):
+        if not item.strip():
+            continue
+        name, _, value = item.partition("=")
+        try:
+            caps[name.strip()] = int(value)
+        except ValueError:
+            logger.warning(f"Ignoring invalid CONTEXT_TOKEN_CAPS entry: {item!r}")
+    return caps
+
+
+def node_token_cap(node: str) -> int:
+    """Token cap for ``node``'s conversation view (NODE_TOKEN_CAPS, overridden by CONTEXT_TOKEN_CAPS)."""
+    return _env_token_caps().get(node, NODE_TOKEN_CAPS.get(node, DEFAULT_TOKEN_CAP))
+
+
+def _trim(messages: List[Any], budget: int) -> List[Any]:
+    """Newest messages within ``budget`` (the last one always), starting at a user message if possible."""
+    kept: List[Any] = []
+    used = 0
+    for m in reversed(messages):
+        cost = message_tokens(m)
+        if kept and used + cost > budget:
+            break
+        kept.append(m)
+        used += cost
+    kept.reverse()
+    start = next((i for i, m in enumerate(kept) if _role(m) in _USER_ROLES), 0)
+    return kept[start:]
+
+
+def window_messages(state: Dict[str, Any], node: str) -> List[Any]:
+    """Conversation view for ``node``: summary of covered turns plus recent messages within the cap."""
+    messages = list(state.get("messages") or [])
+    summary = (state.get("conversation_summary") or "").strip()
+    covered = state.get("summarized_turns") or 0
+    if summary and covered > 0:
+        turns = split_turns(messages)
+        covered = min(covered, len(turns) - 1)  # the current turn is never summarised away
+        messages = [m for turn in turns[covered:] for m in turn]
+
+    head: List[Any] = []
+    budget = node_token_cap(node)
+    if summary:
+        head = [SystemMessage(content=f"{SUMMARY_HEADER}\n{summary}")]
+        budget -= message_tokens(head[0])
+    kept = _trim(messages, budget)
+    if len(kept) < len(messages):
+        logger.debug(f"{node}: windowed conversation to {len(kept)}/{len(messages)} messages")
+    return head + kept
+
+
+# -------------------------
+# Summarisation
+# -------------------------
+
+
+@dataclass
+class SummaryStats:
+    updates: int = 0  # summaries produced by the LLM
+    cache_hits: int = 0  # summaries served from the cache without an LLM call
+    resumed: int = 0  # updates that started from a cached prefix summary
+    turns_folded: int = 0  # turns sent to the LLM across all updates
+    failures: int = 0
+
+
+class ConversationSummarizer:
+    """Incremental, cached summary of the turns that fell out of the conversation window.
+
+    Share one instance across requests. The cache is an in-process LRU keyed by the turn hash
+    chain; it is used only for summaries derived from the conversation alone (a caller-supplied
+    ``conversation_summary`` with ``summarized_turns == 0`` is folded in but not cached).
+
+    Args:
+        llm: Chat model used for summary updates (or a ModelRegistry; its ``summary`` role).
+        keep_turns: Most recent turns kept out of the summary (shown verbatim).
+        max_summary_tokens: Summary length target; longer output is clipped.
+        max_cached: Max cached summaries.
+    """
+
+    def __init__(
+        self,
+        llm,
+        *,
+        keep_turns: int = DEFAULT_KEEP_TURNS,
+        max_summary_tokens: int = DEFAULT_MAX_SUMMARY_TOKENS,
+        max_cached: int = DEFAULT_MAX_CACHED,
+    ):
+        if keep_turns < 1:
+            raise ValueError("keep_turns must be >= 1")
+        prompt = ChatPromptTemplate.from_messages([("system", SUMMARY_PROMPT), ("human", SUMMARY_INPUT)])
+        # Default tier only: cached summaries are shared by requests of every tier
+        self._chain = routed_chains(llm, "summary", lambda m: prompt | m | StrOutputParser()).get()
+        self.keep_turns = keep_turns
+        self.max_summary_tokens = max_summary_tokens
+        self.max_cached = max_cached
+        self.stats = SummaryStats()
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def _get(self, key: str) -> Optional[str]:
+        with self._lock:
+            summary = self._cache.get(key)
+            if summary is not None:
+                self._cache.move_to_end(key)
+            return summary
+
+    def _put(self, key: str, summary: str) -> None:
+        with self._lock:
+            self._cache[key] = summary
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_cached:
+                self._cache.popitem(last=False)
+
+    def _base(self, keys: List[str], state: Dict[str, Any]) -> Tuple[int, str, bool]:
+        """``(start_turn, previous_summary, cacheable)`` for the next update."""
+        summary = (state.get("conversation_summary") or "").strip()
+        covered = state.get("summarized_turns") or 0
+        if covered > 0:
+            return covered, summary, True
+        if summary:
+            return 0, summary, False  # caller-supplied background summary
+        for i in range(len(keys) - 1, 0, -1):
+            cached = self._get(keys[i - 1])
+            if cached is not None:
+                with self._lock:
+                    self.stats.resumed += 1
+                return i, cached, True
+        return 0, "", True
+
+    def _clip(self, text: str) -> str:
+        text = text.strip()
+        max_chars = self.max_summary_tokens * 4
+        return text if len(text) <= max_chars else text[:max_chars].rsplit(" ", 1)[0] + " [...]"
+
+    def steps(self, state: Dict[str, Any]) -> Steps:
+        turns = split_turns(state.get("messages") or [])
+        target = len(turns) - self.keep_turns
+        if target <= (state.get("summarized_turns") or 0):
+            return {}
+
+        keys = turn_keys(turns[:target])
+        start, previous, cacheable = self._base(keys, state)
+        if cacheable:
+            cached = self._get(keys[-1])
+            if cached is not None:
+                with self._lock:
+                    self.stats.cache_hits += 1
+                return {"conversation_summary": cached, "summarized_turns": target}
+
+        variables = {
+            "previous_summary": previous or "(none)",
+            "turns": render_turns(turns[start:target]),
+            "max_words": int(self.max_summary_tokens * 0.75),
+        }
+        try:
+            summary = self._clip((yield invoke_call(self._chain, variables)))
+        except Exception as e:
+            # Soft failure: the previous summary stays in state and the next turn retries the fold
+            logger.warning(f"Conversation summary update failed ({target - start} turns): {e}")
+            with self._lock:
+                self.stats.failures += 1
+            return {}
+
+        with self._lock:
+            self.stats.updates += 1
+            self.stats.turns_folded += target - start
+        if cacheable:
+            self._put(keys[-1], summary)
+        return {"conversation_summary": summary, "summarized_turns": target}
+
+
+def make_summarize_context_node(summarizer: ConversationSummarizer):
+    """Update ``conversation_summary``/``summarized_turns`` before intake."""
+
+    def summarize_context(state: Dict[str, Any]) -> Dict[str, Any]:
+        return run_sync(summarizer.steps(state))
+
+    async def asummarize_context(state: Dict[str, Any]) -> Dict[str, Any]:
+        return await run_async(summarizer.steps(state))
+
+    return with_async(summarize_context, asummarize_context)
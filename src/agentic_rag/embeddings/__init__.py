@@ -0,0 +1,17 @@
+"""Embedding clients, batching and caching used by ingestion and local vector retrieval."""
+
+from agentic_rag.embeddings.adapter import EmbeddingAdapter, model_id_of
+from agentic_rag.embeddings.batching import BatchingEmbeddings
+from agentic_rag.embeddings.cache import CachedEmbeddings
+from agentic_rag.embeddings.factory import build_embeddings, load_embeddings
+from agentic_rag.embeddings.hashing import HashingEmbeddings
+
+__all__ = [
+    "BatchingEmbeddings",
+    "CachedEmbeddings",
+    "EmbeddingAdapter",
+    "HashingEmbeddings",
+    "build_embeddings",
+    "load_embeddings",
+    "model_id_of",
+]
@@ -0,0 +1,50 @@
+# src/agentic_rag/embeddings/adapter.py
+
+from __future__ import annotations
+
+from typing import Any, List, Protocol, runtime_checkable
+
+
+@runtime_checkable
+class EmbeddingAdapter(Protocol):
+    """Adapter for embedding backends used by ingestion, vector retrieval and caches.
+
+    Any langchain ``Embeddings`` with a ``model_id`` attribute satisfies it; wrappers in this
+    package (BatchingEmbeddings, CachedEmbeddings) do too and can be stacked.
+
+    ``model_id`` must change whenever the vectors would (model name, dimension, normalization):
+    caches key on it.
+
+    Example implementation:
+
+        from langchain_openai import OpenAIEmbeddings
+
+        class OpenAIEmbeddingAdapter:
+            model_id = "openai:text-embedding-3-small"
+
+            def __init__(self):
+                self.client = OpenAIEmbeddings(model="text-embedding-3-small")
+
+            def embed_documents(self, texts):
+                return self.client.embed_documents(texts)
+
+            def embed_query(self, text):
+                return self.client.embed_query(text)
+    """
+
+    model_id: str
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        raise NotImplementedError
+
+    def embed_query(self, text: str) -> List[float]:
+        raise NotImplementedError
+
+
+def model_id_of(embeddings: Any) -> str:
+    """Best-effort stable model id for an embeddings client (``model_id``, then ``model``/``model_name``)."""
+    for attr in ("model_id", "model", "model_name"):
+        value = getattr(embeddings, attr, None)
+        if isinstance(value, str) and value:
+            return value if attr == "model_id" else f"{type(embeddings).__name__}:{value}"
+    raise ValueError(f"Cannot determine a model id for {type(embeddings).__name__}; pass model_id explicitly")
@@ -0,0 +1,183 @@
+# src/agentic_rag/embeddings/batching.py
+"""Request batching for embedding backends.
+
+Provider calls are dominated by per-request overhead, so many small ``embed_documents`` calls
+from concurrent callers (retrieval workers, ingestion threads) are coalesced into a few large
+ones. A single dispatcher thread collects pending texts, waits at most ``max_wait_ms`` for more
+to arrive, and cuts batches at ``max_batch_size`` texts or ``max_batch_tokens`` estimated tokens.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Iterator, List, Optional, Sequence, Tuple
+
+from langchain_core.embeddings import Embeddings
+
+from agentic_rag.embeddings.adapter import model_id_of
+from agentic_rag.tokens import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BATCH_SIZE = 64
+DEFAULT_MAX_BATCH_TOKENS = 8000
+DEFAULT_MAX_WAIT_MS = 5.0
+
+
+def split_batches(texts: Sequence[str], max_batch_size: int, max_batch_tokens: int) -> Iterator[range]:
+    """Yield index ranges over ``texts`` that respect both limits (an oversized text gets its own batch)."""
+    start, tokens = 0, 0
+    for i, text in enumerate(texts):
+        t = estimate_tokens(text)
+        if i > start and (i - start >= max_batch_size or tokens + t > max_batch_tokens):
+            yield range(start, i)
+            start, tokens = i, 0
+        tokens += t
+    if start < len(texts):
+        yield range(start, len(texts))
+
+
+@dataclass
+class _Request:
+    texts: List[str]
+    future: Future
+    vectors: List[Optional[List[float]]] = field(default_factory=list)
+    remaining: int = 0
+
+
+class BatchingEmbeddings(Embeddings):
+    """Wrap an embeddings client with size/token-bounded batching and cross-caller micro-batching.
+
+    ``embed_documents`` blocks until its own vectors are ready; results are returned in input
+    order regardless of how texts were grouped. ``embed_query`` is passed through unbatched since
+    some providers embed queries differently from documents.
+
+    Args:
+        inner: Embeddings client to call.
+        max_batch_size: Max texts per backend call.
+        max_batch_tokens: Max estimated tokens per backend call.
+        max_wait_ms: How long the dispatcher waits for more texts before sending a partial batch.
+            ``0`` disables cross-caller coalescing (each call is split and sent directly).
+    """
+
+    def __init__(
+        self,
+        inner: Embeddings,
+        *,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        max_batch_tokens: int = DEFAULT_MAX_BATCH_TOKENS,
+        max_wait_ms: float = DEFAULT_MAX_WAIT_MS,
+        model_id: Optional[str] = None,
+    ):
+        if max_batch_size < 1 or max_batch_tokens < 1:
+            raise ValueError("max_batch_size and max_batch_tokens must be >= 1")
+        self.inner = inner
+        self.max_batch_size = max_batch_size
+        self.max_batch_tokens = max_batch_tokens
+        self.max_wait_ms = max_wait_ms
+        self.model_id = model_id or model_id_of(inner)
+
+        self.calls = 0  # backend calls made, for observability/tests
+        self._cond = threading.Condition()
+        self._queue: Deque[Tuple[_Request, int]] = deque()  # (request, position) per pending text
+        self._queued_tokens = 0
+        self._dispatcher: Optional[threading.Thread] = None
+
+    # -------------------------
+    # Direct path
+    # -------------------------
+
+    def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        self.calls += 1
+        vectors = self.inner.embed_documents(texts)
+        if len(vectors) != len(texts):
+            raise ValueError(f"Embeddings backend returned {len(vectors)} vectors for {len(texts)} texts")
+        return vectors
+
+    def _embed_direct(self, texts: List[str]) -> List[List[float]]:
+        out: List[List[float]] = []
+        for r in split_batches(texts, self.max_batch_size, self.max_batch_tokens):
+            out.extend(self._embed_batch([texts[i] for i in r]))
+        return out
+
+    # -------------------------
+    # Micro-batching path
+    # -------------------------
+
+    def _ensure_dispatcher(self) -> None:
+        if self._dispatcher is None or not self._dispatcher.is_alive():
+            self._dispatcher = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+            self._dispatcher.start()
+
+    def _take_batch(self) -> List[Tuple[_Request, int]]:
+        """Pop the next batch from the queue. Caller holds ``_cond``."""
+        batch: List[Tuple[_Request, int]] = []
+        tokens = 0
+        while self._queue:
+            req, pos = self._queue[0]
+            t = estimate_tokens(req.texts[pos])
+            if batch and (len(batch) >= self.max_batch_size or tokens + t > self.max_batch_tokens):
+                break
+            batch.append(self._queue.popleft())
+            tokens += t
+        self._queued_tokens -= tokens
+        return batch
+
+    def _batch_full(self) -> bool:
+        return len(self._queue) >= self.max_batch_size or self._queued_tokens >= self.max_batch_tokens
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._queue:
+                    self._cond.wait()
+                deadline = time.monotonic() + self.max_wait_ms / 1000.0
+                while not self._batch_full():
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch = self._take_batch()
+
+            try:
+                vectors = self._embed_batch([req.texts[pos] for req, pos in batch])
+            except Exception as exc:  # noqa: BLE001 - propagated to every waiting caller
+                for req, _ in batch:
+                    if not req.future.done():
+                        req.future.set_exception(exc)
+                continue
+
+            for (req, pos), vec in zip(batch, vectors):
+                if req.future.done():
+                    continue
+                req.vectors[pos] = vec
+                req.remaining -= 1
+                if req.remaining == 0:
+                    req.future.set_result(req.vectors)
+
+    # -------------------------
+    # Embeddings interface
+    # -------------------------
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        texts = list(texts)
+        if not texts:
+            return []
+        if self.max_wait_ms <= 0:
+            return self._embed_direct(texts)
+
+        req = _Request(texts=texts, future=Future(), vectors=[None] * len(texts), remaining=len(texts))
+        with self._cond:
+            self._ensure_dispatcher()
+            self._queue.extend((req, i) for i in range(len(texts)))
+            self._queued_tokens += sum(estimate_tokens(t) for t in texts)
+            self._cond.notify()
+        return req.future.result()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.inner.embed_query(text)
@@ -0,0 +1,137 @@
+# src/agentic_rag/embeddings/cache.py
+"""Persistent embedding cache keyed by content hash and model id.
+
+Vectors are stored in a SQLite file as float32 blobs under ``sha256(model_id, kind, text)``.
+WAL mode and a busy timeout let several ingestion worker processes share one cache file.
+Re-ingesting unchanged chunks, or embedding a query variant seen before, costs one lookup.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from agentic_rag.embeddings.adapter import model_id_of
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS embeddings (
+    key TEXT PRIMARY KEY,
+    model_id TEXT NOT NULL,
+    dim INTEGER NOT NULL,
+    vector BLOB NOT NULL
+)
+"""
+
+# SQLite caps host parameters per statement (999 on older builds)
+_LOOKUP_CHUNK = 500
+
+
+def cache_key(model_id: str, text: str, kind: str = "doc") -> str:
+    """Content hash for one text; ``kind`` separates document and query embeddings."""
+    h = hashlib.sha256()
+    for part in (model_id, kind, text):
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+class CachedEmbeddings(Embeddings):
+    """Embeddings wrapper that reads through a persistent cache.
+
+    Misses within one call are de-duplicated and embedded in a single ``embed_documents`` call
+    to ``inner`` (wrap ``inner`` in BatchingEmbeddings to bound request sizes).
+
+    Args:
+        inner: Embeddings client used on cache misses.
+        path: SQLite file (parent directories are created).
+        model_id: Cache namespace; defaults to ``inner.model_id`` (see ``model_id_of``).
+    """
+
+    def __init__(self, inner: Embeddings, path: Union[str, Path], *, model_id: Optional[str] = None):
+        self.inner = inner
+        self.path = Path(path)
+        self.model_id = model_id or model_id_of(inner)
+        self.hits = 0
+        self.misses = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=30.0, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(_SCHEMA)
+        self._conn.commit()
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def _get_many(self, keys: Sequence[str]) -> Dict[str, List[float]]:
+        found: Dict[str, List[float]] = {}
+        with self._lock:
+            for i in range(0, len(keys), _LOOKUP_CHUNK):
+                chunk = keys[i : i + _LOOKUP_CHUNK]
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype="<f4").tolist()
+        return found
+
+    def _put_many(self, items: Dict[str, Sequence[float]]) -> None:
+        rows = []
+        for key, vec in items.items():
+            arr = np.asarray(vec, dtype="<f4")
+            rows.append((key, self.model_id, int(arr.shape[0]), arr.tobytes()))
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO embeddings VALUES (?, ?, ?, ?)", rows)
+            self._conn.commit()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys = [cache_key(self.model_id, t) for t in texts]
+        found = self._get_many(list(dict.fromkeys(keys)))
+
+        missing: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in found:
+                missing.setdefault(key, text)
+        self.hits += len(texts) - sum(1 for k in keys if k in missing)
+        self.misses += sum(1 for k in keys if k in missing)
+
+        if missing:
+            vectors = self.inner.embed_documents(list(missing.values()))
+            fresh = dict(zip(missing.keys(), vectors))
+            self._put_many(fresh)
+            # Round-trip through float32 so cached and fresh results are identical
+            found.update({k: np.asarray(v, dtype="<f4").tolist() for k, v in fresh.items()})
+
+        return [found[k] for k in keys]
+
+    def embed_query(self, text: str) -> List[float]:
+        key = cache_key(self.model_id, text, kind="query")
+        found = self._get_many([key])
+        if key in found:
+            self.hits += 1
+            return found[key]
+        self.misses += 1
+        vec = self.inner.embed_query(text)
+        self._put_many({key: vec})
+        return np.asarray(vec, dtype="<f4").tolist()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0])
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,60 @@
+# src/agentic_rag/embeddings/factory.py
+
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+from typing import Optional, Union
+
+from langchain_core.embeddings import Embeddings
+
+from agentic_rag.embeddings.batching import (
+    DEFAULT_MAX_BATCH_SIZE,
+    DEFAULT_MAX_BATCH_TOKENS,
+    DEFAULT_MAX_WAIT_MS,
+    BatchingEmbeddings,
+)
+from agentic_rag.embeddings.cache import CachedEmbeddings
+from agentic_rag.embeddings.hashing import DEFAULT_HASHING_DIM, HashingEmbeddings
+
+logger = logging.getLogger(__name__)
+
+
+def load_embeddings(spec: str) -> Embeddings:
+    """Build an embeddings client from a string spec.
+
+    Specs are picklable, which lets worker processes build their own client:
+    - ``hashing`` or ``hashing:<dim>``: offline HashingEmbeddings
+    - ``<provider>:<model>`` (e.g. ``openai:text-embedding-3-small``): langchain ``init_embeddings``
+    """
+    if spec == "hashing" or spec.startswith("hashing:"):
+        _, _, dim = spec.partition(":")
+        return HashingEmbeddings(dim=int(dim) if dim else DEFAULT_HASHING_DIM)
+
+    from langchain.embeddings import init_embeddings
+
+    return init_embeddings(spec)
+
+
+def build_embeddings(
+    spec: str,
+    *,
+    cache_path: Optional[Union[str, Path]] = None,
+    max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+    max_batch_tokens: int = DEFAULT_MAX_BATCH_TOKENS,
+    max_wait_ms: float = DEFAULT_MAX_WAIT_MS,
+) -> Embeddings:
+    """``load_embeddings(spec)`` wrapped in batching and, with ``cache_path``, a persistent cache.
+
+    The spec doubles as the cache model id, so switching models never serves stale vectors.
+    """
+    embeddings: Embeddings = BatchingEmbeddings(
+        load_embeddings(spec),
+        max_batch_size=max_batch_size,
+        max_batch_tokens=max_batch_tokens,
+        max_wait_ms=max_wait_ms,
+        model_id=spec,
+    )
+    if cache_path is not None:
+        embeddings = CachedEmbeddings(embeddings, cache_path, model_id=spec)
+    return embeddings
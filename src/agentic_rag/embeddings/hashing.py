@@ -0,0 +1,47 @@
+# src/agentic_rag/embeddings/hashing.py
+
+from __future__ import annotations
+
+import hashlib
+import math
+import re
+from typing import List
+
+from langchain_core.embeddings import Embeddings
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+DEFAULT_HASHING_DIM = 384
+
+
+class HashingEmbeddings(Embeddings):
+    """Deterministic, dependency-free embeddings (signed feature hashing of word unigrams+bigrams).
+
+    Not a semantic model: it exists so ingestion and local vector search work offline (tests,
+    air-gapped builds, CI) with the same code path as a real provider.
+    """
+
+    def __init__(self, dim: int = DEFAULT_HASHING_DIM):
+        if dim < 1:
+            raise ValueError("dim must be >= 1")
+        self.dim = dim
+
+    @property
+    def model_id(self) -> str:
+        return f"hashing-{self.dim}"
+
+    def _embed(self, text: str) -> List[float]:
+        vec = [0.0] * self.dim
+        tokens = _TOKEN_RE.findall(text.lower())
+        features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+        for feat in features:
+            h = int.from_bytes(hashlib.blake2b(feat.encode("utf-8"), digest_size=8).digest(), "little")
+            vec[h % self.dim] += 1.0 if (h >> 63) & 1 else -1.0
+        norm = math.sqrt(sum(v * v for v in vec)) or 1.0
+        return [v / norm for v in vec]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self._embed(t) for t in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed(text)
@@ -30,6 +30,9 @@ class RetrieverAdapter(Protocol):
                         query, top=k, query_type="semantic",
                         hybrid_parameters={"weight": alpha or 0.5}
                     )
+                elif mode == "exact":
+                    # query is a single literal (error code, ID, path); phrase-match it
+                    results = self.client.search(f'"{query}"', top=k, query_type="full")
 
                 # Map to Candidate objects
                 candidates = []
@@ -48,12 +51,15 @@ class RetrieverAdapter(Protocol):
         self,
         *,
         query: str,
-        mode: str,  # "bm25" | "vector" | "hybrid"
+        mode: str,  # "bm25" | "vector" | "hybrid" | "exact"
         k: int,
         alpha: Optional[float],
         filters: Dict[str, Any],
     ) -> List[Candidate]:
-        """Return candidates. Must populate Candidate.key, text, metadata, and retrieval features as available."""
+        """Return candidates. Must populate Candidate.key, text, metadata, and retrieval features as available.
+
+        For mode="exact", ``query`` is a single literal and only chunks containing it verbatim qualify.
+        """
         raise NotImplementedError
 
 
@@ -61,6 +67,8 @@ class HyDEAdapter(Protocol):
     """Adapter for HyDE (Hypothetical Document Embeddings) generation.
 
     HyDE generates synthetic answers to expand query variants for better retrieval.
+    ``context["model_tier"]`` is the request's model tier; with a ModelRegistry (agentic_rag/model.py)
+    use ``registry.model("hyde", context["model_tier"])`` instead of a fixed ``llm``.
 
     Example implementation:
 
@@ -140,6 +148,8 @@ class FusionAdapter(Protocol):
 class CoverageGraderAdapter(Protocol):
     """Optional LLM-based grader for evaluating evidence coverage.
 
+    ``context["model_tier"]`` selects the tier as for HyDEAdapter (``registry.model("grader", tier)``).
+
     Example implementation:
 
         class LLMCoverageGrader:
@@ -179,6 +189,62 @@ class CoverageGraderAdapter(Protocol):
         raise NotImplementedError
 
 
+# -------------------------
+# Async adapters (optional)
+# -------------------------
+#
+# The async graph path (``make_agent_graph(...).ainvoke``) awaits these when an adapter defines them
+# as ``async def`` next to the sync method; otherwise the sync method runs in a worker thread.
+
+
+class AsyncRetrieverAdapter(RetrieverAdapter, Protocol):
+    async def asearch(
+        self,
+        *,
+        query: str,
+        mode: str,
+        k: int,
+        alpha: Optional[float],
+        filters: Dict[str, Any],
+    ) -> List[Candidate]:
+        """Async ``search``; same contract."""
+        raise NotImplementedError
+
+
+class AsyncHyDEAdapter(HyDEAdapter, Protocol):
+    async def asynthesize(self, *, query: str, context: Dict[str, Any]) -> str:
+        raise NotImplementedError
+
+    async def aderive_queries(self, *, original_query: str, synthetic_answer: str, max_queries: int) -> List[str]:
+        raise NotImplementedError
+
+
+class AsyncRerankerAdapter(RerankerAdapter, Protocol):
+    async def arerank(
+        self,
+        *,
+        query: str,
+        candidates: Sequence[Candidate],
+        top_k: int,
+        context: Dict[str, Any],
+    ) -> List[Candidate]:
+        """Async ``rerank``; same contract."""
+        raise NotImplementedError
+
+
+class AsyncCoverageGraderAdapter(CoverageGraderAdapter, Protocol):
+    async def agrade(
+        self,
+        *,
+        plan: Dict[str, Any],
+        normalized_query: str,
+        selected_evidence: Sequence[Candidate],
+        context: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """Async ``grade``; same contract."""
+        raise NotImplementedError
+
+
 # -------------------------
 # Simple defaults (placeholders)
 # -------------------------
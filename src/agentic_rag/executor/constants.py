@@ -17,3 +17,10 @@ DEFAULT_RERANK_TOP_K = 60  # Max candidates to send to reranker
 
 # Retrieval parameters
 DEFAULT_RETRIEVAL_K = 20  # Default number of candidates per retrieval call
+
+# Exact-literal lookup parameters
+DEFAULT_EXACT_K = 20  # Max candidates per literal term in "exact" mode
+
+# Token budget reserves (plan.budget.max_tokens, enforced with enforce_token_budget)
+DEFAULT_HYDE_TOKEN_RESERVE = 1500  # Min remaining tokens to run HyDE for a round
+DEFAULT_ROUND_TOKEN_RESERVE = 2000  # Min remaining tokens to start another retrieval round
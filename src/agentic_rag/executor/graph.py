@@ -2,9 +2,12 @@
 
 from __future__ import annotations
 
+import logging
+
 from langgraph.graph import END, START, StateGraph
 from langgraph.types import RetryPolicy
 
+from agentic_rag.aio import dual_node
 from agentic_rag.executor.adapters import (
     CoverageGraderAdapter,
     FusionAdapter,
@@ -12,6 +15,7 @@ from agentic_rag.executor.adapters import (
     RerankerAdapter,
     RetrieverAdapter,
 )
+from agentic_rag.executor.constants import DEFAULT_ROUND_TOKEN_RESERVE
 from agentic_rag.executor.nodes.executor_gate import executor_gate
 from agentic_rag.executor.nodes.finalize_evidence_pack import finalize_evidence_pack
 from agentic_rag.executor.nodes.grade_coverage import make_grade_coverage_node
@@ -22,6 +26,9 @@ from agentic_rag.executor.nodes.run_retrieval import make_run_retrieval_node
 from agentic_rag.executor.nodes.select_evidence import select_evidence
 from agentic_rag.executor.nodes.should_continue import should_continue
 from agentic_rag.executor.state import ExecutorState
+from agentic_rag.usage import budget_remaining, with_usage
+
+logger = logging.getLogger(__name__)
 
 
 def make_executor_graph(
@@ -32,18 +39,38 @@ def make_executor_graph(
     hyde: HyDEAdapter,
     grader: CoverageGraderAdapter,
     max_retries: int = 2,
+    enforce_budget: bool = False,
 ):
+    """Build the executor subgraph.
+
+    With ``enforce_budget``, HyDE is skipped and no further round starts once the plan's token
+    budget (``plan.budget.max_tokens``, see agentic_rag/usage.py) is nearly spent.
+    """
     retry_policy = RetryPolicy(max_attempts=max(1, int(max_retries)))
 
     g = StateGraph(ExecutorState)
 
     g.add_node("executor_gate", executor_gate, retry=retry_policy)
-    g.add_node("prepare_round_queries", make_prepare_round_queries_node(hyde), retry=retry_policy)
-    g.add_node("run_retrieval", make_run_retrieval_node(retriever), retry=retry_policy)
+    # I/O nodes run natively async under ainvoke (see agentic_rag.aio)
+    # Adapter nodes that may call an LLM record its token usage (with_usage)
+    g.add_node(
+        "prepare_round_queries",
+        dual_node(with_usage(make_prepare_round_queries_node(hyde, enforce_budget), "prepare_round_queries")),
+        retry=retry_policy,
+    )
+    g.add_node("run_retrieval", dual_node(make_run_retrieval_node(retriever)), retry=retry_policy)
     g.add_node("merge_candidates", make_merge_candidates_node(fusion), retry=retry_policy)
-    g.add_node("rerank_candidates", make_rerank_candidates_node(reranker), retry=retry_policy)
+    g.add_node(
+        "rerank_candidates",
+        dual_node(with_usage(make_rerank_candidates_node(reranker), "rerank_candidates")),
+        retry=retry_policy,
+    )
     g.add_node("select_evidence", select_evidence, retry=retry_policy)
-    g.add_node("grade_coverage", make_grade_coverage_node(grader), retry=retry_policy)
+    g.add_node(
+        "grade_coverage",
+        dual_node(with_usage(make_grade_coverage_node(grader), "grade_coverage")),
+        retry=retry_policy,
+    )
     g.add_node("should_continue", should_continue, retry=retry_policy)
     g.add_node("finalize_evidence_pack", finalize_evidence_pack, retry=retry_policy)
 
@@ -63,7 +90,13 @@ def make_executor_graph(
     g.add_edge("grade_coverage", "should_continue")
 
     def route_loop(state: ExecutorState):
-        return "prepare_round_queries" if state.get("continue_search", False) else "finalize_evidence_pack"
+        if not state.get("continue_search", False):
+            return "finalize_evidence_pack"
+        remaining = budget_remaining(state) if enforce_budget else None
+        if remaining is not None and remaining < DEFAULT_ROUND_TOKEN_RESERVE:
+            logger.info(f"Stopping retrieval: {remaining} tokens left in the plan budget")
+            return "finalize_evidence_pack"
+        return "prepare_round_queries"
 
     g.add_conditional_edges("should_continue", route_loop, ["prepare_round_queries", "finalize_evidence_pack"])
 
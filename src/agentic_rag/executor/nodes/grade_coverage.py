@@ -5,32 +5,46 @@ from __future__ import annotations
 import logging
 from typing import Any, Dict, List
 
+from agentic_rag.aio import Steps, adapter_call, run_async, run_sync, with_async
 from agentic_rag.executor.adapters import CoverageGraderAdapter
 from agentic_rag.executor.state import Candidate, ExecutorState
 from agentic_rag.executor.utils import observe, with_error_handling
+from agentic_rag.model import select_tier
 
 logger = logging.getLogger(__name__)
 
 
+def _grade_steps(grader: CoverageGraderAdapter, state: ExecutorState) -> Steps:
+    plan = state.get("plan") or {}
+    selected: List[Candidate] = list(state.get("round_selected") or [])
+
+    coverage = yield adapter_call(
+        grader,
+        "grade",
+        plan=plan,
+        normalized_query=state.get("normalized_query", ""),
+        selected_evidence=selected,
+        context={
+            "constraints": state.get("constraints") or {},
+            "guardrails": state.get("guardrails") or {},
+            "model_tier": select_tier(state),
+        },
+    )
+
+    logger.info(f"Coverage: confidence={coverage.get('confidence', 0.0):.2f}, quality={coverage.get('evidence_quality', 'unknown')}")
+
+    return {"coverage": coverage}
+
+
 def make_grade_coverage_node(grader: CoverageGraderAdapter):
     @observe
     @with_error_handling("grade_coverage")
     def grade_coverage(state: ExecutorState) -> Dict[str, Any]:
-        plan = state.get("plan") or {}
-        selected: List[Candidate] = list(state.get("round_selected") or [])
+        return run_sync(_grade_steps(grader, state))
 
-        coverage = grader.grade(
-            plan=plan,
-            normalized_query=state.get("normalized_query", ""),
-            selected_evidence=selected,
-            context={
-                "constraints": state.get("constraints") or {},
-                "guardrails": state.get("guardrails") or {},
-            },
-        )
-
-        logger.info(f"Coverage: confidence={coverage.get('confidence', 0.0):.2f}, quality={coverage.get('evidence_quality', 'unknown')}")
-
-        return {"coverage": coverage}
+    @observe
+    @with_error_handling("grade_coverage")
+    async def agrade_coverage(state: ExecutorState) -> Dict[str, Any]:
+        return await run_async(_grade_steps(grader, state))
 
-    return grade_coverage
+    return with_async(grade_coverage, agrade_coverage)
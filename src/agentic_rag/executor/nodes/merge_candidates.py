@@ -59,6 +59,7 @@ def make_merge_candidates_node(fusion: FusionAdapter):
                     (x.bm25_score or 0.0) + (x.vector_score or 0.0),
                     -(x.bm25_rank or 10**9),
                     -(x.vector_rank or 10**9),
+                    -(x.exact_rank or 10**9),
                 ),
                 reverse=True,
             )
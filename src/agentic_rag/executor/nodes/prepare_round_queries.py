@@ -5,9 +5,13 @@ from __future__ import annotations
 import logging
 from typing import Any, Dict, List
 
+from agentic_rag.aio import Steps, adapter_call, run_async, run_sync, with_async
 from agentic_rag.executor.adapters import HyDEAdapter
+from agentic_rag.executor.constants import DEFAULT_HYDE_TOKEN_RESERVE
 from agentic_rag.executor.state import ExecutorState
-from agentic_rag.executor.utils import observe, with_error_handling
+from agentic_rag.executor.utils import observe, prefetched_round, with_error_handling
+from agentic_rag.model import select_tier
+from agentic_rag.usage import budget_remaining
 
 logger = logging.getLogger(__name__)
 
@@ -37,46 +41,73 @@ def _preserve_literal_terms(queries: List[str], must_preserve_terms: List[str])
     return merged
 
 
-def make_prepare_round_queries_node(hyde: HyDEAdapter):
+def _prepare_steps(hyde: HyDEAdapter, state: ExecutorState, enforce_budget: bool = False) -> Steps:
+    plan = state.get("plan") or {}
+    rounds = plan.get("retrieval_rounds") or []
+    idx = int(state.get("current_round_index", 0))
+
+    if idx >= len(rounds):
+        return {"continue_search": False}
+
+    prefetch = prefetched_round(state, idx)
+    if prefetch is not None:
+        logger.info(f"Reusing {len(prefetch['round_queries'])} queries prefetched for round {idx}")
+        return {"round_queries": list(prefetch["round_queries"])}
+
+    round_spec = rounds[idx]
+    base_variants = list(round_spec.get("query_variants") or [])
+    if not base_variants:
+        # Fallback to normalized_query
+        base_variants = [state.get("normalized_query", "")]
+
+    literal_constraints = plan.get("literal_constraints") or {}
+    must_preserve = list(literal_constraints.get("must_preserve_terms") or [])
+    use_hyde = bool(round_spec.get("use_hyde", False))
+
+    queries = base_variants
+
+    # HyDE: only if enabled and no strict literal constraints
+    must_match_exactly = bool(literal_constraints.get("must_match_exactly", False))
+    remaining = budget_remaining(state) if enforce_budget else None
+    if use_hyde and remaining is not None and remaining < DEFAULT_HYDE_TOKEN_RESERVE:
+        logger.info(f"Skipping HyDE for round {idx}: {remaining} tokens left in the plan budget")
+        use_hyde = False
+    if use_hyde and not must_match_exactly and not must_preserve:
+        synthetic = yield adapter_call(
+            hyde,
+            "synthesize",
+            query=state.get("normalized_query", ""),
+            context={"plan": plan, "model_tier": select_tier(state)},
+        )
+        derived = yield adapter_call(
+            hyde,
+            "derive_queries",
+            original_query=state.get("normalized_query", ""),
+            synthetic_answer=synthetic,
+            max_queries=4,
+        )
+        # Include original first
+        queries = [state.get("normalized_query", "")] + derived
+
+    queries = _preserve_literal_terms(queries, must_preserve)
+
+    logger.info(f"Prepared {len(queries)} queries for round {idx}, use_hyde={use_hyde and not must_match_exactly}")
+    logger.debug(f"Queries: {queries}")
+
+    return {"round_queries": queries}
+
+
+def make_prepare_round_queries_node(hyde: HyDEAdapter, enforce_budget: bool = False):
+    """``enforce_budget`` skips HyDE when the plan's token budget is nearly spent (agentic_rag/usage.py)."""
+
     @observe
     @with_error_handling("prepare_round_queries")
     def prepare_round_queries(state: ExecutorState) -> Dict[str, Any]:
-        plan = state.get("plan") or {}
-        rounds = plan.get("retrieval_rounds") or []
-        idx = int(state.get("current_round_index", 0))
-
-        if idx >= len(rounds):
-            return {"continue_search": False}
-
-        round_spec = rounds[idx]
-        base_variants = list(round_spec.get("query_variants") or [])
-        if not base_variants:
-            # Fallback to normalized_query
-            base_variants = [state.get("normalized_query", "")]
-
-        literal_constraints = plan.get("literal_constraints") or {}
-        must_preserve = list(literal_constraints.get("must_preserve_terms") or [])
-        use_hyde = bool(round_spec.get("use_hyde", False))
-
-        queries = base_variants
+        return run_sync(_prepare_steps(hyde, state, enforce_budget))
 
-        # HyDE: only if enabled and no strict literal constraints
-        must_match_exactly = bool(literal_constraints.get("must_match_exactly", False))
-        if use_hyde and not must_match_exactly and not must_preserve:
-            synthetic = hyde.synthesize(query=state.get("normalized_query", ""), context={"plan": plan})
-            derived = hyde.derive_queries(
-                original_query=state.get("normalized_query", ""),
-                synthetic_answer=synthetic,
-                max_queries=4,
-            )
-            # Include original first
-            queries = [state.get("normalized_query", "")] + derived
-
-        queries = _preserve_literal_terms(queries, must_preserve)
-
-        logger.info(f"Prepared {len(queries)} queries for round {idx}, use_hyde={use_hyde and not must_match_exactly}")
-        logger.debug(f"Queries: {queries}")
-
-        return {"round_queries": queries}
+    @observe
+    @with_error_handling("prepare_round_queries")
+    async def aprepare_round_queries(state: ExecutorState) -> Dict[str, Any]:
+        return await run_async(_prepare_steps(hyde, state, enforce_budget))
 
-    return prepare_round_queries
+    return with_async(prepare_round_queries, aprepare_round_queries)
@@ -5,6 +5,7 @@ from __future__ import annotations
 import logging
 from typing import Any, Dict, List
 
+from agentic_rag.aio import Steps, adapter_call, run_async, run_sync, with_async
 from agentic_rag.executor.adapters import RerankerAdapter
 from agentic_rag.executor.constants import DEFAULT_RERANK_TOP_K
 from agentic_rag.executor.state import Candidate, ExecutorState
@@ -13,31 +14,42 @@ from agentic_rag.executor.utils import observe, with_error_handling
 logger = logging.getLogger(__name__)
 
 
-def make_rerank_candidates_node(reranker: RerankerAdapter):
-    @observe
-    @with_error_handling("rerank_candidates")
-    def rerank_candidates(state: ExecutorState) -> Dict[str, Any]:
-        plan = state.get("plan") or {}
-        rounds = plan.get("retrieval_rounds") or []
-        idx = int(state.get("current_round_index", 0))
-        round_spec = rounds[idx]
+def _rerank_steps(reranker: RerankerAdapter, state: ExecutorState) -> Steps:
+    plan = state.get("plan") or {}
+    rounds = plan.get("retrieval_rounds") or []
+    idx = int(state.get("current_round_index", 0))
+    round_spec = rounds[idx]
 
-        merged: List[Candidate] = list(state.get("round_candidates_merged") or [])
-        if not merged:
-            return {"round_candidates_reranked": []}
+    merged: List[Candidate] = list(state.get("round_candidates_merged") or [])
+    if not merged:
+        return {"round_candidates_reranked": []}
 
-        rerank_spec = round_spec.get("rerank") or {}
-        enabled = bool(rerank_spec.get("enabled", True))
-        top_k = int(rerank_spec.get("rerank_top_k", DEFAULT_RERANK_TOP_K))
+    rerank_spec = round_spec.get("rerank") or {}
+    enabled = bool(rerank_spec.get("enabled", True))
+    top_k = int(rerank_spec.get("rerank_top_k", DEFAULT_RERANK_TOP_K))
 
-        if not enabled:
-            return {"round_candidates_reranked": merged}
+    if not enabled:
+        return {"round_candidates_reranked": merged}
 
-        query = state.get("normalized_query", "")
-        reranked = reranker.rerank(query=query, candidates=merged, top_k=top_k, context={"plan": plan})
+    query = state.get("normalized_query", "")
+    reranked = yield adapter_call(
+        reranker, "rerank", query=query, candidates=merged, top_k=top_k, context={"plan": plan}
+    )
 
-        logger.info(f"Reranked {len(merged)} candidates to top {min(top_k, len(reranked))}")
+    logger.info(f"Reranked {len(merged)} candidates to top {min(top_k, len(reranked))}")
 
-        return {"round_candidates_reranked": reranked}
+    return {"round_candidates_reranked": reranked}
+
+
+def make_rerank_candidates_node(reranker: RerankerAdapter):
+    @observe
+    @with_error_handling("rerank_candidates")
+    def rerank_candidates(state: ExecutorState) -> Dict[str, Any]:
+        return run_sync(_rerank_steps(reranker, state))
+
+    @observe
+    @with_error_handling("rerank_candidates")
+    async def arerank_candidates(state: ExecutorState) -> Dict[str, Any]:
+        return await run_async(_rerank_steps(reranker, state))
 
-    return rerank_candidates
+    return with_async(rerank_candidates, arerank_candidates)
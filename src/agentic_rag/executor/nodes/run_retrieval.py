@@ -4,63 +4,137 @@ from __future__ import annotations
 
 import logging
 from dataclasses import replace
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
+from agentic_rag.aio import Steps, adapter_call, run_async, run_sync, with_async
 from agentic_rag.executor.adapters import RetrieverAdapter
-from agentic_rag.executor.constants import DEFAULT_RETRIEVAL_K
-from agentic_rag.executor.state import Candidate, ExecutorState
-from agentic_rag.executor.utils import observe, with_error_handling
+from agentic_rag.executor.constants import DEFAULT_EXACT_K, DEFAULT_RETRIEVAL_K
+from agentic_rag.executor.state import Candidate, ExecutorState, RetrievalModeSpec
+from agentic_rag.executor.utils import observe, prefetched_round, with_error_handling
 
 logger = logging.getLogger(__name__)
 
 
+def _literal_terms(plan: Dict[str, Any], signals: Dict[str, Any]) -> List[str]:
+    # Plan-level terms first (planner already picked what matters), then intake literals.
+    literal_constraints = plan.get("literal_constraints") or {}
+    terms: List[str] = []
+    for t in list(literal_constraints.get("must_preserve_terms") or []) + list(signals.get("literal_terms") or []):
+        if t and t not in terms:
+            terms.append(t)
+    return terms
+
+
+def _resolve_modes(
+    modes: List[RetrievalModeSpec], *, must_match_exactly: bool, has_literals: bool
+) -> List[RetrievalModeSpec]:
+    """Apply literal constraints to the planned retrieval modes.
+
+    When the plan demands exact matches we bypass vector search entirely: "vector" is dropped,
+    "hybrid" degrades to "bm25" and an "exact" lookup is guaranteed.
+    """
+    if not (must_match_exactly and has_literals):
+        return modes
+
+    resolved: List[RetrievalModeSpec] = []
+    for spec in modes:
+        mode = spec.get("type", "hybrid")
+        if mode == "vector":
+            continue
+        if mode == "hybrid":
+            spec = {"type": "bm25", "k": spec.get("k", DEFAULT_RETRIEVAL_K), "alpha": None}
+        if spec not in resolved:
+            resolved.append(spec)
+
+    if not any(spec.get("type") == "exact" for spec in resolved):
+        resolved.insert(0, {"type": "exact", "k": DEFAULT_EXACT_K, "alpha": None})
+    return resolved
+
+
+def _retrieval_steps(retriever: RetrieverAdapter, state: ExecutorState) -> Steps:
+    plan = state.get("plan") or {}
+    rounds = plan.get("retrieval_rounds") or []
+    idx = int(state.get("current_round_index", 0))
+    round_spec = rounds[idx]
+
+    queries: List[str] = list(state.get("round_queries") or [])
+    if not queries:
+        return {
+            "errors": [
+                {
+                    "node": "run_retrieval",
+                    "type": "schema_validation",
+                    "message": "Missing round_queries",
+                    "retryable": False,
+                    "details": None,
+                }
+            ]
+        }
+
+    prefetch = prefetched_round(state, idx)
+    if prefetch is not None and list(prefetch.get("round_queries") or []) == queries:
+        raw = list(prefetch["round_candidates_raw"])
+        logger.info(f"Reusing {len(raw)} candidates retrieved while the planner was streaming")
+        return {"round_candidates_raw": raw}
+
+    filters = round_spec.get("filters") or {}
+    modes = round_spec.get("retrieval_modes") or [{"type": "hybrid", "k": DEFAULT_RETRIEVAL_K, "alpha": None}]
+
+    literal_constraints = plan.get("literal_constraints") or {}
+    must_match_exactly = bool(literal_constraints.get("must_match_exactly", False))
+    literal_terms = _literal_terms(plan, state.get("signals") or {})
+    modes = _resolve_modes(modes, must_match_exactly=must_match_exactly, has_literals=bool(literal_terms))
+
+    round_id = int(round_spec.get("round_id", idx))
+    searches: List[Tuple[str, str, int, Optional[float]]] = []
+
+    for q in queries:
+        for mode_spec in modes:
+            mode = mode_spec.get("type", "hybrid")
+            if mode == "exact":
+                continue
+            k = int(mode_spec.get("k", DEFAULT_RETRIEVAL_K))
+            alpha: Optional[float] = mode_spec.get("alpha", None)
+            searches.append((q, mode, k, alpha))
+
+    # Exact lookups are keyed by the literal itself, not by query variants: one ranked list per term,
+    # so chunks containing several literals are rewarded by fusion.
+    for mode_spec in modes:
+        if mode_spec.get("type") != "exact":
+            continue
+        if not literal_terms:
+            logger.info("Skipping exact mode: no literal terms in plan or signals")
+            continue
+        k = int(mode_spec.get("k", DEFAULT_EXACT_K))
+        for term in literal_terms:
+            searches.append((term, "exact", k, None))
+
+    # One call per (query, mode); the async path issues them concurrently
+    results = yield [
+        adapter_call(retriever, "search", query=q, mode=mode, k=k, alpha=alpha, filters=filters)
+        for q, mode, k, alpha in searches
+    ]
+
+    # Adapter returns Candidates; we add provenance fields using replace() since Candidate is frozen
+    raw: List[Candidate] = []
+    for (q, mode, _k, _alpha), hits in zip(searches, results):
+        for h in hits:
+            raw.append(replace(h, round_id=round_id, query=q, mode=mode))
+
+    logger.info(f"Retrieved {len(raw)} candidates across {len(queries)} queries and {len(modes)} modes")
+
+    return {"round_candidates_raw": raw}
+
+
 def make_run_retrieval_node(retriever: RetrieverAdapter):
     @observe
     @with_error_handling("run_retrieval")
     def run_retrieval(state: ExecutorState) -> Dict[str, Any]:
-        plan = state.get("plan") or {}
-        rounds = plan.get("retrieval_rounds") or []
-        idx = int(state.get("current_round_index", 0))
-        round_spec = rounds[idx]
-
-        queries: List[str] = list(state.get("round_queries") or [])
-        if not queries:
-            return {
-                "errors": [
-                    {
-                        "node": "run_retrieval",
-                        "type": "schema_validation",
-                        "message": "Missing round_queries",
-                        "retryable": False,
-                        "details": None,
-                    }
-                ]
-            }
-
-        filters = round_spec.get("filters") or {}
-        modes = round_spec.get("retrieval_modes") or [{"type": "hybrid", "k": DEFAULT_RETRIEVAL_K, "alpha": None}]
-
-        raw: List[Candidate] = []
-
-        for q in queries:
-            for mode_spec in modes:
-                mode = mode_spec.get("type", "hybrid")
-                k = int(mode_spec.get("k", DEFAULT_RETRIEVAL_K))
-                alpha: Optional[float] = mode_spec.get("alpha", None)
-
-                # Adapter returns Candidates; we add provenance fields using replace() since Candidate is frozen
-                hits = retriever.search(query=q, mode=mode, k=k, alpha=alpha, filters=filters)
-                for h in hits:
-                    enriched = replace(
-                        h,
-                        round_id=int(round_spec.get("round_id", idx)),
-                        query=q,
-                        mode=mode,
-                    )
-                    raw.append(enriched)
-
-        logger.info(f"Retrieved {len(raw)} candidates across {len(queries)} queries and {len(modes)} modes")
+        return run_sync(_retrieval_steps(retriever, state))
 
-        return {"round_candidates_raw": raw}
+    @observe
+    @with_error_handling("run_retrieval")
+    async def arun_retrieval(state: ExecutorState) -> Dict[str, Any]:
+        return await run_async(_retrieval_steps(retriever, state))
 
-    return run_retrieval
+    return with_async(run_retrieval, arun_retrieval)
@@ -0,0 +1,67 @@
+# src/agentic_rag/executor/prefetch.py
+"""Round-0 retrieval that can run before the executor subgraph starts.
+
+The streaming planner (planner/streaming.py) calls the prefetcher as soon as the first
+RetrievalRound and the literal constraints have been decoded, so retrieval latency overlaps with
+the rest of the plan being generated. It runs the same prepare_round_queries/run_retrieval nodes
+the executor would; the executor reuses the result when the final plan kept round 0 unchanged
+(see utils.prefetched_round).
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict, Optional
+
+from agentic_rag.executor.adapters import HyDEAdapter, RetrieverAdapter
+from agentic_rag.executor.nodes.prepare_round_queries import make_prepare_round_queries_node
+from agentic_rag.executor.nodes.run_retrieval import make_run_retrieval_node
+
+logger = logging.getLogger(__name__)
+
+
+class RoundPrefetcher:
+    """``prefetch(state) -> {"round_queries", "round_candidates_raw"}`` for round 0.
+
+    ``state`` carries the intake fields plus a partial ``plan`` holding ``retrieval_rounds=[round_0]``
+    and ``literal_constraints``. Errors yield ``{}`` so the executor simply runs the round itself.
+    ``acall`` is the async equivalent used by the async streaming planner.
+    """
+
+    def __init__(self, retriever: RetrieverAdapter, hyde: HyDEAdapter):
+        self._prepare = make_prepare_round_queries_node(hyde)
+        self._retrieve = make_run_retrieval_node(retriever)
+
+    @staticmethod
+    def _state(state: Dict[str, Any]) -> Dict[str, Any]:
+        return {**state, "current_round_index": 0, "prefetched_round": None}
+
+    @staticmethod
+    def _result(prepared: Dict[str, Any], retrieved: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        if "round_queries" not in prepared:
+            logger.info(f"Round prefetch skipped: {prepared.get('errors')}")
+            return {}
+        if "round_candidates_raw" not in retrieved:
+            logger.info(f"Round prefetch failed: {retrieved.get('errors')}")
+            return {}
+        return {
+            "round_queries": prepared["round_queries"],
+            "round_candidates_raw": retrieved["round_candidates_raw"],
+        }
+
+    def __call__(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        state = self._state(state)
+        prepared = self._prepare(state)
+        retrieved = self._retrieve({**state, **prepared}) if "round_queries" in prepared else None
+        return self._result(prepared, retrieved)
+
+    async def acall(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        state = self._state(state)
+        prepared = await self._prepare.afunc(state)
+        retrieved = await self._retrieve.afunc({**state, **prepared}) if "round_queries" in prepared else None
+        return self._result(prepared, retrieved)
+
+
+def make_round_prefetcher(retriever: RetrieverAdapter, hyde: HyDEAdapter) -> RoundPrefetcher:
+    """Return the round-0 prefetcher for the streaming planner (see RoundPrefetcher)."""
+    return RoundPrefetcher(retriever, hyde)
@@ -3,7 +3,9 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Literal, Optional, TypedDict
+from typing import Annotated, Any, Dict, List, Literal, Optional, TypedDict
+
+from agentic_rag.usage import add_ledger
 
 # -------------------------
 # Planner contract (input)
@@ -17,7 +19,7 @@ Strategy = Literal[
 ]
 
 RoundPurpose = Literal["recall", "precision", "verification", "gap_filling"]
-RetrievalModeType = Literal["bm25", "vector", "hybrid"]
+RetrievalModeType = Literal["bm25", "vector", "hybrid", "exact"]
 
 
 class RetrievalModeSpec(TypedDict, total=False):
@@ -30,7 +32,7 @@ class RoundFilters(TypedDict, total=False):
     doc_types: List[str]
     domains: List[str]
     entities: List[str]
-    time_range: str  # free-form for now
+    time_range: str  # free-form; local indexes parse it with index.metadata.parse_time_range
 
 
 class RerankSpec(TypedDict, total=False):
@@ -127,6 +129,8 @@ class Candidate:
     vector_rank: Optional[int] = None
     bm25_score: Optional[float] = None
     vector_score: Optional[float] = None
+    exact_rank: Optional[int] = None
+    exact_score: Optional[float] = None  # occurrences of the literal in text
 
     # Fusion + rerank
     rrf_score: Optional[float] = None
@@ -135,7 +139,7 @@ class Candidate:
     # Provenance
     round_id: Optional[int] = None
     query: Optional[str] = None
-    mode: Optional[str] = None  # "bm25" | "vector" | "hybrid"
+    mode: Optional[str] = None  # "bm25" | "vector" | "hybrid" | "exact"
 
 
 @dataclass
@@ -176,6 +180,10 @@ class ExecutorState(TypedDict, total=False):
     constraints: Dict[str, Any]  # from intake
     guardrails: Dict[str, Any]  # from intake
     signals: Dict[str, Any]  # from intake
+    model_tier: Optional[str]  # explicit model tier (agentic_rag/model.py select_tier)
+
+    # Round 0 retrieved while the planner was streaming (see executor/prefetch.py)
+    prefetched_round: Optional[Dict[str, Any]]
 
     # Execution context
     execution_context: Dict[str, Any]
@@ -198,5 +206,8 @@ class ExecutorState(TypedDict, total=False):
     # Control flow
     continue_search: bool
 
+    # Per-call token usage (agentic_rag/usage.py)
+    token_ledger: Annotated[List[Dict[str, Any]], add_ledger]
+
     # Errors
     errors: List[Dict[str, Any]]
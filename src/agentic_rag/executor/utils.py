@@ -2,9 +2,10 @@
 """Utilities for executor nodes: error handling, observability, logging."""
 
 import functools
+import inspect
 import logging
 import os
-from typing import Any, Callable, Dict
+from typing import Any, Callable, Dict, Optional
 
 # Observability setup (same pattern as intent nodes)
 OBSERVE_ENABLED = os.getenv("LANGFUSE_ENABLED", "1") == "1"
@@ -31,7 +32,7 @@ else:
 def with_error_handling(node_name: str) -> Callable:
     """Decorator to add consistent error handling to executor nodes.
 
-    Wraps node functions in try/except and returns structured error dicts.
+    Wraps node functions (sync or async) in try/except and returns structured error dicts.
     Also adds logging for debugging.
 
     Args:
@@ -47,6 +48,34 @@ def with_error_handling(node_name: str) -> Callable:
     def decorator(func: Callable) -> Callable:
         logger = logging.getLogger(func.__module__)
 
+        def _error(e: Exception) -> Dict[str, Any]:
+            logger.exception(f"Error in {node_name}: {e}")
+            return {
+                "errors": [
+                    {
+                        "node": node_name,
+                        "type": "runtime_error",
+                        "message": str(e),
+                        "retryable": True,
+                        "details": {"exception_type": type(e).__name__},
+                    }
+                ]
+            }
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def awrapper(state: Dict[str, Any]) -> Dict[str, Any]:
+                try:
+                    logger.debug(f"Starting {node_name}")
+                    result = await func(state)
+                    logger.debug(f"Completed {node_name}: {len(result)} fields returned")
+                    return result
+                except Exception as e:
+                    return _error(e)
+
+            return awrapper
+
         @functools.wraps(func)
         def wrapper(state: Dict[str, Any]) -> Dict[str, Any]:
             try:
@@ -55,19 +84,28 @@ def with_error_handling(node_name: str) -> Callable:
                 logger.debug(f"Completed {node_name}: {len(result)} fields returned")
                 return result
             except Exception as e:
-                logger.exception(f"Error in {node_name}: {e}")
-                return {
-                    "errors": [
-                        {
-                            "node": node_name,
-                            "type": "runtime_error",
-                            "message": str(e),
-                            "retryable": True,
-                            "details": {"exception_type": type(e).__name__},
-                        }
-                    ]
-                }
+                return _error(e)
 
         return wrapper
 
     return decorator
+
+
+def prefetched_round(state: Dict[str, Any], idx: int) -> Optional[Dict[str, Any]]:
+    """Round-0 results retrieved while the planner was still streaming, if they still apply.
+
+    The streaming planner (planner/streaming.py) stores the round spec and literal constraints it
+    retrieved with; they are reused only if the final plan kept both unchanged.
+    """
+    prefetch = state.get("prefetched_round")
+    if idx != 0 or not prefetch:
+        return None
+    plan = state.get("plan") or {}
+    rounds = plan.get("retrieval_rounds") or []
+    if not rounds or rounds[0] != prefetch.get("round"):
+        return None
+    if (plan.get("literal_constraints") or {}) != prefetch.get("literal_constraints"):
+        return None
+    if state.get("normalized_query", "") != prefetch.get("normalized_query", ""):
+        return None
+    return prefetch
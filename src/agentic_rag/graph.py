@@ -1,9 +1,25 @@
 # src/agentic_rag/graph.py
 from __future__ import annotations
 
+import os
+from typing import Optional
+
 from langgraph.graph import END, START, StateGraph
 
+from agentic_rag.aio import dual_node
 from agentic_rag.answer.graph import make_answer_graph
+from agentic_rag.answer.speculative import (
+    SpeculativeComposer,
+    make_speculate_answer_node,
+    make_speculation_gate_node,
+)
+from agentic_rag.answer.templates import (
+    intake_short_circuit,
+    make_clarify_template_node,
+    make_refuse_template_node,
+    plan_short_circuit,
+)
+from agentic_rag.context import ConversationSummarizer, make_summarize_context_node
 from agentic_rag.executor.adapters import (
     CoverageGraderAdapter,
     FusionAdapter,
@@ -12,9 +28,24 @@ from agentic_rag.executor.adapters import (
     RetrieverAdapter,
 )
 from agentic_rag.executor.graph import make_executor_graph
+from agentic_rag.executor.prefetch import make_round_prefetcher
+from agentic_rag.intent.cache import IntakeCache
+from agentic_rag.intent.classifier import IntentClassifier
 from agentic_rag.intent.graph import make_intake_graph
 from agentic_rag.planner.graph import make_planner_graph
+from agentic_rag.planner.templates import TemplatePlanner
 from agentic_rag.state import AgentState
+from agentic_rag.usage import with_usage
+
+
+def token_budget_enforced() -> bool:
+    """Default for ``make_agent_graph(enforce_token_budget=None)``; set TOKEN_BUDGET_ENFORCE=1."""
+    return os.getenv("TOKEN_BUDGET_ENFORCE", "0") == "1"
+
+
+def template_short_circuits_enabled() -> bool:
+    """Default for ``make_agent_graph(template_short_circuits=None)``; set TEMPLATE_SHORT_CIRCUITS=1."""
+    return os.getenv("TEMPLATE_SHORT_CIRCUITS", "0") == "1"
 
 
 def make_agent_graph(
@@ -26,11 +57,85 @@ def make_agent_graph(
     hyde: HyDEAdapter,
     grader: CoverageGraderAdapter,
     max_retries: int = 2,
+    fused_intake: Optional[bool] = None,
+    intake_cache: Optional[IntakeCache] = None,
+    intent_classifier: Optional[IntentClassifier] = None,
+    deterministic_signals: Optional[bool] = None,
+    intake_prepass: Optional[bool] = None,
+    template_planner: Optional[TemplatePlanner] = None,
+    template_short_circuits: Optional[bool] = None,
+    streaming_planner: Optional[bool] = None,
+    speculative_composer: Optional[SpeculativeComposer] = None,
+    streaming_answer: Optional[bool] = None,
+    summarizer: Optional[ConversationSummarizer] = None,
+    evidence_compression: Optional[bool] = None,
+    map_llm=None,
+    enforce_token_budget: Optional[bool] = None,
 ):
-    """Create the Master Agent Graph."""
+    """Create the Master Agent Graph.
+
+    ``llm`` is one chat model for every LLM node, or a ModelRegistry (agentic_rag/model.py) that gives
+    intake, planner, composer, map and summary their own model and output cap, with a faster tier
+    for requests whose ``constraints.nonfunctional`` ask for low_latency/low_cost (or that set
+    ``model_tier``).
+    ``fused_intake`` selects the single-call intake node (``None`` = INTAKE_FUSED env switch).
+    ``intake_cache`` (shared across requests) short-circuits intake for repeated conversations.
+    ``intent_classifier`` enables the local fast path in place of the extract_signals LLM call.
+    ``deterministic_signals`` extracts artifact_flags/literal_terms locally
+    (``None`` = INTAKE_DETERMINISTIC_SIGNALS env switch).
+    ``intake_prepass`` fills pii_present/language/locale with local detectors
+    (``None`` = INTAKE_PREPASS env switch).
+    ``template_planner`` builds deterministic plans for routine requests before the LLM planner;
+    its ``stats.bypass_rate`` reports how often the LLM call was skipped.
+    ``template_short_circuits`` routes blocking clarifications and hard refusals to deterministic,
+    localised answers (answer/templates.py) instead of the planner/composer LLM calls
+    (``None`` = TEMPLATE_SHORT_CIRCUITS env switch). Refusals are taken from the plan only, so the
+    planner still decides whether a restricted request is safe to answer.
+    ``streaming_planner`` streams the plan and starts round-0 retrieval while the rest is still
+    decoding (``None`` = PLANNER_STREAMING env switch).
+    ``speculative_composer`` (shared across requests) drafts the answer in parallel with the planner
+    when intake predicts ``direct_answer``; its ``stats`` report acceptance rate and latency saved.
+    ``streaming_answer`` streams answer tokens as custom stream events (``None`` = ANSWER_STREAMING
+    env switch); consume them with answer.streaming.stream_answer_events.
+    ``summarizer`` (shared across requests) folds turns that fell out of the conversation window into
+    ``conversation_summary`` before intake. The LLM nodes always see a windowed, token-capped view
+    of ``messages`` (agentic_rag/context.py); return ``conversation_summary``/``summarized_turns``
+    with the next request to keep updates incremental.
+    ``evidence_compression`` gives the composer only the query-relevant sentences of each evidence
+    chunk (``None`` = ANSWER_EVIDENCE_COMPRESSION env switch; see answer/compression.py).
+    ``map_llm`` is the (cheaper) model for the map step of map-reduce composition, which large
+    evidence packs select automatically (default ``llm``; see answer/map_reduce.py).
+    Every LLM call is recorded in ``token_ledger`` (per node: tokens, model, cost; agentic_rag/usage.py).
+    ``enforce_token_budget`` keeps the executor and answer stages within ``plan.budget.max_tokens`` by
+    skipping HyDE, stopping retrieval, trimming evidence or aborting with a ``budget_exceeded`` error
+    (``None`` = TOKEN_BUDGET_ENFORCE env switch).
+
+    The compiled graph supports ``invoke`` and ``ainvoke``. Under ``ainvoke`` the LLM and adapter nodes
+    await ``ainvoke``/``asearch``/``arerank``/``agrade``/``asynthesize`` (see agentic_rag.aio and the
+    Async*Adapter protocols); adapters with only sync methods run in worker threads.
+    """
+    if enforce_token_budget is None:
+        enforce_token_budget = token_budget_enforced()
+    if template_short_circuits is None:
+        template_short_circuits = template_short_circuits_enabled()
+
     # 1. compile subgraphs
-    intake = make_intake_graph(llm, max_retries=max_retries)
-    planner = make_planner_graph(llm, max_retries=max_retries)
+    intake = make_intake_graph(
+        llm,
+        max_retries=max_retries,
+        fused=fused_intake,
+        cache=intake_cache,
+        classifier=intent_classifier,
+        deterministic_signals=deterministic_signals,
+        prepass=intake_prepass,
+    )
+    planner = make_planner_graph(
+        llm,
+        max_retries=max_retries,
+        templates=template_planner,
+        streaming=streaming_planner,
+        prefetch=make_round_prefetcher(retriever, hyde),
+    )
     executor = make_executor_graph(
         retriever=retriever,
         fusion=fusion,
@@ -38,8 +143,16 @@ def make_agent_graph(
         hyde=hyde,
         grader=grader,
         max_retries=max_retries,
+        enforce_budget=enforce_token_budget,
+    )
+    answer = make_answer_graph(
+        llm,
+        max_retries=max_retries,
+        streaming=streaming_answer,
+        compress=evidence_compression,
+        map_llm=map_llm,
+        enforce_budget=enforce_token_budget,
     )
-    answer = make_answer_graph(llm, max_retries=max_retries)
 
     # 2. construct master graph
     workflow = StateGraph(AgentState)
@@ -49,9 +162,38 @@ def make_agent_graph(
     workflow.add_node("executor", executor)
     workflow.add_node("answer", answer)
 
+    if template_short_circuits:
+        workflow.add_node("clarify_template", make_clarify_template_node())
+        workflow.add_node("refuse_template", make_refuse_template_node())
+        workflow.add_edge("clarify_template", END)
+        workflow.add_edge("refuse_template", END)
+
+    # Speculation wraps the planner: speculate_answer -> planner -> speculation_gate
+    plan_entry, plan_exit = "planner", "planner"
+    if speculative_composer is not None:
+        workflow.add_node("speculate_answer", make_speculate_answer_node(speculative_composer))
+        workflow.add_node("speculation_gate", dual_node(make_speculation_gate_node(speculative_composer)))
+        workflow.add_edge("speculate_answer", "planner")
+        workflow.add_edge("planner", "speculation_gate")
+        plan_entry, plan_exit = "speculate_answer", "speculation_gate"
+
     # 3. define edges
-    workflow.add_edge(START, "intake")
-    workflow.add_edge("intake", "planner")
+    if summarizer is not None:
+        workflow.add_node(
+            "summarize_context", dual_node(with_usage(make_summarize_context_node(summarizer), "summarize_context"))
+        )
+        workflow.add_edge(START, "summarize_context")
+        workflow.add_edge("summarize_context", "intake")
+    else:
+        workflow.add_edge(START, "intake")
+    if template_short_circuits:
+        workflow.add_conditional_edges(
+            "intake",
+            lambda state: "clarify_template" if intake_short_circuit(state) == "clarify" else plan_entry,
+            [plan_entry, "clarify_template"],
+        )
+    else:
+        workflow.add_edge("intake", plan_entry)
 
     # Conditional logic could go here:
     # if planner says "direct_answer", skip executor?
@@ -60,6 +202,11 @@ def make_agent_graph(
     # Let's check planner strategy.
 
     def route_after_planner(state: AgentState):
+        if template_short_circuits:
+            short = plan_short_circuit(state)
+            if short is not None:
+                return f"{short}_template"
+
         plan = state.get("plan") or {}
         strategy = plan.get("strategy", "retrieve_then_answer")
 
@@ -76,7 +223,10 @@ def make_agent_graph(
 
         return "executor"
 
-    workflow.add_conditional_edges("planner", route_after_planner, ["executor", "answer"])
+    planner_targets = ["executor", "answer"]
+    if template_short_circuits:
+        planner_targets += ["clarify_template", "refuse_template"]
+    workflow.add_conditional_edges(plan_exit, route_after_planner, planner_targets)
 
     workflow.add_edge("executor", "answer")
     workflow.add_edge("answer", END)
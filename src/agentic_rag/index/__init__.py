@@ -0,0 +1,25 @@
+"""Local retrieval indexes (exact-literal, BM25, vector, metadata filters, updatable segments) and their retriever."""
+
+from agentic_rag.index.bm25 import BM25Index
+from agentic_rag.index.literal import LiteralIndex
+from agentic_rag.index.local import LocalIndex
+from agentic_rag.index.metadata import MetadataStore, TimeInterval, parse_time_range
+from agentic_rag.index.retriever import LocalRetriever
+from agentic_rag.index.segments import SegmentedIndex, SegmentSnapshot
+from agentic_rag.index.storage import load_index, save_index
+from agentic_rag.index.vector import VectorIndex
+
+__all__ = [
+    "BM25Index",
+    "LiteralIndex",
+    "LocalIndex",
+    "LocalRetriever",
+    "MetadataStore",
+    "SegmentSnapshot",
+    "SegmentedIndex",
+    "TimeInterval",
+    "VectorIndex",
+    "load_index",
+    "parse_time_range",
+    "save_index",
+]
@@ -0,0 +1,142 @@
+# src/agentic_rag/index/bm25.py
+"""In-process BM25 (Okapi) index over chunk ordinals."""
+
+from __future__ import annotations
+
+import math
+import re
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+class BM25Index:
+    """Postings are kept as Python lists while building and frozen to numpy arrays on first search.
+
+    ``search`` accepts an optional boolean mask (see MetadataStore.compile); postings are
+    restricted to allowed ordinals before any scoring happens.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Tuple[List[int], List[int]]] = {}
+        self._doc_len: List[int] = []
+        self._frozen: Optional[Dict[str, Tuple[np.ndarray, np.ndarray]]] = None
+        self._doc_len_arr: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self._doc_len)
+
+    def add(self, ordinal: int, text: str) -> None:
+        if ordinal != len(self._doc_len):
+            raise ValueError(f"Expected ordinal {len(self._doc_len)}, got {ordinal}")
+        tokens = tokenize(text)
+        self._doc_len.append(len(tokens))
+
+        tf: Dict[str, int] = {}
+        for t in tokens:
+            tf[t] = tf.get(t, 0) + 1
+        for term, count in tf.items():
+            ords, tfs = self._postings.setdefault(term, ([], []))
+            ords.append(ordinal)
+            tfs.append(count)
+
+        self._frozen = None
+        self._doc_len_arr = None
+
+    def _freeze(self) -> None:
+        if self._frozen is None:
+            self._frozen = {
+                term: (np.asarray(ords, dtype=np.int64), np.asarray(tfs, dtype=np.float32))
+                for term, (ords, tfs) in self._postings.items()
+            }
+            self._doc_len_arr = np.asarray(self._doc_len, dtype=np.float32)
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """Flatten postings into CSR-style arrays for persistence.
+
+        Terms are stored as one UTF-8 blob (``term_bytes``) sliced by ``term_offsets``; a fixed-width
+        unicode array would pad every term to the longest one at 4 bytes per character.
+        """
+        terms = sorted(self._postings)
+        encoded = [term.encode("utf-8") for term in terms]
+        term_offsets = np.zeros(len(terms) + 1, dtype=np.int64)
+        term_offsets[1:] = np.cumsum([len(e) for e in encoded], dtype=np.int64)
+        offsets = np.zeros(len(terms) + 1, dtype=np.int64)
+        ords: List[int] = []
+        tfs: List[int] = []
+        for i, term in enumerate(terms):
+            t_ords, t_tfs = self._postings[term]
+            ords.extend(t_ords)
+            tfs.extend(t_tfs)
+            offsets[i + 1] = len(ords)
+        return {
+            "term_bytes": np.frombuffer(b"".join(encoded), dtype=np.uint8),
+            "term_offsets": term_offsets,
+            "offsets": offsets,
+            "ords": np.asarray(ords, dtype=np.int64),
+            "tfs": np.asarray(tfs, dtype=np.int64),
+            "doc_len": np.asarray(self._doc_len, dtype=np.int64),
+            "params": np.asarray([self.k1, self.b], dtype=np.float64),
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray]) -> "BM25Index":
+        k1, b = (float(x) for x in arrays["params"])
+        index = cls(k1=k1, b=b)
+        offsets = arrays["offsets"]
+        ords, tfs = arrays["ords"], arrays["tfs"]
+        blob = arrays["term_bytes"].tobytes()
+        term_offsets = arrays["term_offsets"].tolist()
+        for i in range(len(term_offsets) - 1):
+            term = blob[term_offsets[i] : term_offsets[i + 1]].decode("utf-8")
+            lo, hi = int(offsets[i]), int(offsets[i + 1])
+            index._postings[term] = (ords[lo:hi].tolist(), tfs[lo:hi].tolist())
+        index._doc_len = arrays["doc_len"].tolist()
+        return index
+
+    def search(self, query: str, k: int, mask: Optional[np.ndarray] = None) -> List[Tuple[int, float]]:
+        """Return up to ``k`` ``(ordinal, score)`` pairs, best first."""
+        n_docs = len(self._doc_len)
+        if n_docs == 0 or k <= 0:
+            return []
+        self._freeze()
+
+        doc_len = self._doc_len_arr
+        avgdl = float(doc_len.mean()) or 1.0
+        scores = np.zeros(n_docs, dtype=np.float32)
+        touched = np.zeros(n_docs, dtype=bool)
+
+        for term in set(tokenize(query)):
+            posting = self._frozen.get(term)
+            if posting is None:
+                continue
+            ords, tfs = posting
+            if mask is not None:
+                keep = mask[ords]
+                ords, tfs = ords[keep], tfs[keep]
+                if ords.size == 0:
+                    continue
+            # idf uses corpus-wide df so scores are comparable with and without filters
+            df = len(posting[0])
+            idf = math.log(1.0 + (n_docs - df + 0.5) / (df + 0.5))
+            denom = tfs + self.k1 * (1.0 - self.b + self.b * doc_len[ords] / avgdl)
+            scores[ords] += idf * tfs * (self.k1 + 1.0) / denom
+            touched[ords] = True
+
+        hit_ords = np.flatnonzero(touched)
+        if hit_ords.size == 0:
+            return []
+        hit_scores = scores[hit_ords]
+        if hit_ords.size > k:
+            top = np.argpartition(-hit_scores, k - 1)[:k]
+            hit_ords, hit_scores = hit_ords[top], hit_scores[top]
+        order = np.lexsort((hit_ords, -hit_scores))
+        return [(int(hit_ords[i]), float(hit_scores[i])) for i in order]
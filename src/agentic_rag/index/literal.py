@@ -0,0 +1,133 @@
+# src/agentic_rag/index/literal.py
+"""Exact-literal lookup index.
+
+Error codes, ticket IDs, config keys and paths are poorly served by BM25 tokenization and
+vector similarity. This index keeps character n-gram posting lists over chunk text so a literal
+can be resolved by intersecting a handful of postings and verifying the surviving chunks with a
+plain substring check.
+"""
+
+from __future__ import annotations
+
+import logging
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from agentic_rag.executor.state import Candidate, CandidateKey
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_NGRAM = 3
+
+
+def _ngrams(text: str, n: int) -> Iterable[str]:
+    for i in range(len(text) - n + 1):
+        yield text[i : i + n]
+
+
+class LiteralIndex:
+    """Character n-gram index answering "which chunks contain this exact string".
+
+    Chunks are addressed by a dense ordinal (insertion order). Posting lists are append-only
+    ``array('I')`` so they stay sorted and compact without extra bookkeeping.
+    """
+
+    def __init__(self, n: int = DEFAULT_NGRAM, case_sensitive: bool = True):
+        if n < 1:
+            raise ValueError("n must be >= 1")
+        self.n = n
+        self.case_sensitive = case_sensitive
+
+        self._keys: List[CandidateKey] = []
+        self._texts: List[str] = []
+        self._metadata: List[Dict] = []
+        self._postings: Dict[str, array] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _fold(self, text: str) -> str:
+        return text if self.case_sensitive else text.lower()
+
+    def add(self, key: CandidateKey, text: str, metadata: Optional[Dict] = None) -> int:
+        """Index one chunk and return its ordinal."""
+        ordinal = len(self._keys)
+        self._keys.append(key)
+        self._texts.append(text)
+        self._metadata.append(dict(metadata or {}))
+
+        for gram in set(_ngrams(self._fold(text), self.n)):
+            postings = self._postings.get(gram)
+            if postings is None:
+                postings = self._postings[gram] = array("I")
+            postings.append(ordinal)
+
+        return ordinal
+
+    def key(self, ordinal: int) -> CandidateKey:
+        return self._keys[ordinal]
+
+    def text(self, ordinal: int) -> str:
+        return self._texts[ordinal]
+
+    def metadata(self, ordinal: int) -> Dict:
+        return self._metadata[ordinal]
+
+    def _candidate_ordinals(self, term: str) -> Iterable[int]:
+        if len(term) < self.n:
+            # Too short to use postings; callers are expected to pass real identifiers,
+            # so a linear scan here is rare and bounded by corpus size.
+            return range(len(self._keys))
+
+        postings: List[array] = []
+        for gram in set(_ngrams(term, self.n)):
+            p = self._postings.get(gram)
+            if p is None:
+                return ()
+            postings.append(p)
+
+        postings.sort(key=len)
+        survivors = set(postings[0])
+        for p in postings[1:]:
+            survivors.intersection_update(p)
+            if not survivors:
+                break
+        return sorted(survivors)
+
+    def lookup(self, term: str, k: Optional[int] = None, mask: Optional[np.ndarray] = None) -> List[Tuple[int, int]]:
+        """Return ``(ordinal, occurrences)`` for chunks containing ``term`` verbatim.
+
+        Results are ordered by occurrence count (desc), then by ordinal for determinism.
+        ``mask`` (see MetadataStore.compile) drops disallowed ordinals before verification.
+        """
+        if not term:
+            return []
+
+        needle = self._fold(term)
+        hits: List[Tuple[int, int]] = []
+        for ordinal in self._candidate_ordinals(needle):
+            if mask is not None and not mask[ordinal]:
+                continue
+            count = self._fold(self._texts[ordinal]).count(needle)
+            if count:
+                hits.append((ordinal, count))
+
+        hits.sort(key=lambda h: (-h[1], h[0]))
+        return hits[:k] if k is not None else hits
+
+    def search(self, term: str, k: int, mask: Optional[np.ndarray] = None) -> List[Candidate]:
+        """Return candidates whose text contains ``term`` verbatim."""
+        candidates: List[Candidate] = []
+        for rank, (ordinal, count) in enumerate(self.lookup(term, k=k, mask=mask), start=1):
+            candidates.append(
+                Candidate(
+                    key=self._keys[ordinal],
+                    text=self._texts[ordinal],
+                    metadata=dict(self._metadata[ordinal]),
+                    exact_score=float(count),
+                    exact_rank=rank,
+                )
+            )
+        return candidates
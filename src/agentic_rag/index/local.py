@@ -0,0 +1,46 @@
+# src/agentic_rag/index/local.py
+
+from __future__ import annotations
+
+from typing import Any, Dict, Optional, Sequence
+
+from agentic_rag.executor.state import CandidateKey
+from agentic_rag.index.bm25 import BM25Index
+from agentic_rag.index.literal import DEFAULT_NGRAM, LiteralIndex
+from agentic_rag.index.metadata import MetadataStore
+from agentic_rag.index.vector import VectorIndex
+
+
+class LocalIndex:
+    """Chunk-aligned bundle of the local indexes.
+
+    Every component is addressed by the same dense ordinal. The LiteralIndex doubles as the
+    chunk store (key, text, metadata); BM25, vector and metadata indexes only hold features.
+    ``vectors`` is ``None`` when the index is built without embeddings.
+    """
+
+    def __init__(self, *, dim: Optional[int] = None, literal_ngram: int = DEFAULT_NGRAM):
+        self.literal = LiteralIndex(n=literal_ngram)
+        self.bm25 = BM25Index()
+        self.metadata = MetadataStore()
+        self.vectors: Optional[VectorIndex] = VectorIndex(dim) if dim else None
+
+    def __len__(self) -> int:
+        return len(self.literal)
+
+    def add(
+        self,
+        key: CandidateKey,
+        text: str,
+        metadata: Optional[Dict[str, Any]] = None,
+        vector: Optional[Sequence[float]] = None,
+    ) -> int:
+        if self.vectors is not None and vector is None:
+            raise ValueError(f"Index has vectors (dim={self.vectors.dim}); missing vector for {key}")
+
+        ordinal = self.literal.add(key, text, metadata)
+        self.bm25.add(ordinal, text)
+        self.metadata.add(ordinal, metadata)
+        if self.vectors is not None:
+            self.vectors.add(ordinal, vector)
+        return ordinal
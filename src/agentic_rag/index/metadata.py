@@ -0,0 +1,266 @@
+# src/agentic_rag/index/metadata.py
+"""Columnar metadata store for filter pushdown.
+
+Each filterable field keeps, per normalized value, a sorted array of chunk ordinals. A
+``RoundFilters`` dict compiles into a single boolean bitset over ordinals that the BM25 and
+vector indexes apply *before* scoring, so filtered-out chunks cost nothing.
+
+Semantics: values within one field are OR-ed, fields are AND-ed. An empty field list means
+"no restriction" (matches how the planner emits RoundFilters defaults).
+"""
+
+from __future__ import annotations
+
+import calendar
+import logging
+import re
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# RoundFilters key -> chunk metadata keys that feed it (first present wins)
+FILTER_FIELDS: Dict[str, tuple] = {
+    "doc_types": ("doc_type", "doc_types"),
+    "domains": ("domain", "domains"),
+    "entities": ("entities",),
+}
+
+DATE_FIELDS = ("date", "updated_at", "published_at", "created_at")
+
+_NO_DATE = -1
+
+
+# -------------------------
+# time_range parsing
+# -------------------------
+
+
+@dataclass(frozen=True)
+class TimeInterval:
+    """Closed date interval; ``None`` bounds are open."""
+
+    start: Optional[date] = None
+    end: Optional[date] = None
+
+    def contains(self, d: date) -> bool:
+        if self.start is not None and d < self.start:
+            return False
+        if self.end is not None and d > self.end:
+            return False
+        return True
+
+
+_RANGE_SEP_RE = re.compile(r"\s*(?:\.\.|/|\bto\b|\s-\s|–)\s*")
+_YEAR_RANGE_RE = re.compile(r"^(\d{4})-(\d{4})$")
+_QUARTER_RE = re.compile(r"^(\d{4})-?q([1-4])$")
+_RELATIVE_RE = re.compile(r"^(?:last|past|previous)\s+(\d+)?\s*(day|week|month|year)s?$")
+_OPEN_RE = re.compile(r"^(since|after|from|before|until|up to)\s+(.+)$")
+
+
+def _add_months(d: date, months: int) -> date:
+    y, m = divmod(d.month - 1 + months, 12)
+    year, month = d.year + y, m + 1
+    return date(year, month, min(d.day, calendar.monthrange(year, month)[1]))
+
+
+def _parse_point(text: str) -> Optional[TimeInterval]:
+    """Parse a single date expression into the interval it covers (year, month or day)."""
+    text = text.strip()
+    try:
+        m = _QUARTER_RE.match(text)
+        if m:
+            year, q = int(m.group(1)), int(m.group(2))
+            start = date(year, 3 * (q - 1) + 1, 1)
+            return TimeInterval(start, _add_months(start, 3) - timedelta(days=1))
+        if re.fullmatch(r"\d{4}", text):
+            year = int(text)
+            return TimeInterval(date(year, 1, 1), date(year, 12, 31))
+        if re.fullmatch(r"\d{4}-\d{1,2}", text):
+            year, month = (int(x) for x in text.split("-"))
+            return TimeInterval(date(year, month, 1), date(year, month, calendar.monthrange(year, month)[1]))
+        d = date.fromisoformat(text)
+    except ValueError:  # also out-of-range parts, e.g. "2023-13", "2023-0", "0000"
+        return None
+    return TimeInterval(d, d)
+
+
+def parse_time_range(text: Optional[str], *, today: Optional[date] = None) -> Optional[TimeInterval]:
+    """Parse the planner's free-form ``time_range`` into a TimeInterval.
+
+    Supported forms: ``2023``, ``2023-05``, ``2023-05-01``, ``2024Q1``, ``2022-2024``,
+    ``2023-01-01..2023-06-30`` (also ``/`` or ``to``), ``since 2022``, ``before 2024-03``,
+    ``last 6 months``, ``past year``. Returns ``None`` if the text is empty or unparseable.
+    """
+    if not text or not text.strip():
+        return None
+    s = text.strip().lower()
+    today = today or date.today()
+
+    m = _RELATIVE_RE.match(s)
+    if m:
+        n = int(m.group(1) or 1)
+        unit = m.group(2)
+        try:  # spans reaching past year 1 are unparseable, not errors
+            if unit == "day":
+                start = today - timedelta(days=n)
+            elif unit == "week":
+                start = today - timedelta(weeks=n)
+            elif unit == "month":
+                start = _add_months(today, -n)
+            else:
+                start = _add_months(today, -12 * n)
+        except (ValueError, OverflowError):
+            return None
+        return TimeInterval(start, today)
+
+    m = _OPEN_RE.match(s)
+    if m:
+        point = _parse_point(m.group(2))
+        if point is None:
+            return None
+        if m.group(1) in ("since", "from"):
+            return TimeInterval(point.start, None)
+        try:  # "after 9999-12-31" / "before 0001-01-01" fall off the calendar
+            if m.group(1) == "after":
+                return TimeInterval(point.end + timedelta(days=1), None)
+            if m.group(1) == "before":
+                return TimeInterval(None, point.start - timedelta(days=1))
+        except (ValueError, OverflowError):
+            return None
+        return TimeInterval(None, point.end)
+
+    m = _YEAR_RANGE_RE.match(s)
+    if m:
+        try:
+            return TimeInterval(date(int(m.group(1)), 1, 1), date(int(m.group(2)), 12, 31))
+        except ValueError:
+            return None
+
+    point = _parse_point(s)
+    if point is not None:
+        return point
+
+    parts = _RANGE_SEP_RE.split(s, maxsplit=1)
+    if len(parts) == 2:
+        lo, hi = _parse_point(parts[0]), _parse_point(parts[1])
+        if lo is not None and hi is not None:
+            return TimeInterval(lo.start, hi.end)
+
+    return None
+
+
+def _coerce_date(value: Any) -> Optional[date]:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if isinstance(value, str) and value:
+        try:
+            return date.fromisoformat(value[:10])
+        except ValueError:
+            return None
+    return None
+
+
+def _as_values(raw: Any) -> List[str]:
+    if raw is None:
+        return []
+    if isinstance(raw, str):
+        raw = [raw]
+    out: List[str] = []
+    for v in raw:
+        if isinstance(v, dict):  # e.g. intake-style entity objects
+            v = v.get("text")
+        if v:
+            out.append(str(v).strip().lower())
+    return out
+
+
+# -------------------------
+# Store
+# -------------------------
+
+
+class MetadataStore:
+    """Per-value sorted ordinal arrays plus a dense date column."""
+
+    def __init__(self):
+        self._size = 0
+        self._ids: Dict[str, Dict[str, List[int]]] = {f: {} for f in FILTER_FIELDS}
+        self._dates: List[int] = []
+        # numpy views are rebuilt lazily after writes
+        self._frozen: Optional[Dict[str, Dict[str, np.ndarray]]] = None
+        self._dates_arr: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, ordinal: int, metadata: Optional[Dict[str, Any]]) -> None:
+        """Record metadata for the chunk at ``ordinal`` (ordinals must be added in order)."""
+        if ordinal != self._size:
+            raise ValueError(f"Expected ordinal {self._size}, got {ordinal}")
+        metadata = metadata or {}
+
+        for field, sources in FILTER_FIELDS.items():
+            raw = next((metadata[k] for k in sources if metadata.get(k)), None)
+            for value in set(_as_values(raw)):
+                self._ids[field].setdefault(value, []).append(ordinal)
+
+        d = next((_coerce_date(metadata[k]) for k in DATE_FIELDS if metadata.get(k)), None)
+        self._dates.append(d.toordinal() if d else _NO_DATE)
+
+        self._size += 1
+        self._frozen = None
+        self._dates_arr = None
+
+    def _freeze(self) -> None:
+        if self._frozen is None:
+            self._frozen = {
+                field: {v: np.asarray(ids, dtype=np.int64) for v, ids in values.items()}
+                for field, values in self._ids.items()
+            }
+            self._dates_arr = np.asarray(self._dates, dtype=np.int64)
+
+    def values(self, field: str) -> Iterable[str]:
+        return self._ids[field].keys()
+
+    def compile(self, filters: Optional[Dict[str, Any]]) -> Optional[np.ndarray]:
+        """Compile RoundFilters into a boolean mask over ordinals.
+
+        Returns ``None`` when the filters do not restrict anything, so callers can skip masking.
+        """
+        filters = filters or {}
+        self._freeze()
+        mask: Optional[np.ndarray] = None
+
+        for field in FILTER_FIELDS:
+            wanted = _as_values(filters.get(field))
+            if not wanted:
+                continue
+            field_mask = np.zeros(self._size, dtype=bool)
+            for value in wanted:
+                ids = self._frozen[field].get(value)
+                if ids is not None:
+                    field_mask[ids] = True
+            mask = field_mask if mask is None else (mask & field_mask)
+
+        time_range = filters.get("time_range")
+        if time_range:
+            interval = time_range if isinstance(time_range, TimeInterval) else parse_time_range(str(time_range))
+            if interval is None:
+                logger.warning(f"Ignoring unparseable time_range filter: {time_range!r}")
+            else:
+                dates = self._dates_arr
+                # Undated chunks cannot satisfy an explicit time restriction.
+                time_mask = dates != _NO_DATE
+                if interval.start is not None:
+                    time_mask &= dates >= interval.start.toordinal()
+                if interval.end is not None:
+                    time_mask &= dates <= interval.end.toordinal()
+                mask = time_mask if mask is None else (mask & time_mask)
+
+        return mask
@@ -0,0 +1,179 @@
+# src/agentic_rag/index/retriever.py
+
+from __future__ import annotations
+
+import logging
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from agentic_rag.executor.adapters import RetrieverAdapter
+from agentic_rag.executor.state import Candidate
+from agentic_rag.index.local import LocalIndex
+from agentic_rag.index.segments import SegmentedIndex
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HYBRID_ALPHA = 0.5  # weight of the vector side in hybrid scoring
+
+
+def _minmax(scores: Dict[Any, float]) -> Dict[Any, float]:
+    if not scores:
+        return {}
+    lo, hi = min(scores.values()), max(scores.values())
+    if hi <= lo:
+        return {o: 1.0 for o in scores}
+    return {o: (s - lo) / (hi - lo) for o, s in scores.items()}
+
+
+# (part index, ordinal within that part's LocalIndex)
+_Ref = Tuple[int, int]
+_Parts = List[Tuple[LocalIndex, Optional[np.ndarray]]]
+
+
+class LocalRetriever:
+    """RetrieverAdapter backed by a LocalIndex or a SegmentedIndex.
+
+    Filters are compiled once per call into an ordinal mask (MetadataStore.compile) and pushed
+    into every index, so scoring never touches filtered-out chunks. Modes the local index cannot
+    serve (vector/hybrid without embeddings) are delegated to ``fallback`` when provided.
+
+    A SegmentedIndex is searched through one snapshot per call: each segment is scored with its
+    tombstones folded into the mask and the per-segment hits are merged by score. BM25 statistics
+    are per segment, so scores drift slightly until segments are compacted.
+    """
+
+    def __init__(
+        self,
+        index: Union[LocalIndex, SegmentedIndex],
+        *,
+        embed_query: Optional[Callable[[str], Sequence[float]]] = None,
+        fallback: Optional[RetrieverAdapter] = None,
+    ):
+        self.index = index
+        self.embed_query = embed_query
+        self.fallback = fallback
+
+    @property
+    def _has_vectors(self) -> bool:
+        if isinstance(self.index, SegmentedIndex):
+            has_vectors = self.index.dim is not None
+        else:
+            has_vectors = self.index.vectors is not None
+        return has_vectors and self.embed_query is not None
+
+    def _parts(self, filters: Dict[str, Any]) -> _Parts:
+        if isinstance(self.index, SegmentedIndex):
+            return self.index.snapshot().parts(filters)
+        return [(self.index, self.index.metadata.compile(filters))]
+
+    def _candidates(
+        self,
+        parts: _Parts,
+        refs: List[_Ref],
+        bm25: Dict[_Ref, Tuple[int, float]],
+        vector: Dict[_Ref, Tuple[int, float]],
+    ) -> List[Candidate]:
+        out: List[Candidate] = []
+        for ref in refs:
+            literal = parts[ref[0]][0].literal
+            o = ref[1]
+            b, v = bm25.get(ref), vector.get(ref)
+            out.append(
+                Candidate(
+                    key=literal.key(o),
+                    text=literal.text(o),
+                    metadata=dict(literal.metadata(o)),
+                    bm25_rank=b[0] if b else None,
+                    bm25_score=b[1] if b else None,
+                    vector_rank=v[0] if v else None,
+                    vector_score=v[1] if v else None,
+                )
+            )
+        return out
+
+    def _ranked(self, hits: List[Tuple[_Ref, float]], k: int) -> Dict[_Ref, Tuple[int, float]]:
+        hits = sorted(hits, key=lambda h: (-h[1], h[0]))[:k]
+        return {ref: (rank, score) for rank, (ref, score) in enumerate(hits, start=1)}
+
+    def _exact(self, parts: _Parts, term: str, k: int) -> List[Candidate]:
+        hits = [
+            ((i, o), count)
+            for i, (index, mask) in enumerate(parts)
+            for o, count in index.literal.lookup(term, k, mask)
+        ]
+        hits.sort(key=lambda h: (-h[1], h[0]))
+        out: List[Candidate] = []
+        for rank, ((i, o), count) in enumerate(hits[:k], start=1):
+            literal = parts[i][0].literal
+            out.append(
+                Candidate(
+                    key=literal.key(o),
+                    text=literal.text(o),
+                    metadata=dict(literal.metadata(o)),
+                    exact_score=float(count),
+                    exact_rank=rank,
+                )
+            )
+        return out
+
+    def _bm25(self, parts: _Parts, query: str, k: int) -> Dict[_Ref, Tuple[int, float]]:
+        hits = [
+            ((i, o), s) for i, (index, mask) in enumerate(parts) for o, s in index.bm25.search(query, k, mask=mask)
+        ]
+        return self._ranked(hits, k)
+
+    def _vector(self, parts: _Parts, qvec: Sequence[float], k: int) -> Dict[_Ref, Tuple[int, float]]:
+        hits = [
+            ((i, o), s)
+            for i, (index, mask) in enumerate(parts)
+            if index.vectors is not None
+            for o, s in index.vectors.search(qvec, k, mask=mask)
+        ]
+        return self._ranked(hits, k)
+
+    def search(
+        self,
+        *,
+        query: str,
+        mode: str,
+        k: int,
+        alpha: Optional[float],
+        filters: Dict[str, Any],
+    ) -> List[Candidate]:
+        needs_vectors = mode in ("vector", "hybrid")
+        if needs_vectors and not self._has_vectors and self.fallback is not None:
+            return self.fallback.search(query=query, mode=mode, k=k, alpha=alpha, filters=filters)
+        if mode == "vector" and not self._has_vectors:
+            raise NotImplementedError("Vector search needs an index built with vectors and an embed_query function")
+        if mode not in ("exact", "bm25", "vector", "hybrid"):
+            raise ValueError(f"Unknown retrieval mode: {mode}")
+
+        parts = self._parts(filters)
+
+        if mode == "exact":
+            return self._exact(parts, query, k)
+
+        if mode == "bm25" or (mode == "hybrid" and not self._has_vectors):
+            if mode == "hybrid":
+                logger.info("Hybrid requested without local vectors; serving bm25 only")
+            bm25 = self._bm25(parts, query, k)
+            return self._candidates(parts, list(bm25), bm25, {})
+
+        qvec = self.embed_query(query)
+        if mode == "vector":
+            vector = self._vector(parts, qvec, k)
+            return self._candidates(parts, list(vector), {}, vector)
+
+        # hybrid: min-max normalised weighted sum over a wider pool from each side
+        pool = k * 2
+        bm25 = self._bm25(parts, query, pool)
+        vector = self._vector(parts, qvec, pool)
+        w = DEFAULT_HYBRID_ALPHA if alpha is None else float(alpha)
+        b_norm = _minmax({ref: s for ref, (_, s) in bm25.items()})
+        v_norm = _minmax({ref: s for ref, (_, s) in vector.items()})
+        combined = {
+            ref: w * v_norm.get(ref, 0.0) + (1.0 - w) * b_norm.get(ref, 0.0) for ref in set(bm25) | set(vector)
+        }
+        refs = sorted(combined, key=lambda ref: (-combined[ref], ref))[:k]
+        return self._candidates(parts, refs, bm25, vector)
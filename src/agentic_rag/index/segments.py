@@ -0,0 +1,477 @@
+# src/agentic_rag/index/segments.py
+"""Append-only segmented index with doc-level upserts, deletes and compaction.
+
+Every write (upsert/delete batch) produces at most one new immutable segment (a LocalIndex)
+and marks superseded chunks in older segments with tombstones. Readers take a
+``SegmentSnapshot``: an immutable tuple of segments with their tombstone bitsets at one point in
+time. Writers never mutate a published snapshot (tombstones are copy-on-write), so queries keep
+running against a consistent view while updates and compaction proceed.
+
+Compaction merges live rows of all current segments into one segment. The merge (and saving the
+merged segment) runs outside the writer lock; when it is installed, deletes that landed during the
+merge are re-applied to the merged segment and segments written during the merge are kept after it.
+
+On disk (when ``path`` is set)::
+
+    segments.json               commit point: live segments and their tombstone files
+    seg-000001/                 one save_index directory per segment
+    seg-000001/tombstones-<generation>.npy
+
+``segments.json`` is replaced atomically after the new segment and tombstone files are written,
+so a crash leaves either the old or the new commit, never a mix.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import shutil
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
+
+import numpy as np
+
+from agentic_rag.executor.state import CandidateKey
+from agentic_rag.index.literal import DEFAULT_NGRAM
+from agentic_rag.index.local import LocalIndex
+from agentic_rag.index.storage import load_index, save_index, write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+SEGMENTS_FILE = "segments.json"
+SEGMENTS_FORMAT_VERSION = 1
+
+DEFAULT_MAX_SEGMENTS = 8
+DEFAULT_MAX_DELETED_RATIO = 0.3
+
+# (chunk_id, text, metadata, vector); vector is required iff the index has dim
+ChunkInput = Tuple[str, str, Optional[Dict[str, Any]], Optional[Sequence[float]]]
+
+PathLike = Union[str, Path]
+
+
+@dataclass(frozen=True)
+class Segment:
+    """One immutable LocalIndex plus the tombstones visible in a given snapshot."""
+
+    seg_id: int
+    index: LocalIndex
+    tombstones: np.ndarray  # bool[len(index)], read-only; True = deleted
+
+    @property
+    def deleted(self) -> int:
+        return int(self.tombstones.sum())
+
+    @property
+    def live(self) -> int:
+        return len(self.index) - self.deleted
+
+    def live_mask(self, mask: Optional[np.ndarray]) -> Optional[np.ndarray]:
+        """Combine a filter mask with this segment's tombstones (``None`` = everything allowed)."""
+        if not self.tombstones.any():
+            return mask
+        alive = ~self.tombstones
+        return alive if mask is None else (mask & alive)
+
+
+@dataclass(frozen=True)
+class SegmentSnapshot:
+    """Point-in-time view of a SegmentedIndex, safe to query while writers proceed."""
+
+    generation: int
+    segments: Tuple[Segment, ...]
+    dim: Optional[int]
+
+    def __len__(self) -> int:
+        return sum(s.live for s in self.segments)
+
+    def parts(self, filters: Optional[Dict[str, Any]]) -> List[Tuple[LocalIndex, Optional[np.ndarray]]]:
+        """``(index, mask)`` pairs to search, with filters compiled and tombstones applied."""
+        out: List[Tuple[LocalIndex, Optional[np.ndarray]]] = []
+        for seg in self.segments:
+            if seg.live == 0:
+                continue
+            out.append((seg.index, seg.live_mask(seg.index.metadata.compile(filters))))
+        return out
+
+
+def _frozen(arr: np.ndarray) -> np.ndarray:
+    arr.setflags(write=False)
+    return arr
+
+
+def _seg_dir(seg_id: int) -> str:
+    return f"seg-{seg_id:06d}"
+
+
+class SegmentedIndex:
+    """Doc-addressed index supporting ``upsert``/``delete`` without rebuilding the corpus.
+
+    Args:
+        path: Directory to persist segments in; ``None`` keeps everything in memory.
+        dim: Embedding dimension (``None`` for an index without vectors).
+        literal_ngram: n-gram size for each segment's LiteralIndex.
+        max_segments: Compact once more segments than this exist.
+        max_deleted_ratio: Compact once this fraction of stored chunks is tombstoned.
+        auto_compact: Schedule background compaction after writes when a threshold is crossed.
+    """
+
+    def __init__(
+        self,
+        path: Optional[PathLike] = None,
+        *,
+        dim: Optional[int] = None,
+        literal_ngram: int = DEFAULT_NGRAM,
+        max_segments: int = DEFAULT_MAX_SEGMENTS,
+        max_deleted_ratio: float = DEFAULT_MAX_DELETED_RATIO,
+        auto_compact: bool = True,
+    ):
+        self.path = Path(path) if path is not None else None
+        self.dim = dim
+        self.literal_ngram = literal_ngram
+        self.max_segments = max_segments
+        self.max_deleted_ratio = max_deleted_ratio
+        self.auto_compact = auto_compact
+
+        self._lock = threading.Lock()
+        self._compact_lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: Optional[Future] = None
+
+        self._next_seg_id = 1
+        # seg_ids reserved for segments still being written outside the lock (not orphans yet)
+        self._building: Set[int] = set()
+        # doc_id -> [(seg_id, ordinal)] of its live chunks; updated per write, rebuilt on load/compaction
+        self._live: Dict[str, List[Tuple[int, int]]] = {}
+        # seg_id -> (committed tombstone file, the array it holds) to skip rewriting unchanged ones
+        self._tombstone_files: Dict[int, Tuple[str, np.ndarray]] = {}
+        self._committed_ids: List[int] = []
+        self._snapshot = SegmentSnapshot(generation=0, segments=(), dim=dim)
+
+        if self.path is not None:
+            if (self.path / SEGMENTS_FILE).exists():
+                self._load()
+            else:
+                self.path.mkdir(parents=True, exist_ok=True)
+                self._commit(self._snapshot)
+
+    # -------------------------
+    # Construction
+    # -------------------------
+
+    @classmethod
+    def open(cls, path: PathLike, **kwargs: Any) -> "SegmentedIndex":
+        """Open an existing segmented index directory."""
+        if not (Path(path) / SEGMENTS_FILE).exists():
+            raise FileNotFoundError(f"No {SEGMENTS_FILE} in {path}")
+        return cls(path, **kwargs)
+
+    @classmethod
+    def from_index(cls, index: LocalIndex, path: Optional[PathLike] = None, **kwargs: Any) -> "SegmentedIndex":
+        """Adopt a bulk-built LocalIndex (e.g. from the ingestion pipeline) as the first segment."""
+        dim = index.vectors.dim if index.vectors is not None else None
+        seg_index = cls(path, dim=dim, literal_ngram=index.literal.n, **kwargs)
+        if len(seg_index.snapshot().segments):
+            raise ValueError(f"Segmented index at {path} is not empty")
+        with seg_index._lock:
+            seg = seg_index._new_segment(index)
+            seg_index._publish(seg_index._snapshot.segments + (seg,))
+            seg_index._add_live(seg)
+        return seg_index
+
+    def _load(self) -> None:
+        with (self.path / SEGMENTS_FILE).open("r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("format_version") != SEGMENTS_FORMAT_VERSION:
+            raise ValueError(f"Unsupported segments format_version={manifest.get('format_version')} at {self.path}")
+
+        self.dim = manifest.get("dim")
+        self.literal_ngram = int(manifest.get("literal_ngram", self.literal_ngram))
+        self._next_seg_id = int(manifest["next_seg_id"])
+
+        segments: List[Segment] = []
+        for entry in manifest["segments"]:
+            seg_path = self.path / _seg_dir(entry["id"])
+            index = load_index(seg_path)
+            if entry.get("tombstones"):
+                tombstones = _frozen(np.load(seg_path / entry["tombstones"]))
+                self._tombstone_files[int(entry["id"])] = (entry["tombstones"], tombstones)
+            else:
+                tombstones = _frozen(np.zeros(len(index), dtype=bool))
+            segments.append(Segment(seg_id=int(entry["id"]), index=index, tombstones=tombstones))
+
+        self._snapshot = SegmentSnapshot(
+            generation=int(manifest["generation"]), segments=tuple(segments), dim=self.dim
+        )
+        self._rebuild_live()
+        self._committed_ids = [seg.seg_id for seg in segments]
+        self._remove_orphans()
+
+    # -------------------------
+    # Reads
+    # -------------------------
+
+    def snapshot(self) -> SegmentSnapshot:
+        """Current consistent view; hold on to it for the duration of one query."""
+        return self._snapshot
+
+    def __len__(self) -> int:
+        return len(self._snapshot)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._live
+
+    def doc_ids(self) -> List[str]:
+        with self._lock:  # _live is updated in place by writers
+            return sorted(self._live)
+
+    # -------------------------
+    # Writes
+    # -------------------------
+
+    def upsert(self, doc_id: str, chunks: Iterable[ChunkInput]) -> int:
+        """Replace all chunks of ``doc_id``; returns the new generation."""
+        return self.apply(upserts={doc_id: chunks})
+
+    def delete(self, doc_id: str) -> int:
+        """Tombstone all chunks of ``doc_id`` (no-op if unknown); returns the new generation."""
+        return self.apply(deletes=[doc_id])
+
+    def apply(
+        self,
+        *,
+        upserts: Optional[Dict[str, Iterable[ChunkInput]]] = None,
+        deletes: Iterable[str] = (),
+    ) -> int:
+        """Apply a batch of doc upserts and deletes as one segment + one commit."""
+        upserts = upserts or {}
+        new_index: Optional[LocalIndex] = None
+        if upserts:
+            # Build outside the lock; segments are private until published.
+            new_index = LocalIndex(dim=self.dim, literal_ngram=self.literal_ngram)
+            for doc_id, chunks in upserts.items():
+                for chunk_id, text, metadata, vector in chunks:
+                    new_index.add(CandidateKey(doc_id=doc_id, chunk_id=chunk_id), text, metadata, vector)
+
+        with self._lock:
+            doc_ids = set(upserts) | set(deletes)
+            segments = self._tombstone_docs(doc_ids)
+            seg = self._new_segment(new_index) if new_index is not None and len(new_index) else None
+            if seg is not None:
+                segments = segments + (seg,)
+            generation = self._publish(segments)
+            # Every live chunk of these docs was just tombstoned; the new segment holds their replacements.
+            for doc_id in doc_ids:
+                self._live.pop(doc_id, None)
+            if seg is not None:
+                self._add_live(seg)
+
+        self._maybe_schedule_compaction()
+        return generation
+
+    def _tombstone_docs(self, doc_ids: Iterable[str]) -> Tuple[Segment, ...]:
+        by_seg: Dict[int, List[int]] = {}
+        for doc_id in doc_ids:
+            for seg_id, ordinal in self._live.get(doc_id, ()):
+                by_seg.setdefault(seg_id, []).append(ordinal)
+        if not by_seg:
+            return self._snapshot.segments
+
+        out: List[Segment] = []
+        for seg in self._snapshot.segments:
+            ordinals = by_seg.get(seg.seg_id)
+            if ordinals:
+                tombstones = seg.tombstones.copy()
+                tombstones[ordinals] = True
+                seg = Segment(seg_id=seg.seg_id, index=seg.index, tombstones=_frozen(tombstones))
+            out.append(seg)
+        return tuple(out)
+
+    def _new_segment(self, index: LocalIndex, seg_id: Optional[int] = None) -> Segment:
+        """Save ``index`` as a segment.
+
+        Without ``seg_id`` the caller holds ``_lock``. A ``seg_id`` from ``_reserve_seg_id`` lets the
+        save run outside the lock; the caller releases the reservation once the segment is published.
+        """
+        if seg_id is None:
+            seg_id = self._next_seg_id
+            self._next_seg_id += 1
+        if self.path is not None:
+            save_index(index, self.path / _seg_dir(seg_id))
+        return Segment(seg_id=seg_id, index=index, tombstones=_frozen(np.zeros(len(index), dtype=bool)))
+
+    def _reserve_seg_id(self) -> int:
+        """Allocate a segment id whose directory orphan cleanup leaves alone. Caller holds ``_lock``."""
+        seg_id = self._next_seg_id
+        self._next_seg_id += 1
+        self._building.add(seg_id)
+        return seg_id
+
+    def _publish(self, segments: Tuple[Segment, ...]) -> int:
+        """Commit and swap in a new snapshot. Caller holds ``_lock`` and updates ``_live``."""
+        snapshot = SegmentSnapshot(generation=self._snapshot.generation + 1, segments=segments, dim=self.dim)
+        if self.path is not None:
+            self._commit(snapshot)
+        self._snapshot = snapshot
+        return snapshot.generation
+
+    def _add_live(self, seg: Segment) -> None:
+        """Index the live chunks of a newly published segment in ``_live``."""
+        keys = seg.index.literal
+        for ordinal in np.flatnonzero(~seg.tombstones).tolist():
+            self._live.setdefault(keys.key(ordinal).doc_id, []).append((seg.seg_id, ordinal))
+
+    def _rebuild_live(self) -> None:
+        live: Dict[str, List[Tuple[int, int]]] = {}
+        for seg in self._snapshot.segments:
+            keys = seg.index.literal
+            for ordinal in np.flatnonzero(~seg.tombstones).tolist():
+                live.setdefault(keys.key(ordinal).doc_id, []).append((seg.seg_id, ordinal))
+        self._live = live
+
+    # -------------------------
+    # Persistence
+    # -------------------------
+
+    def _commit(self, snapshot: SegmentSnapshot) -> None:
+        entries = []
+        tombstone_files: Dict[int, Tuple[str, np.ndarray]] = {}
+        for seg in snapshot.segments:
+            tomb_file = None
+            if seg.tombstones.any():
+                prev = self._tombstone_files.get(seg.seg_id)
+                if prev is not None and prev[1] is seg.tombstones:
+                    tomb_file = prev[0]
+                else:
+                    tomb_file = f"tombstones-{snapshot.generation}.npy"
+                    seg_path = self.path / _seg_dir(seg.seg_id)
+                    tmp = seg_path / (tomb_file + ".tmp")
+                    with tmp.open("wb") as f:
+                        np.save(f, seg.tombstones)
+                        f.flush()
+                        os.fsync(f.fileno())
+                    os.replace(tmp, seg_path / tomb_file)
+                tombstone_files[seg.seg_id] = (tomb_file, seg.tombstones)
+            entries.append({"id": seg.seg_id, "count": len(seg.index), "tombstones": tomb_file})
+
+        write_json_atomic(
+            self.path / SEGMENTS_FILE,
+            {
+                "format_version": SEGMENTS_FORMAT_VERSION,
+                "generation": snapshot.generation,
+                "next_seg_id": self._next_seg_id,
+                "dim": self.dim,
+                "literal_ngram": self.literal_ngram,
+                "segments": entries,
+            },
+        )
+        self._tombstone_files = tombstone_files
+        self._committed_ids = [seg.seg_id for seg in snapshot.segments]
+        self._remove_orphans()
+
+    def _remove_orphans(self) -> None:
+        """Delete segment directories and tombstone files no longer referenced by the commit point.
+
+        Called with the writer lock held (or before the index is shared). Segments being written
+        outside the lock (reserved in ``_building``) are skipped.
+        """
+        live = {_seg_dir(seg_id): self._tombstone_files.get(seg_id, (None,))[0] for seg_id in self._committed_ids}
+        building = {_seg_dir(seg_id) for seg_id in self._building}
+        for child in self.path.iterdir():
+            if not child.is_dir() or not child.name.startswith("seg-") or child.name in building:
+                continue
+            if child.name not in live:
+                shutil.rmtree(child, ignore_errors=True)
+                continue
+            for f in child.glob("tombstones-*.npy*"):
+                if f.name != live[child.name]:
+                    f.unlink(missing_ok=True)
+
+    # -------------------------
+    # Compaction
+    # -------------------------
+
+    def needs_compaction(self) -> bool:
+        segments = self._snapshot.segments
+        if len(segments) > self.max_segments:
+            return True
+        stored = sum(len(s.index) for s in segments)
+        deleted = sum(s.deleted for s in segments)
+        return bool(stored) and deleted / stored > self.max_deleted_ratio
+
+    def _maybe_schedule_compaction(self) -> None:
+        if self.auto_compact and self.needs_compaction():
+            self.compact_in_background()
+
+    def compact_in_background(self) -> Future:
+        """Schedule ``compact()`` on a background thread; returns the pending Future."""
+        with self._lock:
+            if self._pending is not None and not self._pending.done():
+                return self._pending
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="index-compaction")
+            self._pending = self._executor.submit(self.compact)
+            return self._pending
+
+    def compact(self) -> int:
+        """Merge all current segments into one, dropping tombstoned chunks; returns the new generation."""
+        with self._compact_lock:
+            base = self._snapshot
+            if len(base.segments) <= 1 and not any(s.deleted for s in base.segments):
+                return base.generation
+
+            merged = LocalIndex(dim=self.dim, literal_ngram=self.literal_ngram)
+            origin: List[Tuple[int, np.ndarray]] = []  # (seg_id, ordinals) in merged order
+            for seg in base.segments:
+                literal = seg.index.literal
+                matrix = seg.index.vectors.to_matrix() if seg.index.vectors is not None else None
+                ordinals = np.flatnonzero(~seg.tombstones)
+                for o in ordinals.tolist():
+                    merged.add(
+                        literal.key(o),
+                        literal.text(o),
+                        literal.metadata(o),
+                        matrix[o] if matrix is not None else None,
+                    )
+                origin.append((seg.seg_id, ordinals))
+            compacted_ids = {s.seg_id for s in base.segments}
+
+            # Save the merged segment before taking the writer lock; the reservation keeps
+            # concurrent commits from removing its directory as an orphan.
+            seg: Optional[Segment] = None
+            seg_id: Optional[int] = None
+            try:
+                if len(merged):
+                    with self._lock:
+                        seg_id = self._reserve_seg_id()
+                    seg = self._new_segment(merged, seg_id)
+
+                with self._lock:
+                    if seg is not None:
+                        # Deletes that landed while merging: carry them over to the merged rows.
+                        current = {s.seg_id: s for s in self._snapshot.segments}
+                        tombstones = np.concatenate(
+                            [current[src_id].tombstones[ordinals] for src_id, ordinals in origin]
+                        )
+                        if tombstones.any():
+                            seg = Segment(seg_id=seg.seg_id, index=seg.index, tombstones=_frozen(tombstones))
+                    newer = tuple(s for s in self._snapshot.segments if s.seg_id not in compacted_ids)
+                    generation = self._publish(((seg,) if seg is not None else ()) + newer)
+                    self._rebuild_live()
+            finally:
+                if seg_id is not None:
+                    with self._lock:
+                        self._building.discard(seg_id)
+
+            logger.info(f"Compacted {len(compacted_ids)} segments into {len(merged)} chunks (generation {generation})")
+            return generation
+
+    def close(self) -> None:
+        """Wait for pending background compaction and release the worker thread."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
@@ -0,0 +1,126 @@
+# src/agentic_rag/index/storage.py
+"""On-disk layout of a LocalIndex.
+
+An index directory contains:
+- ``chunks.jsonl``: one ``{"doc_id", "chunk_id", "text", "metadata"}`` record per ordinal
+- ``vectors.f32``: little-endian float32 rows, ``dim`` values per ordinal (absent without vectors)
+- ``bm25.npz``: BM25 postings in CSR form, terms as a UTF-8 blob plus offsets (see BM25Index.to_arrays)
+- ``manifest.json``: format version, counts and build parameters; written last
+
+Literal and metadata indexes are rebuilt from ``chunks.jsonl`` on load; both are cheap relative
+to embedding and avoid a second copy of the chunk text.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple, Union
+
+import numpy as np
+
+from agentic_rag.executor.state import CandidateKey
+from agentic_rag.index.bm25 import BM25Index
+from agentic_rag.index.local import LocalIndex
+from agentic_rag.index.vector import VectorIndex
+
+CHUNKS_FILE = "chunks.jsonl"
+VECTORS_FILE = "vectors.f32"
+BM25_FILE = "bm25.npz"
+MANIFEST_FILE = "manifest.json"
+FORMAT_VERSION = 1
+
+PathLike = Union[str, Path]
+
+
+def chunk_record(key: CandidateKey, text: str, metadata: Optional[Dict[str, Any]]) -> str:
+    """Serialize one chunk as a JSONL line (newline included)."""
+    return (
+        json.dumps(
+            {"doc_id": key.doc_id, "chunk_id": key.chunk_id, "text": text, "metadata": metadata or {}},
+            ensure_ascii=False,
+        )
+        + "\n"
+    )
+
+
+def iter_chunk_records(path: PathLike) -> Iterator[Tuple[CandidateKey, str, Dict[str, Any]]]:
+    with Path(path).open("r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            rec = json.loads(line)
+            yield CandidateKey(doc_id=rec["doc_id"], chunk_id=rec["chunk_id"]), rec["text"], rec.get("metadata") or {}
+
+
+def write_json_atomic(path: PathLike, payload: Dict[str, Any]) -> None:
+    path = Path(path)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2, sort_keys=True)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def read_manifest(path: PathLike) -> Dict[str, Any]:
+    with (Path(path) / MANIFEST_FILE).open("r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("format_version") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported index format_version={manifest.get('format_version')} at {path}")
+    return manifest
+
+
+def save_index(index: LocalIndex, path: PathLike, *, extra: Optional[Dict[str, Any]] = None) -> None:
+    """Write ``index`` to ``path`` (created if missing)."""
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+
+    with (path / CHUNKS_FILE).open("w", encoding="utf-8") as f:
+        for o in range(len(index)):
+            f.write(chunk_record(index.literal.key(o), index.literal.text(o), index.literal.metadata(o)))
+
+    if index.vectors is not None:
+        np.asarray(index.vectors.to_matrix(), dtype="<f4").tofile(path / VECTORS_FILE)
+
+    np.savez(path / BM25_FILE, **index.bm25.to_arrays())
+
+    write_json_atomic(
+        path / MANIFEST_FILE,
+        {
+            "format_version": FORMAT_VERSION,
+            "count": len(index),
+            "dim": index.vectors.dim if index.vectors is not None else None,
+            "literal_ngram": index.literal.n,
+            **(extra or {}),
+        },
+    )
+
+
+def load_index(path: PathLike, *, mmap_vectors: bool = True) -> LocalIndex:
+    """Load an index written by ``save_index`` or the ingestion pipeline."""
+    path = Path(path)
+    manifest = read_manifest(path)
+    count = int(manifest["count"])
+    dim = manifest.get("dim")
+
+    index = LocalIndex(dim=None, literal_ngram=int(manifest.get("literal_ngram", 3)))
+    for key, text, metadata in iter_chunk_records(path / CHUNKS_FILE):
+        ordinal = index.literal.add(key, text, metadata)
+        index.metadata.add(ordinal, metadata)
+    if len(index) != count:
+        raise ValueError(f"Index at {path} is inconsistent: manifest count={count}, chunks={len(index)}")
+
+    with np.load(path / BM25_FILE) as arrays:
+        index.bm25 = BM25Index.from_arrays(dict(arrays))
+
+    if dim:
+        vectors_path = path / VECTORS_FILE
+        if mmap_vectors and count:
+            matrix = np.memmap(vectors_path, dtype="<f4", mode="r", shape=(count, int(dim)))
+        else:
+            matrix = np.fromfile(vectors_path, dtype="<f4").reshape(-1, int(dim))[:count]
+        index.vectors = VectorIndex.from_matrix(matrix)
+
+    return index
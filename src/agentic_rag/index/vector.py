@@ -0,0 +1,90 @@
+# src/agentic_rag/index/vector.py
+"""In-process dense vector index (exact cosine similarity)."""
+
+from __future__ import annotations
+
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+def _normalize(mat: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(mat, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return mat / norms
+
+
+class VectorIndex:
+    """Row ``i`` holds the embedding of chunk ordinal ``i``.
+
+    Brute-force cosine over a float32 matrix. With a mask, only allowed rows are scored.
+    A matrix passed to ``from_matrix`` (e.g. a memory-mapped vectors file) is kept as is: rows are
+    never copied into Python lists or restacked, and cosine uses cached row norms instead of a
+    normalised copy.
+    """
+
+    def __init__(self, dim: int):
+        if dim < 1:
+            raise ValueError("dim must be >= 1")
+        self.dim = dim
+        self._base = np.zeros((0, dim), dtype=np.float32)  # adopted matrix (possibly memmapped)
+        self._rows: List[np.ndarray] = []  # rows added after it
+        self._norms: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return self._base.shape[0] + len(self._rows)
+
+    def add(self, ordinal: int, vector: Sequence[float]) -> None:
+        if ordinal != len(self):
+            raise ValueError(f"Expected ordinal {len(self)}, got {ordinal}")
+        row = np.asarray(vector, dtype=np.float32).reshape(-1)
+        if row.shape[0] != self.dim:
+            raise ValueError(f"Expected vector of dim {self.dim}, got {row.shape[0]}")
+        self._rows.append(row)
+        self._norms = None
+
+    @classmethod
+    def from_matrix(cls, matrix: np.ndarray) -> "VectorIndex":
+        """Build from an ``(n, dim)`` matrix (e.g. a memory-mapped vectors file) without copying it."""
+        index = cls(dim=int(matrix.shape[1]))
+        index._base = matrix if matrix.dtype == np.float32 else matrix.astype(np.float32)
+        return index
+
+    def to_matrix(self) -> np.ndarray:
+        """Raw (unnormalised) ``(n, dim)`` float32 matrix in ordinal order."""
+        if self._rows:
+            self._base = np.vstack([self._base, *self._rows])
+            self._rows = []
+        return self._base
+
+    def _freeze(self) -> Tuple[np.ndarray, np.ndarray]:
+        matrix = self.to_matrix()
+        if self._norms is None:
+            norms = np.linalg.norm(matrix, axis=-1)
+            norms[norms == 0] = 1.0
+            self._norms = norms
+        return matrix, self._norms
+
+    def search(
+        self, query_vector: Sequence[float], k: int, mask: Optional[np.ndarray] = None
+    ) -> List[Tuple[int, float]]:
+        """Return up to ``k`` ``(ordinal, cosine)`` pairs, best first."""
+        matrix, norms = self._freeze()
+        if matrix.shape[0] == 0 or k <= 0:
+            return []
+        q = _normalize(np.asarray(query_vector, dtype=np.float32).reshape(-1))
+
+        if mask is not None:
+            rows = np.flatnonzero(mask[: matrix.shape[0]])
+            if rows.size == 0:
+                return []
+            sims = (matrix[rows] @ q) / norms[rows]
+        else:
+            rows = np.arange(matrix.shape[0])
+            sims = (matrix @ q) / norms
+
+        if rows.size > k:
+            top = np.argpartition(-sims, k - 1)[:k]
+            rows, sims = rows[top], sims[top]
+        order = np.lexsort((rows, -sims))
+        return [(int(rows[i]), float(sims[i])) for i in order]
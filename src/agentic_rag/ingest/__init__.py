@@ -0,0 +1,20 @@
+"""Offline ingestion pipeline: stream documents, chunk, embed and write a LocalIndex directory.
+
+Run with ``python -m agentic_rag.ingest --source <dir|file.jsonl> --out <index_dir>``.
+"""
+
+from agentic_rag.ingest.chunking import Chunk, chunk_document
+from agentic_rag.ingest.loaders import Document, iter_documents
+from agentic_rag.ingest.pipeline import IngestConfig, IngestReport, run_ingest
+from agentic_rag.ingest.writer import IndexWriter
+
+__all__ = [
+    "Chunk",
+    "Document",
+    "IndexWriter",
+    "IngestConfig",
+    "IngestReport",
+    "chunk_document",
+    "iter_documents",
+    "run_ingest",
+]
@@ -0,0 +1,3 @@
+from agentic_rag.ingest.cli import main
+
+main()
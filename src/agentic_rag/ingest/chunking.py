@@ -0,0 +1,85 @@
+# src/agentic_rag/ingest/chunking.py
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+from agentic_rag.executor.state import CandidateKey
+from agentic_rag.ingest.loaders import Document
+
+DEFAULT_CHUNK_CHARS = 1200
+DEFAULT_CHUNK_OVERLAP = 150
+
+# Preferred split points, strongest first
+_BOUNDARIES = ("\n\n", "\n", ". ", " ")
+
+
+@dataclass
+class Chunk:
+    key: CandidateKey
+    text: str
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+
+def chunk_id_for(index: int) -> str:
+    """Positional chunk id; stable as long as the document text and chunking params are unchanged."""
+    return f"c{index:04d}"
+
+
+def _snap_end(text: str, start: int, end: int) -> int:
+    if end >= len(text):
+        return len(text)
+    floor = start + (end - start) // 2
+    for sep in _BOUNDARIES:
+        cut = text.rfind(sep, floor, end)
+        if cut != -1:
+            return cut + len(sep)
+    return end
+
+
+def chunk_document(
+    doc: Document, *, max_chars: int = DEFAULT_CHUNK_CHARS, overlap: int = DEFAULT_CHUNK_OVERLAP
+) -> List[Chunk]:
+    """Split a document into overlapping character windows snapped to paragraph/sentence boundaries.
+
+    Each chunk carries the document metadata plus ``chunk_index``, ``char_start`` and ``char_end``
+    (offsets into the original document text).
+    """
+    if max_chars < 1:
+        raise ValueError("max_chars must be >= 1")
+    overlap = max(0, min(overlap, max_chars // 2))
+    text = doc.text
+
+    chunks: List[Chunk] = []
+    start = 0
+    while start < len(text):
+        end = _snap_end(text, start, min(start + max_chars, len(text)))
+
+        # Trim whitespace but keep offsets pointing at the original text
+        lo, hi = start, end
+        while lo < hi and text[lo].isspace():
+            lo += 1
+        while hi > lo and text[hi - 1].isspace():
+            hi -= 1
+
+        if hi > lo:
+            i = len(chunks)
+            chunks.append(
+                Chunk(
+                    key=CandidateKey(doc_id=doc.doc_id, chunk_id=chunk_id_for(i)),
+                    text=text[lo:hi],
+                    metadata={**doc.metadata, "chunk_index": i, "char_start": lo, "char_end": hi},
+                )
+            )
+
+        if end >= len(text):
+            break
+        next_start = end - overlap
+        if overlap:
+            # restart on a word boundary inside the overlap window
+            space = text.find(" ", next_start, end)
+            next_start = space + 1 if space != -1 else next_start
+        start = max(next_start, start + 1)
+
+    return chunks
@@ -0,0 +1,60 @@
+# src/agentic_rag/ingest/cli.py
+
+import argparse
+import logging
+
+from agentic_rag.embeddings.batching import DEFAULT_MAX_BATCH_TOKENS
+from agentic_rag.ingest.chunking import DEFAULT_CHUNK_CHARS, DEFAULT_CHUNK_OVERLAP
+from agentic_rag.ingest.pipeline import IngestConfig, run_ingest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build a local retrieval index (chunks, BM25, vectors).")
+    parser.add_argument("--source", required=True, help="Directory of text/markdown files or a .jsonl file")
+    parser.add_argument("--out", required=True, help="Index output directory")
+    parser.add_argument(
+        "--embedder",
+        default="hashing",
+        help="Embeddings spec: 'hashing[:dim]', '<provider>:<model>' (e.g. openai:text-embedding-3-small), or 'none'",
+    )
+    parser.add_argument("--chunk-chars", type=int, default=DEFAULT_CHUNK_CHARS, help="Max characters per chunk")
+    parser.add_argument("--chunk-overlap", type=int, default=DEFAULT_CHUNK_OVERLAP, help="Overlap between chunks")
+    parser.add_argument("--batch-docs", type=int, default=16, help="Documents per worker task")
+    parser.add_argument("--embed-batch-size", type=int, default=64, help="Texts per embedding call")
+    parser.add_argument(
+        "--embed-batch-tokens", type=int, default=DEFAULT_MAX_BATCH_TOKENS, help="Est. tokens per call"
+    )
+    parser.add_argument("--embed-cache", default=None, help="SQLite embedding cache file (skips unchanged chunks)")
+    parser.add_argument("--workers", type=int, default=0, help="Worker processes (0 = inline)")
+    parser.add_argument("--max-in-flight", type=int, default=0, help="Max batches in flight (default 2 * workers)")
+    parser.add_argument("--resume", action="store_true", help="Resume from the last checkpoint in --out")
+    parser.add_argument("--log-level", default="INFO", help="Logging level")
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=args.log_level.upper(), format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    report = run_ingest(
+        IngestConfig(
+            source=args.source,
+            out=args.out,
+            embedder=None if args.embedder.lower() == "none" else args.embedder,
+            chunk_chars=args.chunk_chars,
+            chunk_overlap=args.chunk_overlap,
+            batch_docs=args.batch_docs,
+            embed_batch_size=args.embed_batch_size,
+            embed_batch_tokens=args.embed_batch_tokens,
+            embed_cache=args.embed_cache,
+            workers=args.workers,
+            max_in_flight=args.max_in_flight,
+            resume=args.resume,
+        )
+    )
+
+    print(
+        f"Indexed {report.docs} docs ({report.skipped_docs} resumed) into {report.chunks} chunks, "
+        f"dim={report.dim}, in {report.elapsed_s:.1f}s -> {args.out}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# src/agentic_rag/ingest/loaders.py
+
+from __future__ import annotations
+
+import json
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, Union
+
+logger = logging.getLogger(__name__)
+
+TEXT_SUFFIXES = (".md", ".markdown", ".txt", ".rst")
+
+
+@dataclass
+class Document:
+    doc_id: str
+    text: str
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+
+def _title_from_text(text: str, fallback: str) -> str:
+    for line in text.splitlines():
+        line = line.strip()
+        if line:
+            return line.lstrip("#").strip() or fallback
+    return fallback
+
+
+def iter_directory(root: Union[str, Path]) -> Iterator[Document]:
+    """Yield text documents under ``root`` in sorted path order (stable across runs).
+
+    ``doc_id`` is the POSIX path relative to ``root``.
+    """
+    root = Path(root)
+    for path in sorted(p for p in root.rglob("*") if p.is_file() and p.suffix.lower() in TEXT_SUFFIXES):
+        rel = path.relative_to(root).as_posix()
+        try:
+            text = path.read_text(encoding="utf-8")
+        except UnicodeDecodeError:
+            logger.warning(f"Skipping non-UTF-8 file: {rel}")
+            continue
+        mtime = datetime.fromtimestamp(path.stat().st_mtime, tz=timezone.utc)
+        yield Document(
+            doc_id=rel,
+            text=text,
+            metadata={
+                "source": rel,
+                "title": _title_from_text(text, path.stem),
+                "updated_at": mtime.date().isoformat(),
+            },
+        )
+
+
+def iter_jsonl(path: Union[str, Path]) -> Iterator[Document]:
+    """Yield documents from a JSONL file.
+
+    Each line needs text under ``text`` or ``content``; ``doc_id`` (or ``id``) defaults to
+    ``<file stem>:<line number>``. ``metadata`` is taken as-is, otherwise any remaining keys are used.
+    """
+    path = Path(path)
+    with path.open("r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            rec = json.loads(line)
+            text = rec.get("text") or rec.get("content")
+            if not text:
+                logger.warning(f"Skipping {path.name}:{line_no}: no text/content")
+                continue
+            doc_id = str(rec.get("doc_id") or rec.get("id") or f"{path.stem}:{line_no}")
+            metadata = rec.get("metadata")
+            if metadata is None:
+                metadata = {k: v for k, v in rec.items() if k not in ("doc_id", "id", "text", "content")}
+            yield Document(doc_id=doc_id, text=text, metadata=dict(metadata))
+
+
+def iter_documents(source: Union[str, Path]) -> Iterator[Document]:
+    """Stream documents from a directory or a ``.jsonl`` file."""
+    source = Path(source)
+    if source.is_dir():
+        return iter_directory(source)
+    if source.is_file() and source.suffix.lower() in (".jsonl", ".ndjson"):
+        return iter_jsonl(source)
+    raise ValueError(f"Unsupported source (expected a directory or .jsonl file): {source}")
@@ -0,0 +1,175 @@
+# src/agentic_rag/ingest/pipeline.py
+"""Offline ingestion: load -> chunk -> embed -> index.
+
+Documents are streamed from the source and grouped into small batches. Each batch is chunked and
+embedded in a worker process; at most ``max_in_flight`` batches exist at once, so memory stays
+bounded regardless of corpus size. Results are written in submission order, which keeps chunk
+ordinals deterministic and makes "documents done" a valid resume point.
+"""
+
+from __future__ import annotations
+
+import itertools
+import logging
+import multiprocessing
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Deque, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from agentic_rag.embeddings.batching import DEFAULT_MAX_BATCH_TOKENS
+from agentic_rag.embeddings.factory import build_embeddings
+from agentic_rag.index.literal import DEFAULT_NGRAM
+from agentic_rag.ingest.chunking import DEFAULT_CHUNK_CHARS, DEFAULT_CHUNK_OVERLAP, Chunk, chunk_document
+from agentic_rag.ingest.loaders import Document, iter_documents
+from agentic_rag.ingest.writer import IndexWriter
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class IngestConfig:
+    source: str
+    out: str
+    embedder: Optional[str] = "hashing"  # load_embeddings spec; None builds a BM25/literal-only index
+    chunk_chars: int = DEFAULT_CHUNK_CHARS
+    chunk_overlap: int = DEFAULT_CHUNK_OVERLAP
+    batch_docs: int = 16
+    embed_batch_size: int = 64
+    embed_batch_tokens: int = DEFAULT_MAX_BATCH_TOKENS
+    embed_cache: Optional[str] = None  # SQLite embedding cache; unchanged chunks are not re-embedded
+    workers: int = 0  # 0 = run inline in this process
+    max_in_flight: int = 0  # 0 = 2 * workers
+    resume: bool = False
+
+    def build_params(self):
+        """Parameters that must match for a resumed build to be consistent."""
+        return {
+            "embedder": self.embedder,
+            "chunk_chars": self.chunk_chars,
+            "chunk_overlap": self.chunk_overlap,
+            "literal_ngram": DEFAULT_NGRAM,
+        }
+
+
+@dataclass
+class IngestReport:
+    docs: int
+    chunks: int
+    skipped_docs: int
+    dim: Optional[int]
+    elapsed_s: float
+
+
+# -------------------------
+# Worker side
+# -------------------------
+
+_WORKER_EMBEDDINGS = None
+
+
+def _init_worker(
+    embedder_spec: Optional[str], cache_path: Optional[str], max_batch_size: int, max_batch_tokens: int
+) -> None:
+    global _WORKER_EMBEDDINGS
+    if not embedder_spec:
+        _WORKER_EMBEDDINGS = None
+        return
+    # One caller per process: split batches directly instead of waiting for others to coalesce.
+    _WORKER_EMBEDDINGS = build_embeddings(
+        embedder_spec,
+        cache_path=cache_path,
+        max_batch_size=max_batch_size,
+        max_batch_tokens=max_batch_tokens,
+        max_wait_ms=0,
+    )
+
+
+def _process_batch(
+    docs: List[Document], chunk_chars: int, chunk_overlap: int
+) -> Tuple[List[Chunk], Optional[np.ndarray]]:
+    chunks = [c for d in docs for c in chunk_document(d, max_chars=chunk_chars, overlap=chunk_overlap)]
+    if _WORKER_EMBEDDINGS is None:
+        return chunks, None
+
+    rows = _WORKER_EMBEDDINGS.embed_documents([c.text for c in chunks])
+    vectors = np.asarray(rows, dtype=np.float32) if rows else np.zeros((0, 0), dtype=np.float32)
+    return chunks, vectors
+
+
+# -------------------------
+# Driver
+# -------------------------
+
+
+def _batched(docs: Iterable[Document], size: int) -> Iterator[List[Document]]:
+    it = iter(docs)
+    while batch := list(itertools.islice(it, size)):
+        yield batch
+
+
+def run_ingest(config: IngestConfig, documents: Optional[Iterable[Document]] = None) -> IngestReport:
+    """Build (or resume building) an index at ``config.out``.
+
+    ``documents`` overrides ``config.source``; it must yield in the same order on every run for
+    ``resume`` to be meaningful.
+    """
+    started = time.perf_counter()
+    writer = IndexWriter(config.out, params=config.build_params(), resume=config.resume)
+    skipped = writer.docs_done
+
+    docs = documents if documents is not None else iter_documents(config.source)
+    docs = itertools.islice(docs, skipped, None)
+    batches = _batched(docs, max(1, config.batch_docs))
+    task_args = (config.chunk_chars, config.chunk_overlap)
+    worker_args = (
+        config.embedder,
+        config.embed_cache,
+        max(1, config.embed_batch_size),
+        max(1, config.embed_batch_tokens),
+    )
+
+    docs_done = skipped
+
+    def _commit(n_docs: int, result: Tuple[List[Chunk], Optional[np.ndarray]]) -> None:
+        nonlocal docs_done
+        chunks, vectors = result
+        writer.write(chunks, vectors)
+        docs_done += n_docs
+        writer.checkpoint(docs_done)
+
+    if config.workers <= 0:
+        _init_worker(*worker_args)
+        for batch in batches:
+            _commit(len(batch), _process_batch(batch, *task_args))
+    else:
+        max_in_flight = config.max_in_flight or 2 * config.workers
+        pending: Deque[Tuple[int, Future]] = deque()
+        with ProcessPoolExecutor(
+            max_workers=config.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=worker_args,
+        ) as pool:
+            for batch in batches:
+                pending.append((len(batch), pool.submit(_process_batch, batch, *task_args)))
+                while len(pending) >= max_in_flight:
+                    n, fut = pending.popleft()
+                    _commit(n, fut.result())
+            while pending:
+                n, fut = pending.popleft()
+                _commit(n, fut.result())
+
+    manifest = writer.finalize()
+    report = IngestReport(
+        docs=docs_done,
+        chunks=int(manifest["count"]),
+        skipped_docs=skipped,
+        dim=manifest.get("dim"),
+        elapsed_s=time.perf_counter() - started,
+    )
+    logger.info(f"Ingest finished: {asdict(report)}")
+    return report
@@ -0,0 +1,147 @@
+# src/agentic_rag/ingest/writer.py
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+
+from agentic_rag.index.bm25 import BM25Index
+from agentic_rag.index.storage import (
+    BM25_FILE,
+    CHUNKS_FILE,
+    FORMAT_VERSION,
+    MANIFEST_FILE,
+    VECTORS_FILE,
+    chunk_record,
+    iter_chunk_records,
+    write_json_atomic,
+)
+from agentic_rag.ingest.chunking import Chunk
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_FILE = "checkpoint.json"
+
+
+class IndexWriter:
+    """Append-only writer for the LocalIndex on-disk layout.
+
+    Chunk records and vectors are streamed to disk as they arrive; only BM25 postings are kept in
+    memory. ``checkpoint`` fsyncs both files and records their sizes, so an interrupted build can
+    resume by truncating back to the last checkpoint and skipping the documents already written.
+    """
+
+    def __init__(self, path: Union[str, Path], *, params: Dict[str, Any], resume: bool = False):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.params = dict(params)
+
+        self.bm25 = BM25Index()
+        self.count = 0
+        self.docs_done = 0
+        self.dim: Optional[int] = None
+
+        checkpoint = self._read_checkpoint() if resume else None
+        if checkpoint is not None:
+            self._restore(checkpoint)
+        else:
+            for name in (CHUNKS_FILE, VECTORS_FILE, BM25_FILE, MANIFEST_FILE, CHECKPOINT_FILE):
+                (self.path / name).unlink(missing_ok=True)
+
+        self._chunks = (self.path / CHUNKS_FILE).open("a", encoding="utf-8")
+        self._vectors = (self.path / VECTORS_FILE).open("ab")
+
+    def _read_checkpoint(self) -> Optional[Dict[str, Any]]:
+        cp_path = self.path / CHECKPOINT_FILE
+        if not cp_path.exists():
+            logger.info(f"No checkpoint at {cp_path}; starting fresh")
+            return None
+        with cp_path.open("r", encoding="utf-8") as f:
+            checkpoint = json.load(f)
+        if checkpoint.get("params") != self.params:
+            raise ValueError(
+                f"Cannot resume {self.path}: build params changed "
+                f"(checkpoint={checkpoint.get('params')}, now={self.params})"
+            )
+        return checkpoint
+
+    def _restore(self, checkpoint: Dict[str, Any]) -> None:
+        chunks_path, vectors_path = self.path / CHUNKS_FILE, self.path / VECTORS_FILE
+        # Drop anything written after the last checkpoint
+        with chunks_path.open("ab") as f:
+            f.truncate(int(checkpoint["chunks_bytes"]))
+        with vectors_path.open("ab") as f:
+            f.truncate(int(checkpoint["vectors_bytes"]))
+
+        for ordinal, (_, text, _) in enumerate(iter_chunk_records(chunks_path)):
+            self.bm25.add(ordinal, text)
+        self.count = len(self.bm25)
+        if self.count != int(checkpoint["count"]):
+            raise ValueError(f"Checkpoint at {self.path} is inconsistent with {CHUNKS_FILE}")
+        self.docs_done = int(checkpoint["docs_done"])
+        self.dim = checkpoint.get("dim")
+        logger.info(f"Resuming {self.path}: {self.docs_done} docs / {self.count} chunks already indexed")
+
+    def write(self, chunks: List[Chunk], vectors: Optional[np.ndarray]) -> None:
+        if vectors is not None:
+            vectors = np.asarray(vectors, dtype="<f4")
+            if vectors.shape[0] != len(chunks):
+                raise ValueError(f"Got {vectors.shape[0]} vectors for {len(chunks)} chunks")
+            if len(chunks):
+                if self.dim is None:
+                    self.dim = int(vectors.shape[1])
+                elif vectors.shape[1] != self.dim:
+                    raise ValueError(f"Embedding dim changed from {self.dim} to {vectors.shape[1]}")
+                vectors.tofile(self._vectors)
+
+        for chunk in chunks:
+            self._chunks.write(chunk_record(chunk.key, chunk.text, chunk.metadata))
+            self.bm25.add(self.count, chunk.text)
+            self.count += 1
+
+    def checkpoint(self, docs_done: int) -> None:
+        for f in (self._chunks, self._vectors):
+            f.flush()
+            os.fsync(f.fileno())
+        self.docs_done = docs_done
+        write_json_atomic(
+            self.path / CHECKPOINT_FILE,
+            {
+                "params": self.params,
+                "docs_done": docs_done,
+                "count": self.count,
+                "dim": self.dim,
+                "chunks_bytes": self._chunks.tell(),
+                "vectors_bytes": self._vectors.tell(),
+                "complete": False,
+            },
+        )
+
+    def finalize(self) -> Dict[str, Any]:
+        """Write BM25 postings and the manifest; the index is loadable afterwards."""
+        self.checkpoint(self.docs_done)
+        self._chunks.close()
+        self._vectors.close()
+        if self.dim is None:
+            (self.path / VECTORS_FILE).unlink(missing_ok=True)
+
+        np.savez(self.path / BM25_FILE, **self.bm25.to_arrays())
+        manifest = {
+            "format_version": FORMAT_VERSION,
+            "count": self.count,
+            "docs": self.docs_done,
+            "dim": self.dim,
+            "literal_ngram": int(self.params.get("literal_ngram", 3)),
+            "build": self.params,
+        }
+        write_json_atomic(self.path / MANIFEST_FILE, manifest)
+
+        with (self.path / CHECKPOINT_FILE).open("r", encoding="utf-8") as f:
+            checkpoint = json.load(f)
+        write_json_atomic(self.path / CHECKPOINT_FILE, {**checkpoint, "complete": True})
+        return manifest
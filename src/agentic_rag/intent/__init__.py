@@ -1,6 +1,7 @@
 """Intent intake subgraph for normalizing user requests and extracting planning signals."""
 
+from agentic_rag.intent.cache import IntakeCache
 from agentic_rag.intent.graph import make_intake_graph
 from agentic_rag.intent.state import IntakeState
 
-__all__ = ["make_intake_graph", "IntakeState"]
+__all__ = ["make_intake_graph", "IntakeCache", "IntakeState"]
@@ -0,0 +1,241 @@
+# src/agentic_rag/intent/artifacts.py
+"""Deterministic artifact and literal-term extraction for intake signals.
+
+``signals.artifact_flags`` and ``signals.literal_terms`` describe surface features of the user's
+text (code, stack traces, identifiers, paths, URLs, tables, quoted strings), so compiled regexes
+find them in microseconds. With the pre-extractor enabled the extract_signals LLM only fills
+entities/acronyms and the labels, and long pasted stack traces are shortened before the call.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, List, Sequence, Tuple
+
+from agentic_rag.intent.state import ArtifactFlag
+
+DEFAULT_MAX_LITERAL_TERMS = 20
+DEFAULT_TRACE_HEAD = 6
+DEFAULT_TRACE_TAIL = 6
+
+_MAX_LITERAL_LEN = 80
+
+# -------------------------
+# Patterns
+# -------------------------
+
+_URL_RE = re.compile(r"\b(?:https?|ftp)://[^\s<>()\"'`]+|\bwww\.[^\s<>()\"'`]+", re.IGNORECASE)
+
+_FENCE_RE = re.compile(r"^\s*(?:```|~~~)", re.MULTILINE)
+_CODE_LINE_RE = re.compile(
+    r"^\s*(?:def |class \w+[:(]|import \w|from [\w.]+ import |function\s*\w*\(|(?:const|let|var) \w+\s*=|"
+    r"(?:public|private|protected) [\w<>\[\]]+ |#include\s*[<\"]|SELECT .+ FROM |\w+\s*=\s*\w+\(.*\)\s*;?$)",
+    re.MULTILINE,
+)
+
+_TRACE_HEADER_RE = re.compile(
+    r"Traceback \(most recent call last\):|^Exception in thread |^Caused by: |^goroutine \d+ \[",
+    re.MULTILINE,
+)
+_FRAME_RE = re.compile(
+    r"^\s+(?:File \".*\", line \d+|at [\w$.<>/]+.*(?:\(.*\)|:\d+)|\S+\.(?:py|java|kt|js|ts|go|cs|rb|php):\d+)"
+)
+
+_UUID_RE = re.compile(r"\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b", re.IGNORECASE)
+_TICKET_RE = re.compile(r"\b[A-Z][A-Z0-9]{1,9}-\d+\b")  # JIRA-123, ORA-00942
+_CONST_RE = re.compile(r"\b[A-Z][A-Z0-9]*(?:_[A-Z0-9]+)+\b")  # ERR_CONN_RESET
+_ERROR_CODE_RE = re.compile(r"\b(?:0x[0-9a-fA-F]{4,}|[A-Z]{1,4}\d{3,6})\b")  # 0x80070005, E1234, CS0246
+_HASH_RE = re.compile(r"\b(?=[0-9a-f]*\d)(?=[0-9a-f]*[a-f])[0-9a-f]{7,40}\b")
+# Anchored at a name start with a bounded package prefix; an open-ended prefix backtracks quadratically on dotted text
+_EXCEPTION_RE = re.compile(r"(?<![\w.])(?:[a-z_]\w*\.){0,8}[A-Z]\w*(?:Error|Exception|Fault)\b")
+
+_UNIX_PATH_RE = re.compile(r"(?<![\w/:.])(?:~|\.{1,2})?/(?:[\w.@-]+/)+[\w.@-]*")
+_WIN_PATH_RE = re.compile(r"\b[A-Za-z]:\\(?:[^\\\s\"'<>|]+\\)*[^\\\s\"'<>|]*")
+_REL_FILE_RE = re.compile(r"(?<![\w/.])[\w.-]+/[\w./-]*\.[A-Za-z0-9]{1,6}\b")
+
+_CONFIG_KEY_RE = re.compile(r"(?<![\w.])[a-z][\w-]+(?:\.[a-z][\w-]+)+(?!\.?[\w(])")
+
+_TABLE_ROW_RE = re.compile(r"^\s*\|.*\|\s*$", re.MULTILINE)
+_TABLE_SEP_RE = re.compile(r"^\s*\|?\s*:?-{3,}:?\s*(?:\|\s*:?-{3,}:?\s*)+\|?\s*$", re.MULTILINE)
+
+_QUOTED_RE = re.compile(
+    r"(?:(?<![\w])\"([^\"\n]{2,%d})\"|(?<![\w])'([^'\n]{2,%d})'(?![\w])|“([^”\n]{2,%d})”|`([^`\n]{1,%d})`)"
+    % ((_MAX_LITERAL_LEN,) * 4)
+)
+
+
+# -------------------------
+# Stack traces
+# -------------------------
+
+
+def _frame_runs(lines: Sequence[str]) -> List[Tuple[int, int]]:
+    """Return ``[start, end)`` line ranges of consecutive stack frames.
+
+    A run starts at a frame line and continues over frame lines and the indented source lines
+    Python prints beneath each ``File ...`` frame.
+    """
+    runs: List[Tuple[int, int]] = []
+    i = 0
+    while i < len(lines):
+        if not _FRAME_RE.match(lines[i]):
+            i += 1
+            continue
+        start = i
+        i += 1
+        while i < len(lines) and (_FRAME_RE.match(lines[i]) or (lines[i][:1].isspace() and lines[i].strip())):
+            i += 1
+        runs.append((start, i))
+    return runs
+
+
+def truncate_stacktraces(text: str, *, head: int = DEFAULT_TRACE_HEAD, tail: int = DEFAULT_TRACE_TAIL) -> str:
+    """Shorten every frame run longer than ``head + tail`` lines, keeping both ends.
+
+    The outermost and innermost frames plus the exception line carry the diagnostic value; the
+    middle of a deep trace is framework plumbing that only costs prompt tokens.
+    """
+    lines = text.split("\n")
+    runs = [(s, e) for s, e in _frame_runs(lines) if e - s > head + tail + 1]
+    if not runs:
+        return text
+
+    out: List[str] = []
+    pos = 0
+    for start, end in runs:
+        out.extend(lines[pos : start + head])
+        indent = re.match(r"\s*", lines[start]).group(0)
+        out.append(f"{indent}... [{end - start - head - tail} trace lines omitted] ...")
+        out.extend(lines[end - tail : end])
+        pos = end
+    out.extend(lines[pos:])
+    return "\n".join(out)
+
+
+# -------------------------
+# Flags and literals
+# -------------------------
+
+
+def detect_artifact_flags(text: str) -> List[ArtifactFlag]:
+    """Artifact flags present in ``text``, in the canonical ArtifactFlag order."""
+    flags: List[ArtifactFlag] = []
+    if not text:
+        return flags
+    has_trace = bool(_TRACE_HEADER_RE.search(text)) or sum(bool(_FRAME_RE.match(ln)) for ln in text.splitlines()) >= 2
+    without_urls = _URL_RE.sub(" ", text)
+
+    if _FENCE_RE.search(text) or _CODE_LINE_RE.search(text):
+        flags.append("has_code")
+    if has_trace:
+        flags.append("has_stacktrace")
+    if any(p.search(without_urls) for p in (_UUID_RE, _TICKET_RE, _CONST_RE, _ERROR_CODE_RE, _HASH_RE)):
+        flags.append("has_ids")
+    if any(p.search(without_urls) for p in (_UNIX_PATH_RE, _WIN_PATH_RE, _REL_FILE_RE)):
+        flags.append("has_paths")
+    if _URL_RE.search(text):
+        flags.append("has_urls")
+    if _TABLE_SEP_RE.search(text) and len(_TABLE_ROW_RE.findall(text)) >= 2:
+        flags.append("has_table")
+    if _QUOTED_RE.search(text):
+        flags.append("has_quoted_strings")
+    return flags
+
+
+def extract_literal_terms(text: str, *, max_terms: int = DEFAULT_MAX_LITERAL_TERMS) -> List[str]:
+    """Exact strings worth preserving verbatim for retrieval, in order of first appearance.
+
+    Covers quoted/backticked phrases, UUIDs, ticket and error codes, CONSTANT_CASE codes, commit
+    hashes, exception class names, file paths and dotted config keys. URLs are excluded (they are
+    flagged, but rarely useful as lexical queries).
+    """
+    if not text:
+        return []
+    text = _URL_RE.sub(lambda m: " " * len(m.group(0)), text)  # keep offsets stable
+
+    found: List[Tuple[int, str]] = []
+    for m in _QUOTED_RE.finditer(text):
+        term = next(g for g in m.groups() if g is not None).strip()
+        if term:
+            found.append((m.start(), term))
+    for pattern in (
+        _UUID_RE,
+        _TICKET_RE,
+        _CONST_RE,
+        _ERROR_CODE_RE,
+        _HASH_RE,
+        _EXCEPTION_RE,
+        _WIN_PATH_RE,
+        _UNIX_PATH_RE,
+        _REL_FILE_RE,
+        _CONFIG_KEY_RE,
+    ):
+        for m in pattern.finditer(text):
+            term = m.group(0).rstrip(".,;:")
+            if 2 <= len(term) <= _MAX_LITERAL_LEN:
+                found.append((m.start(), term))
+
+    found.sort(key=lambda t: t[0])
+    terms: List[str] = []
+    seen = set()
+    for _, term in found:
+        if term in seen:
+            continue
+        # Drop fragments already covered by a longer term (eg a path inside a quoted phrase)
+        if any(term in t for t in terms):
+            continue
+        seen.add(term)
+        terms.append(term)
+        if len(terms) >= max_terms:
+            break
+    return terms
+
+
+# -------------------------
+# Messages
+# -------------------------
+
+
+def _role(message: Any) -> Any:
+    if isinstance(message, dict):
+        return message.get("role") or message.get("type")
+    return getattr(message, "type", None)
+
+
+def _content(message: Any) -> Any:
+    return message.get("content") if isinstance(message, dict) else getattr(message, "content", None)
+
+
+def user_text(messages: Sequence[Any]) -> str:
+    """Concatenated text of the user messages (assistant turns are not the user's artifacts)."""
+    parts = [_content(m) for m in messages or [] if _role(m) in ("user", "human")]
+    return "\n\n".join(p for p in parts if isinstance(p, str) and p)
+
+
+@dataclass
+class ArtifactScan:
+    artifact_flags: List[ArtifactFlag] = field(default_factory=list)
+    literal_terms: List[str] = field(default_factory=list)
+
+
+def scan_messages(messages: Sequence[Any], *, max_terms: int = DEFAULT_MAX_LITERAL_TERMS) -> ArtifactScan:
+    """Deterministic ``artifact_flags`` / ``literal_terms`` for a conversation."""
+    text = user_text(messages)
+    return ArtifactScan(
+        artifact_flags=detect_artifact_flags(text),
+        literal_terms=extract_literal_terms(truncate_stacktraces(text), max_terms=max_terms),
+    )
+
+
+def compact_messages(messages: Sequence[Any], **kwargs: Any) -> List[Any]:
+    """Copy of ``messages`` with long stack traces truncated (see truncate_stacktraces)."""
+    out: List[Any] = []
+    for m in messages or []:
+        content = _content(m)
+        if isinstance(content, str):
+            short = truncate_stacktraces(content, **kwargs)
+            if short != content:
+                m = {**m, "content": short} if isinstance(m, dict) else m.model_copy(update={"content": short})
+        out.append(m)
+    return out
@@ -0,0 +1,269 @@
+# src/agentic_rag/intent/cache.py
+"""Intake result cache.
+
+Intake runs at temperature 0, so the same (near-identical) conversation yields the same intake
+output. The cache key is a canonical hash of the last ``last_n`` messages, the conversation summary
+(``conversation_summary``/``summarized_turns``), ``user_context_info``, the intake configuration
+(``IntakeConfig``: path, prepass, deterministic signals, classifier threshold) and the prompt/schema
+versions; any prompt bump invalidates old entries. Values are the IntakeState deltas the intake
+nodes would have written.
+"""
+
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import logging
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from agentic_rag.intent.artifacts import detect_artifact_flags, extract_literal_terms
+from agentic_rag.intent.prompts import (
+    EXTRACT_SIGNALS_LITE_PROMPT_VERSION,
+    EXTRACT_SIGNALS_PROMPT_VERSION,
+    INTAKE_FUSED_PROMPT_VERSION,
+    NORMALIZE_PREPASS_PROMPT_VERSION,
+    NORMALIZE_PROMPT_VERSION,
+)
+
+logger = logging.getLogger(__name__)
+
+INTAKE_VERSION = "intake_v1"
+
+# Fields written by normalize_gate/extract_signals (or intake_fused)
+INTAKE_OUTPUT_KEYS = (
+    "normalized_query",
+    "constraints",
+    "guardrails",
+    "clarification",
+    "language",
+    "locale",
+    "user_intent",
+    "retrieval_intent",
+    "answerability",
+    "complexity_flags",
+    "signals",
+    "intake_version",
+)
+
+DEFAULT_MAX_SIZE = 4096
+DEFAULT_TTL_S = 3600.0
+DEFAULT_LAST_N = 4
+
+_WS_RE = re.compile(r"\s+")
+_FENCED_BLOCK_RE = re.compile(r"^[ \t]*(```|~~~).*?(?:^[ \t]*\1[^\n]*|\Z)", re.MULTILINE | re.DOTALL)
+_TRAILING_PUNCT_RE = re.compile(r"[\s?!.。？！]+$")
+
+_ROLE_ALIASES = {"human": "user", "ai": "assistant"}
+
+
+def _message_parts(message: Any) -> Tuple[str, Any]:
+    if isinstance(message, dict):
+        return message.get("role") or message.get("type") or "user", message.get("content", "")
+    return getattr(message, "type", "user"), getattr(message, "content", "")
+
+
+def _keep_lines(text: str) -> str:
+    return "\n".join(line.rstrip() for line in text.splitlines())
+
+
+def _fold_whitespace(text: str) -> str:
+    return _WS_RE.sub(" ", text)
+
+
+def canonical_text(text: Any) -> str:
+    """Fold variations that do not change intake output: unicode forms, whitespace, trailing punctuation.
+
+    Intake copies literals verbatim, so case is folded only for text without literal terms or artifacts.
+    Whitespace is collapsed in prose only; fenced code blocks, and every line of a message with a stack
+    trace, keep their line structure and indentation.
+    """
+    if not isinstance(text, str):
+        # multimodal content blocks: keep structure, sorted for stability
+        return json.dumps(text, sort_keys=True, ensure_ascii=False, default=str)
+    text = unicodedata.normalize("NFKC", text)
+    flags = detect_artifact_flags(text)
+    if not flags and not extract_literal_terms(text, max_terms=1):
+        text = text.casefold()
+
+    fold = _keep_lines if "has_stacktrace" in flags else _fold_whitespace
+    parts, pos = [], 0
+    for m in _FENCED_BLOCK_RE.finditer(text):
+        parts += [fold(text[pos : m.start()]), _keep_lines(m.group())]
+        pos = m.end()
+    parts.append(fold(text[pos:]))
+    return _TRAILING_PUNCT_RE.sub("", "".join(parts).strip())
+
+
+@dataclass(frozen=True)
+class IntakeConfig:
+    """Intake graph settings that change its output for the same conversation.
+
+    ``prepass``, ``deterministic_signals`` and ``classifier_threshold`` (``None`` = no classifier
+    fast path) apply to the two-step path only and are ignored when ``fused``.
+    """
+
+    fused: bool = False
+    prepass: bool = False
+    deterministic_signals: bool = False
+    classifier_threshold: Optional[float] = None
+
+    def key_payload(self) -> Dict[str, Any]:
+        if self.fused:
+            return {"path": "fused", "versions": [INTAKE_FUSED_PROMPT_VERSION]}
+        return {
+            "path": "two_step",
+            "prepass": self.prepass,
+            "deterministic_signals": self.deterministic_signals,
+            "classifier_threshold": self.classifier_threshold,
+            "versions": [
+                NORMALIZE_PREPASS_PROMPT_VERSION if self.prepass else NORMALIZE_PROMPT_VERSION,
+                EXTRACT_SIGNALS_LITE_PROMPT_VERSION if self.deterministic_signals else EXTRACT_SIGNALS_PROMPT_VERSION,
+            ],
+        }
+
+
+def intake_cache_key(
+    messages: List[Any],
+    user_context_info: Optional[Dict[str, Any]] = None,
+    *,
+    conversation_summary: Optional[str] = None,
+    summarized_turns: int = 0,
+    config: IntakeConfig = IntakeConfig(),
+    last_n: int = DEFAULT_LAST_N,
+) -> str:
+    """Canonical hash of the inputs intake depends on."""
+    summary = (conversation_summary or "").strip()
+    payload = {
+        "messages": [
+            (_ROLE_ALIASES.get(role, role), canonical_text(content))
+            for role, content in (_message_parts(m) for m in messages[-last_n:])
+        ],
+        # The LLM nodes see the summary in place of the first summarized_turns turns (agentic_rag/context.py)
+        "summary": [summary, summarized_turns or 0] if summary else None,
+        "user_context_info": user_context_info or {},
+        "intake_version": INTAKE_VERSION,
+        **config.key_payload(),
+    }
+    blob = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class IntakeCacheStats:
+    hits: int = 0
+    misses: int = 0
+    expired: int = 0
+    evicted: int = 0
+    stores: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class IntakeCache:
+    """Bounded LRU + TTL cache of intake deltas; thread-safe, in-process.
+
+    Args:
+        max_size: Max entries; least recently used entries are evicted first.
+        ttl_s: Seconds an entry stays valid.
+        last_n: How many trailing messages make up the key.
+        clock: Monotonic time source (injectable for tests).
+    """
+
+    def __init__(
+        self,
+        *,
+        max_size: int = DEFAULT_MAX_SIZE,
+        ttl_s: float = DEFAULT_TTL_S,
+        last_n: int = DEFAULT_LAST_N,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if max_size < 1:
+            raise ValueError("max_size must be >= 1")
+        self.max_size = max_size
+        self.ttl_s = ttl_s
+        self.last_n = last_n
+        self.clock = clock
+        self.stats = IntakeCacheStats()
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def key(self, state: Dict[str, Any], config: IntakeConfig = IntakeConfig()) -> Optional[str]:
+        messages = state.get("messages")
+        if not isinstance(messages, list) or not messages:
+            return None
+        return intake_cache_key(
+            messages,
+            state.get("user_context_info"),
+            conversation_summary=state.get("conversation_summary"),
+            summarized_turns=state.get("summarized_turns") or 0,
+            config=config,
+            last_n=self.last_n,
+        )
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of the cached deltas, or ``None``; records hit/miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.clock() - entry[0] > self.ttl_s:
+                del self._entries[key]
+                self.stats.expired += 1
+                entry = None
+            if entry is None:
+                self.stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            value = entry[1]
+        return copy.deepcopy(value)
+
+    def put(self, key: str, deltas: Dict[str, Any]) -> None:
+        value = copy.deepcopy({k: v for k, v in deltas.items() if k in INTAKE_OUTPUT_KEYS})
+        with self._lock:
+            self._entries[key] = (self.clock(), value)
+            self._entries.move_to_end(key)
+            self.stats.stores += 1
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.stats.evicted += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def make_cache_lookup_node(cache: IntakeCache, config: IntakeConfig = IntakeConfig()):
+    def intake_cache_lookup(state: Dict[str, Any]) -> Dict[str, Any]:
+        key = cache.key(state, config)
+        deltas = cache.get(key) if key is not None else None
+        logger.debug(f"Intake cache {'hit' if deltas else 'miss'} (hit_rate={cache.stats.hit_rate:.2f})")
+        if deltas is None:
+            return {"intake_cache_hit": False}
+        return {**deltas, "intake_cache_hit": True}
+
+    return intake_cache_lookup
+
+
+def make_cache_store_node(cache: IntakeCache, config: IntakeConfig = IntakeConfig()):
+    def intake_cache_store(state: Dict[str, Any]) -> Dict[str, Any]:
+        # Never cache partial results: any intake error means the output is not reusable.
+        if state.get("errors") or not state.get("normalized_query") or not state.get("user_intent"):
+            return {}
+        key = cache.key(state, config)
+        if key is not None:
+            cache.put(key, state)
+        return {}
+
+    return intake_cache_store
@@ -0,0 +1,347 @@
+# src/agentic_rag/intent/classifier.py
+"""Local intent classifier for the closed intake label sets.
+
+``user_intent``, ``retrieval_intent``, ``answerability`` and ``complexity_flags`` are closed
+``Literal`` vocabularies (see intent/state.py), so a hashed n-gram linear model predicts them in
+well under a millisecond. The intake graph uses it as a fast path: when every field clears the
+confidence threshold, the extract_signals LLM call is skipped.
+
+Model: signed feature hashing of word unigrams/bigrams and character trigrams into ``dim``
+buckets, one softmax head per single-label field and one-vs-rest sigmoid heads for
+``complexity_flags``. Trained with full-batch gradient descent + L2 in NumPy.
+"""
+
+from __future__ import annotations
+
+import glob
+import hashlib
+import json
+import logging
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Sequence, Tuple, Union, get_args
+
+import numpy as np
+
+from agentic_rag.intent.artifacts import scan_messages
+from agentic_rag.intent.state import Answerability, ComplexityFlag, RetrievalIntent, UserIntent
+
+logger = logging.getLogger(__name__)
+
+SINGLE_LABEL_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "user_intent": get_args(UserIntent),
+    "retrieval_intent": get_args(RetrievalIntent),
+    "answerability": get_args(Answerability),
+}
+MULTI_LABEL_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "complexity_flags": get_args(ComplexityFlag),
+}
+
+DEFAULT_DIM = 2**14
+DEFAULT_THRESHOLD = 0.85
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+PathLike = Union[str, Path]
+
+
+# -------------------------
+# Features
+# -------------------------
+
+
+def _hash(feature: str) -> int:
+    return int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def featurize(text: str, dim: int = DEFAULT_DIM) -> Tuple[np.ndarray, np.ndarray]:
+    """Return ``(indices, values)`` of the L2-normalised hashed feature vector."""
+    lowered = text.lower()
+    words = _WORD_RE.findall(lowered)
+    features = [f"w:{w}" for w in words]
+    features += [f"b:{a} {b}" for a, b in zip(words, words[1:])]
+    padded = f" {' '.join(words)} "
+    features += [f"c:{padded[i:i + 3]}" for i in range(len(padded) - 2)]
+    # Length bucket: long_query is partly a length signal
+    features.append(f"len:{min(len(words) // 20, 5)}")
+
+    acc: Dict[int, float] = {}
+    for feat in features:
+        h = _hash(feat)
+        idx = h % dim
+        acc[idx] = acc.get(idx, 0.0) + (1.0 if (h >> 63) & 1 else -1.0)
+
+    indices = np.fromiter(acc.keys(), dtype=np.int64, count=len(acc))
+    values = np.fromiter(acc.values(), dtype=np.float32, count=len(acc))
+    norm = float(np.linalg.norm(values)) or 1.0
+    return indices, values / norm
+
+
+@dataclass
+class _Batch:
+    """Sparse rows in CSR form."""
+
+    indptr: np.ndarray
+    indices: np.ndarray
+    values: np.ndarray
+
+    @property
+    def rows(self) -> np.ndarray:
+        return np.repeat(np.arange(len(self.indptr) - 1), np.diff(self.indptr))
+
+    def matmul(self, weights: np.ndarray) -> np.ndarray:
+        """``X @ W`` for ``W`` of shape ``(dim, k)``."""
+        n = len(self.indptr) - 1
+        out = np.zeros((n, weights.shape[1]), dtype=np.float32)
+        np.add.at(out, self.rows, weights[self.indices] * self.values[:, None])
+        return out
+
+    def grad(self, delta: np.ndarray, dim: int) -> np.ndarray:
+        """``X.T @ delta`` of shape ``(dim, k)``."""
+        out = np.zeros((dim, delta.shape[1]), dtype=np.float32)
+        np.add.at(out, self.indices, delta[self.rows] * self.values[:, None])
+        return out
+
+
+def _batch(texts: Sequence[str], dim: int) -> _Batch:
+    indptr = [0]
+    idx_parts: List[np.ndarray] = []
+    val_parts: List[np.ndarray] = []
+    for text in texts:
+        i, v = featurize(text, dim)
+        idx_parts.append(i)
+        val_parts.append(v)
+        indptr.append(indptr[-1] + len(i))
+    return _Batch(
+        indptr=np.asarray(indptr, dtype=np.int64),
+        indices=np.concatenate(idx_parts) if idx_parts else np.zeros(0, dtype=np.int64),
+        values=np.concatenate(val_parts) if val_parts else np.zeros(0, dtype=np.float32),
+    )
+
+
+def _softmax(z: np.ndarray) -> np.ndarray:
+    z = z - z.max(axis=1, keepdims=True)
+    e = np.exp(z)
+    return e / e.sum(axis=1, keepdims=True)
+
+
+def _sigmoid(z: np.ndarray) -> np.ndarray:
+    return 1.0 / (1.0 + np.exp(-z))
+
+
+# -------------------------
+# Training data
+# -------------------------
+
+
+@dataclass
+class Example:
+    text: str
+    labels: Dict[str, Any] = field(default_factory=dict)  # field -> label (or list for multi-label)
+
+
+def example_text(messages: Sequence[Any]) -> str:
+    """Classifier input: the last user message (the primary request)."""
+    for m in reversed(list(messages or [])):
+        role = (m.get("role") or m.get("type")) if isinstance(m, dict) else getattr(m, "type", None)
+        content = m.get("content") if isinstance(m, dict) else getattr(m, "content", None)
+        if role in ("user", "human") and isinstance(content, str):
+            return content
+    return ""
+
+
+def _clean_labels(raw: Dict[str, Any]) -> Dict[str, Any]:
+    labels: Dict[str, Any] = {}
+    for name, vocab in SINGLE_LABEL_FIELDS.items():
+        if raw.get(name) in vocab:
+            labels[name] = raw[name]
+    for name, vocab in MULTI_LABEL_FIELDS.items():
+        value = raw.get(name)
+        if value is None:
+            value = raw.get(f"{name}_contains")  # eval expected files label a subset
+            if value is not None:
+                continue  # a subset is not a complete multi-label target
+        if isinstance(value, list):
+            labels[name] = [v for v in value if v in vocab]
+    return labels
+
+
+def load_case_examples(cases_dir: PathLike, expected_dir: PathLike) -> List[Example]:
+    """Examples from ``tests/intent_eval`` cases paired with their ``*.expected.json`` labels."""
+    examples: List[Example] = []
+    for case_path in sorted(Path(cases_dir).glob("*.json")):
+        expected_path = Path(expected_dir) / f"{case_path.stem}.expected.json"
+        if not expected_path.exists():
+            continue
+        case = json.loads(case_path.read_text(encoding="utf-8"))
+        labels = _clean_labels(json.loads(expected_path.read_text(encoding="utf-8")))
+        text = example_text(case.get("messages"))
+        if text and labels:
+            examples.append(Example(text=text, labels=labels))
+    return examples
+
+
+def load_logged_examples(patterns: Iterable[str]) -> List[Example]:
+    """Examples from logged intake outputs: JSON files or JSONL lines holding a final IntakeState.
+
+    Records with ``errors`` are skipped; ``intake_fast_path`` records are skipped too so the model
+    never trains on its own predictions.
+    """
+    examples: List[Example] = []
+    for pattern in patterns:
+        for path in sorted(glob.glob(pattern, recursive=True)):
+            text = Path(path).read_text(encoding="utf-8")
+            if path.endswith(".jsonl"):
+                records = [json.loads(line) for line in text.splitlines() if line.strip()]
+            else:
+                records = [json.loads(text)]
+            for rec in records:
+                if not isinstance(rec, dict) or rec.get("errors") or rec.get("intake_fast_path"):
+                    continue
+                labels = _clean_labels(rec)
+                content = example_text(rec.get("messages"))
+                if content and labels:
+                    examples.append(Example(text=content, labels=labels))
+    return examples
+
+
+# -------------------------
+# Model
+# -------------------------
+
+
+@dataclass
+class Prediction:
+    labels: Dict[str, Any]
+    confidence: Dict[str, float]
+
+    @property
+    def min_confidence(self) -> float:
+        return min(self.confidence.values()) if self.confidence else 0.0
+
+
+class IntentClassifier:
+    """Hashed n-gram linear classifier over the intake label vocabularies."""
+
+    def __init__(self, dim: int = DEFAULT_DIM):
+        self.dim = dim
+        self.weights: Dict[str, np.ndarray] = {}
+        self.bias: Dict[str, np.ndarray] = {}
+        self.vocab: Dict[str, Tuple[str, ...]] = {**SINGLE_LABEL_FIELDS, **MULTI_LABEL_FIELDS}
+
+    @property
+    def fields(self) -> List[str]:
+        return [f for f in self.vocab if f in self.weights]
+
+    def fit(
+        self,
+        examples: Sequence[Example],
+        *,
+        epochs: int = 200,
+        lr: float = 2.0,
+        l2: float = 1e-4,
+    ) -> "IntentClassifier":
+        """Train every head that has labelled examples; fields without labels are left untrained."""
+        for name, vocab in self.vocab.items():
+            labelled = [ex for ex in examples if name in ex.labels]
+            if not labelled:
+                continue
+            X = _batch([ex.text for ex in labelled], self.dim)
+            multi = name in MULTI_LABEL_FIELDS
+            Y = np.zeros((len(labelled), len(vocab)), dtype=np.float32)
+            for r, ex in enumerate(labelled):
+                for label in ex.labels[name] if multi else [ex.labels[name]]:
+                    Y[r, vocab.index(label)] = 1.0
+
+            W = np.zeros((self.dim, len(vocab)), dtype=np.float32)
+            b = np.zeros(len(vocab), dtype=np.float32)
+            n = float(len(labelled))
+            for _ in range(epochs):
+                z = X.matmul(W) + b
+                p = _sigmoid(z) if multi else _softmax(z)
+                delta = (p - Y) / n
+                W -= lr * (X.grad(delta, self.dim) + l2 * W)
+                b -= lr * delta.sum(axis=0)
+            self.weights[name], self.bias[name] = W, b
+            logger.info(f"Trained {name} head on {len(labelled)} examples")
+        return self
+
+    def predict(self, text: str) -> Prediction:
+        """Predict every trained field; ``confidence`` is per field in [0, 1].
+
+        Single-label confidence is the top softmax probability. For multi-label fields it is the
+        least decisive flag (``max(p, 1 - p)``), so one uncertain flag makes the field uncertain.
+        """
+        idx, val = featurize(text, self.dim)
+        labels: Dict[str, Any] = {}
+        confidence: Dict[str, float] = {}
+        for name in self.fields:
+            z = val @ self.weights[name][idx] + self.bias[name]
+            vocab = self.vocab[name]
+            if name in MULTI_LABEL_FIELDS:
+                p = _sigmoid(z)
+                labels[name] = [vocab[i] for i in np.flatnonzero(p >= 0.5)]
+                confidence[name] = float(np.maximum(p, 1.0 - p).min())
+            else:
+                p = _softmax(z[None, :])[0]
+                best = int(p.argmax())
+                labels[name] = vocab[best]
+                confidence[name] = float(p[best])
+        return Prediction(labels=labels, confidence=confidence)
+
+    def save(self, path: PathLike) -> None:
+        arrays = {f"W_{name}": w for name, w in self.weights.items()}
+        arrays.update({f"b_{name}": b for name, b in self.bias.items()})
+        meta = {"dim": self.dim, "vocab": {name: list(v) for name, v in self.vocab.items()}}
+        with Path(path).open("wb") as f:
+            np.savez_compressed(f, meta=np.asarray(json.dumps(meta)), **arrays)
+
+    @classmethod
+    def load(cls, path: PathLike) -> "IntentClassifier":
+        with np.load(path) as data:
+            meta = json.loads(str(data["meta"]))
+            clf = cls(dim=int(meta["dim"]))
+            for name, vocab in meta["vocab"].items():
+                if tuple(vocab) != clf.vocab.get(name):
+                    # Vocabulary changed since training: that head's label indices are stale.
+                    logger.warning(f"Ignoring {name} head: label vocabulary changed since training")
+                    continue
+                if f"W_{name}" in data:
+                    clf.weights[name] = data[f"W_{name}"]
+                    clf.bias[name] = data[f"b_{name}"]
+        return clf
+
+
+def make_classify_signals_node(classifier: IntentClassifier, threshold: float = DEFAULT_THRESHOLD):
+    """Fast-path node: fill the extract_signals labels locally when every field is confident.
+
+    Sets ``intake_fast_path``; the graph routes to the LLM extract_signals node when it is False.
+    On the fast path artifact_flags/literal_terms come from the deterministic extractor
+    (intent/artifacts.py); entities/acronyms stay empty since they need the LLM.
+    """
+    required = set(SINGLE_LABEL_FIELDS) | set(MULTI_LABEL_FIELDS)
+
+    def classify_signals(state: Dict[str, Any]) -> Dict[str, Any]:
+        text = example_text(state.get("messages"))
+        if not text or not required.issubset(classifier.fields):
+            return {"intake_fast_path": False}
+
+        pred = classifier.predict(text)
+        if pred.min_confidence < threshold:
+            logger.debug(f"Classifier below threshold ({pred.min_confidence:.2f} < {threshold}); using LLM")
+            return {"intake_fast_path": False}
+
+        scan = scan_messages(state.get("messages"))
+        return {
+            **pred.labels,
+            "signals": {
+                "entities": [],
+                "acronyms": [],
+                "artifact_flags": scan.artifact_flags,
+                "literal_terms": scan.literal_terms,
+            },
+            "intake_fast_path": True,
+        }
+
+    return classify_signals
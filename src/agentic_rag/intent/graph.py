@@ -1,39 +1,147 @@
 # src/agentic_rag/intent/graph.py
 
 import logging
+import os
+from typing import Optional
 
 from langgraph.graph import END, START, StateGraph
 from langgraph.types import RetryPolicy
 
+from agentic_rag.aio import dual_node
+from agentic_rag.intent.cache import IntakeCache, IntakeConfig, make_cache_lookup_node, make_cache_store_node
+from agentic_rag.intent.classifier import DEFAULT_THRESHOLD, IntentClassifier, make_classify_signals_node
 from agentic_rag.intent.nodes.extract_signals import make_extract_signals_node
+from agentic_rag.intent.nodes.intake_fused import make_intake_fused_node
 from agentic_rag.intent.nodes.normalize_gate import make_normalize_gate_node
 from agentic_rag.intent.state import IntakeState
+from agentic_rag.usage import with_usage
 
 logger = logging.getLogger(__name__)
 
 
-def make_intake_graph(llm, max_retries: int = 3):
+def intake_fused_enabled() -> bool:
+    """Default for ``make_intake_graph(fused=None)``; set INTAKE_FUSED=1 to use the single-call node."""
+    return os.getenv("INTAKE_FUSED", "0") == "1"
+
+
+def deterministic_signals_enabled() -> bool:
+    """Default for ``make_intake_graph(deterministic_signals=None)``; set INTAKE_DETERMINISTIC_SIGNALS=1."""
+    return os.getenv("INTAKE_DETERMINISTIC_SIGNALS", "0") == "1"
+
+
+def prepass_enabled() -> bool:
+    """Default for ``make_intake_graph(prepass=None)``; set INTAKE_PREPASS=1."""
+    return os.getenv("INTAKE_PREPASS", "0") == "1"
+
+
+def make_intake_graph(
+    llm,
+    max_retries: int = 3,
+    fused: Optional[bool] = None,
+    cache: Optional[IntakeCache] = None,
+    classifier: Optional[IntentClassifier] = None,
+    classifier_threshold: float = DEFAULT_THRESHOLD,
+    deterministic_signals: Optional[bool] = None,
+    prepass: Optional[bool] = None,
+):
+    """Build the intake subgraph.
+
+    ``fused=True`` replaces normalize_gate -> extract_signals with one intake_fused call that
+    writes the same IntakeState fields (one round trip, messages sent once). ``None`` reads the
+    INTAKE_FUSED env switch.
+
+    With ``cache``, an intake_cache_lookup node runs first and ends the subgraph on a hit;
+    successful misses are stored by intake_cache_store.
+
+    With ``classifier`` (two-step path only), classify_signals runs after normalize_gate and
+    skips the extract_signals LLM call when every label clears ``classifier_threshold``.
+
+    With ``deterministic_signals`` (two-step path only), artifact_flags/literal_terms are extracted
+    locally and extract_signals asks the LLM for the remaining fields with long stack traces
+    truncated.
+
+    With ``prepass`` (two-step path only), guardrails.pii_present, language and locale come from
+    the local PII/language detectors and the normalize prompt skips them.
+    """
+    if fused is None:
+        fused = intake_fused_enabled()
+    if deterministic_signals is None:
+        deterministic_signals = deterministic_signals_enabled()
+    if prepass is None:
+        prepass = prepass_enabled()
+
     # Use the function argument, not a hardcoded constant.
     retry_policy = RetryPolicy(max_attempts=max_retries)
 
     # Provide the state schema (TypedDict) to StateGraph for correctness and tooling.
     intent_graph_builder = StateGraph(IntakeState)
 
-    # Node factory signatures should be consistent: make_*_node(llm) -> callable
+    if cache is not None:
+        config = IntakeConfig(
+            fused=fused,
+            prepass=prepass,
+            deterministic_signals=deterministic_signals,
+            classifier_threshold=classifier_threshold if classifier is not None else None,
+        )
+        intent_graph_builder.add_node("intake_cache_lookup", make_cache_lookup_node(cache, config))
+        intent_graph_builder.add_node("intake_cache_store", make_cache_store_node(cache, config))
+        exit_node = "intake_cache_store"
+        intent_graph_builder.add_edge("intake_cache_store", END)
+    else:
+        exit_node = END
+
+    def _enter(first: str) -> None:
+        if cache is None:
+            intent_graph_builder.add_edge(START, first)
+            return
+        intent_graph_builder.add_edge(START, "intake_cache_lookup")
+        intent_graph_builder.add_conditional_edges(
+            "intake_cache_lookup",
+            lambda state: END if state.get("intake_cache_hit") else first,
+            [first, END],
+        )
+
+    if fused:
+        if classifier is not None:
+            logger.warning("Intent classifier fast path applies to the two-step intake only; ignoring it")
+        intent_graph_builder.add_node(
+            "intake_fused",
+            dual_node(with_usage(make_intake_fused_node(llm), "intake_fused")),
+            retry=retry_policy,
+        )
+        _enter("intake_fused")
+        intent_graph_builder.add_edge("intake_fused", exit_node)
+        return intent_graph_builder.compile()
+
+    # Node factory signatures should be consistent: make_*_node(llm) -> callable.
+    # dual_node: LLM nodes run their async variant (node.afunc) under ainvoke.
+    # with_usage: LLM nodes append their token usage to token_ledger.
     intent_graph_builder.add_node(
         "normalize_gate",
-        make_normalize_gate_node(llm),
+        dual_node(with_usage(make_normalize_gate_node(llm, prepass=prepass), "normalize_gate")),
         retry=retry_policy,
     )
 
     intent_graph_builder.add_node(
         "extract_signals",
-        make_extract_signals_node(llm),
+        dual_node(with_usage(make_extract_signals_node(llm, deterministic=deterministic_signals), "extract_signals")),
         retry=retry_policy,
     )
 
-    intent_graph_builder.add_edge(START, "normalize_gate")
-    intent_graph_builder.add_edge("normalize_gate", "extract_signals")
-    intent_graph_builder.add_edge("extract_signals", END)
+    _enter("normalize_gate")
+    if classifier is not None:
+        intent_graph_builder.add_node(
+            "classify_signals",
+            make_classify_signals_node(classifier, threshold=classifier_threshold),
+        )
+        intent_graph_builder.add_edge("normalize_gate", "classify_signals")
+        intent_graph_builder.add_conditional_edges(
+            "classify_signals",
+            lambda state: exit_node if state.get("intake_fast_path") else "extract_signals",
+            ["extract_signals", exit_node],
+        )
+    else:
+        intent_graph_builder.add_edge("normalize_gate", "extract_signals")
+    intent_graph_builder.add_edge("extract_signals", exit_node)
 
     return intent_graph_builder.compile()
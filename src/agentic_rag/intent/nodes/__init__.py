@@ -1,6 +1,7 @@
 """Intent intake nodes."""
 
 from agentic_rag.intent.nodes.extract_signals import make_extract_signals_node
+from agentic_rag.intent.nodes.intake_fused import make_intake_fused_node
 from agentic_rag.intent.nodes.normalize_gate import make_normalize_gate_node
 
-__all__ = ["make_normalize_gate_node", "make_extract_signals_node"]
+__all__ = ["make_normalize_gate_node", "make_extract_signals_node", "make_intake_fused_node"]
@@ -3,13 +3,16 @@ import logging
 import os
 from typing import Any, Dict, List, Literal, Optional
 
-from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+from langchain_core.prompts import ChatPromptTemplate
 
 # If this import fails in your env, switch to:
 # from langfuse.decorators import observe
 from pydantic import BaseModel, ConfigDict, Field, ValidationError
 
-from agentic_rag.intent.prompts.extract_signals import EXTRACT_SIGNALS_PROMPT
+from agentic_rag.aio import Steps, invoke_call, run_async, run_sync, with_async
+from agentic_rag.context import window_messages
+from agentic_rag.intent.artifacts import compact_messages, scan_messages
+from agentic_rag.intent.prompts.extract_signals import EXTRACT_SIGNALS_LITE_PROMPT, EXTRACT_SIGNALS_PROMPT
 from agentic_rag.intent.state import (
     Answerability,
     ArtifactFlag,
@@ -18,9 +21,16 @@ from agentic_rag.intent.state import (
     RetrievalIntent,
     UserIntent,
 )
+from agentic_rag.model import routed_chains
+from agentic_rag.prompt_layout import prefix_cached_messages
+from agentic_rag.repair import structured_data, validate_with_repair
 
 logger = logging.getLogger(__name__)
 
+# Prompt variables sent in the trailing inputs message (agentic_rag/prompt_layout.py)
+EXTRACT_SIGNALS_INPUTS = ("normalized_query", "constraints", "guardrails", "clarification", "language", "locale")
+EXTRACT_SIGNALS_LITE_INPUTS = EXTRACT_SIGNALS_INPUTS + ("artifact_flags", "literal_terms")
+
 OBSERVE_ENABLED = os.getenv("LANGFUSE_ENABLED", "1") == "1"
 
 if OBSERVE_ENABLED:
@@ -75,21 +85,57 @@ class ExtractSignalsModel(BaseModel):
     signals: SignalsModel = Field(default_factory=SignalsModel)
 
 
-def make_extract_signals_node(llm):
+class LiteSignalsModel(BaseModel):
+    """Signals the LLM still fills when artifact_flags/literal_terms are pre-extracted."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    entities: List[EntityModel] = Field(default_factory=list)
+    acronyms: List[AcronymModel] = Field(default_factory=list)
+
+
+class ExtractSignalsLiteModel(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    user_intent: UserIntent
+    retrieval_intent: RetrievalIntent
+    answerability: Answerability
+    complexity_flags: List[ComplexityFlag] = Field(default_factory=list)
+    signals: LiteSignalsModel = Field(default_factory=LiteSignalsModel)
+
+
+def signals_updates(result: ExtractSignalsModel) -> Dict[str, Any]:
+    """IntakeState fields owned by Node 2 (shared with the fused intake node)."""
+    # Return JSON-serializable values into LangGraph state
+    return {
+        "user_intent": result.user_intent,
+        "retrieval_intent": result.retrieval_intent,
+        "answerability": result.answerability,
+        "complexity_flags": result.complexity_flags,
+        "signals": result.signals.model_dump(),
+    }
+
+
+def make_extract_signals_node(llm, deterministic: bool = False):
+    """Build Node 2.
+
+    With ``deterministic=True``, artifact_flags/literal_terms come from intent/artifacts.py, the LLM
+    fills the smaller ExtractSignalsLiteModel, and long stack traces are truncated in its input.
+    """
+    schema = ExtractSignalsLiteModel if deterministic else ExtractSignalsModel
     prompt = ChatPromptTemplate.from_messages(
-        [
-            ("system", EXTRACT_SIGNALS_PROMPT),
-            MessagesPlaceholder("messages"),
-        ]
+        prefix_cached_messages(EXTRACT_SIGNALS_LITE_PROMPT, EXTRACT_SIGNALS_LITE_INPUTS)
+        if deterministic
+        else prefix_cached_messages(EXTRACT_SIGNALS_PROMPT, EXTRACT_SIGNALS_INPUTS)
     )
 
     # Keep this while you iterate; it's tolerant to schema quirks.
     # Once stable, you can try removing method="function_calling" to use strict structured outputs.
-    model = llm.with_structured_output(ExtractSignalsModel, method="function_calling")
-    chain = prompt | model
+    models = routed_chains(
+        llm, "intake", lambda m: m.with_structured_output(schema, method="function_calling", include_raw=True)
+    )
 
-    @observe
-    def extract_signals(state: IntakeState) -> Dict[str, Any]:
+    def steps(state: IntakeState) -> Steps:
         user_messages = state.get("messages")
         if not isinstance(user_messages, list) or not user_messages:
             return {
@@ -112,28 +158,45 @@ def make_extract_signals_node(llm):
         language = state.get("language", None)
         locale = state.get("locale", None)
 
+        variables = {
+            "messages": window_messages(state, "extract_signals"),
+            "normalized_query": normalized_query,
+            "constraints": constraints,
+            "guardrails": guardrails,
+            "clarification": clarification,
+            "language": language,
+            "locale": locale,
+        }
+        if deterministic:
+            scan = scan_messages(user_messages)
+            variables.update(
+                messages=compact_messages(variables["messages"]),
+                artifact_flags=scan.artifact_flags,
+                literal_terms=scan.literal_terms,
+            )
+
         try:
             # Use direct invocation instead of | pipe for better testability and stability with mocks
-            prompt_val = prompt.invoke(
-                {
-                    "messages": user_messages,
-                    "normalized_query": normalized_query,
-                    "constraints": constraints,
-                    "guardrails": guardrails,
-                    "clarification": clarification,
-                    "language": language,
-                    "locale": locale,
-                }
-            )
-            raw = model.invoke(prompt_val)
+            prompt_val = prompt.invoke(variables)
+            raw = structured_data((yield invoke_call(models.for_state(state), prompt_val)))
 
             # Support both dict and Pydantic object (for testing and LLM variation)
-            if isinstance(raw, ExtractSignalsModel):
-                result = raw
-            elif hasattr(raw, "model_dump"):  # Handle potential duck-typing/other models
-                result = ExtractSignalsModel.model_validate(raw.model_dump())
+            if isinstance(raw, schema):
+                parsed = raw
+            else:
+                data = raw.model_dump() if hasattr(raw, "model_dump") else raw  # duck-typing/other models
+                if deterministic and isinstance(data, dict) and isinstance(data.get("signals"), dict):
+                    # Models sometimes echo the pre-extracted fields; they are overwritten below anyway.
+                    lite = {k: v for k, v in data["signals"].items() if k in LiteSignalsModel.model_fields}
+                    data = {**data, "signals": lite}
+                parsed = validate_with_repair(schema, data, node="extract_signals")
+
+            if deterministic:
+                data = parsed.model_dump()
+                data["signals"].update(artifact_flags=scan.artifact_flags, literal_terms=scan.literal_terms)
+                result = ExtractSignalsModel.model_validate(data)
             else:
-                result = ExtractSignalsModel.model_validate(raw)
+                result = parsed
 
         except ValidationError as e:
             return {
@@ -160,13 +223,14 @@ def make_extract_signals_node(llm):
                 ]
             }
 
-        # Return JSON-serializable values into LangGraph state
-        return {
-            "user_intent": result.user_intent,
-            "retrieval_intent": result.retrieval_intent,
-            "answerability": result.answerability,
-            "complexity_flags": result.complexity_flags,
-            "signals": result.signals.model_dump(),
-        }
+        return signals_updates(result)
+
+    @observe
+    def extract_signals(state: IntakeState) -> Dict[str, Any]:
+        return run_sync(steps(state))
+
+    @observe
+    async def aextract_signals(state: IntakeState) -> Dict[str, Any]:
+        return await run_async(steps(state))
 
-    return extract_signals
+    return with_async(extract_signals, aextract_signals)
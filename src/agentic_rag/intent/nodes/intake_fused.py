@@ -0,0 +1,147 @@
+# src/agentic_rag/intent/nodes/intake_fused.py
+
+from __future__ import annotations
+
+import logging
+import os
+from typing import Any, Dict, List, Optional
+
+from langchain_core.prompts import ChatPromptTemplate
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
+
+from agentic_rag.aio import Steps, invoke_call, run_async, run_sync, with_async
+from agentic_rag.context import window_messages
+from agentic_rag.intent.nodes.extract_signals import ExtractSignalsModel, SignalsModel, signals_updates
+from agentic_rag.intent.nodes.normalize_gate import NormalizeModel, normalize_updates
+from agentic_rag.intent.prompts.intake_fused import INTAKE_FUSED_PROMPT
+from agentic_rag.intent.state import (
+    Answerability,
+    Clarification,
+    ComplexityFlag,
+    Constraints,
+    Guardrails,
+    IntakeState,
+    RetrievalIntent,
+    UserIntent,
+)
+from agentic_rag.model import routed_chains
+from agentic_rag.prompt_layout import prefix_cached_messages
+from agentic_rag.repair import structured_data, validate_with_repair
+
+logger = logging.getLogger(__name__)
+
+OBSERVE_ENABLED = os.getenv("LANGFUSE_ENABLED", "1") == "1"
+
+if OBSERVE_ENABLED:
+    try:
+        from langfuse import observe
+    except ImportError:
+
+        def observe(fn=None, **kwargs):
+            return fn if fn else lambda f: f
+
+else:
+
+    def observe(fn=None, **kwargs):
+        def _wrap(f):
+            return f
+
+        return _wrap(fn) if fn else _wrap
+
+
+class IntakeFusedModel(BaseModel):
+    """NormalizeModel + ExtractSignalsModel in one schema.
+
+    Field order matters: normalization fields come first so the model commits to them before
+    classifying, mirroring the two-step path where extract_signals sees normalize_gate output.
+    """
+
+    model_config = ConfigDict(extra="forbid")
+
+    # Part A (NormalizeModel)
+    normalized_query: str = Field(..., min_length=1)
+    constraints: Constraints = Field(default_factory=dict)
+    guardrails: Guardrails = Field(default_factory=dict)
+    clarification: Clarification = Field(default_factory=dict)
+    language: Optional[str] = None
+    locale: Optional[str] = None
+
+    # Part B (ExtractSignalsModel)
+    user_intent: UserIntent
+    retrieval_intent: RetrievalIntent
+    answerability: Answerability
+    complexity_flags: List[ComplexityFlag] = Field(default_factory=list)
+    signals: SignalsModel = Field(default_factory=SignalsModel)
+
+    def split(self) -> tuple[NormalizeModel, ExtractSignalsModel]:
+        """Per-node models, so the fused path writes exactly what the two-step path writes."""
+        normalize = NormalizeModel.model_validate(self.model_dump(include=set(NormalizeModel.model_fields)))
+        extract = ExtractSignalsModel.model_validate(self.model_dump(include=set(ExtractSignalsModel.model_fields)))
+        return normalize, extract
+
+
+def make_intake_fused_node(llm):
+    prompt = ChatPromptTemplate.from_messages(prefix_cached_messages(INTAKE_FUSED_PROMPT))
+
+    models = routed_chains(
+        llm,
+        "intake",
+        lambda m: m.with_structured_output(IntakeFusedModel, method="function_calling", include_raw=True),
+    )
+
+    def steps(state: IntakeState) -> Steps:
+        user_messages = state.get("messages")
+        if not isinstance(user_messages, list) or not user_messages:
+            return {
+                "errors": [
+                    {
+                        "node": "intake_fused",
+                        "type": "schema_validation",
+                        "message": "Missing or invalid 'messages' in state (expected non-empty list).",
+                        "retryable": False,
+                        "details": {"messages_type": str(type(user_messages))},
+                    }
+                ]
+            }
+
+        try:
+            prompt_val = prompt.invoke({"messages": window_messages(state, "intake_fused")})
+            raw = structured_data((yield invoke_call(models.for_state(state), prompt_val)))
+            result = validate_with_repair(IntakeFusedModel, raw, node="intake_fused")
+            normalize, extract = result.split()
+        except ValidationError as e:
+            return {
+                "errors": [
+                    {
+                        "node": "intake_fused",
+                        "type": "model_output_parse",
+                        "message": "Structured output failed validation.",
+                        "retryable": True,
+                        "details": {"validation_errors": e.errors()},
+                    }
+                ]
+            }
+        except Exception as e:
+            return {
+                "errors": [
+                    {
+                        "node": "intake_fused",
+                        "type": "runtime_error",
+                        "message": str(e),
+                        "retryable": True,
+                        "details": None,
+                    }
+                ]
+            }
+
+        return {**normalize_updates(normalize), **signals_updates(extract)}
+
+    @observe
+    def intake_fused(state: IntakeState) -> Dict[str, Any]:
+        return run_sync(steps(state))
+
+    @observe
+    async def aintake_fused(state: IntakeState) -> Dict[str, Any]:
+        return await run_async(steps(state))
+
+    return with_async(intake_fused, aintake_fused)
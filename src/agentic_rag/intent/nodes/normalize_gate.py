@@ -6,11 +6,17 @@ import logging
 import os
 from typing import Any, Dict, List, Optional
 
-from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+from langchain_core.prompts import ChatPromptTemplate
 from pydantic import BaseModel, Field, ValidationError
 
-from agentic_rag.intent.prompts.normalize import NORMALIZE_PROMPT
+from agentic_rag.aio import Steps, invoke_call, run_async, run_sync, with_async
+from agentic_rag.context import window_messages
+from agentic_rag.intent.prepass import run_prepass
+from agentic_rag.intent.prompts.normalize import NORMALIZE_PREPASS_PROMPT, NORMALIZE_PROMPT
 from agentic_rag.intent.state import Clarification, Constraints, Guardrails, IntakeState
+from agentic_rag.model import routed_chains
+from agentic_rag.prompt_layout import prefix_cached_messages
+from agentic_rag.repair import structured_data, validate_with_repair
 
 logger = logging.getLogger(__name__)
 
@@ -41,23 +47,54 @@ class NormalizeModel(BaseModel):
     locale: Optional[str] = None
 
 
-def make_normalize_gate_node(llm):
-    # Build prompt once (faster, less error-prone)
+class NormalizeLiteModel(BaseModel):
+    """Fields the LLM still fills when the local pre-pass supplies pii_present/language/locale."""
+
+    normalized_query: str = Field(..., min_length=1)
+    constraints: Constraints = Field(default_factory=dict)
+    guardrails: Guardrails = Field(default_factory=dict)
+    clarification: Clarification = Field(default_factory=dict)
+
+
+def normalize_updates(result: NormalizeModel) -> Dict[str, Any]:
+    """IntakeState fields owned by Node 1 (shared with the fused intake node)."""
+    out: Dict[str, Any] = {
+        "normalized_query": result.normalized_query,
+        "constraints": result.constraints,
+        "guardrails": result.guardrails,
+        "clarification": result.clarification,
+        "intake_version": "intake_v1",  # Track version for evaluation stability
+    }
+
+    # Include only if present (keeps state tidy)
+    if result.language is not None:
+        out["language"] = result.language
+    if result.locale is not None:
+        out["locale"] = result.locale
+
+    return out
+
+
+def make_normalize_gate_node(llm, prepass: bool = False):
+    """Build Node 1.
+
+    With ``prepass=True``, guardrails.pii_present, language and locale come from the local
+    detectors in intent/prepass.py and the LLM fills the smaller NormalizeLiteModel.
+    """
+    schema = NormalizeLiteModel if prepass else NormalizeModel
+
+    # Build prompt once (faster, less error-prone); static system prompt first for prefix caching
     prompt = ChatPromptTemplate.from_messages(
-        [
-            ("system", NORMALIZE_PROMPT),
-            MessagesPlaceholder("messages"),
-        ]
+        prefix_cached_messages(NORMALIZE_PREPASS_PROMPT, ("pii_present",))
+        if prepass
+        else prefix_cached_messages(NORMALIZE_PROMPT)
     )
 
-    # Bind structured output to the node-specific schema
-    model = llm.with_structured_output(NormalizeModel)
+    # Bind structured output to the node-specific schema (per model tier when llm is a ModelRegistry)
+    # include_raw: invalid tool-call arguments reach validate_with_repair instead of raising
+    models = routed_chains(llm, "intake", lambda m: m.with_structured_output(schema, include_raw=True))
 
-    # Compose once
-    chain = prompt | model
-
-    @observe
-    def intake_normalize(state: IntakeState) -> Dict[str, Any]:
+    def steps(state: IntakeState) -> Steps:
         user_messages = state.get("messages")
 
         if not isinstance(user_messages, list) or len(user_messages) == 0:
@@ -73,18 +110,30 @@ def make_normalize_gate_node(llm):
                 ]
             }
 
+        variables: Dict[str, Any] = {"messages": window_messages(state, "normalize_gate")}
+        if prepass:
+            detected = run_prepass(user_messages, state.get("user_context_info"))
+            variables["pii_present"] = detected.pii_present
+
         try:
             # Use direct invocation instead of | pipe for better testability and stability with mocks
-            prompt_val = prompt.invoke({"messages": user_messages})
-            raw = model.invoke(prompt_val)
-
-            # Support both dict and Pydantic object
-            if isinstance(raw, NormalizeModel):
-                result = raw
-            elif hasattr(raw, "model_dump"):  # Handle potential duck-typing/other models
-                result = NormalizeModel.model_validate(raw.model_dump())
+            prompt_val = prompt.invoke(variables)
+            raw = structured_data((yield invoke_call(models.for_state(state), prompt_val)))
+
+            # Supports both dict and Pydantic object; common violations are repaired locally
+            parsed = validate_with_repair(schema, raw, node="normalize_gate")
+
+            if prepass:
+                result = NormalizeModel(
+                    normalized_query=parsed.normalized_query,
+                    constraints=parsed.constraints,
+                    guardrails={**parsed.guardrails, "pii_present": detected.pii_present},
+                    clarification=parsed.clarification,
+                    language=detected.language,
+                    locale=detected.locale,
+                )
             else:
-                result = NormalizeModel.model_validate(raw)
+                result = parsed
         except ValidationError as e:
             # model output didn't match schema
             return {
@@ -112,21 +161,14 @@ def make_normalize_gate_node(llm):
                 ]
             }
 
-        # Return only fields owned by Node 1
-        out: Dict[str, Any] = {
-            "normalized_query": result.normalized_query,
-            "constraints": result.constraints,
-            "guardrails": result.guardrails,
-            "clarification": result.clarification,
-            "intake_version": "intake_v1",  # Track version for evaluation stability
-        }
+        return normalize_updates(result)
 
-        # Include only if present (keeps state tidy)
-        if result.language is not None:
-            out["language"] = result.language
-        if result.locale is not None:
-            out["locale"] = result.locale
+    @observe
+    def intake_normalize(state: IntakeState) -> Dict[str, Any]:
+        return run_sync(steps(state))
 
-        return out
+    @observe
+    async def aintake_normalize(state: IntakeState) -> Dict[str, Any]:
+        return await run_async(steps(state))
 
-    return intake_normalize
+    return with_async(intake_normalize, aintake_normalize)
@@ -0,0 +1,344 @@
+# src/agentic_rag/intent/prepass.py
+"""Local intake pre-pass: PII detection and language identification.
+
+``guardrails.pii_present``, ``language`` and ``locale`` do not need an LLM. PII is found with
+validated regexes (emails, phone numbers, IBANs with the mod-97 check, card numbers with the
+Luhn check, US SSNs). Language comes from the Unicode script for non-Latin text and from a
+character-trigram naive Bayes model over small built-in seed texts for Latin-script languages.
+With the pre-pass enabled, normalize_gate prefills these fields and the prompt skips them.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+import unicodedata
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from agentic_rag.intent.artifacts import user_text
+
+MIN_LANGUAGE_CHARS = 12
+DEFAULT_LANGUAGE_MARGIN = 0.15  # min normalised log-likelihood gap between the top two languages
+
+# -------------------------
+# PII
+# -------------------------
+
+_EMAIL_RE = re.compile(r"(?<![\w.+-])[\w.+-]+@[A-Za-z0-9-]+(?:\.[A-Za-z0-9-]+)*\.[A-Za-z]{2,}\b")
+_IBAN_RE = re.compile(r"\b[A-Z]{2}\d{2}(?: ?[A-Z0-9]{4}){2,7}(?: ?[A-Z0-9]{1,4})?\b")
+_CARD_RE = re.compile(r"(?<![\d-])\d(?:[ -]?\d){12,18}(?![\d-])")
+_SSN_RE = re.compile(r"(?<![\d-])(?!000|666|9\d\d)\d{3}-(?!00)\d{2}-(?!0000)\d{4}(?![\d-])")
+# Needs a leading "+", parentheses or separators: bare digit runs are usually order/ticket numbers.
+_PHONE_RE = re.compile(r"(?<![\w+])(?:\+\d{1,3}[ -]?)?(?:\(\d{1,4}\)[ -]?)?\d{2,4}(?:[ -]\d{2,8}){1,4}(?![\w-])")
+
+
+@dataclass(frozen=True)
+class PIIMatch:
+    kind: str  # email | iban | card | ssn | phone
+    start: int
+    end: int
+    text: str
+
+
+def _iban_valid(candidate: str) -> bool:
+    s = candidate.replace(" ", "")
+    if not 15 <= len(s) <= 34:
+        return False
+    digits = "".join(str(int(c, 36)) for c in s[4:] + s[:4])
+    return int(digits) % 97 == 1
+
+
+def _luhn_valid(candidate: str) -> bool:
+    digits = [int(c) for c in candidate if c.isdigit()]
+    if not 13 <= len(digits) <= 19:
+        return False
+    total = 0
+    for i, d in enumerate(reversed(digits)):
+        if i % 2:
+            d *= 2
+            if d > 9:
+                d -= 9
+        total += d
+    return total % 10 == 0
+
+
+def _is_timestamp(groups: List[str]) -> bool:
+    """``YYYY MM DD [HH [MM [SS]]]`` with plausible field ranges."""
+    if not 3 <= len(groups) <= 6 or len(groups[0]) != 4 or any(len(g) != 2 for g in groups[1:]):
+        return False
+    year, *rest = (int(g) for g in groups)
+    limits = (12, 31, 23, 59, 59)
+    return 1900 <= year <= 2099 and all(lo <= v <= hi for v, lo, hi in zip(rest, (1, 1, 0, 0, 0), limits))
+
+
+def _phone_valid(candidate: str) -> bool:
+    digits = sum(c.isdigit() for c in candidate)
+    if not 9 <= digits <= 15:
+        return False
+    if candidate.startswith("+") or "(" in candidate:
+        return True
+    # Without a country code or area-code parens, require the separators of a dialable number,
+    # and skip dates/times written with spaces or dashes ("2024 03 15 10 30")
+    groups = re.split(r"[ -]", candidate)
+    return len(groups) >= 3 and not _is_timestamp(groups)
+
+
+# Earlier kinds win when spans overlap (an IBAN also looks like a long phone number).
+_PII_DETECTORS: Tuple[Tuple[str, "re.Pattern[str]", Any], ...] = (
+    ("email", _EMAIL_RE, None),
+    ("iban", _IBAN_RE, _iban_valid),
+    ("card", _CARD_RE, _luhn_valid),
+    ("ssn", _SSN_RE, None),
+    ("phone", _PHONE_RE, _phone_valid),
+)
+
+
+def detect_pii(text: str) -> List[PIIMatch]:
+    """Non-overlapping PII matches in ``text``, ordered by position."""
+    if not text:
+        return []
+    taken: List[Tuple[int, int]] = []
+    matches: List[PIIMatch] = []
+    for kind, pattern, valid in _PII_DETECTORS:
+        for m in pattern.finditer(text):
+            start, end = m.span()
+            if valid is not None and not valid(m.group(0)):
+                continue
+            if any(start < e and s < end for s, e in taken):
+                continue
+            taken.append((start, end))
+            matches.append(PIIMatch(kind=kind, start=start, end=end, text=m.group(0)))
+    matches.sort(key=lambda p: p.start)
+    return matches
+
+
+# -------------------------
+# Language identification
+# -------------------------
+
+# Script -> language for scripts that (practically) identify one language.
+_SCRIPT_LANGUAGES = {
+    "HIRAGANA": "ja",
+    "KATAKANA": "ja",
+    "HANGUL": "ko",
+    "CJK": "zh",
+    "ARABIC": "ar",
+    "HEBREW": "he",
+    "GREEK": "el",
+    "DEVANAGARI": "hi",
+    "THAI": "th",
+    "CYRILLIC": "ru",
+}
+
+# Seed texts for the Latin-script trigram profiles: short, everyday support/documentation prose.
+_SEED_TEXTS: Dict[str, str] = {
+    "en": (
+        "How do I configure the service for production? I need the steps to set up access and what "
+        "the best practices are. The deployment fails with an error when we update the settings. "
+        "Can you explain what this means and which document describes the process for our team? "
+        "Please summarize the policy and tell me whether it is still valid this year."
+    ),
+    "de": (
+        "Wie konfiguriere ich den Dienst für die Produktion? Ich brauche die Schritte zur Einrichtung "
+        "des Zugriffs und die empfohlenen Vorgehensweisen. Die Bereitstellung schlägt mit einem Fehler "
+        "fehl, wenn wir die Einstellungen ändern. Kannst du erklären, was das bedeutet und welches "
+        "Dokument den Prozess für unser Team beschreibt? Bitte fasse die Richtlinie zusammen und sag "
+        "mir, ob sie in diesem Jahr noch gültig ist."
+    ),
+    "fr": (
+        "Comment configurer le service pour la production ? J'ai besoin des étapes pour mettre en place "
+        "l'accès et des bonnes pratiques. Le déploiement échoue avec une erreur lorsque nous modifions "
+        "les paramètres. Peux-tu expliquer ce que cela signifie et quel document décrit le processus "
+        "pour notre équipe ? Merci de résumer la politique et de me dire si elle est toujours valable "
+        "cette année."
+    ),
+    "es": (
+        "¿Cómo configuro el servicio para producción? Necesito los pasos para configurar el acceso y "
+        "cuáles son las mejores prácticas. El despliegue falla con un error cuando actualizamos la "
+        "configuración. ¿Puedes explicar qué significa esto y qué documento describe el proceso para "
+        "nuestro equipo? Por favor resume la política y dime si todavía es válida este año."
+    ),
+    "it": (
+        "Come configuro il servizio per la produzione? Ho bisogno dei passaggi per impostare l'accesso "
+        "e delle migliori pratiche. Il rilascio non riesce con un errore quando aggiorniamo le "
+        "impostazioni. Puoi spiegare cosa significa e quale documento descrive il processo per il "
+        "nostro gruppo? Per favore riassumi la politica e dimmi se è ancora valida quest'anno."
+    ),
+    "pt": (
+        "Como configuro o serviço para produção? Preciso dos passos para configurar o acesso e quais "
+        "são as melhores práticas. A implantação falha com um erro quando atualizamos as "
+        "configurações. Você pode explicar o que isso significa e qual documento descreve o processo "
+        "para a nossa equipe? Por favor resuma a política e diga se ela ainda é válida este ano."
+    ),
+    "nl": (
+        "Hoe configureer ik de dienst voor productie? Ik heb de stappen nodig om de toegang in te "
+        "stellen en wat de beste werkwijzen zijn. De uitrol mislukt met een fout wanneer we de "
+        "instellingen bijwerken. Kun je uitleggen wat dit betekent en welk document het proces voor "
+        "ons team beschrijft? Vat het beleid samen en vertel me of het dit jaar nog geldig is."
+    ),
+    "pl": (
+        "Jak skonfigurować usługę do produkcji? Potrzebuję kroków, aby ustawić dostęp, oraz dobrych "
+        "praktyk. Wdrożenie kończy się błędem, gdy zmieniamy ustawienia. Czy możesz wyjaśnić, co to "
+        "oznacza i który dokument opisuje ten proces dla naszego zespołu? Proszę streść zasady i "
+        "powiedz mi, czy nadal obowiązują w tym roku."
+    ),
+}
+
+# Function words: the strongest cue for short queries, where trigram evidence is thin.
+_STOPWORDS: Dict[str, frozenset] = {
+    lang: frozenset(words.split())
+    for lang, words in {
+        "en": "the a an and or of to in on for with is are was be do does how what which who why where when "
+        "can i we you it this that my our from not should",
+        "de": "der die das den dem des ein eine einen und oder ist sind wie was wer warum wo wann ich wir du "
+        "nicht mit für von zu im auf kann können bei sich es",
+        "fr": "le la les un une des et ou est sont comment que qui quoi pourquoi où quand je nous vous ne pas "
+        "avec pour du dans sur ce cette mon notre",
+        "es": "el la los las un una y o es son cómo qué quién por qué dónde cuándo yo nosotros no con para de "
+        "del en se lo mi nuestro",
+        "it": "il lo la gli le un una e o è sono come che chi perché dove quando io noi non con per di del "
+        "della nel mio nostro",
+        "pt": "o a os as um uma e ou é são como que quem por onde quando eu nós não com para de do da no na "
+        "em se meu nosso posso",
+        "nl": "de het een en of is zijn hoe wat wie waarom waar wanneer ik wij je niet met voor van te in op "
+        "kan dit dat mijn ons",
+        "pl": "i w na z do jest są jak co kto dlaczego gdzie kiedy ja my nie się dla od to czy mogę mój nasz",
+    }.items()
+}
+_STOPWORD_WEIGHT = 2.0
+
+_LETTERS_RE = re.compile(r"[^\W\d_]+", re.UNICODE)
+
+
+def _trigrams(text: str) -> List[str]:
+    grams: List[str] = []
+    for word in _LETTERS_RE.findall(text.lower()):
+        padded = f" {word} "
+        grams.extend(padded[i : i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+@lru_cache(maxsize=1)
+def _profiles() -> Dict[str, Tuple[Dict[str, float], float]]:
+    """Per-language trigram log-probabilities (add-one smoothed) and the unseen-trigram log-prob."""
+    out: Dict[str, Tuple[Dict[str, float], float]] = {}
+    vocab = {g for text in _SEED_TEXTS.values() for g in _trigrams(text)}
+    for lang, text in _SEED_TEXTS.items():
+        counts = Counter(_trigrams(text))
+        denom = sum(counts.values()) + len(vocab) + 1
+        out[lang] = ({g: math.log((c + 1) / denom) for g, c in counts.items()}, math.log(1 / denom))
+    return out
+
+
+def _script(ch: str) -> Optional[str]:
+    try:
+        name = unicodedata.name(ch)
+    except ValueError:
+        return None
+    head = name.split(" ", 1)[0]
+    return head if head in _SCRIPT_LANGUAGES or head == "LATIN" else None
+
+
+@dataclass(frozen=True)
+class LanguageGuess:
+    language: Optional[str]
+    confidence: float
+
+
+def detect_language(text: str, *, margin: float = DEFAULT_LANGUAGE_MARGIN) -> LanguageGuess:
+    """Best-effort ISO 639-1 language code, or ``None`` when not confidently detectable."""
+    scripts = Counter(s for s in map(_script, text) if s)
+    if sum(scripts.values()) < MIN_LANGUAGE_CHARS:
+        return LanguageGuess(None, 0.0)
+
+    if scripts.get("HIRAGANA") or scripts.get("KATAKANA"):
+        scripts["HIRAGANA"] += scripts.pop("CJK", 0)  # Japanese mixes kana with kanji
+    script, count = scripts.most_common(1)[0]
+    if script != "LATIN":
+        return LanguageGuess(_SCRIPT_LANGUAGES[script], count / sum(scripts.values()))
+
+    words = _LETTERS_RE.findall(text.lower())
+    grams = _trigrams(text)
+    scores = []
+    for lang, (logp, unseen) in _profiles().items():
+        trigram_score = sum(logp.get(g, unseen) for g in grams) / len(grams)
+        stop_ratio = sum(w in _STOPWORDS[lang] for w in words) / len(words)
+        scores.append((trigram_score + _STOPWORD_WEIGHT * stop_ratio, lang))
+    scores.sort(reverse=True)
+    gap = scores[0][0] - scores[1][0]
+    if gap < margin:
+        return LanguageGuess(None, 0.0)
+    return LanguageGuess(scores[0][1], min(1.0, gap))
+
+
+def locale_for(language: Optional[str], user_context_info: Optional[Dict[str, Any]] = None) -> Optional[str]:
+    """BCP 47 locale from user context (``locale``, or ``country`` + detected language)."""
+    ctx = user_context_info or {}
+    if isinstance(ctx.get("locale"), str) and ctx["locale"]:
+        return ctx["locale"].replace("_", "-")
+    country = ctx.get("country")
+    if language and isinstance(country, str) and len(country) == 2:
+        return f"{language}-{country.upper()}"
+    return None
+
+
+# -------------------------
+# Pre-pass
+# -------------------------
+
+
+@dataclass
+class PrepassResult:
+    pii: List[PIIMatch] = field(default_factory=list)
+    language: Optional[str] = None
+    language_confidence: float = 0.0
+    locale: Optional[str] = None
+
+    @property
+    def pii_present(self) -> bool:
+        return bool(self.pii)
+
+    @property
+    def pii_kinds(self) -> List[str]:
+        return sorted({p.kind for p in self.pii})
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serialisable form for eval artifacts."""
+        return {**asdict(self), "pii_present": self.pii_present, "pii_kinds": self.pii_kinds}
+
+
+def _last_user_text(messages: Sequence[Any]) -> str:
+    for m in reversed(list(messages or [])):
+        if user_text([m]):
+            return user_text([m])
+    return ""
+
+
+def run_prepass(
+    messages: Union[str, Sequence[Any]],
+    user_context_info: Optional[Dict[str, Any]] = None,
+) -> PrepassResult:
+    """PII over all user messages; language from the last user message (the primary request)."""
+    if isinstance(messages, str):
+        messages = [{"role": "user", "content": messages}]
+    guess = detect_language(_last_user_text(messages))
+    return PrepassResult(
+        pii=detect_pii(user_text(messages)),
+        language=guess.language,
+        language_confidence=guess.confidence,
+        locale=locale_for(guess.language, user_context_info),
+    )
+
+
+def run_prepass_batch(items: Iterable[Union[str, Sequence[Any], Dict[str, Any]]]) -> List[PrepassResult]:
+    """Pre-pass many inputs in order (eval runs). Items are text, message lists or case/state dicts."""
+    results: List[PrepassResult] = []
+    for item in items:
+        if isinstance(item, dict):
+            results.append(run_prepass(item.get("messages") or [], item.get("user_context_info")))
+        else:
+            results.append(run_prepass(item))
+    return results
@@ -1,11 +1,28 @@
 """Prompts for intent intake nodes."""
 
-from agentic_rag.intent.prompts.extract_signals import EXTRACT_SIGNALS_PROMPT, EXTRACT_SIGNALS_PROMPT_VERSION
-from agentic_rag.intent.prompts.normalize import NORMALIZE_PROMPT, NORMALIZE_PROMPT_VERSION
+from agentic_rag.intent.prompts.extract_signals import (
+    EXTRACT_SIGNALS_LITE_PROMPT,
+    EXTRACT_SIGNALS_LITE_PROMPT_VERSION,
+    EXTRACT_SIGNALS_PROMPT,
+    EXTRACT_SIGNALS_PROMPT_VERSION,
+)
+from agentic_rag.intent.prompts.intake_fused import INTAKE_FUSED_PROMPT, INTAKE_FUSED_PROMPT_VERSION
+from agentic_rag.intent.prompts.normalize import (
+    NORMALIZE_PREPASS_PROMPT,
+    NORMALIZE_PREPASS_PROMPT_VERSION,
+    NORMALIZE_PROMPT,
+    NORMALIZE_PROMPT_VERSION,
+)
 
 __all__ = [
     "NORMALIZE_PROMPT",
     "NORMALIZE_PROMPT_VERSION",
+    "NORMALIZE_PREPASS_PROMPT",
+    "NORMALIZE_PREPASS_PROMPT_VERSION",
     "EXTRACT_SIGNALS_PROMPT",
     "EXTRACT_SIGNALS_PROMPT_VERSION",
+    "EXTRACT_SIGNALS_LITE_PROMPT",
+    "EXTRACT_SIGNALS_LITE_PROMPT_VERSION",
+    "INTAKE_FUSED_PROMPT",
+    "INTAKE_FUSED_PROMPT_VERSION",
 ]
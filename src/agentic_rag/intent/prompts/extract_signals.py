@@ -20,19 +20,20 @@ You must return a JSON object with EXACTLY these keys:
 No extra keys. No commentary.
 
 --------------------------------------------
-INPUTS (provided to you as variables)
+INPUTS
 --------------------------------------------
 
-Normalized intake outputs (from the previous node):
-- normalized_query: {normalized_query}
-- constraints: {constraints}
-- guardrails: {guardrails}
-- clarification: {clarification}
-- language: {language}
-- locale: {locale}
-
 Conversation messages:
-- You also receive the full messages list (the last user message is the primary request).
+- You receive the messages list (the last user message is the primary request).
+
+Normalized intake outputs (from the previous node), as JSON in the final system message after the
+conversation:
+- normalized_query
+- constraints
+- guardrails
+- clarification
+- language
+- locale
 
 --------------------------------------------
 TASKS
@@ -138,4 +139,25 @@ Return ONLY a valid JSON object that matches the schema exactly. No markdown. No
 
 """
 
-EXTRACT_SIGNALS_PROMPT_VERSION = "1.0"
+EXTRACT_SIGNALS_PROMPT_VERSION = "1.1"
+
+# Variant used when artifact_flags / literal_terms are pre-extracted deterministically
+# (intent/artifacts.py): the model only fills entities and acronyms under signals.
+_ARTIFACT_SIGNALS_SECTION = EXTRACT_SIGNALS_PROMPT[
+    EXTRACT_SIGNALS_PROMPT.index("signals.artifact_flags:") : EXTRACT_SIGNALS_PROMPT.index("Consistency requirements:")
+]
+
+EXTRACT_SIGNALS_LITE_PROMPT = EXTRACT_SIGNALS_PROMPT.replace(
+    _ARTIFACT_SIGNALS_SECTION,
+    """signals.artifact_flags / signals.literal_terms:
+- Already extracted deterministically; do NOT return them. For context only, they are listed as
+  artifact_flags and literal_terms in the inputs JSON.
+- Long stack traces in the messages may be shortened; omitted frames are marked "trace lines omitted".
+
+""",
+).replace(
+    "Return a JSON object with these keys (exact spelling).",
+    "Return a JSON object with ONLY the keys entities and acronyms (exact spelling).",
+)
+
+EXTRACT_SIGNALS_LITE_PROMPT_VERSION = "1.1"
@@ -99,3 +99,15 @@ Be precise, minimal, and cautious.
 """
 
 NORMALIZE_PROMPT_VERSION = "1.0"
+
+# Variant used when the local pre-pass (intent/prepass.py) supplies pii_present, language and
+# locale: the model is told not to spend output on them.
+NORMALIZE_PREPASS_PROMPT = NORMALIZE_PROMPT.replace(
+    "- pii_present: true | false\n",
+    "- pii_present: do NOT return it (detected locally; given as pii_present in the inputs JSON)\n",
+).replace(
+    "### 5. language / locale (optional)\nOnly include if confidently detectable.",
+    "### 5. language / locale\nDo NOT return them; they are detected locally.",
+)
+
+NORMALIZE_PREPASS_PROMPT_VERSION = "1.1"
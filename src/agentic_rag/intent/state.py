@@ -6,6 +6,8 @@ from langgraph.graph import StateGraph
 from langgraph.graph.message import add_messages
 from typing_extensions import TypedDict
 
+from agentic_rag.usage import add_ledger
+
 
 # reducer to append errors across nodes
 def add_errors(existing: Optional[List[Dict[str, Any]]], new: Optional[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
@@ -191,6 +193,8 @@ class IntakeState(TypedDict, total=False):
     user_context_info: Optional[Dict[str, Any]]  # optional from app (could be graph API, job title, ACL)
     # user_message: str
     conversation_summary: Optional[str]  # or a pointer/id, depending on your architecture
+    summarized_turns: int  # leading turns covered by conversation_summary (agentic_rag/context.py)
+    model_tier: Optional[str]  # explicit model tier; else chosen from constraints (agentic_rag/model.py)
 
     # Node 1: Normalize + Gate
     normalized_query: str
@@ -218,10 +222,17 @@ class IntakeState(TypedDict, total=False):
 
     # Meta for logging/traceability
     intake_version: str  # eg "intake_v1"
+    intake_cache_hit: bool  # set only when the graph is built with an IntakeCache
+    intake_fast_path: bool  # True when the local classifier replaced the extract_signals LLM call
     debug_notes: Optional[str]  # avoid putting chain-of-thought here; keep it short
 
     # Planner output (added to support planner graph)
     plan: Optional[Dict[str, Any]]  # PlannerState from planner subgraph
+    planner_fast_path: bool  # True when a TemplatePlanner template replaced the LLM planner
+    prefetched_round: Optional[Dict[str, Any]]  # round-0 retrieval started by the streaming planner
+
+    # Per-call token usage (agentic_rag/usage.py)
+    token_ledger: Annotated[List[Dict[str, Any]], add_ledger]
 
     # Error handling (APPEND semantics across nodes)
     errors: Annotated[List[IntakeError], add_errors]
@@ -0,0 +1,253 @@
+# src/agentic_rag/llm_cache.py
+"""Persistent response cache for temperature-0 chat model calls.
+
+The structured-output nodes run at ``temperature=0.0``, so the same prompt and input give
+effectively the same output; eval reruns and repeated production queries can reuse it.
+
+``ResponseCache`` is a langchain ``BaseCache`` backed by a SQLite file. Chat models consult it on
+``invoke``/``ainvoke`` when it is set as their ``cache`` (``with_response_cache``). The key hashes
+langchain's ``llm_string`` (model id, temperature, max_tokens and the bound tool schema/tool_choice)
+with the rendered messages, so any change to the prompt, schema or params is a different entry.
+Token streaming (``stream``/``astream``) does not go through the cache.
+
+- Size bound: least recently used entries are evicted past ``max_entries`` or ``max_bytes``.
+- Several worker processes can share one file: WAL mode, a busy timeout and ``BEGIN IMMEDIATE``
+  writes; each process (including forked workers) opens its own connection.
+- Bypass: ``bypass=True``, LLM_RESPONSE_CACHE_BYPASS=1, or ``with bypass_response_cache():`` for
+  the current request. A bypassed lookup misses, and the fresh response replaces the entry.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterator, Optional, Sequence, Union
+
+from langchain_core.caches import BaseCache
+from langchain_core.load import dumps, loads
+
+logger = logging.getLogger(__name__)
+
+RESPONSE_CACHE_VERSION = "llm_response_cache_v1"
+
+DEFAULT_MAX_ENTRIES = 50_000
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+_SCHEMA = (
+    """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    last_used REAL NOT NULL
+)
+""",
+    "CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)",
+)
+
+_bypass: contextvars.ContextVar[bool] = contextvars.ContextVar("llm_response_cache_bypass", default=False)
+
+
+@contextmanager
+def bypass_response_cache() -> Iterator[None]:
+    """Skip cache lookups for calls made in this context (fresh responses are still stored)."""
+    token = _bypass.set(True)
+    try:
+        yield
+    finally:
+        _bypass.reset(token)
+
+
+def response_cache_key(prompt: str, llm_string: str) -> str:
+    """Hash of the rendered messages and the model id/params/tool schema."""
+    h = hashlib.sha256()
+    for part in (RESPONSE_CACHE_VERSION, llm_string, prompt):
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+@dataclass
+class ResponseCacheStats:
+    hits: int = 0
+    misses: int = 0
+    bypassed: int = 0
+    stores: int = 0
+    evicted: int = 0
+    errors: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class ResponseCache(BaseCache):
+    """SQLite-backed, size-bounded LLM response cache; shareable across threads and processes.
+
+    Args:
+        path: SQLite file (parent directories are created).
+        max_entries: Max cached responses; least recently used are evicted first.
+        max_bytes: Max total size of the serialized responses.
+        bypass: Skip lookups (``None`` = LLM_RESPONSE_CACHE_BYPASS env switch, read per lookup).
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        *,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        bypass: Optional[bool] = None,
+    ):
+        if max_entries < 1 or max_bytes < 1:
+            raise ValueError("max_entries and max_bytes must be >= 1")
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.bypass = bypass
+        self.stats = ResponseCacheStats()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid = -1
+        with self._lock:
+            conn = self._connection()
+            for statement in _SCHEMA:
+                conn.execute(statement)
+
+    # -------------------------
+    # Connection handling
+    # -------------------------
+
+    def _connection(self) -> sqlite3.Connection:
+        """This process's connection (callers hold ``_lock``); reopened after a fork."""
+        if self._conn is None or self._pid != os.getpid():
+            # isolation_level=None: explicit transactions, so writes can take the lock up front
+            self._conn = sqlite3.connect(str(self.path), timeout=30.0, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._pid = os.getpid()
+        return self._conn
+
+    def _bypassed(self) -> bool:
+        if _bypass.get():
+            return True
+        if self.bypass is not None:
+            return self.bypass
+        return os.getenv("LLM_RESPONSE_CACHE_BYPASS", "0") == "1"
+
+    # -------------------------
+    # BaseCache
+    # -------------------------
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[Sequence[Any]]:
+        if self._bypassed():
+            with self._lock:
+                self.stats.bypassed += 1
+            return None
+        key = response_cache_key(prompt, llm_string)
+        try:
+            with self._lock:
+                conn = self._connection()
+                row = conn.execute("SELECT value FROM responses WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (time.time(), key))
+            generations = loads(row[0]) if row is not None else None
+        except Exception as e:
+            logger.warning(f"LLM response cache lookup failed: {e}")
+            with self._lock:
+                self.stats.errors += 1
+            return None
+        with self._lock:
+            if generations is None:
+                self.stats.misses += 1
+            else:
+                self.stats.hits += 1
+        for generation in generations or []:
+            # lets token accounting (agentic_rag/usage.py) tell replayed usage from paid usage
+            message = getattr(generation, "message", None)
+            if message is not None:
+                message.response_metadata = {**(message.response_metadata or {}), "response_cache_hit": True}
+        return generations
+
+    def update(self, prompt: str, llm_string: str, return_val: Sequence[Any]) -> None:
+        key = response_cache_key(prompt, llm_string)
+        try:
+            value = dumps(list(return_val))
+        except Exception as e:
+            logger.warning(f"LLM response not cacheable: {e}")
+            return
+        size = len(value.encode("utf-8"))
+        try:
+            with self._lock:
+                conn = self._connection()
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)", (key, value, size, time.time())
+                    )
+                    evicted = self._evict(conn)
+                    conn.execute("COMMIT")
+                except BaseException:
+                    conn.execute("ROLLBACK")
+                    raise
+                self.stats.stores += 1
+                self.stats.evicted += evicted
+        except Exception as e:
+            logger.warning(f"LLM response cache update failed: {e}")
+            with self._lock:
+                self.stats.errors += 1
+
+    def _evict(self, conn: sqlite3.Connection) -> int:
+        """Drop least recently used entries once a bound is exceeded; returns the number dropped.
+
+        Eviction goes down to 90% of both bounds, so a full cache does not evict on every write.
+        """
+        count, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return 0
+        max_entries, max_bytes = max(1, int(self.max_entries * 0.9)), int(self.max_bytes * 0.9)
+        doomed = []
+        for key, size in conn.execute("SELECT key, size FROM responses ORDER BY last_used ASC"):
+            if count <= 1 or (count <= max_entries and total <= max_bytes):
+                break  # the newest entry (the one just written) always stays
+            doomed.append((key,))
+            count -= 1
+            total -= size
+        conn.executemany("DELETE FROM responses WHERE key = ?", doomed)
+        return len(doomed)
+
+    def clear(self, **kwargs: Any) -> None:
+        with self._lock:
+            self._connection().execute("DELETE FROM responses")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(self._connection().execute("SELECT COUNT(*) FROM responses").fetchone()[0])
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None and self._pid == os.getpid():
+                self._conn.close()
+            self._conn = None
+
+
+def with_response_cache(model: Any, cache: Optional[ResponseCache]) -> Any:
+    """``model`` reading through ``cache``; models with a non-zero temperature are returned unchanged."""
+    if cache is None:
+        return model
+    temperature = getattr(model, "temperature", None)
+    if temperature not in (None, 0, 0.0):
+        logger.info(f"Not caching responses of {type(model).__name__} at temperature={temperature}")
+        return model
+    return model.model_copy(update={"cache": cache})
@@ -0,0 +1,544 @@
+# src/agentic_rag/llm_clients.py
+"""Process-wide HTTP clients, rate limiting and key scheduling for LLM calls.
+
+Chat models built by ``get_default_model`` or a ``ModelRegistry`` (agentic_rag/model.py) share the
+process's ``LLMClientManager`` (``get_client_manager()``). Before, each model had its own connection
+pool and every node called the provider on its own:
+
+- Keep-alive pooling: one ``httpx`` client pair (sync and async) serves every OpenAI-compatible chat
+  model, as their ``http_client``/``http_async_client``, so connections are reused across nodes.
+- Rate limiting: each endpoint has token buckets for requests per minute (``rpm``) and tokens per
+  minute (``tpm``). A request is charged its estimated prompt tokens plus its output cap
+  (``max_tokens``), which is how providers count it against TPM. A 429 response pauses the endpoint
+  for its ``retry-after``.
+- Endpoints: several API keys and/or deployments (``base_url`` origins, e.g. Azure OpenAI resources
+  in different regions), each with its own quota. They are used round-robin, and a request goes to
+  the next endpoint with capacity.
+- Priority lanes: waiting requests are served ``interactive`` first, then ``batch``. Batch requests
+  also leave ``batch_headroom`` of each bucket free for interactive ones. Eval and batch runs use
+  ``with llm_priority(BATCH):`` (or LLM_PRIORITY=batch).
+
+Limits apply per process, so processes that share a quota should split ``rpm``/``tpm`` between them.
+Response-cache hits (agentic_rag/llm_cache.py) never reach the HTTP layer and are not charged.
+
+``from_env`` reads these variables:
+- LLM_API_KEYS and LLM_BASE_URLS: comma-separated, paired by position (a single value is shared);
+- LLM_RPM and LLM_TPM: per endpoint;
+- LLM_MAX_CONNECTIONS and LLM_BATCH_HEADROOM.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import heapq
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+import weakref
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import httpx
+from langchain.chat_models import init_chat_model
+
+from agentic_rag.tokens import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+INTERACTIVE = "interactive"
+BATCH = "batch"
+LANES = (INTERACTIVE, BATCH)  # highest priority first
+
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 20
+DEFAULT_KEEPALIVE_EXPIRY = 30.0  # seconds an idle connection is kept
+DEFAULT_TIMEOUT = 120.0  # seconds per request
+DEFAULT_BATCH_HEADROOM = 0.1  # share of each bucket batch requests leave to interactive ones
+DEFAULT_RETRY_AFTER = 1.0  # seconds an endpoint pauses after a 429 without retry-after
+POLL_INTERVAL = 0.05  # max seconds between capacity checks of a waiting request
+
+OPENAI_COMPATIBLE_PROVIDERS = frozenset({"openai", "azure_openai"})
+
+_lane: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("llm_priority_lane", default=None)
+
+
+@contextmanager
+def llm_priority(lane: str) -> Iterator[None]:
+    """Send the LLM calls made in this context through ``lane`` (``interactive`` or ``batch``)."""
+    if lane not in LANES:
+        raise ValueError(f"Unknown priority lane {lane!r}; expected one of {LANES}")
+    token = _lane.set(lane)
+    try:
+        yield
+    finally:
+        _lane.reset(token)
+
+
+def current_lane() -> str:
+    """Lane of the current context; LLM_PRIORITY sets the process default (``interactive``)."""
+    lane = _lane.get() or os.getenv("LLM_PRIORITY", INTERACTIVE)
+    return lane if lane in LANES else INTERACTIVE
+
+
+# -------------------------
+# Token buckets and scheduling
+# -------------------------
+
+
+class TokenBucket:
+    """``per_minute`` units, refilled continuously; taking more than is left runs into debt."""
+
+    def __init__(self, per_minute: float, now: float):
+        if per_minute <= 0:
+            raise ValueError("per_minute must be > 0")
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.level = self.capacity
+        self._updated = now
+
+    def wait(self, amount: float, now: float, reserve: float = 0.0) -> float:
+        """Seconds until ``amount`` can be taken with ``reserve`` left over (0.0 = now).
+
+        A request larger than the bucket goes through once the bucket is full.
+        """
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+        needed = min(amount + reserve, self.capacity)
+        return 0.0 if self.level >= needed else (needed - self.level) / self.rate
+
+    def take(self, amount: float) -> None:
+        self.level -= amount
+
+
+@dataclass(frozen=True)
+class Endpoint:
+    """One API key and/or deployment with its own quota.
+
+    ``api_key`` replaces the request's credentials; ``base_url`` (``scheme://host[:port]``) replaces
+    its origin. ``None`` keeps what the chat model was configured with.
+    """
+
+    name: str
+    api_key: Optional[str] = field(default=None, repr=False)
+    base_url: Optional[str] = None
+    rpm: Optional[int] = None
+    tpm: Optional[int] = None
+
+
+@dataclass
+class SchedulerStats:
+    requests: int = 0
+    delayed: int = 0
+    wait_seconds: float = 0.0
+    throttled: int = 0  # 429 responses
+    by_endpoint: Counter = field(default_factory=Counter)
+    by_lane: Counter = field(default_factory=Counter)
+
+
+class _EndpointState:
+    def __init__(self, endpoint: Endpoint, now: float):
+        self.endpoint = endpoint
+        self.requests = TokenBucket(endpoint.rpm, now) if endpoint.rpm else None
+        self.tokens = TokenBucket(endpoint.tpm, now) if endpoint.tpm else None
+        self.paused_until = 0.0
+
+
+class RequestScheduler:
+    """Per-endpoint RPM/TPM token buckets, round-robin over endpoints, priority lanes for waiters.
+
+    Waiting requests queue by (lane, arrival); only the head of the queue is granted capacity, so an
+    interactive request that arrives while batch requests wait is served before them.
+    """
+
+    def __init__(
+        self,
+        endpoints: Sequence[Endpoint],
+        *,
+        batch_headroom: float = DEFAULT_BATCH_HEADROOM,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if not endpoints:
+            raise ValueError("At least one endpoint is required")
+        if not 0.0 <= batch_headroom < 1.0:
+            raise ValueError("batch_headroom must be in [0, 1)")
+        self.batch_headroom = batch_headroom
+        self._clock = clock
+        now = clock()
+        self._states = [_EndpointState(e, now) for e in endpoints]
+        self._next = 0
+        self._lock = threading.Lock()
+        self._waiting: List[Tuple[int, int]] = []  # heap of (lane rank, arrival) tickets
+        self._arrivals = itertools.count()
+        self.stats = SchedulerStats()
+
+    def _grant(self, tokens: int, lane: str, now: float) -> Tuple[Optional[Endpoint], float]:
+        """Charge the next endpoint with capacity (caller holds ``_lock``).
+
+        Returns the endpoint, or ``None`` and the seconds until one may have capacity.
+        """
+        wait = float("inf")
+        count = len(self._states)
+        for i in range(count):
+            state = self._states[(self._next + i) % count]
+            if state.paused_until > now:
+                wait = min(wait, state.paused_until - now)
+                continue
+            charges = [(b, amount) for b, amount in ((state.requests, 1), (state.tokens, tokens)) if b is not None]
+            waits = [
+                b.wait(amount, now, self.batch_headroom * b.capacity if lane == BATCH else 0.0)
+                for b, amount in charges
+            ]
+            if any(waits):
+                wait = min(wait, max(waits))
+                continue
+            for b, amount in charges:
+                b.take(amount)
+            self._next = (self._next + i + 1) % count
+            return state.endpoint, 0.0
+        return None, wait
+
+    def _record(self, endpoint: Endpoint, lane: str, waited: float) -> None:
+        with self._lock:
+            self.stats.requests += 1
+            self.stats.by_endpoint[endpoint.name] += 1
+            self.stats.by_lane[lane] += 1
+            if waited > 0:
+                self.stats.delayed += 1
+                self.stats.wait_seconds += waited
+
+    def try_acquire(self, tokens: int = 0, lane: Optional[str] = None) -> Optional[Endpoint]:
+        """An endpoint if one has capacity now and no request of the same or a higher lane waits."""
+        lane = lane or current_lane()
+        with self._lock:
+            if self._waiting and self._waiting[0][0] <= LANES.index(lane):
+                return None
+            endpoint, _ = self._grant(tokens, lane, self._clock())
+        if endpoint is not None:
+            self._record(endpoint, lane, 0.0)
+        return endpoint
+
+    def _enter(self, lane: str) -> Tuple[int, int]:
+        ticket = (LANES.index(lane), next(self._arrivals))
+        with self._lock:
+            heapq.heappush(self._waiting, ticket)
+        return ticket
+
+    def _poll(self, ticket: Tuple[int, int], tokens: int, lane: str) -> Tuple[Optional[Endpoint], float]:
+        with self._lock:
+            if self._waiting[0] != ticket:
+                return None, POLL_INTERVAL
+            endpoint, wait = self._grant(tokens, lane, self._clock())
+            if endpoint is not None:
+                heapq.heappop(self._waiting)
+        return endpoint, min(wait, POLL_INTERVAL)
+
+    def _leave(self, ticket: Tuple[int, int]) -> None:
+        with self._lock:
+            if ticket in self._waiting:
+                self._waiting.remove(ticket)
+                heapq.heapify(self._waiting)
+
+    def acquire(self, tokens: int = 0, lane: Optional[str] = None) -> Endpoint:
+        """Block until an endpoint can take a request of ``tokens``; returns it (already charged)."""
+        lane = lane or current_lane()
+        ticket = self._enter(lane)
+        started, waited = time.monotonic(), False
+        try:
+            while True:
+                endpoint, wait = self._poll(ticket, tokens, lane)
+                if endpoint is not None:
+                    self._record(endpoint, lane, time.monotonic() - started if waited else 0.0)
+                    return endpoint
+                waited = True
+                time.sleep(wait)
+        except BaseException:
+            self._leave(ticket)
+            raise
+
+    async def aacquire(self, tokens: int = 0, lane: Optional[str] = None) -> Endpoint:
+        """Async ``acquire``: waits without blocking the event loop."""
+        lane = lane or current_lane()
+        ticket = self._enter(lane)
+        started, waited = time.monotonic(), False
+        try:
+            while True:
+                endpoint, wait = self._poll(ticket, tokens, lane)
+                if endpoint is not None:
+                    self._record(endpoint, lane, time.monotonic() - started if waited else 0.0)
+                    return endpoint
+                waited = True
+                await asyncio.sleep(wait)
+        except BaseException:
+            self._leave(ticket)
+            raise
+
+    def penalize(self, endpoint: Endpoint, seconds: float) -> None:
+        """Pause ``endpoint`` for ``seconds`` (after a 429); requests go to the other endpoints."""
+        with self._lock:
+            self.stats.throttled += 1
+            for state in self._states:
+                if state.endpoint == endpoint:
+                    state.paused_until = max(state.paused_until, self._clock() + seconds)
+
+
+# -------------------------
+# HTTP layer
+# -------------------------
+
+
+def request_tokens(request: httpx.Request) -> int:
+    """Tokens a request counts against TPM: estimated prompt tokens plus its output cap."""
+    try:
+        body = request.content
+    except httpx.RequestNotRead:
+        return 0
+    if not body:
+        return 0
+    text = body.decode("utf-8", errors="replace")
+    try:
+        payload = json.loads(text)
+    except ValueError:
+        payload = None
+    cap = 0
+    if isinstance(payload, dict):
+        cap = payload.get("max_completion_tokens") or payload.get("max_tokens") or payload.get("max_output_tokens")
+    return estimate_tokens(text) + int(cap or 0)
+
+
+def retry_after(headers: httpx.Headers) -> float:
+    """Seconds to pause after a 429, from ``retry-after-ms``/``retry-after``."""
+    for name, scale in (("retry-after-ms", 0.001), ("retry-after", 1.0)):
+        try:
+            return max(0.0, float(headers[name]) * scale)
+        except (KeyError, ValueError):
+            continue
+    return DEFAULT_RETRY_AFTER
+
+
+def route_request(request: httpx.Request, endpoint: Endpoint) -> httpx.Request:
+    """Point ``request`` at ``endpoint``: its API key and origin, where set."""
+    if endpoint.api_key:
+        if "api-key" in request.headers:  # Azure OpenAI
+            request.headers["api-key"] = endpoint.api_key
+        else:
+            request.headers["authorization"] = f"Bearer {endpoint.api_key}"
+    if endpoint.base_url:
+        origin = httpx.URL(endpoint.base_url)
+        request.url = request.url.copy_with(scheme=origin.scheme, host=origin.host, port=origin.port)
+        request.headers["host"] = request.url.netloc.decode("ascii")
+    return request
+
+
+class _ScheduledTransport(httpx.BaseTransport):
+    def __init__(self, manager: "LLMClientManager"):
+        self._manager = manager
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        endpoint = self._manager.scheduler.acquire(request_tokens(request))
+        response = self._manager._sync_transport().handle_request(route_request(request, endpoint))
+        self._manager._observe(endpoint, response)
+        return response
+
+
+class _AsyncScheduledTransport(httpx.AsyncBaseTransport):
+    def __init__(self, manager: "LLMClientManager"):
+        self._manager = manager
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        endpoint = await self._manager.scheduler.aacquire(request_tokens(request))
+        response = await self._manager._async_transport().handle_async_request(route_request(request, endpoint))
+        self._manager._observe(endpoint, response)
+        return response
+
+
+# -------------------------
+# Manager
+# -------------------------
+
+
+def openai_compatible(model: Optional[str], model_provider: Optional[str] = None) -> bool:
+    """Whether ``init_chat_model(model, model_provider=...)`` builds an OpenAI-SDK based model."""
+    provider = model_provider
+    if provider is None and model and ":" in model:
+        provider = model.split(":", 1)[0]
+    if provider is not None:
+        return provider in OPENAI_COMPATIBLE_PROVIDERS
+    return bool(model) and model.startswith(("gpt-", "o1", "o3", "o4", "chatgpt"))
+
+
+class LLMClientManager:
+    """Shared HTTP clients and request scheduling for the process's OpenAI-compatible chat models.
+
+    Args:
+        endpoints: API keys/deployments to spread requests over (default: one endpoint that keeps
+            the chat model's own credentials and URL).
+        rpm: Requests per minute per endpoint, for endpoints without their own (``None`` = unlimited).
+        tpm: Tokens per minute per endpoint, likewise.
+        max_connections: Connection pool size.
+        max_keepalive_connections: Idle connections kept open.
+        keepalive_expiry: Seconds an idle connection is kept.
+        timeout: Request timeout in seconds.
+        batch_headroom: Share of each bucket batch-lane requests leave to interactive ones.
+        transport: Transport requests are finally sent with (default: a pooled ``httpx`` transport
+            per process and event loop; tests pass ``httpx.MockTransport``).
+    """
+
+    def __init__(
+        self,
+        endpoints: Optional[Sequence[Endpoint]] = None,
+        *,
+        rpm: Optional[int] = None,
+        tpm: Optional[int] = None,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY,
+        timeout: float = DEFAULT_TIMEOUT,
+        batch_headroom: float = DEFAULT_BATCH_HEADROOM,
+        transport: Optional[Any] = None,
+    ):
+        self.endpoints = [replace(e, rpm=e.rpm or rpm, tpm=e.tpm or tpm) for e in endpoints or [Endpoint("default")]]
+        self.scheduler = RequestScheduler(self.endpoints, batch_headroom=batch_headroom)
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = timeout
+        self._transport = transport
+        self._lock = threading.Lock()
+        self._pid = -1
+        self._pool: Optional[httpx.HTTPTransport] = None
+        self._async_pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncHTTPTransport]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._http_client: Optional[httpx.Client] = None
+        self._http_async_client: Optional[httpx.AsyncClient] = None
+
+    @classmethod
+    def from_env(cls) -> "LLMClientManager":
+        keys, urls = _env_list("LLM_API_KEYS"), _env_list("LLM_BASE_URLS")
+        count = max(len(keys), len(urls))
+        if len(keys) > 1 and len(urls) > 1 and len(keys) != len(urls):
+            raise ValueError("LLM_API_KEYS and LLM_BASE_URLS must pair up (same length, or a single value)")
+        endpoints = [
+            Endpoint(
+                name=f"endpoint-{i}",
+                api_key=keys[i if len(keys) > 1 else 0] if keys else None,
+                base_url=urls[i if len(urls) > 1 else 0] if urls else None,
+            )
+            for i in range(count)
+        ]
+        return cls(
+            endpoints or None,
+            rpm=_env_int("LLM_RPM"),
+            tpm=_env_int("LLM_TPM"),
+            max_connections=_env_int("LLM_MAX_CONNECTIONS") or DEFAULT_MAX_CONNECTIONS,
+            batch_headroom=float(os.getenv("LLM_BATCH_HEADROOM", DEFAULT_BATCH_HEADROOM)),
+        )
+
+    # -------------------------
+    # Transports and clients
+    # -------------------------
+
+    def _sync_transport(self) -> httpx.BaseTransport:
+        """This process's pooled transport; forked workers open their own connections."""
+        if self._transport is not None:
+            return self._transport
+        with self._lock:
+            if self._pool is None or self._pid != os.getpid():
+                self._pool = httpx.HTTPTransport(limits=self.limits)
+                self._pid = os.getpid()
+            return self._pool
+
+    def _async_transport(self) -> httpx.AsyncBaseTransport:
+        """Pooled transport of the running event loop (connections cannot move between loops)."""
+        if self._transport is not None:
+            return self._transport
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            pool = self._async_pools.get(loop)
+            if pool is None:
+                pool = self._async_pools[loop] = httpx.AsyncHTTPTransport(limits=self.limits)
+            return pool
+
+    def _observe(self, endpoint: Endpoint, response: httpx.Response) -> None:
+        if response.status_code == 429:
+            seconds = retry_after(response.headers)
+            logger.warning(f"LLM endpoint {endpoint.name} rate limited (429); pausing it for {seconds:.1f}s")
+            self.scheduler.penalize(endpoint, seconds)
+
+    @property
+    def http_client(self) -> httpx.Client:
+        with self._lock:
+            if self._http_client is None:
+                self._http_client = httpx.Client(transport=_ScheduledTransport(self), timeout=self.timeout)
+            return self._http_client
+
+    @property
+    def http_async_client(self) -> httpx.AsyncClient:
+        with self._lock:
+            if self._http_async_client is None:
+                self._http_async_client = httpx.AsyncClient(
+                    transport=_AsyncScheduledTransport(self), timeout=self.timeout
+                )
+            return self._http_async_client
+
+    # -------------------------
+    # Chat models
+    # -------------------------
+
+    def chat_model_kwargs(self) -> Dict[str, Any]:
+        """Constructor kwargs that make an OpenAI-compatible chat model use the shared clients."""
+        kwargs: Dict[str, Any] = {"http_client": self.http_client, "http_async_client": self.http_async_client}
+        if self.endpoints[0].api_key:
+            # the constructor needs a key; each request then carries its endpoint's key
+            kwargs["api_key"] = self.endpoints[0].api_key
+        return kwargs
+
+    def chat_model(self, **kwargs: Any) -> Any:
+        """``init_chat_model(**kwargs)``; OpenAI-compatible models share the managed clients."""
+        if openai_compatible(kwargs.get("model"), kwargs.get("model_provider")):
+            kwargs = {**self.chat_model_kwargs(), **kwargs}
+        return init_chat_model(**kwargs)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._http_client is not None:
+                self._http_client.close()
+            self._http_client = None
+            self._pool = None
+
+
+def _env_list(name: str) -> List[str]:
+    return [v.strip() for v in os.getenv(name, "").split(",") if v.strip()]
+
+
+def _env_int(name: str) -> Optional[int]:
+    value = os.getenv(name)
+    return int(value) if value else None
+
+
+_manager: Optional[LLMClientManager] = None
+_manager_lock = threading.Lock()
+
+
+def get_client_manager() -> LLMClientManager:
+    """The process-wide manager (``LLMClientManager.from_env()`` on first use)."""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = LLMClientManager.from_env()
+        return _manager
+
+
+def set_client_manager(manager: Optional[LLMClientManager]) -> None:
+    """Replace the process-wide manager (``None``: rebuilt from env on next use)."""
+    global _manager
+    with _manager_lock:
+        _manager = manager
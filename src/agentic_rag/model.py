@@ -1,16 +1,247 @@
 # src/agentic_rag/model.py
+"""Chat models for the LLM nodes.
 
+``get_default_model()`` returns the single ``gpt-4.1`` model every node used to share.
+``ModelRegistry`` routes each node role to its own model and output cap instead:
+
+    registry = ModelRegistry.from_env()
+    graph = make_agent_graph(registry, retriever=..., hyde=LLMHyDEAdapter(registry.model("hyde")), ...)
+
+Roles are ``intake`` (normalize_gate, extract_signals, intake_fused), ``planner``, ``composer``
+(compose_answer and speculative drafts), ``map`` (map-reduce map step), ``summary`` (conversation
+summaries), and ``hyde``/``grader`` for the executor adapters, which are built from
+``registry.model(role, tier)``.
+
+Each role has a ``default`` and a ``fast`` tier. A request runs on the fast tier when its
+``constraints.nonfunctional`` contain ``low_latency`` or ``low_cost``, or when the state sets
+``model_tier`` explicitly (``select_tier``). Roles missing from a tier fall back to the default tier.
+
+Configuration, later sources winning:
+
+1. ``DEFAULT_MODEL_SPECS``;
+2. the JSON file named by MODEL_CONFIG, e.g.
+   ``{"default": {"planner": {"model": "gpt-4.1", "max_tokens": 4000}}, "fast": {...}}``;
+3. env vars ``MODEL_<ROLE>``/``MODEL_<ROLE>_MAX_TOKENS`` (default tier) and
+   ``MODEL_FAST_<ROLE>``/``MODEL_FAST_<ROLE>_MAX_TOKENS`` (fast tier).
+
+Node factories accept either a chat model (every role and tier use it, as before) or a registry;
+``routed_chains`` builds their chains per tier.
+
+With a ``response_cache`` (LLM_RESPONSE_CACHE=<sqlite path> for ``from_env``), temperature-0
+models read through the persistent response cache in agentic_rag/llm_cache.py.
+
+Models built by ``get_default_model`` and the default registry factory share the process-wide HTTP
+clients, rate limits and API-key scheduling of agentic_rag/llm_clients.py.
+"""
+
+from __future__ import annotations
+
+import json
 import logging
+import os
+import threading
+from dataclasses import asdict, dataclass, replace
+from typing import Any, Callable, Dict, Mapping, Optional
 
-from langchain.chat_models import init_chat_model
+from agentic_rag.llm_cache import ResponseCache, with_response_cache
+from agentic_rag.llm_clients import get_client_manager
 
 logger = logging.getLogger(__name__)
 
 
 def get_default_model():
-    model = init_chat_model(
+    model = get_client_manager().chat_model(
         model="gpt-4.1",
         temperature=0.0,
         max_tokens=25000,
     )
     return model
+
+
+# -------------------------
+# Specs and defaults
+# -------------------------
+
+DEFAULT_TIER = "default"
+FAST_TIER = "fast"
+TIERS = (DEFAULT_TIER, FAST_TIER)
+FAST_TIER_FLAGS = frozenset({"low_latency", "low_cost"})
+
+ROLES = ("intake", "planner", "composer", "map", "summary", "hyde", "grader")
+
+
+@dataclass(frozen=True)
+class ModelSpec:
+    """Model id and generation parameters for one role in one tier."""
+
+    model: str
+    max_tokens: int
+    temperature: float = 0.0
+
+
+# Output caps sized to each role's structured output; the composer keeps room for long answers.
+DEFAULT_MODEL_SPECS: Dict[str, Dict[str, ModelSpec]] = {
+    DEFAULT_TIER: {
+        "intake": ModelSpec("gpt-4.1", 2000),
+        "planner": ModelSpec("gpt-4.1", 4000),
+        "composer": ModelSpec("gpt-4.1", 8000),
+        "map": ModelSpec("gpt-4.1-mini", 2000),
+        "summary": ModelSpec("gpt-4.1-mini", 800),
+        "hyde": ModelSpec("gpt-4.1-mini", 512),
+        "grader": ModelSpec("gpt-4.1-mini", 1000),
+    },
+    FAST_TIER: {
+        "intake": ModelSpec("gpt-4.1-mini", 2000),
+        "planner": ModelSpec("gpt-4.1-mini", 3000),
+        "composer": ModelSpec("gpt-4.1-mini", 4000),
+        "map": ModelSpec("gpt-4.1-nano", 1500),
+        "hyde": ModelSpec("gpt-4.1-nano", 384),
+        "grader": ModelSpec("gpt-4.1-nano", 800),
+    },
+}
+
+
+def select_tier(state: Mapping[str, Any]) -> str:
+    """Tier for a request: ``state["model_tier"]`` if set, else ``fast`` for low_latency/low_cost."""
+    explicit = state.get("model_tier")
+    if explicit:
+        return str(explicit)
+    constraints = state.get("constraints") or {}
+    flags = (constraints.get("nonfunctional") if isinstance(constraints, dict) else None) or []
+    return FAST_TIER if FAST_TIER_FLAGS.intersection(flags) else DEFAULT_TIER
+
+
+# -------------------------
+# Registry
+# -------------------------
+
+
+def _merge_spec(base: Optional[ModelSpec], raw: Mapping[str, Any], where: str) -> Optional[ModelSpec]:
+    fields = {k: raw[k] for k in ("model", "max_tokens", "temperature") if raw.get(k) is not None}
+    try:
+        if "max_tokens" in fields:
+            fields["max_tokens"] = int(fields["max_tokens"])
+        if "temperature" in fields:
+            fields["temperature"] = float(fields["temperature"])
+        return ModelSpec(**fields) if base is None else replace(base, **fields)
+    except (KeyError, TypeError, ValueError):
+        logger.warning(f"Ignoring incomplete model spec for {where}: {dict(raw)!r}")
+        return base
+
+
+class ModelRegistry:
+    """Per-role, per-tier chat models. Share one instance across requests.
+
+    Args:
+        specs: ``{tier: {role: ModelSpec}}``; roles missing from a tier use the default tier.
+        factory: Builds a chat model from a ModelSpec (default: ``init_chat_model`` on the shared
+            clients of ``get_client_manager()``).
+        response_cache: Persistent cache for the responses of temperature-0 models.
+    """
+
+    def __init__(
+        self,
+        specs: Optional[Mapping[str, Mapping[str, ModelSpec]]] = None,
+        *,
+        factory: Optional[Callable[[ModelSpec], Any]] = None,
+        response_cache: Optional[ResponseCache] = None,
+    ):
+        source = DEFAULT_MODEL_SPECS if specs is None else specs
+        self.specs: Dict[str, Dict[str, ModelSpec]] = {tier: dict(roles) for tier, roles in source.items()}
+        self._factory = factory or (
+            lambda spec: get_client_manager().chat_model(
+                model=spec.model, temperature=spec.temperature, max_tokens=spec.max_tokens
+            )
+        )
+        self.response_cache = response_cache
+        self._lock = threading.Lock()
+        self._models: Dict[ModelSpec, Any] = {}
+
+    @classmethod
+    def from_env(cls, *, factory: Optional[Callable[[ModelSpec], Any]] = None) -> "ModelRegistry":
+        """Defaults, overridden by the MODEL_CONFIG file, overridden by MODEL_* env vars.
+
+        LLM_RESPONSE_CACHE names the SQLite file of the response cache (unset = no cache).
+        """
+        specs = {tier: dict(roles) for tier, roles in DEFAULT_MODEL_SPECS.items()}
+
+        path = os.getenv("MODEL_CONFIG")
+        if path:
+            with open(path, encoding="utf-8") as f:
+                config = json.load(f)
+            for tier, roles in config.items():
+                for role, raw in (roles or {}).items():
+                    merged = _merge_spec(specs.setdefault(tier, {}).get(role), raw, f"{tier}.{role}")
+                    if merged is not None:
+                        specs[tier][role] = merged
+
+        for tier, prefix in ((DEFAULT_TIER, "MODEL_"), (FAST_TIER, "MODEL_FAST_")):
+            for role in ROLES:
+                key = f"{prefix}{role.upper()}"
+                raw = {"model": os.getenv(key), "max_tokens": os.getenv(f"{key}_MAX_TOKENS")}
+                if raw["model"] is None and raw["max_tokens"] is None:
+                    continue
+                base = specs.setdefault(tier, {}).get(role) or specs[DEFAULT_TIER].get(role)
+                merged = _merge_spec(base, raw, key)
+                if merged is not None:
+                    specs[tier][role] = merged
+
+        cache_path = os.getenv("LLM_RESPONSE_CACHE")
+        return cls(specs, factory=factory, response_cache=ResponseCache(cache_path) if cache_path else None)
+
+    def spec(self, role: str, tier: str = DEFAULT_TIER) -> ModelSpec:
+        spec = self.specs.get(tier, {}).get(role) or self.specs.get(DEFAULT_TIER, {}).get(role)
+        if spec is None:
+            raise KeyError(f"No model configured for role {role!r}")
+        return spec
+
+    def model(self, role: str, tier: str = DEFAULT_TIER) -> Any:
+        """Chat model for ``role`` in ``tier``; roles sharing a spec share the model instance."""
+        spec = self.spec(role, tier)
+        with self._lock:
+            model = self._models.get(spec)
+            if model is None:
+                model = self._factory(spec)
+                if spec.temperature == 0:
+                    model = with_response_cache(model, self.response_cache)
+                self._models[spec] = model
+        return model
+
+    def describe(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Resolved specs as plain dicts (for logs and run reports)."""
+        return {tier: {role: asdict(spec) for role, spec in roles.items()} for tier, roles in self.specs.items()}
+
+
+# -------------------------
+# Node chains
+# -------------------------
+
+
+class RoutedChains:
+    """The chain a node uses for a request, built per tier on first use."""
+
+    def __init__(self, llm: Any, role: str, build: Callable[[Any], Any]):
+        self.role = role
+        self._llm = llm
+        self._build = build
+        self._lock = threading.Lock()
+        self._chains: Dict[str, Any] = {}
+        if not isinstance(llm, ModelRegistry):
+            self._chains[DEFAULT_TIER] = build(llm)
+
+    def get(self, tier: str = DEFAULT_TIER) -> Any:
+        if not isinstance(self._llm, ModelRegistry):
+            return self._chains[DEFAULT_TIER]
+        with self._lock:
+            chain = self._chains.get(tier)
+            if chain is None:
+                chain = self._chains[tier] = self._build(self._llm.model(self.role, tier))
+        return chain
+
+    def for_state(self, state: Mapping[str, Any]) -> Any:
+        return self.get(select_tier(state))
+
+
+def routed_chains(llm: Any, role: str, build: Callable[[Any], Any]) -> RoutedChains:
+    """``build(model)`` per tier for a registry, or once for a plain chat model."""
+    return RoutedChains(llm, role, build)
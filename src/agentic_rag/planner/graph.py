@@ -1,17 +1,59 @@
 from __future__ import annotations
 
+import os
+from typing import Any, Callable, Dict, Optional
+
 from langgraph.graph import END, START, StateGraph
 from langgraph.types import RetryPolicy
 
+from agentic_rag.aio import dual_node
 from agentic_rag.intent.state import IntakeState
 from agentic_rag.planner.nodes.planner import make_planner_node
+from agentic_rag.planner.streaming import StreamingPlannerStats, make_streaming_planner_node
+from agentic_rag.planner.templates import TemplatePlanner, make_template_planner_node
+from agentic_rag.usage import with_usage
+
+
+def planner_streaming_enabled() -> bool:
+    """Default for ``make_planner_graph(streaming=None)``; set PLANNER_STREAMING=1."""
+    return os.getenv("PLANNER_STREAMING", "0") == "1"
 
 
-def make_planner_graph(llm, max_retries: int = 2):
+def make_planner_graph(
+    llm,
+    max_retries: int = 2,
+    templates: Optional[TemplatePlanner] = None,
+    streaming: Optional[bool] = None,
+    prefetch: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None,
+    streaming_stats: Optional[StreamingPlannerStats] = None,
+):
+    """Build the planner subgraph.
+
+    With ``templates``, a template_planner node runs first and ends the subgraph when a
+    deterministic plan applies; otherwise the LLM planner runs as before.
+    ``streaming`` decodes the plan incrementally (``None`` = PLANNER_STREAMING env switch) and,
+    with ``prefetch``, starts round-0 retrieval before the plan is complete (planner/streaming.py).
+    """
+    if streaming is None:
+        streaming = planner_streaming_enabled()
     retry_policy = RetryPolicy(max_attempts=max(1, int(max_retries)))
 
+    if streaming:
+        planner = make_streaming_planner_node(llm, prefetch=prefetch, stats=streaming_stats)
+    else:
+        planner = make_planner_node(llm)
+
     g = StateGraph(IntakeState)
-    g.add_node("planner", make_planner_node(llm), retry=retry_policy)
-    g.add_edge(START, "planner")
+    g.add_node("planner", dual_node(with_usage(planner, "planner")), retry=retry_policy)
+    if templates is not None:
+        g.add_node("template_planner", make_template_planner_node(templates))
+        g.add_edge(START, "template_planner")
+        g.add_conditional_edges(
+            "template_planner",
+            lambda state: END if state.get("planner_fast_path") else "planner",
+            ["planner", END],
+        )
+    else:
+        g.add_edge(START, "planner")
     g.add_edge("planner", END)
     return g.compile()
@@ -1,68 +1,125 @@
 from __future__ import annotations
 
 import logging
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
-from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+from langchain_core.prompts import ChatPromptTemplate
 from pydantic import ValidationError
 
+from agentic_rag.aio import Steps, invoke_call, run_async, run_sync, with_async
+from agentic_rag.context import window_messages
 from agentic_rag.intent.state import IntakeState
+from agentic_rag.model import routed_chains
 from agentic_rag.planner.prompts.planner import PLANNER_PROMPT
 from agentic_rag.planner.state import PlannerState
+from agentic_rag.prompt_layout import prefix_cached_messages
+from agentic_rag.repair import structured_data, validate_with_repair
 
 logger = logging.getLogger(__name__)
 
 
+def missing_messages_error(state: IntakeState, node: str) -> Optional[Dict[str, Any]]:
+    """Error update for a state without a usable ``messages`` list, else ``None``."""
+    msgs = state.get("messages") or []
+    if isinstance(msgs, list) and msgs:
+        return None
+    return {
+        "errors": [
+            {
+                "node": node,
+                "type": "schema_validation",
+                "message": "Missing or invalid 'messages' in state (expected non-empty list).",
+                "retryable": False,
+                "details": {"messages_type": str(type(msgs))},
+            }
+        ]
+    }
+
+
+# planner_payload fields sent in the trailing inputs message (agentic_rag/prompt_layout.py)
+PLANNER_INPUTS = (
+    "normalized_query",
+    "constraints",
+    "guardrails",
+    "clarification",
+    "user_intent",
+    "retrieval_intent",
+    "answerability",
+    "complexity_flags",
+    "signals",
+    "language",
+    "locale",
+)
+
+
+def planner_payload(state: IntakeState) -> Dict[str, Any]:
+    """Prompt variables for PLANNER_PROMPT: the conversation window plus ``PLANNER_INPUTS``."""
+    return {
+        "messages": window_messages(state, "planner"),
+        "normalized_query": state.get("normalized_query", ""),
+        "constraints": state.get("constraints") or {},
+        "guardrails": state.get("guardrails") or {},
+        "clarification": state.get("clarification") or {},
+        "user_intent": state.get("user_intent", None),
+        "retrieval_intent": state.get("retrieval_intent", None),
+        "answerability": state.get("answerability", None),
+        "complexity_flags": state.get("complexity_flags") or [],
+        "signals": state.get("signals") or {},
+        "language": state.get("language", None),
+        "locale": state.get("locale", None),
+    }
+
+
+def validate_plan(raw: Any, state: IntakeState) -> PlannerState:
+    """Validate planner output, repairing common violations locally (see agentic_rag.repair).
+
+    An empty ``query_variants`` falls back to the plan goal, then the normalized query.
+    """
+    normalized_query = state.get("normalized_query", "")
+    data = raw.model_dump() if hasattr(raw, "model_dump") and not isinstance(raw, PlannerState) else raw
+    goal = data.get("goal") if isinstance(data, dict) else None
+    if not isinstance(goal, str) or len(goal.strip()) < 5:
+        goal = normalized_query
+    fallbacks = {"goal": normalized_query, "query_variants": [goal]} if goal else {}
+    return validate_with_repair(PlannerState, raw, node="planner", fallbacks=fallbacks)
+
+
+def enforce_plan_invariants(plan_obj: PlannerState) -> PlannerState:
+    """Enforce a couple of invariants defensively (belt and suspenders)."""
+    if any(q.blocking for q in plan_obj.clarifying_questions):
+        if plan_obj.strategy != "clarify_then_retrieve":
+            logger.warning("Forcing strategy=clarify_then_retrieve due to blocking clarifications.")
+            plan_obj.strategy = "clarify_then_retrieve"
+            plan_obj.retrieval_rounds = []
+
+    if plan_obj.strategy != "retrieve_then_answer":
+        plan_obj.retrieval_rounds = []
+    return plan_obj
+
+
 def make_planner_node(llm):
     """Planner node:
     - Reads IntakeState fields
     - Emits `plan` as a dict (validated against PlannerState)
     - Does not do retrieval or answering
     """
-    prompt = ChatPromptTemplate.from_messages(
-        [
-            ("system", PLANNER_PROMPT),
-            # Keep conversation context available, but the schema inputs below are what we actually pass.
-            MessagesPlaceholder("messages"),
-        ]
-    )
-
-    model = llm.with_structured_output(PlannerState, method="function_calling")
-    chain = prompt | model
+    # Static system prompt, conversation window, then the schema inputs (prefix-cache friendly)
+    prompt = ChatPromptTemplate.from_messages(prefix_cached_messages(PLANNER_PROMPT, PLANNER_INPUTS))
 
-    def planner(state: IntakeState) -> Dict[str, Any]:
-        msgs = state.get("messages") or []
-        if not isinstance(msgs, list) or not msgs:
-            return {
-                "errors": [
-                    {
-                        "node": "planner",
-                        "type": "schema_validation",
-                        "message": "Missing or invalid 'messages' in state (expected non-empty list).",
-                        "retryable": False,
-                        "details": {"messages_type": str(type(msgs))},
-                    }
-                ]
-            }
+    chains = routed_chains(
+        llm,
+        "planner",
+        lambda m: prompt | m.with_structured_output(PlannerState, method="function_calling", include_raw=True),
+    )
 
-        payload = {
-            "messages": msgs,
-            "normalized_query": state.get("normalized_query", ""),
-            "constraints": state.get("constraints") or {},
-            "guardrails": state.get("guardrails") or {},
-            "clarification": state.get("clarification") or {},
-            "user_intent": state.get("user_intent", None),
-            "retrieval_intent": state.get("retrieval_intent", None),
-            "answerability": state.get("answerability", None),
-            "complexity_flags": state.get("complexity_flags") or [],
-            "signals": state.get("signals") or {},
-            "language": state.get("language", None),
-            "locale": state.get("locale", None),
-        }
+    def steps(state: IntakeState) -> Steps:
+        missing = missing_messages_error(state, "planner")
+        if missing is not None:
+            return missing
 
         try:
-            raw = chain.invoke(payload)
-            plan_obj = PlannerState.model_validate(raw)
+            raw = structured_data((yield invoke_call(chains.for_state(state), planner_payload(state))))
+            plan_obj = validate_plan(raw, state)
         except ValidationError as e:
             return {
                 "errors": [
@@ -88,16 +145,12 @@ def make_planner_node(llm):
                 ]
             }
 
-        # Enforce a couple of invariants defensively (belt and suspenders)
-        if any(q.blocking for q in plan_obj.clarifying_questions):
-            if plan_obj.strategy != "clarify_then_retrieve":
-                logger.warning("Forcing strategy=clarify_then_retrieve due to blocking clarifications.")
-                plan_obj.strategy = "clarify_then_retrieve"
-                plan_obj.retrieval_rounds = []
+        return {"plan": enforce_plan_invariants(plan_obj).model_dump()}
 
-        if plan_obj.strategy != "retrieve_then_answer":
-            plan_obj.retrieval_rounds = []
+    def planner(state: IntakeState) -> Dict[str, Any]:
+        return run_sync(steps(state))
 
-        return {"plan": plan_obj.model_dump()}
+    async def aplanner(state: IntakeState) -> Dict[str, Any]:
+        return await run_async(steps(state))
 
-    return planner
+    return with_async(planner, aplanner)
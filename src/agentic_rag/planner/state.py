@@ -13,7 +13,7 @@ Strategy = Literal[
 ]
 
 RoundPurpose = Literal["recall", "precision", "verification", "gap_filling"]
-RetrievalModeType = Literal["bm25", "vector", "hybrid"]
+RetrievalModeType = Literal["bm25", "vector", "hybrid", "exact"]
 
 ClarificationReason = Literal[
     "missing_version",
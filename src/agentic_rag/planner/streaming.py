@@ -0,0 +1,403 @@
+# src/agentic_rag/planner/streaming.py
+"""Streaming planner: decode the plan incrementally and start round-0 retrieval early.
+
+The plan arrives as one function-call argument string, and round 0 of the executor only needs
+``retrieval_rounds[0]`` and ``literal_constraints``. ``answer_requirements``, ``safety`` and
+``planner_meta`` can still be decoding while it runs. ``PartialJSONScanner`` tracks the
+top-level keys of the argument stream. It exposes every top-level value and every array element
+as soon as it closes. The streaming planner node hands the first complete round to a prefetcher
+(executor/prefetch.py) on a worker thread, so retrieval latency overlaps with decoding.
+
+The final plan is validated exactly like the blocking planner's. The executor reuses the
+prefetched candidates only if round 0 and the literal constraints did not change.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from langchain_core.prompts import ChatPromptTemplate
+from pydantic import ValidationError
+
+from agentic_rag.aio import with_async
+from agentic_rag.intent.state import IntakeState
+from agentic_rag.model import routed_chains
+from agentic_rag.planner.nodes.planner import (
+    PLANNER_INPUTS,
+    enforce_plan_invariants,
+    missing_messages_error,
+    planner_payload,
+    validate_plan,
+)
+from agentic_rag.planner.prompts.planner import PLANNER_PROMPT
+from agentic_rag.planner.state import LiteralConstraints, PlannerState, RetrievalRound
+from agentic_rag.prompt_layout import prefix_cached_messages
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class PartialJSONScanner:
+    """Incremental scanner over a JSON object that is still being generated.
+
+    ``feed`` only looks at the new characters, so scanning a whole stream costs O(n). Top-level
+    values become available through ``value``/``has`` once they close. Elements of a top-level
+    array become available through ``items`` one by one, before the array itself closes. Nested
+    structure is not interpreted beyond bracket depth, and each value is parsed only when it is
+    asked for.
+    """
+
+    def __init__(self) -> None:
+        self._buf = ""
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._str_start = 0
+        self._expect_key = False
+        self._key: Optional[str] = None
+        self._value_start: Optional[int] = None
+        self._array_open = False  # the depth-2 container is an array
+        self._item_start: Optional[int] = None
+        self._values: Dict[str, str] = {}
+        self._items: Dict[str, List[str]] = {}
+        self._parsed: Dict[Tuple[str, int], Any] = {}
+        self.done = False
+
+    @property
+    def text(self) -> str:
+        return self._buf
+
+    def keys(self) -> List[str]:
+        """Top-level keys whose values are complete, in stream order."""
+        return list(self._values)
+
+    def has(self, key: str) -> bool:
+        return key in self._values
+
+    def value(self, key: str, default: Any = _MISSING) -> Any:
+        """Parsed top-level value for ``key``; ``default`` (or KeyError) while it is incomplete."""
+        if key not in self._values:
+            if default is _MISSING:
+                raise KeyError(key)
+            return default
+        if (key, -1) not in self._parsed:
+            self._parsed[(key, -1)] = json.loads(self._values[key])
+        return self._parsed[(key, -1)]
+
+    def raw_value(self, key: str) -> Optional[str]:
+        """Raw text of the top-level value for ``key`` so far, complete or still decoding (else ``None``)."""
+        if key in self._values:
+            return self._values[key]
+        if self._key == key and not self._expect_key and self._value_start is not None:
+            return self._buf[self._value_start :]
+        return None
+
+    def items(self, key: str) -> List[Any]:
+        """Complete elements of the top-level array ``key`` so far (the array may still be open)."""
+        out = []
+        for i, raw in enumerate(self._items.get(key, [])):
+            if (key, i) not in self._parsed:
+                self._parsed[(key, i)] = json.loads(raw)
+            out.append(self._parsed[(key, i)])
+        return out
+
+    def parse(self) -> Any:
+        """Parse the whole buffer (raises ``json.JSONDecodeError`` if it is not complete JSON)."""
+        return json.loads(self._buf)
+
+    def _complete(self, end: int) -> None:
+        if self._key is not None and self._value_start is not None:
+            self._values[self._key] = self._buf[self._value_start : end].strip()
+        self._value_start = None
+        self._array_open = False
+
+    def _close_item(self, end: int) -> None:
+        if self._key is not None and self._item_start is not None:
+            self._items.setdefault(self._key, []).append(self._buf[self._item_start : end].strip())
+        self._item_start = None
+
+    def feed(self, chunk: str) -> None:
+        start = len(self._buf)
+        self._buf += chunk
+        buf = self._buf
+        for i in range(start, len(buf)):
+            c = buf[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+                    if self._depth == 1 and self._expect_key:
+                        self._key = json.loads(buf[self._str_start : i + 1])
+                continue
+            if c.isspace() or self.done:
+                continue
+
+            # First character of a pending top-level value or array element
+            if self._depth == 1 and not self._expect_key and self._value_start is None and c not in ":,}":
+                self._value_start = i
+            if self._depth == 2 and self._array_open and self._item_start is None and c not in ",]":
+                self._item_start = i
+
+            if c == '"':
+                self._in_string = True
+                self._str_start = i
+            elif c in "{[":
+                self._depth += 1
+                if self._depth == 1:
+                    self._expect_key = True
+                elif self._depth == 2:
+                    self._array_open = c == "["
+                    self._item_start = None
+            elif c in "}]":
+                if self._depth == 1:  # closing the top-level object
+                    if self._value_start is not None:
+                        self._complete(i)
+                    self._depth = 0
+                    self.done = True
+                    continue
+                if self._depth == 2 and self._array_open:
+                    self._close_item(i)
+                self._depth -= 1
+                if self._depth == 1:
+                    self._complete(i + 1)
+            elif c == ",":
+                if self._depth == 1:
+                    if self._value_start is not None:
+                        self._complete(i)
+                    self._expect_key = True
+                elif self._depth == 2 and self._array_open:
+                    self._close_item(i)
+            elif c == ":" and self._depth == 1:
+                self._expect_key = False
+                self._value_start = None
+
+
+def first_round(scanner: PartialJSONScanner) -> Optional[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    """``(round_0, literal_constraints)`` as validated dumps once both have been decoded, else ``None``.
+
+    Requires ``strategy == "retrieve_then_answer"``. A plan that omits ``literal_constraints`` is
+    not prefetched, because exact-match handling depends on them.
+    """
+    try:
+        if scanner.value("strategy", None) != "retrieve_then_answer" or not scanner.has("literal_constraints"):
+            return None
+        rounds = scanner.items("retrieval_rounds")
+        if not rounds:
+            return None
+        round_0 = RetrievalRound.model_validate(rounds[0]).model_dump()
+        literal_constraints = LiteralConstraints.model_validate(scanner.value("literal_constraints")).model_dump()
+    except (ValidationError, ValueError):
+        return None
+    return round_0, literal_constraints
+
+
+@dataclass
+class StreamingPlannerStats:
+    streamed: int = 0  # plans decoded by the streaming planner
+    prefetched: int = 0  # plans whose round 0 started retrieval before decoding finished
+    lead_ms: float = 0.0  # total time retrieval ran ahead of the end of decoding
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def record(self, lead_ms: Optional[float]) -> None:
+        with self._lock:
+            self.streamed += 1
+            if lead_ms is not None:
+                self.prefetched += 1
+                self.lead_ms += lead_ms
+
+    @property
+    def prefetch_rate(self) -> float:
+        return self.prefetched / self.streamed if self.streamed else 0.0
+
+    @property
+    def mean_lead_ms(self) -> float:
+        return self.lead_ms / self.prefetched if self.prefetched else 0.0
+
+
+def tool_call_args(chunk: Any) -> List[str]:
+    """Argument text pieces of the first tool call in a streamed message chunk."""
+    # Single forced tool call: only index 0 carries the structured output
+    parts = []
+    for tc in getattr(chunk, "tool_call_chunks", None) or []:
+        if tc.get("index") in (0, None) and tc.get("args"):
+            parts.append(tc["args"])
+    return parts
+
+
+def _partial_plan(round_0: Dict[str, Any], literal_constraints: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "strategy": "retrieve_then_answer",
+        "retrieval_rounds": [round_0],
+        "literal_constraints": literal_constraints,
+    }
+
+
+def _plan_error(e: Exception, scanner: PartialJSONScanner) -> Dict[str, Any]:
+    if isinstance(e, ValidationError):
+        return {
+            "node": "planner",
+            "type": "model_output_parse",
+            "message": "Planner structured output failed validation.",
+            "retryable": True,
+            "details": {"validation_errors": e.errors()},
+        }
+    if isinstance(e, json.JSONDecodeError):
+        return {
+            "node": "planner",
+            "type": "model_output_parse",
+            "message": "Planner tool call arguments are not valid JSON.",
+            "retryable": True,
+            "details": {"error": str(e), "received_chars": len(scanner.text)},
+        }
+    return {
+        "node": "planner",
+        "type": "runtime_error",
+        "message": str(e),
+        "retryable": True,
+        "details": None,
+    }
+
+
+def _prefetched_round(
+    state: IntakeState,
+    launched: Tuple[Dict[str, Any], Dict[str, Any], float],
+    result: Optional[Dict[str, Any]],
+    decoded_at: float,
+) -> Optional[Dict[str, Any]]:
+    if not result:
+        return None
+    round_0, literal_constraints, launched_at = launched
+    return {
+        "round": round_0,
+        "literal_constraints": literal_constraints,
+        "normalized_query": state.get("normalized_query", ""),
+        **result,
+        "lead_ms": round((decoded_at - launched_at) * 1000, 1),
+    }
+
+
+def make_streaming_planner_node(
+    llm,
+    *,
+    prefetch: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None,
+    stats: Optional[StreamingPlannerStats] = None,
+):
+    """Planner node that streams the PlannerState tool call.
+
+    It emits the same ``plan`` as make_planner_node. With ``prefetch`` (see
+    executor.prefetch.make_round_prefetcher), round-0 retrieval starts when the first round and
+    the literal constraints are decoded. The result is returned as ``prefetched_round``, which
+    is ``None`` when nothing was prefetched. The async variant (``node.afunc``) consumes
+    ``astream`` and runs the prefetch as a task, awaiting ``prefetch.acall`` when available.
+    """
+    prompt = ChatPromptTemplate.from_messages(prefix_cached_messages(PLANNER_PROMPT, PLANNER_INPUTS))
+    chains = routed_chains(
+        llm, "planner", lambda m: prompt | m.bind_tools([PlannerState], tool_choice=PlannerState.__name__)
+    )
+
+    def _finish(state: IntakeState, plan_obj: PlannerState, prefetched: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        if stats is not None:
+            stats.record(prefetched["lead_ms"] if prefetched else None)
+        return {"plan": enforce_plan_invariants(plan_obj).model_dump(), "prefetched_round": prefetched}
+
+    def streaming_planner(state: IntakeState) -> Dict[str, Any]:
+        missing = missing_messages_error(state, "planner")
+        if missing is not None:
+            return missing
+
+        scanner = PartialJSONScanner()
+        started = time.perf_counter()
+        launched: Optional[Tuple[Dict[str, Any], Dict[str, Any], float]] = None
+        future = None
+        prefetched: Optional[Dict[str, Any]] = None
+
+        pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="plan-prefetch")
+        try:
+            try:
+                for chunk in chains.for_state(state).stream(planner_payload(state)):
+                    for part in tool_call_args(chunk):
+                        scanner.feed(part)
+                    if prefetch is not None and future is None:
+                        ready = first_round(scanner)
+                        if ready is not None:
+                            launched = (*ready, time.perf_counter())
+                            future = pool.submit(prefetch, {**state, "plan": _partial_plan(*ready)})
+                            logger.debug(f"Round 0 prefetch started after {(launched[2] - started) * 1000:.0f} ms")
+                decoded_at = time.perf_counter()
+                plan_obj = validate_plan(scanner.parse(), state)
+            except Exception as e:
+                if future is not None:
+                    future.cancel()
+                return {"errors": [_plan_error(e, scanner)]}
+
+            if future is not None:
+                # Retrieval has been running since launch; only the remainder is waited for here
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logger.warning(f"Round 0 prefetch failed, executor will retrieve it: {e}")
+                    result = None
+                prefetched = _prefetched_round(state, launched, result, decoded_at)
+        finally:
+            # Never block here: a successful plan already waited for the prefetch, and a failed
+            # plan has no use for it (an in-flight retrieval/HyDE call finishes in the background).
+            pool.shutdown(wait=False)
+
+        return _finish(state, plan_obj, prefetched)
+
+    async def astreaming_planner(state: IntakeState) -> Dict[str, Any]:
+        missing = missing_messages_error(state, "planner")
+        if missing is not None:
+            return missing
+
+        scanner = PartialJSONScanner()
+        started = time.perf_counter()
+        launched: Optional[Tuple[Dict[str, Any], Dict[str, Any], float]] = None
+        task: Optional[asyncio.Task] = None
+        prefetched: Optional[Dict[str, Any]] = None
+        aprefetch = getattr(prefetch, "acall", None)
+
+        try:
+            async for chunk in chains.for_state(state).astream(planner_payload(state)):
+                for part in tool_call_args(chunk):
+                    scanner.feed(part)
+                if prefetch is not None and task is None:
+                    ready = first_round(scanner)
+                    if ready is not None:
+                        launched = (*ready, time.perf_counter())
+                        partial_state = {**state, "plan": _partial_plan(*ready)}
+                        if inspect.iscoroutinefunction(aprefetch):
+                            task = asyncio.ensure_future(aprefetch(partial_state))
+                        else:
+                            task = asyncio.ensure_future(asyncio.to_thread(prefetch, partial_state))
+                        logger.debug(f"Round 0 prefetch started after {(launched[2] - started) * 1000:.0f} ms")
+            decoded_at = time.perf_counter()
+            plan_obj = validate_plan(scanner.parse(), state)
+        except Exception as e:
+            if task is not None:
+                task.cancel()
+            return {"errors": [_plan_error(e, scanner)]}
+
+        if task is not None:
+            try:
+                result = await task
+            except Exception as e:
+                logger.warning(f"Round 0 prefetch failed, executor will retrieve it: {e}")
+                result = None
+            prefetched = _prefetched_round(state, launched, result, decoded_at)
+
+        return _finish(state, plan_obj, prefetched)
+
+    return with_async(streaming_planner, astreaming_planner)
@@ -0,0 +1,200 @@
+# src/agentic_rag/planner/templates.py
+"""Template planner: deterministic plans for well-understood intake combinations.
+
+Routine requests (a ``lookup`` + ``definition`` question, a how-to ``procedure``, a request that
+needs no retrieval) get near-identical plans from the LLM planner: one recall round, hybrid
+k=20, rerank on. ``TemplatePlanner`` builds those PlannerStates directly from intake signals and
+returns ``None`` for anything it does not recognise, so the LLM planner stays the fallback.
+
+A template only fires when intake is clean: no intake errors, no clarification, normal
+sensitivity, internal-corpus answerability and no complexity flag beyond ``long_query``.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+from agentic_rag.planner.state import (
+    AnswerRequirements,
+    LiteralConstraints,
+    PlannerMeta,
+    PlannerState,
+    RerankSpec,
+    RetrievalModeSpec,
+    RetrievalRound,
+    RoundOutputSpec,
+    SafetySpec,
+    StopConditions,
+)
+
+logger = logging.getLogger(__name__)
+
+# complexity_flags that still allow a template (anything else needs real planning)
+_SIMPLE_FLAGS = frozenset({"long_query"})
+# artifact_flags that make the request literal-sensitive (see PLANNER_PROMPT hard rules)
+_LITERAL_ARTIFACTS = frozenset({"has_stacktrace", "has_ids", "has_paths"})
+
+
+@dataclass(frozen=True)
+class PlanTemplate:
+    """One single-round retrieve_then_answer plan shape, keyed by intent labels."""
+
+    name: str
+    user_intents: FrozenSet[str]
+    retrieval_intents: FrozenSet[str]
+    k: int = 20
+    alpha: float = 0.5
+    rerank_top_k: int = 60
+    max_docs: int = 8
+
+    def matches(self, user_intent: Optional[str], retrieval_intent: Optional[str]) -> bool:
+        return user_intent in self.user_intents and retrieval_intent in self.retrieval_intents
+
+
+DEFAULT_TEMPLATES: Sequence[PlanTemplate] = (
+    PlanTemplate(
+        "definition",
+        user_intents=frozenset({"lookup", "explain"}),
+        retrieval_intents=frozenset({"definition"}),
+        max_docs=6,
+    ),
+    PlanTemplate(
+        "procedure",
+        user_intents=frozenset({"lookup", "explain"}),
+        retrieval_intents=frozenset({"procedure"}),
+    ),
+    PlanTemplate(
+        "background",
+        user_intents=frozenset({"explain"}),
+        retrieval_intents=frozenset({"background"}),
+    ),
+)
+
+
+@dataclass
+class TemplatePlannerStats:
+    planned: int = 0  # requests seen by the template planner
+    bypassed: int = 0  # requests answered by a template (LLM planner skipped)
+    by_template: Counter = field(default_factory=Counter)
+
+    @property
+    def bypass_rate(self) -> float:
+        return self.bypassed / self.planned if self.planned else 0.0
+
+
+class TemplatePlanner:
+    """Rule-based planner for common intent/strategy combinations; thread-safe stats."""
+
+    def __init__(self, templates: Sequence[PlanTemplate] = DEFAULT_TEMPLATES, *, direct_answer: bool = True):
+        self.templates = list(templates)
+        self.direct_answer = direct_answer
+        self.stats = TemplatePlannerStats()
+        self._lock = threading.Lock()
+
+    def _record(self, name: Optional[str]) -> None:
+        with self._lock:
+            self.stats.planned += 1
+            if name is not None:
+                self.stats.bypassed += 1
+                self.stats.by_template[name] += 1
+
+    def plan(self, state: Dict[str, Any]) -> Optional[PlannerState]:
+        """Return a deterministic PlannerState, or ``None`` when the LLM planner should decide."""
+        name, plan = self._match(state)
+        self._record(name)
+        return plan
+
+    def _match(self, state: Dict[str, Any]) -> Tuple[Optional[str], Optional[PlannerState]]:
+        if state.get("errors"):
+            return None, None
+        goal = (state.get("normalized_query") or "").strip()
+        if len(goal) < 5:
+            return None, None
+
+        clarification = state.get("clarification") or {}
+        guardrails = state.get("guardrails") or {}
+        if clarification.get("needed") or clarification.get("blocking"):
+            return None, None
+        if guardrails.get("sensitivity", "normal") != "normal":
+            return None, None
+        if not set(state.get("complexity_flags") or []) <= _SIMPLE_FLAGS:
+            return None, None
+
+        if self.direct_answer and (
+            state.get("retrieval_intent") == "none" or state.get("answerability") == "reasoning_only"
+        ):
+            return "direct_answer", self._build(state, goal, "direct_answer", rounds=[])
+
+        if state.get("answerability") != "internal_corpus":
+            return None, None
+        signals = state.get("signals") or {}
+        if _LITERAL_ARTIFACTS & set(signals.get("artifact_flags") or []) and not self._literals(state):
+            return None, None  # literal-sensitive artifacts without usable terms: let the LLM pick them
+        for template in self.templates:
+            if template.matches(state.get("user_intent"), state.get("retrieval_intent")):
+                rounds = [self._round(state, goal, template)]
+                return template.name, self._build(state, goal, template.name, rounds=rounds)
+        return None, None
+
+    @staticmethod
+    def _literals(state: Dict[str, Any]) -> List[str]:
+        signals = state.get("signals") or {}
+        return [t for t in signals.get("literal_terms") or [] if isinstance(t, str) and t.strip()]
+
+    def _round(self, state: Dict[str, Any], goal: str, template: PlanTemplate) -> RetrievalRound:
+        literal = bool(self._literals(state))
+        alpha = min(template.alpha, 0.4) if literal else template.alpha  # bias toward bm25 for literals
+        modes = [RetrievalModeSpec(type="hybrid", k=template.k, alpha=alpha)]
+        if literal:
+            modes.append(RetrievalModeSpec(type="exact", k=min(template.k, 20)))
+        return RetrievalRound(
+            round_id=0,
+            purpose="recall",
+            query_variants=[goal],
+            retrieval_modes=modes,
+            use_hyde=False,
+            rrf=True,
+            rerank=RerankSpec(enabled=True, rerank_top_k=template.rerank_top_k),
+            output=RoundOutputSpec(max_docs=template.max_docs),
+        )
+
+    def _build(self, state: Dict[str, Any], goal: str, name: str, *, rounds: List[RetrievalRound]) -> PlannerState:
+        terms = self._literals(state) if rounds else []
+        constraints = state.get("constraints") or {}
+        guardrails = state.get("guardrails") or {}
+        if rounds:
+            stop = StopConditions(max_rounds=1, max_total_docs=rounds[0].output.max_docs)
+        else:
+            stop = StopConditions()
+        return PlannerState(
+            goal=goal,
+            strategy="retrieve_then_answer" if rounds else "direct_answer",
+            retrieval_rounds=rounds,
+            literal_constraints=LiteralConstraints(must_preserve_terms=terms, must_match_exactly=bool(terms)),
+            stop_conditions=stop,
+            answer_requirements=AnswerRequirements(format=list(constraints.get("format") or [])),
+            safety=SafetySpec(sensitivity=guardrails.get("sensitivity", "normal")),
+            planner_meta=PlannerMeta(rationale_tags=[f"template:{name}"]),
+        )
+
+
+def make_template_planner_node(templates: TemplatePlanner):
+    """Fast-path node: emit a template plan when one applies.
+
+    Sets ``planner_fast_path``; the planner graph routes to the LLM planner when it is False.
+    """
+
+    def template_planner(state: Dict[str, Any]) -> Dict[str, Any]:
+        plan = templates.plan(state)
+        if plan is None:
+            return {"planner_fast_path": False}
+        logger.debug(
+            f"Template plan {plan.planner_meta.rationale_tags}; bypass rate {templates.stats.bypass_rate:.2f}"
+        )
+        return {"plan": plan.model_dump(), "planner_fast_path": True}
+
+    return template_planner
@@ -0,0 +1,79 @@
+# src/agentic_rag/prompt_layout.py
+"""Prompt layout for provider prefix caching.
+
+OpenAI-style providers cache prompt prefixes. Once a prompt is over about 1024 tokens, the longest
+previously seen prefix is served from cache: it is billed at the cached-input price and is faster to
+first token. A prefix only matches byte for byte (tool schemas first, then the messages in order),
+so every LLM node lays out its prompt as:
+
+1. the static system prompt: the same bytes for every request, with no per-request values in it;
+2. the conversation window (``messages``), which is stable across the turns of one conversation;
+3. one trailing system message with this request's inputs (query, constraints, signals,
+   evidence...) as JSON.
+
+``prefix_cached_messages(SYSTEM_PROMPT, inputs)`` returns that message list for
+``ChatPromptTemplate.from_messages``. The inputs are still passed to the prompt as separate variables,
+so node payloads do not change. The cached tokens of each call are recorded in the token ledger
+(``cached_tokens``, agentic_rag/usage.py).
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, List, Mapping, Sequence, Union
+
+from langchain_core.messages import BaseMessage, SystemMessage
+from langchain_core.prompts import MessagesPlaceholder, PromptTemplate
+from langchain_core.prompts.chat import BaseMessagePromptTemplate
+
+INPUTS_HEADER = "Inputs for this request (JSON):"
+
+
+def static_system_prompt(template: str) -> str:
+    """``template`` rendered once (``{{``/``}}`` unescaped); it must not have variables."""
+    prompt = PromptTemplate.from_template(template)
+    if prompt.input_variables:
+        raise ValueError(f"System prompt must be static, found variables: {prompt.input_variables}")
+    return prompt.format()
+
+
+def render_inputs(inputs: Mapping[str, Any]) -> str:
+    """The trailing inputs message: deterministic JSON, so identical inputs render identically."""
+    body = json.dumps(dict(inputs), ensure_ascii=False, sort_keys=True, default=str)
+    return f"{INPUTS_HEADER}\n{body}"
+
+
+class InputsMessagePromptTemplate(BaseMessagePromptTemplate):
+    """System message carrying the prompt variables ``names`` as one JSON object."""
+
+    names: List[str]
+
+    @property
+    def input_variables(self) -> List[str]:
+        return list(self.names)
+
+    def format_messages(self, **kwargs: Any) -> List[BaseMessage]:
+        return [SystemMessage(content=render_inputs({name: kwargs.get(name) for name in self.names}))]
+
+    def pretty_repr(self, html: bool = False) -> str:
+        return f"{INPUTS_HEADER}\n{{{', '.join(self.names)}}}"
+
+
+def prefix_cached_messages(
+    system: str, inputs: Sequence[str] = (), *, messages: bool = True
+) -> List[Union[BaseMessage, BaseMessagePromptTemplate, MessagesPlaceholder]]:
+    """Messages for ``ChatPromptTemplate.from_messages`` in the cache-friendly order.
+
+    Args:
+        system: Static system prompt (no variables; see ``static_system_prompt``).
+        inputs: Prompt variables sent in the trailing inputs message; none means no such message.
+        messages: Include the conversation window (the ``messages`` variable) after the system prompt.
+    """
+    layout: List[Union[BaseMessage, BaseMessagePromptTemplate, MessagesPlaceholder]] = [
+        SystemMessage(content=static_system_prompt(system))
+    ]
+    if messages:
+        layout.append(MessagesPlaceholder("messages"))
+    if inputs:
+        layout.append(InputsMessagePromptTemplate(names=list(inputs)))
+    return layout
@@ -0,0 +1,301 @@
+# src/agentic_rag/repair.py
+"""Local repair of structured LLM output before escalating to a retry.
+
+Most schema violations from function-calling models are small: an enum value outside the
+Literal (``"semantic"`` for a retrieval mode, ``"aws"`` for a domain), a ``k`` above its
+bound, ``None`` where a default exists, a bare string where a list is expected, an empty
+``query_variants``. Another LLM call costs far more than fixing these locally.
+
+``validate_with_repair`` validates, repairs the reported locations from ``ValidationError.errors()``
+and validates again. It re-raises the original error when repair does not produce a valid object,
+and the node then reports a retryable ``model_output_parse`` error exactly as before.
+Repairs:
+
+- unknown Literal: normalised/prefix/close match, else ``"other"`` when allowed, else drop
+  (list items are removed; fields fall back to their defaults)
+- safety fields never fall back to a permissive default: an unmatched ``sensitivity`` becomes
+  ``"restricted"``; any other error on ``pii_present`` escalates
+- numeric bounds (ge/gt/le/lt): clamp
+- ``None`` / wrong type where a default exists: drop the key so the default applies
+- string where a list is expected: wrap it
+- extra keys on ``extra="forbid"`` models: drop
+- missing or too-short fields: fill from ``fallbacks`` (field name -> value), when given
+
+``REPAIR_STATS`` counts validations, repairs and escalations per node.
+"""
+
+from __future__ import annotations
+
+import copy
+import difflib
+import json
+import logging
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, List, Mapping, Optional, Tuple, Type, TypeVar
+
+from pydantic import BaseModel, ValidationError
+
+logger = logging.getLogger(__name__)
+
+M = TypeVar("M", bound=BaseModel)
+
+MAX_REPAIR_PASSES = 3
+
+_LITERAL_OPTION_RE = re.compile(r"'((?:[^'\\]|\\.)*)'")
+# Safety/guardrail fields: unmatched values map to the most restrictive option ...
+_MOST_RESTRICTIVE = {"sensitivity": "restricted"}
+# ... or, without one, are never repaired (the output escalates to a retry)
+_NEVER_REPAIRED = frozenset({"pii_present"})
+# Error types where dropping the offending key lets the field default apply
+_DROPPABLE = frozenset(
+    {
+        "string_type",
+        "int_type",
+        "int_parsing",
+        "float_type",
+        "float_parsing",
+        "bool_type",
+        "bool_parsing",
+        "dict_type",
+        "model_type",
+        "list_type",
+        "none_required",
+    }
+)
+
+
+@dataclass
+class RepairStats:
+    validated: int = 0  # structured outputs checked
+    repaired: Counter = field(default_factory=Counter)  # node -> outputs fixed locally
+    escalated: Counter = field(default_factory=Counter)  # node -> outputs returned as retryable errors
+    fixes: Counter = field(default_factory=Counter)  # pydantic error type -> fixes applied
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    @property
+    def repair_rate(self) -> float:
+        """Share of invalid outputs that were fixed without a retry."""
+        invalid = sum(self.repaired.values()) + sum(self.escalated.values())
+        return sum(self.repaired.values()) / invalid if invalid else 0.0
+
+    def reset(self) -> None:
+        with self._lock:
+            self.validated = 0
+            self.repaired.clear()
+            self.escalated.clear()
+            self.fixes.clear()
+
+
+REPAIR_STATS = RepairStats()
+
+
+# -------------------------
+# Structured-output results
+# -------------------------
+
+
+def structured_data(result: Any) -> Any:
+    """Model output as a pydantic object or plain data, unwrapping ``include_raw=True`` results.
+
+    With ``include_raw=True`` a parsing failure arrives as ``{"raw", "parsed", "parsing_error"}``
+    instead of an exception. The tool call arguments (or JSON content) of the raw message are what
+    gets repaired.
+    """
+    if not (isinstance(result, dict) and "parsing_error" in result and "raw" in result):
+        return result
+    if result.get("parsed") is not None:
+        return result["parsed"]
+    raw = result.get("raw")
+    tool_calls = getattr(raw, "tool_calls", None) or []
+    if tool_calls and isinstance(tool_calls[0].get("args"), dict):
+        return tool_calls[0]["args"]
+    content = getattr(raw, "content", None)
+    if isinstance(content, str) and content.lstrip().startswith("{"):  # json_schema / json_mode output
+        try:
+            return json.loads(content)
+        except json.JSONDecodeError:
+            pass
+    error = result.get("parsing_error")
+    if isinstance(error, BaseException):
+        raise error
+    raise ValueError("Structured output missing: no parsed value and no tool call arguments.")
+
+
+# -------------------------
+# Repair
+# -------------------------
+
+
+def _literal_options(error: Mapping[str, Any]) -> List[str]:
+    expected = (error.get("ctx") or {}).get("expected", "")
+    return [m.replace("\\'", "'") for m in _LITERAL_OPTION_RE.findall(expected)]
+
+
+def _norm(value: str) -> str:
+    return re.sub(r"[\s\-]+", "_", value.strip().lower())
+
+
+def _match_literal(value: Any, options: List[str]) -> Optional[str]:
+    if not options or not isinstance(value, str):
+        return None
+    norm = _norm(value)
+    by_norm = {_norm(o): o for o in options}
+    if norm in by_norm:
+        return by_norm[norm]
+    prefixed = [o for o in options if _norm(o).startswith(norm) and norm]
+    if len(prefixed) == 1:
+        return prefixed[0]
+    close = difflib.get_close_matches(norm, list(by_norm), n=1, cutoff=0.75)
+    if close:
+        return by_norm[close[0]]
+    return "other" if "other" in options else None
+
+
+def _clamp(value: Any, ctx: Mapping[str, Any]) -> Any:
+    if not isinstance(value, (int, float)) or isinstance(value, bool):
+        return None
+    step = 1 if isinstance(value, int) else 0.0
+    if "le" in ctx:
+        return ctx["le"]
+    if "lt" in ctx:
+        return ctx["lt"] - step if step else None
+    if "ge" in ctx:
+        return ctx["ge"]
+    if "gt" in ctx:
+        return ctx["gt"] + step if step else None
+    return None
+
+
+def _container(data: Any, loc: Tuple[Any, ...]) -> Optional[Any]:
+    node = data
+    for part in loc:
+        try:
+            node = node[part]
+        except (KeyError, IndexError, TypeError):
+            return None
+    return node if isinstance(node, (dict, list)) else None
+
+
+def _fix(error: Mapping[str, Any], fallbacks: Mapping[str, Any]) -> Optional[Tuple[str, Any]]:
+    """``("set", value)`` / ``("drop", None)`` for one error, or ``None`` if it cannot be repaired."""
+    kind = error.get("type")
+    value = error.get("input")
+    name = next((p for p in reversed(error.get("loc") or ()) if isinstance(p, str)), None)
+
+    if name in _MOST_RESTRICTIVE:
+        match = _match_literal(value, _literal_options(error)) if kind == "literal_error" else None
+        return ("set", match if match is not None else _MOST_RESTRICTIVE[name])
+    if name in _NEVER_REPAIRED:
+        return None
+    if kind == "literal_error":
+        match = _match_literal(value, _literal_options(error))
+        return ("set", match) if match is not None else ("drop", None)
+    if kind in ("less_than_equal", "less_than", "greater_than_equal", "greater_than"):
+        clamped = _clamp(value, error.get("ctx") or {})
+        return ("set", clamped) if clamped is not None else None
+    if kind == "int_from_float" and isinstance(value, float):
+        return ("set", int(round(value)))
+    if kind == "list_type" and isinstance(value, str):
+        return ("set", [value])
+    if kind == "extra_forbidden":
+        return ("drop", None)
+    if kind in ("missing", "too_short", "string_too_short") and name in fallbacks:
+        return ("set", copy.deepcopy(fallbacks[name]))
+    if kind == "missing" and any(isinstance(p, int) for p in error.get("loc") or ()):
+        return ("drop_item", None)  # a list element without a required field: drop the element
+    if kind in _DROPPABLE:
+        return ("drop", None)
+    return None
+
+
+def repair_data(
+    data: Any, errors: List[Mapping[str, Any]], fallbacks: Optional[Mapping[str, Any]] = None
+) -> Tuple[Any, List[str]]:
+    """Return a repaired deep copy of ``data`` and the error types fixed (others are left in place)."""
+    fallbacks = fallbacks or {}
+    data = copy.deepcopy(data)
+    drops: List[Tuple[Any, Any]] = []
+    fixed: List[str] = []
+    for error in errors:
+        loc = tuple(error.get("loc") or ())
+        if not loc:
+            continue
+        parent = _container(data, loc[:-1])
+        if parent is None:
+            continue
+        fix = _fix(error, fallbacks)
+        if fix is None:
+            continue
+        action, value = fix
+        key = loc[-1]
+        if action == "drop_item":
+            i = max(i for i, p in enumerate(loc) if isinstance(p, int))
+            parent, key, action = _container(data, loc[:i]), loc[i], "drop"
+        if action == "set" and (isinstance(parent, dict) or (isinstance(key, int) and key < len(parent))):
+            parent[key] = value
+        elif action == "drop":
+            if not any(p is parent and k == key for p, k in drops):
+                drops.append((parent, key))
+        else:
+            continue
+        fixed.append(error.get("type"))
+
+    # Delete list items from the back so earlier indices stay valid
+    for parent, key in sorted(drops, key=lambda d: d[1] if isinstance(d[1], int) else -1, reverse=True):
+        if isinstance(parent, dict):
+            parent.pop(key, None)
+        elif isinstance(key, int) and key < len(parent):
+            del parent[key]
+    return data, fixed
+
+
+def validate_with_repair(
+    schema: Type[M],
+    raw: Any,
+    *,
+    node: str,
+    fallbacks: Optional[Mapping[str, Any]] = None,
+    stats: RepairStats = REPAIR_STATS,
+) -> M:
+    """Validate ``raw`` against ``schema``, repairing common violations locally.
+
+    Raises the original ``ValidationError`` when repair does not yield a valid object, so callers
+    keep their existing retryable ``model_output_parse`` handling.
+    """
+    with stats._lock:
+        stats.validated += 1
+    if isinstance(raw, schema):
+        return raw
+    data = raw.model_dump() if hasattr(raw, "model_dump") else raw
+    try:
+        return schema.model_validate(data)
+    except ValidationError as e:
+        if not isinstance(data, dict):
+            with stats._lock:
+                stats.escalated[node] += 1
+            raise
+        original = error = e
+
+    for _ in range(MAX_REPAIR_PASSES):
+        data, fixed = repair_data(data, error.errors(), fallbacks)
+        with stats._lock:
+            stats.fixes.update(fixed)
+        if not fixed:
+            break
+        try:
+            result = schema.model_validate(data)
+        except ValidationError as e:
+            error = e
+            continue
+        with stats._lock:
+            stats.repaired[node] += 1
+        logger.info(f"Repaired {schema.__name__} output locally in {node} ({original.error_count()} errors)")
+        return result
+
+    with stats._lock:
+        stats.escalated[node] += 1
+    logger.info(f"Repair failed for {schema.__name__} in {node}; escalating to retry")
+    raise original
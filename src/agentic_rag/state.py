@@ -6,6 +6,8 @@ from typing import Annotated, Any, Dict, List, Optional
 from langgraph.graph.message import add_messages
 from typing_extensions import TypedDict
 
+from agentic_rag.usage import add_ledger
+
 # Import specific state definitions from sub-modules
 # We use Any/Dict for flexibility where strict typing causes circular imports or rigid coupling,
 # but ideally we align with the keys used in subgraphs.
@@ -32,6 +34,8 @@ class AgentState(TypedDict, total=False):
     user_email: str
     user_context_info: Optional[Dict[str, Any]]
     conversation_summary: Optional[str]
+    summarized_turns: int  # leading turns covered by conversation_summary (agentic_rag/context.py)
+    model_tier: Optional[str]  # explicit model tier; else chosen from constraints (agentic_rag/model.py)
 
     # Intake outputs
     normalized_query: str
@@ -48,12 +52,18 @@ class AgentState(TypedDict, total=False):
     complexity_flags: List[str]
     signals: Dict[str, Any]
     intake_version: str
+    intake_cache_hit: bool
+    intake_fast_path: bool
     debug_notes: Optional[str]
 
     # --- PLANNER ---
     # The planner subgraph returns a 'plan' dictionary (PlannerState).
     # We store it here to pass to Executor and Answer.
     plan: Optional[Dict[str, Any]]  # keys: goal, strategy, retrieval_rounds, etc.
+    planner_fast_path: bool  # True when a TemplatePlanner template replaced the LLM planner
+    prefetched_round: Optional[Dict[str, Any]]  # round-0 retrieval started by the streaming planner
+    speculation_id: Optional[str]  # pending speculative answer draft (answer/speculative.py)
+    speculative_answer: Optional[Dict[str, Any]]  # accepted draft, reused by compose_answer
 
     # --- EXECUTOR ---
     # Executor keys needed for inter-node communication within creating the plan
@@ -75,5 +85,8 @@ class AgentState(TypedDict, total=False):
     answer_meta: Dict[str, Any]
 
     # --- COMMON ---
+    # Per-call token usage, appended by every LLM node (agentic_rag/usage.py)
+    token_ledger: Annotated[List[Dict[str, Any]], add_ledger]
+
     # Shared error channel
     errors: Annotated[List[Dict[str, Any]], add_errors]
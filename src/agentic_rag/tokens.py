@@ -0,0 +1,7 @@
+# src/agentic_rag/tokens.py
+"""Tokenizer-free token estimate shared by embedding batching and prompt budgeting."""
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 chars per token); no tokenizer, so it is model-agnostic."""
+    return max(1, len(text) // 4)
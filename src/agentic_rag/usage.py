@@ -0,0 +1,299 @@
+# src/agentic_rag/usage.py
+"""Token and cost accounting per node and per request.
+
+Every LLM node runs under ``with_usage(node, name)``. While the node runs, a callback handler
+(registered through a langchain configure hook, so it also sees LLM calls made inside the HyDE and
+grader adapters) collects the ``usage_metadata`` of each chat model response. The node's update
+then carries one ``token_ledger`` entry per call:
+
+    {"id", "node", "model", "input_tokens", "cached_tokens", "output_tokens", "total_tokens",
+     "cost_usd", "cache_hit"}
+
+``token_ledger`` uses the ``add_ledger`` reducer (append, de-duplicated by ``id``) in every state
+schema, so the master state holds the request's full ledger. ``cache_hit`` entries were served by
+the persistent response cache (agentic_rag/llm_cache.py) and cost nothing. ``cached_tokens`` are the
+input tokens the provider served from its prompt prefix cache (agentic_rag/prompt_layout.py); they
+are billed at the cached-input price.
+
+Budget: ``plan.budget.max_tokens`` caps the tokens spent after planning (executor and answer
+stages; intake and planner tokens are already spent when the plan exists). ``budget_remaining``
+is what is left. With ``make_agent_graph(enforce_token_budget=True)`` HyDE is skipped, retrieval
+stops and the composer's evidence is trimmed when the budget would be exceeded, and the request
+aborts with a ``budget_exceeded`` error when not even a trimmed answer fits.
+
+``UsageReport`` aggregates ledgers across batch runs into per-node p50/p95 token counts and
+prefix cache hit rates.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import functools
+import inspect
+import logging
+import threading
+import uuid
+from collections import defaultdict
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import ChatGeneration, LLMResult
+from langchain_core.tracers.context import register_configure_hook
+
+logger = logging.getLogger(__name__)
+
+# USD per 1M tokens: (input, cached input, output)
+MODEL_PRICES: Dict[str, Tuple[float, float, float]] = {
+    "gpt-4.1": (2.00, 0.50, 8.00),
+    "gpt-4.1-mini": (0.40, 0.10, 1.60),
+    "gpt-4.1-nano": (0.10, 0.025, 0.40),
+    "gpt-4o": (2.50, 1.25, 10.00),
+    "gpt-4o-mini": (0.15, 0.075, 0.60),
+}
+
+# Nodes that run before the plan (and its budget) exist
+PRE_PLAN_NODES = frozenset({"summarize_context", "normalize_gate", "extract_signals", "intake_fused", "planner"})
+
+
+# -------------------------
+# Ledger
+# -------------------------
+
+
+def add_ledger(existing: Optional[List[Dict[str, Any]]], new: Optional[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """Append ledger entries; entries already present (same ``id``) are skipped.
+
+    Subgraphs return their whole ledger to the parent graph, which already holds the entries it
+    passed in.
+    """
+    existing = list(existing or [])
+    if not new:
+        return existing
+    seen = {e.get("id") for e in existing}
+    return existing + [e for e in new if e.get("id") not in seen]
+
+
+def model_price(model: Optional[str]) -> Optional[Tuple[float, float, float]]:
+    """Prices for ``model``; dated snapshots (``gpt-4.1-2025-04-14``) match their base id."""
+    if not model:
+        return None
+    name = model.split(":", 1)[-1]
+    matches = [m for m in MODEL_PRICES if name == m or name.startswith(m + "-")]
+    return MODEL_PRICES[max(matches, key=len)] if matches else None
+
+
+def cost_usd(model: Optional[str], input_tokens: int, output_tokens: int, cached_tokens: int = 0) -> Optional[float]:
+    price = model_price(model)
+    if price is None:
+        return None
+    uncached = max(0, input_tokens - cached_tokens)
+    return (uncached * price[0] + cached_tokens * price[1] + output_tokens * price[2]) / 1_000_000
+
+
+def ledger_entry(node: str, record: Mapping[str, Any]) -> Dict[str, Any]:
+    input_tokens = int(record.get("input_tokens") or 0)
+    cached_tokens = min(input_tokens, int(record.get("cached_tokens") or 0))
+    output_tokens = int(record.get("output_tokens") or 0)
+    cache_hit = bool(record.get("cache_hit"))
+    return {
+        "id": uuid.uuid4().hex,
+        "node": node,
+        "model": record.get("model"),
+        "input_tokens": input_tokens,
+        "cached_tokens": cached_tokens,
+        "output_tokens": output_tokens,
+        "total_tokens": int(record.get("total_tokens") or input_tokens + output_tokens),
+        "cost_usd": 0.0 if cache_hit else cost_usd(record.get("model"), input_tokens, output_tokens, cached_tokens),
+        "cache_hit": cache_hit,
+    }
+
+
+def ledger_totals(ledger: Optional[Iterable[Mapping[str, Any]]], *, exclude: Iterable[str] = ()) -> Dict[str, Any]:
+    """Summed tokens and cost over ``ledger`` (entries of ``exclude`` nodes are skipped)."""
+    skip = set(exclude)
+    totals: Dict[str, Any] = {
+        "calls": 0,
+        "input_tokens": 0,
+        "cached_tokens": 0,
+        "output_tokens": 0,
+        "total_tokens": 0,
+        "cost_usd": 0.0,
+    }
+    for e in ledger or []:
+        if e.get("node") in skip:
+            continue
+        totals["calls"] += 1
+        for k in ("input_tokens", "cached_tokens", "output_tokens", "total_tokens"):
+            totals[k] += int(e.get(k) or 0)
+        totals["cost_usd"] += float(e.get("cost_usd") or 0.0)
+    return totals
+
+
+# -------------------------
+# Collection
+# -------------------------
+
+
+class UsageMeter(BaseCallbackHandler):
+    """Collects the usage of every chat model response in the current context."""
+
+    def __init__(self):
+        self.records: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def on_llm_end(self, response: LLMResult, **kwargs: Any) -> None:
+        llm_output = response.llm_output or {}
+        for generations in response.generations:
+            for generation in generations:
+                if not isinstance(generation, ChatGeneration):
+                    continue
+                message = generation.message
+                usage = getattr(message, "usage_metadata", None)
+                if not usage:
+                    continue
+                metadata = getattr(message, "response_metadata", None) or {}
+                details = usage.get("input_token_details") or {}
+                record = {
+                    "model": metadata.get("model_name") or llm_output.get("model_name"),
+                    "input_tokens": usage.get("input_tokens", 0),
+                    "cached_tokens": details.get("cache_read") or 0,
+                    "output_tokens": usage.get("output_tokens", 0),
+                    "total_tokens": usage.get("total_tokens", 0),
+                    "cache_hit": bool(metadata.get("response_cache_hit")),
+                }
+                with self._lock:
+                    self.records.append(record)
+
+    def drain(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            records, self.records = self.records, []
+        return records
+
+
+_meter: contextvars.ContextVar[Optional[UsageMeter]] = contextvars.ContextVar("agentic_rag_usage_meter", default=None)
+# Any chat model invoked while ``_meter`` is set reports to it, however deep in the call stack
+register_configure_hook(_meter, inheritable=True)
+
+
+def _with_ledger(update: Any, node: str, meter: UsageMeter) -> Any:
+    entries = [ledger_entry(node, r) for r in meter.drain()]
+    if not entries or not isinstance(update, dict):
+        return update
+    logger.debug(f"{node}: {ledger_totals(entries)['total_tokens']} tokens over {len(entries)} LLM call(s)")
+    return {**update, "token_ledger": list(update.get("token_ledger") or []) + entries}
+
+
+def with_usage(node: Callable[..., Any], name: str) -> Callable[..., Any]:
+    """Wrap an LLM node (and its async twin ``node.afunc``) to add ``token_ledger`` entries to its update."""
+
+    @functools.wraps(node)
+    def metered(*args: Any, **kwargs: Any) -> Any:
+        meter = UsageMeter()
+        token = _meter.set(meter)
+        try:
+            update = node(*args, **kwargs)
+        finally:
+            _meter.reset(token)
+        return _with_ledger(update, name, meter)
+
+    afunc = getattr(node, "afunc", None)
+    if afunc is not None or inspect.iscoroutinefunction(node):
+        inner = afunc or node
+
+        async def ametered(*args: Any, **kwargs: Any) -> Any:
+            meter = UsageMeter()
+            token = _meter.set(meter)
+            try:
+                update = await inner(*args, **kwargs)
+            finally:
+                _meter.reset(token)
+            return _with_ledger(update, name, meter)
+
+        if afunc is None:
+            return functools.wraps(node)(ametered)
+        metered.afunc = ametered
+    return metered
+
+
+# -------------------------
+# Budget
+# -------------------------
+
+
+def plan_budget(state: Mapping[str, Any]) -> Optional[int]:
+    budget = ((state.get("plan") or {}).get("budget") or {}).get("max_tokens")
+    return int(budget) if budget else None
+
+
+def budget_spent(state: Mapping[str, Any]) -> int:
+    """Tokens spent after planning (the part of the request the plan's budget covers)."""
+    return ledger_totals(state.get("token_ledger"), exclude=PRE_PLAN_NODES)["total_tokens"]
+
+
+def budget_remaining(state: Mapping[str, Any]) -> Optional[int]:
+    """Tokens left in ``plan.budget.max_tokens``, or ``None`` without a budget."""
+    budget = plan_budget(state)
+    return None if budget is None else budget - budget_spent(state)
+
+
+# -------------------------
+# Batch reporting
+# -------------------------
+
+
+class UsageReport:
+    """Per-node token percentiles and prefix cache hit rates across requests (eval and batch runs)."""
+
+    def __init__(self):
+        self._calls: Dict[str, List[Tuple[int, int, int, int]]] = defaultdict(list)
+        self._requests: List[Tuple[int, float]] = []
+
+    def add(self, state_or_ledger: Any) -> None:
+        ledger = state_or_ledger.get("token_ledger") if isinstance(state_or_ledger, dict) else state_or_ledger
+        ledger = list(ledger or [])
+        for e in ledger:
+            self._calls[e.get("node") or "unknown"].append(
+                (
+                    int(e.get("input_tokens") or 0),
+                    int(e.get("output_tokens") or 0),
+                    int(e.get("total_tokens") or 0),
+                    int(e.get("cached_tokens") or 0),
+                )
+            )
+        totals = ledger_totals(ledger)
+        self._requests.append((totals["total_tokens"], totals["cost_usd"]))
+
+    @staticmethod
+    def _percentiles(values: Sequence[float], prefix: str) -> Dict[str, float]:
+        p50, p95 = np.percentile(np.asarray(values, dtype=float), [50, 95]) if values else (0.0, 0.0)
+        return {f"{prefix}_p50": float(p50), f"{prefix}_p95": float(p95)}
+
+    def summary(self) -> Dict[str, Any]:
+        nodes: Dict[str, Any] = {}
+        for node, calls in sorted(self._calls.items()):
+            columns = list(zip(*calls))
+            nodes[node] = {"calls": len(calls)}
+            for prefix, values in zip(("input", "output", "total", "cached"), columns):
+                nodes[node].update(self._percentiles(values, prefix))
+            nodes[node]["prefix_cache_rate"] = sum(columns[3]) / sum(columns[0]) if sum(columns[0]) else 0.0
+        return {
+            "requests": len(self._requests),
+            "nodes": nodes,
+            **self._percentiles([t for t, _ in self._requests], "request_tokens"),
+            "cost_usd": sum(c for _, c in self._requests),
+        }
+
+    def format(self) -> str:
+        summary = self.summary()
+        lines = [f"{'node':<24}{'calls':>7}{'in p50':>9}{'in p95':>9}{'out p50':>9}{'out p95':>9}{'cached':>9}"]
+        for node, s in summary["nodes"].items():
+            lines.append(
+                f"{node:<24}{s['calls']:>7}{s['input_p50']:>9.0f}{s['input_p95']:>9.0f}"
+                f"{s['output_p50']:>9.0f}{s['output_p95']:>9.0f}{s['prefix_cache_rate']:>9.0%}"
+            )
+        lines.append(
+            f"{summary['requests']} request(s): p50 {summary['request_tokens_p50']:.0f} / "
+            f"p95 {summary['request_tokens_p95']:.0f} tokens, ${summary['cost_usd']:.4f}"
+        )
+        return "\n".join(lines)
@@ -32,15 +32,15 @@ def build_state_from_case(case: Dict[str, Any]) -> Dict[str, Any]:
     return state_in
 
 
-def run_intake(llm, case: Dict[str, Any], max_retries: int = 3) -> Dict[str, Any]:
+def run_intake(llm, case: Dict[str, Any], max_retries: int = 3, fused: Optional[bool] = None) -> Dict[str, Any]:
     """Run the compiled intake graph against a single case dict.
     Returns the final IntakeState (dict).
     """
-    graph = make_intake_graph(llm, max_retries=max_retries)
+    graph = make_intake_graph(llm, max_retries=max_retries, fused=fused)
     state_in = build_state_from_case(case)
     return graph.invoke(state_in)
 
 
-def run_intake_from_file(llm, case_path: Path, max_retries: int = 3) -> Dict[str, Any]:
+def run_intake_from_file(llm, case_path: Path, max_retries: int = 3, fused: Optional[bool] = None) -> Dict[str, Any]:
     case = load_case(case_path)
-    return run_intake(llm, case, max_retries=max_retries)
+    return run_intake(llm, case, max_retries=max_retries, fused=fused)
@@ -0,0 +1,134 @@
+"""Compare the fused single-call intake node against the two-step path.
+
+For every case, both paths run on the same input. The test:
+- hard-fails if either path returns errors or the fused path writes a different set of IntakeState keys
+- hard-fails if the fused path breaks a labeled behavior contract the two-step path satisfies
+- soft-fails (xfail) on projection disagreements, like test_stability, unless
+  INTENT_EVAL_FAIL_ON_FUSED_DIFF=1
+
+Artifacts (both outputs, projections, timings) go to artifacts/intent_eval/<run_id>/<case_id>/fused.*.
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+from dotenv import load_dotenv
+from json_utils import write_artifact
+
+from agentic_rag.intent.graph import make_intake_graph
+
+load_dotenv()
+
+CASES_DIR = Path("tests/intent_eval/cases/intake_v1")
+EXPECTED_DIR = Path("tests/intent_eval/expected/intake_v1")
+ARTIFACTS_DIR = Path("artifacts/intent_eval")
+
+FAIL_ON_FUSED_DIFF = os.environ.get("INTENT_EVAL_FAIL_ON_FUSED_DIFF", "0") == "1"
+
+MAX_RETRIES = 1
+
+# Optional keys are only written when present, so they are excluded from the key-set check
+OPTIONAL_KEYS = {"language", "locale"}
+
+
+def _load_json(path: Path) -> Dict[str, Any]:
+    with path.open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _list_case_files() -> List[Path]:
+    if not CASES_DIR.exists():
+        return []
+    return sorted([p for p in CASES_DIR.glob("*.json") if p.is_file()])
+
+
+def _run(llm, case: Dict[str, Any], fused: bool) -> Dict[str, Any]:
+    graph = make_intake_graph(llm, max_retries=MAX_RETRIES, fused=fused)
+    state_in = {"messages": case["messages"]}
+    if "conversation_summary" in case:
+        state_in["conversation_summary"] = case["conversation_summary"]
+    if "user_context_info" in case:
+        state_in["user_context_info"] = case["user_context_info"]
+    return graph.invoke(state_in)
+
+
+def _projection(out: Dict[str, Any]) -> Dict[str, Any]:
+    clar = out.get("clarification") or {}
+    signals = out.get("signals") or {}
+    return {
+        "user_intent": out.get("user_intent"),
+        "retrieval_intent": out.get("retrieval_intent"),
+        "answerability": out.get("answerability"),
+        "clarification_needed": clar.get("needed"),
+        "clarification_blocking": clar.get("blocking"),
+        "constraints_format": sorted(((out.get("constraints") or {}).get("format") or [])),
+        "complexity_flags": sorted(out.get("complexity_flags") or []),
+        "artifact_flags": sorted(signals.get("artifact_flags") or []),
+    }
+
+
+def _contract_violations(out: Dict[str, Any], expected: Dict[str, Any]) -> List[str]:
+    """Subset of test_behavior_contract checks, returned instead of asserted."""
+    violations = []
+    for k in ("user_intent", "retrieval_intent", "answerability"):
+        if k in expected and out.get(k) != expected[k]:
+            violations.append(f"{k}={out.get(k)!r} (expected {expected[k]!r})")
+    clar_exp = expected.get("clarification") or {}
+    clar = out.get("clarification") or {}
+    for k in ("needed", "blocking"):
+        if k in clar_exp and clar.get(k) != clar_exp[k]:
+            violations.append(f"clarification.{k}={clar.get(k)!r} (expected {clar_exp[k]!r})")
+    return violations
+
+
+@pytest.mark.parametrize("case_path", _list_case_files())
+def test_fused_matches_two_step(case_path: Path, llm):
+    case = _load_json(case_path)
+    case_id = case.get("case_id", case_path.stem)
+    run_id = os.environ.get("INTENT_EVAL_RUN_ID", "local")
+
+    started = time.perf_counter()
+    two_step = _run(llm, case, fused=False)
+    two_step_s = time.perf_counter() - started
+    started = time.perf_counter()
+    fused = _run(llm, case, fused=True)
+    fused_s = time.perf_counter() - started
+
+    write_artifact(ARTIFACTS_DIR, run_id, case_id, "fused.two_step", two_step)
+    write_artifact(ARTIFACTS_DIR, run_id, case_id, "fused.fused", fused)
+    write_artifact(
+        ARTIFACTS_DIR,
+        run_id,
+        case_id,
+        "fused.comparison",
+        {
+            "two_step": _projection(two_step),
+            "fused": _projection(fused),
+            "latency_s": {"two_step": round(two_step_s, 3), "fused": round(fused_s, 3)},
+        },
+    )
+
+    assert (two_step.get("errors") or []) == [], f"Two-step path returned errors: {two_step.get('errors')}"
+    assert (fused.get("errors") or []) == [], f"Fused path returned errors: {fused.get('errors')}"
+    assert set(fused) - OPTIONAL_KEYS == set(two_step) - OPTIONAL_KEYS
+
+    expected_path = EXPECTED_DIR / f"{case_path.stem}.expected.json"
+    if expected_path.exists():
+        expected = _load_json(expected_path)
+        regressions = [
+            v for v in _contract_violations(fused, expected) if v not in _contract_violations(two_step, expected)
+        ]
+        assert not regressions, f"Fused path regressed the behavior contract for {case_id}: {regressions}"
+
+    a, b = _projection(two_step), _projection(fused)
+    diffs = [f"{k}: {a[k]!r} != {b[k]!r}" for k in a if a[k] != b[k]]
+    if diffs:
+        msg = f"Fused/two-step disagreement for {case_id}: " + "; ".join(diffs)
+        if FAIL_ON_FUSED_DIFF:
+            pytest.fail(msg)
+        else:
+            pytest.xfail(msg)
@@ -0,0 +1,63 @@
+# tests/unit/answer/test_answer_budget.py
+"""Unit tests for the answer_budget node."""
+
+from agentic_rag.answer.nodes.answer_budget import compose_tokens, make_answer_budget_node
+from agentic_rag.answer.nodes.compose_answer import _coerce_evidence
+
+
+def _evidence(n, words=200):
+    return [{"evidence_id": f"e{i}", "text": " ".join(["token"] * words)} for i in range(n)]
+
+
+def _state(max_tokens, evidence, spent=0, mode="answer"):
+    return {
+        "messages": [{"type": "human", "content": "What is LangGraph?"}],
+        "normalized_query": "What is LangGraph?",
+        "answer_mode": mode,
+        "plan": {"goal": "Explain LangGraph", "budget": {"max_tokens": max_tokens}},
+        "final_evidence": evidence,
+        "token_ledger": [{"id": "g", "node": "grade_coverage", "total_tokens": spent}],
+    }
+
+
+def _full_tokens(evidence):
+    """Compose estimate with the whole pack, as the node computes it under a budget of that size.
+
+    ``plan.budget.max_tokens`` is rendered into the compose inputs, so the estimate depends on the
+    budget itself; iterate to the fixed point.
+    """
+    items = _coerce_evidence(evidence)
+    full = compose_tokens(_state(0, evidence), items)
+    while (again := compose_tokens(_state(full, evidence), items)) > full:
+        full = again
+    return full
+
+
+class TestAnswerBudget:
+    def test_no_budget_or_fitting_budget_is_noop(self):
+        node = make_answer_budget_node()
+        state = _state(100000, _evidence(3))
+        assert node(state) == {}
+        state["plan"].pop("budget")
+        assert node(state) == {}
+
+    def test_trims_lowest_ranked_evidence(self):
+        evidence = _evidence(6)
+        full = _full_tokens(evidence)
+        out = make_answer_budget_node()(_state(full - 300, evidence))
+        kept = [e["evidence_id"] for e in out["compressed_evidence"]]
+        assert kept == [f"e{i}" for i in range(len(kept))]
+        assert 0 < len(kept) < 6
+        assert out["answer_meta"]["budget_degraded"] is True
+
+    def test_spent_tokens_count_against_budget(self):
+        evidence = _evidence(6)
+        full = _full_tokens(evidence)
+        assert make_answer_budget_node()(_state(full, evidence)) == {}
+        assert "compressed_evidence" in make_answer_budget_node()(_state(full, evidence, spent=300))
+
+    def test_aborts_when_nothing_fits(self):
+        out = make_answer_budget_node()(_state(300, _evidence(2)))
+        assert out["answer_meta"]["budget_exceeded"] is True
+        assert out["errors"][0]["type"] == "budget_exceeded"
+        assert "compressed_evidence" not in out
@@ -0,0 +1,100 @@
+# tests/unit/answer/test_compression.py
+"""Unit tests for extractive evidence compression."""
+
+from agentic_rag.answer.compression import (
+    SEPARATOR,
+    compress_evidence,
+    original_span,
+    query_terms,
+    sentence_spans,
+)
+from agentic_rag.answer.graph import make_answer_graph
+from agentic_rag.answer.nodes.compose_answer import compose_payload
+from agentic_rag.answer.nodes.compress_evidence import make_compress_evidence_node
+from agentic_rag.answer.nodes.postprocess_answer import make_postprocess_answer_node
+from agentic_rag.answer.state import EvidenceItem
+
+FILLER = [
+    "The platform team meets every Tuesday to review the quarterly roadmap.",
+    "Office plants are watered by the facilities staff on alternate weeks.",
+    "Historical context for the project goes back to the original prototype.",
+    "Several teams contributed documentation during the migration period.",
+    "The cafeteria menu rotates seasonally and includes vegetarian options.",
+]
+KEY = "To configure Azure OpenAI, set AZURE_OPENAI_ENDPOINT and AZURE_OPENAI_API_KEY."
+
+
+def _chunk(key_at=2):
+    sentences = FILLER[:key_at] + [KEY] + FILLER[key_at:]
+    return " ".join(sentences)
+
+
+def _state(evidence):
+    return {
+        "answer_mode": "answer",
+        "normalized_query": "How do I configure Azure OpenAI endpoint and API key?",
+        "plan": {"goal": "Configure Azure OpenAI", "acceptance_criteria": {"must_cover_entities": ["Azure OpenAI"]}},
+        "final_evidence": evidence,
+    }
+
+
+def _evidence(n=3):
+    return [{"evidence_id": f"ev_{i:03d}", "text": _chunk(key_at=i % 5), "source": "kb"} for i in range(n)]
+
+
+class TestCompression:
+    def test_sentence_spans(self):
+        text = "First one. Second one!\nThird line\n\n  Fourth?"
+        assert [text[s:e] for s, e in sentence_spans(text)] == ["First one.", "Second one!", "Third line", "Fourth?"]
+
+    def test_keeps_relevant_sentence_and_halves_tokens(self):
+        state = _state(_evidence())
+        items = [EvidenceItem.model_validate(e) for e in state["final_evidence"]]
+        compressed = compress_evidence(items, query_terms(state))
+
+        assert sum(len(c["text"]) for c in compressed) * 2 <= sum(len(i.text) for i in items)
+        for item, c in zip(items, compressed):
+            assert KEY in c["text"]
+            info = c["provenance"]["compression"]
+            assert c["text"] == SEPARATOR.join(item.text[s:e] for s, e in info["spans"])
+            assert info["original_chars"] == len(item.text)
+
+    def test_short_chunks_pass_through(self):
+        item = EvidenceItem(evidence_id="ev_1", text="Short. Chunk.")
+        assert compress_evidence([item], ["short"]) == [item.model_dump()]
+
+    def test_original_span_maps_back(self):
+        text = "aaa. bbb. ccc. ddd."
+        info = {"spans": [[0, 4], [10, 19]]}
+        compressed = SEPARATOR.join(text[s:e] for s, e in info["spans"])
+        pos = compressed.find("ddd")
+        assert original_span(info, pos, pos + 3) == (15, 18)
+        assert original_span(info, compressed.find("…"), compressed.find("…") + 1) is None
+
+
+class TestCompressionInAnswerGraph:
+    def test_node_writes_compressed_evidence_for_composer(self):
+        state = _state(_evidence())
+        update = make_compress_evidence_node()(state)
+        payload = compose_payload({**state, **update, "messages": [{"role": "user", "content": "q"}]})
+        assert all(SEPARATOR in e["text"] for e in payload["final_evidence"])
+        assert state["final_evidence"][0]["text"] == _chunk(key_at=0)  # original untouched
+
+    def test_node_skips_non_answer_modes(self):
+        assert make_compress_evidence_node()({**_state(_evidence()), "answer_mode": "clarify"}) == {}
+
+    def test_citation_quote_anchored_in_original_chunk(self):
+        state = _state(_evidence(1))
+        state.update(make_compress_evidence_node()(state))
+        quote = "set AZURE_OPENAI_ENDPOINT and AZURE_OPENAI_API_KEY"
+        state.update(final_answer="Set both variables.", citations=[{"evidence_id": "ev_000", "text": quote}])
+
+        citation = make_postprocess_answer_node()(state)["citations"][0]
+
+        original = state["final_evidence"][0]["text"]
+        assert original[citation["chunk_start"] : citation["chunk_end"]] == quote
+
+    def test_graph_switch(self, mock_llm, monkeypatch):
+        assert "compress_evidence" not in make_answer_graph(mock_llm).get_graph().nodes
+        monkeypatch.setenv("ANSWER_EVIDENCE_COMPRESSION", "1")
+        assert "compress_evidence" in make_answer_graph(mock_llm).get_graph().nodes
@@ -0,0 +1,149 @@
+# tests/unit/answer/test_map_reduce.py
+"""Unit tests for map-reduce answer composition."""
+
+import asyncio
+import json
+import threading
+import time
+
+from langchain_core.runnables import RunnableLambda
+
+from agentic_rag.answer.graph import make_answer_graph, use_map_reduce
+from agentic_rag.answer.map_reduce import condensed_evidence, group_evidence
+from agentic_rag.answer.nodes.map_evidence import make_map_evidence_node
+from agentic_rag.answer.state import ComposeAnswerModel, EvidenceItem, Finding, PartialAnswerModel
+
+KEY = "Retries use exponential backoff with a cap of 30 seconds."
+
+
+def _items(docs=6, per_doc=2, chars=1200):
+    return [
+        EvidenceItem(
+            evidence_id=f"ev_{d}_{c}",
+            doc_id=f"doc_{d}",
+            text=(KEY + " " if c == 0 else "") + "filler text " * (chars // 12),
+        )
+        for d in range(docs)
+        for c in range(per_doc)
+    ]
+
+
+class _MapLLM:
+    """Structured-output mock: one finding for the first evidence item of each group."""
+
+    def __init__(self, fail_groups=()):
+        self.threads = set()
+        self.calls = 0
+        self.fail_groups = set(fail_groups)
+        self.lock = threading.Lock()
+
+    def _map(self, prompt_value):
+        text = prompt_value.to_messages()[-1].content  # trailing inputs message
+        evidence = json.loads(text.split("\n", 1)[1])["evidence"]
+        with self.lock:
+            index = self.calls
+            self.calls += 1
+            self.threads.add(threading.current_thread().name)
+        if index in self.fail_groups:
+            raise RuntimeError("map model down")
+        time.sleep(0.01)  # hold the worker so concurrent groups land on other threads
+        first = evidence[0]["evidence_id"]
+        return PartialAnswerModel(
+            findings=[
+                Finding(evidence_id=first, point="Backoff is exponential.", quote=KEY),
+                Finding(evidence_id="ev_unknown", point="invented"),
+            ]
+        )
+
+    def with_structured_output(self, schema, **kwargs):
+        assert schema is PartialAnswerModel
+        return RunnableLambda(self._map)
+
+
+def _state(items, **extra):
+    return {
+        "answer_mode": "answer",
+        "normalized_query": "How do retries back off?",
+        "plan": {"goal": "Explain retry backoff"},
+        "final_evidence": [i.model_dump() for i in items],
+        **extra,
+    }
+
+
+class TestMapReduceHelpers:
+    def test_group_by_document_within_budget(self):
+        groups = group_evidence(_items(docs=4, per_doc=2, chars=400), group_tokens=250)
+        assert [[i.doc_id for i in g] for g in groups] == [[f"doc_{d}"] * 2 for d in range(4)]
+        oversized = group_evidence(_items(docs=1, per_doc=3, chars=1200), group_tokens=400)
+        assert [len(g) for g in oversized] == [1, 1, 1]
+
+    def test_condensed_evidence(self):
+        items = _items(docs=2, per_doc=1)
+        items[0].provenance["compression"] = {"spans": [[0, 5]]}
+        findings = [
+            Finding(evidence_id="ev_0_0", point="One.", quote="q1", subquestion="How?"),
+            Finding(evidence_id="ev_0_0", point="Two."),
+        ]
+        out = condensed_evidence(items, findings)
+        assert [e["evidence_id"] for e in out] == ["ev_0_0"]
+        assert out[0]["text"] == '[How?] One. Quote: "q1"\nTwo.'
+        assert "compression" not in out[0]["provenance"]
+
+    def test_selection_by_evidence_tokens(self):
+        items = _items()
+        assert use_map_reduce(_state(items), min_tokens=1000)
+        assert not use_map_reduce(_state(items), min_tokens=10**6)
+        assert not use_map_reduce(_state(items, answer_mode="clarify"), min_tokens=1000)
+        assert not use_map_reduce(_state(items), min_tokens=0)
+        assert not use_map_reduce(_state(items[:1]), min_tokens=1)
+
+
+class TestMapEvidenceNode:
+    def test_groups_mapped_concurrently_into_condensed_evidence(self):
+        llm = _MapLLM()
+        node = make_map_evidence_node(llm, group_tokens=700, max_concurrency=4)
+        out = node(_state(_items()))
+
+        assert out["map_reduce_report"] == {"groups": 6, "failed_groups": 0, "findings": 6, "applied": True}
+        assert [e["evidence_id"] for e in out["compressed_evidence"]] == [f"ev_{d}_0" for d in range(6)]
+        assert len(llm.threads) > 1  # batch() fans out across worker threads
+
+    def test_failed_groups_are_skipped(self):
+        out = make_map_evidence_node(_MapLLM(fail_groups={0}), group_tokens=700)(_state(_items()))
+        assert out["map_reduce_report"]["failed_groups"] == 1
+        assert len(out["compressed_evidence"]) == 5
+
+    def test_all_groups_failing_keeps_full_evidence(self):
+        out = make_map_evidence_node(_MapLLM(fail_groups=set(range(6))), group_tokens=700)(_state(_items()))
+        assert "compressed_evidence" not in out
+        assert out["map_reduce_report"]["applied"] is False
+
+    def test_async_variant(self):
+        out = asyncio.run(make_map_evidence_node(_MapLLM(), group_tokens=700).afunc(_state(_items())))
+        assert out["map_reduce_report"]["groups"] == 6
+
+
+class TestMapReduceGraph:
+    def test_large_pack_is_reduced_with_citations_preserved(self, mock_llm, sample_messages):
+        seen = {}
+
+        def compose(prompt_value):
+            seen["prompt"] = prompt_value.to_messages()[-1].content  # evidence rides in the human turn
+            return ComposeAnswerModel(
+                final_answer="Retries back off exponentially, capped at 30 seconds.",
+                citations=[{"evidence_id": "ev_3_0", "text": KEY}],
+                used_evidence_ids=["ev_3_0"],
+            )
+
+        mock_llm.with_structured_output.return_value = RunnableLambda(compose)
+        graph = make_answer_graph(mock_llm, map_llm=_MapLLM(), map_reduce_min_tokens=1000)
+        state = _state(_items(), messages=sample_messages, coverage={"confidence": 0.9})
+
+        result = graph.invoke(state)
+
+        assert "filler text filler text" not in seen["prompt"]  # composer saw findings, not chunks
+        assert "Backoff is exponential." in seen["prompt"]
+        citation = result["citations"][0]
+        original = state["final_evidence"][6]["text"]
+        assert citation["evidence_id"] == "ev_3_0"
+        assert original[citation["chunk_start"] : citation["chunk_end"]] == KEY
@@ -0,0 +1,259 @@
+# tests/unit/answer/test_speculative.py
+"""Unit tests for speculative answer drafting."""
+
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+
+from agentic_rag.answer.speculative import (
+    SpeculativeComposer,
+    make_speculate_answer_node,
+    make_speculation_gate_node,
+)
+from agentic_rag.answer.state import ComposeAnswerModel
+from agentic_rag.graph import make_agent_graph
+from agentic_rag.intent.nodes.extract_signals import ExtractSignalsModel
+from agentic_rag.intent.nodes.normalize_gate import NormalizeModel
+from agentic_rag.planner.state import PlannerState
+
+
+@pytest.fixture
+def direct_state():
+    """Intake output that predicts a direct answer."""
+    return {
+        "messages": [{"role": "user", "content": "Rewrite this sentence in passive voice: the team shipped it."}],
+        "normalized_query": "rewrite sentence in passive voice",
+        "guardrails": {"sensitivity": "normal", "pii_present": False},
+        "clarification": {"needed": False, "blocking": False, "reasons": []},
+        "constraints": {"format": []},
+        "user_intent": "draft",
+        "retrieval_intent": "none",
+        "answerability": "reasoning_only",
+        "complexity_flags": [],
+        "signals": {},
+        "language": "en",
+    }
+
+
+def _report_usage(input_tokens=120, output_tokens=30):
+    """Make one chat model call that reports usage to the active usage meter."""
+    usage = {
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "total_tokens": input_tokens + output_tokens,
+    }
+    message = AIMessage(content="ok", usage_metadata=usage, response_metadata={"model_name": "gpt-4.1-mini"})
+    GenericFakeChatModel(messages=iter([message])).invoke("draft")
+
+
+def _compose_llm(answer="It was shipped by the team.", delay=0.0, gate=None):
+    """LLM whose compose call optionally sleeps or waits on ``gate``; records calls and reports usage."""
+    llm = MagicMock()
+    llm.calls = []
+
+    def with_structured_output(schema, **kwargs):
+        def invoke(_):
+            llm.calls.append(schema)
+            if gate is not None:
+                gate.wait(timeout=5)
+            time.sleep(delay)
+            _report_usage()
+            return ComposeAnswerModel(final_answer=answer)
+
+        return RunnableLambda(invoke)
+
+    llm.with_structured_output = MagicMock(side_effect=with_structured_output)
+    return llm
+
+
+class TestSpeculativeComposer:
+    """Tests for start/resolve and stats."""
+
+    def test_no_speculation_when_retrieval_likely(self, direct_state):
+        """Test requests that need retrieval never start a draft."""
+        composer = SpeculativeComposer(_compose_llm())
+        state = {**direct_state, "retrieval_intent": "procedure", "answerability": "internal_corpus"}
+        assert composer.start(state) is None
+        assert composer.stats.speculated == 0
+
+    def test_accepted_draft_overlaps_planning(self, direct_state):
+        """Test a direct_answer plan keeps the draft and counts the overlap as saved latency."""
+        composer = SpeculativeComposer(_compose_llm(delay=0.02))
+        speculation_id = composer.start(direct_state)
+        time.sleep(0.05)  # the "planner"
+
+        out = composer.resolve(speculation_id, {"strategy": "direct_answer"})
+
+        assert out["final_answer"] == "It was shipped by the team."
+        assert out["answer_meta"]["refusal"] is False
+        stats = composer.stats
+        assert (stats.speculated, stats.accepted, stats.discarded) == (1, 1, 0)
+        assert stats.acceptance_rate == 1.0
+        assert stats.mean_saved_ms >= 15
+
+    def test_retrieval_plan_discards_without_waiting(self, direct_state):
+        """Test a retrieval plan drops the draft immediately, even if it is still running."""
+        gate = threading.Event()
+        composer = SpeculativeComposer(_compose_llm(gate=gate))
+        speculation_id = composer.start(direct_state)
+
+        started = time.perf_counter()
+        assert composer.resolve(speculation_id, {"strategy": "retrieve_then_answer"}) is None
+        assert time.perf_counter() - started < 1
+        gate.set()
+
+        assert (composer.stats.accepted, composer.stats.discarded) == (0, 1)
+        assert composer.resolve(speculation_id, {"strategy": "direct_answer"}) is None  # already resolved
+
+    @pytest.mark.parametrize(
+        "plan, accepted",
+        [
+            ({"strategy": "direct_answer"}, True),
+            ({"strategy": "direct_answer", "answer_requirements": {"format": ["no_code"]}}, False),
+            ({"strategy": "direct_answer", "answer_requirements": {"tone": "formal"}}, False),
+            ({"strategy": "direct_answer", "answer_requirements": {"length": "short"}}, False),
+            ({"strategy": "direct_answer", "answer_requirements": {"citation_style": "footnotes"}}, False),
+            ({"strategy": "direct_answer", "answer_requirements": {"format": [], "tone": None}}, True),
+            ({"strategy": "direct_answer", "safety": {"sensitivity": "elevated"}}, False),
+            ({"strategy": "clarify_then_retrieve"}, False),
+        ],
+    )
+    def test_accepts(self, plan, accepted):
+        """Test acceptance requires the answer requirements and sensitivity the draft assumed."""
+        provisional = {"strategy": "direct_answer", "answer_requirements": {"format": []}}
+        assert SpeculativeComposer.accepts(provisional, plan) is accepted
+
+    def test_failed_draft_is_discarded(self, direct_state):
+        """Test a compose error falls back to the normal answer path."""
+        llm = _compose_llm()
+        llm.with_structured_output = MagicMock(
+            return_value=RunnableLambda(lambda _: (_ for _ in ()).throw(RuntimeError("rate limited")))
+        )
+        composer = SpeculativeComposer(llm)
+        assert composer.resolve(composer.start(direct_state), {"strategy": "direct_answer"}) is None
+        assert composer.stats.discarded == 1
+
+    def test_nodes(self, direct_state):
+        """Test the speculate/gate nodes thread the draft through state by id."""
+        composer = SpeculativeComposer(_compose_llm())
+        started = make_speculate_answer_node(composer)(direct_state)
+        assert started["speculation_id"]
+
+        gated = make_speculation_gate_node(composer)({**started, "plan": {"strategy": "direct_answer"}})
+        assert gated["speculation_id"] is None
+        assert gated["speculative_answer"]["final_answer"] == "It was shipped by the team."
+
+    def test_accepted_draft_carries_compose_usage(self, direct_state):
+        """Test the draft is metered on its worker thread and its usage travels with the update."""
+        composer = SpeculativeComposer(_compose_llm())
+        started = make_speculate_answer_node(composer)(direct_state)
+        gated = make_speculation_gate_node(composer)({**started, "plan": {"strategy": "direct_answer"}})
+
+        ledger = gated["speculative_answer"]["token_ledger"]
+        assert [(e["node"], e["total_tokens"]) for e in ledger] == [("compose_answer", 150)]
+        assert "token_ledger" not in gated
+
+    def test_discarded_draft_usage_recorded(self, direct_state):
+        """Test a finished draft that the plan rejects is recorded as speculative_draft."""
+        composer = SpeculativeComposer(_compose_llm())
+        started = make_speculate_answer_node(composer)(direct_state)
+        composer._pending[started["speculation_id"]][0].result(timeout=5)  # let the draft finish
+
+        gated = make_speculation_gate_node(composer)({**started, "plan": {"strategy": "retrieve_then_answer"}})
+
+        assert gated["speculative_answer"] is None
+        assert [(e["node"], e["total_tokens"]) for e in gated["token_ledger"]] == [("speculative_draft", 150)]
+        assert composer.stats.discarded_tokens == 150
+
+    def test_running_discarded_draft_counted_when_done(self, direct_state):
+        """Test a draft discarded mid-flight is not waited for but still counted once it finishes."""
+        gate = threading.Event()
+        composer = SpeculativeComposer(_compose_llm(gate=gate))
+        speculation_id = composer.start(direct_state)
+        future = composer._pending[speculation_id][0]
+
+        assert composer.resolve_with_usage(speculation_id, {"strategy": "retrieve_then_answer"}) == (None, [])
+        gate.set()
+        future.result(timeout=5)
+        deadline = time.perf_counter() + 5
+        while composer.stats.discarded_tokens == 0 and time.perf_counter() < deadline:
+            time.sleep(0.01)  # done callbacks run right after the result is set
+        assert composer.stats.discarded_tokens == 150
+
+
+class TestAgentGraphSpeculation:
+    """Tests for speculation wired into make_agent_graph."""
+
+    @staticmethod
+    def _llm(direct_state, strategy):
+        normalize = NormalizeModel(
+            normalized_query=direct_state["normalized_query"],
+            guardrails=direct_state["guardrails"],
+            clarification=direct_state["clarification"],
+            language="en",
+        )
+        extract = ExtractSignalsModel(
+            user_intent="draft",
+            retrieval_intent="none",
+            answerability="reasoning_only",
+        )
+        plan = {"goal": direct_state["normalized_query"], "strategy": strategy}
+        if strategy == "retrieve_then_answer":
+            plan["retrieval_rounds"] = [{"round_id": 0, "purpose": "recall", "query_variants": ["passive voice"]}]
+        results = {
+            NormalizeModel: normalize,
+            ExtractSignalsModel: extract,
+            PlannerState: plan,
+            ComposeAnswerModel: ComposeAnswerModel(final_answer="It was shipped by the team."),
+        }
+
+        llm = MagicMock()
+        llm.calls = []
+
+        def with_structured_output(schema, **kwargs):
+            def invoke(_):
+                llm.calls.append(schema)
+                if schema is ComposeAnswerModel:
+                    _report_usage()
+                return results[schema]
+
+            return RunnableLambda(invoke)
+
+        llm.with_structured_output = MagicMock(side_effect=with_structured_output)
+        return llm
+
+    @staticmethod
+    def _graph(llm, composer):
+        adapters = {name: MagicMock() for name in ("retriever", "fusion", "reranker", "hyde", "grader")}
+        adapters["grader"].grade.return_value = {"confidence": 0.0}
+        adapters["fusion"].rrf.return_value = []
+        adapters["reranker"].rerank.return_value = []
+        adapters["retriever"].search.return_value = []
+        return make_agent_graph(llm, max_retries=1, fused_intake=False, speculative_composer=composer, **adapters)
+
+    def test_direct_answer_uses_draft(self, direct_state):
+        """Test the composer runs once (speculatively) and its draft becomes the answer."""
+        llm = self._llm(direct_state, "direct_answer")
+        composer = SpeculativeComposer(llm)
+        result = self._graph(llm, composer).invoke({"messages": direct_state["messages"]})
+
+        assert llm.calls.count(ComposeAnswerModel) == 1
+        assert result["final_answer"] == "It was shipped by the team."
+        assert [e["node"] for e in result["token_ledger"]].count("compose_answer") == 1
+        assert result["answer_mode"] == "answer"
+        assert composer.stats.accepted == 1
+
+    def test_retrieval_plan_discards_draft(self, direct_state):
+        """Test a retrieval plan discards the draft and the answer stage composes again."""
+        llm = self._llm(direct_state, "retrieve_then_answer")
+        composer = SpeculativeComposer(llm)
+        result = self._graph(llm, composer).invoke({"messages": direct_state["messages"]})
+
+        assert composer.stats.discarded == 1
+        assert result.get("speculative_answer") is None
+        assert result["plan"]["strategy"] == "retrieve_then_answer"
@@ -0,0 +1,176 @@
+# tests/unit/answer/test_streaming.py
+"""Unit tests for token-streaming answer output."""
+
+import asyncio
+import json
+
+import pytest
+from langchain_core.messages import AIMessageChunk
+from langchain_core.runnables import RunnableLambda
+from langgraph.graph import END, START, StateGraph
+
+from agentic_rag.answer.graph import make_answer_graph
+from agentic_rag.answer.nodes.postprocess_answer import _CODE_FENCE_RE
+from agentic_rag.answer.state import AnswerState
+from agentic_rag.answer.streaming import (
+    AnswerTextFilter,
+    JSONStringDecoder,
+    make_streaming_compose_answer_node,
+    stream_answer_events,
+)
+
+ANSWER = 'Use the "retry" policy.\n\n```python\nretry(3)\n```\n\nThen check the logs — done \U0001f600.'
+
+
+def _chunks(text, size):
+    return [text[i : i + size] for i in range(0, len(text), size)]
+
+
+def _streaming_llm(output, size=5):
+    """Mock LLM whose bound ComposeAnswerModel tool call streams ``output`` in ``size``-char pieces."""
+    args_text = output if isinstance(output, str) else json.dumps(output)
+
+    def stream(_prompt_value):
+        for i, piece in enumerate(_chunks(args_text, size)):
+            yield AIMessageChunk(
+                content="",
+                tool_call_chunks=[
+                    {"name": "ComposeAnswerModel" if i == 0 else None, "args": piece, "id": "call_1", "index": 0}
+                ],
+            )
+
+    async def astream(prompt_value):
+        for chunk in stream(prompt_value):
+            yield chunk
+
+    class _LLM:
+        def bind_tools(self, tools, **kwargs):
+            self.bound = (tools, kwargs)
+            return RunnableLambda(stream, afunc=astream)
+
+        def with_structured_output(self, schema, **kwargs):  # map_evidence model, unused at this evidence size
+            return RunnableLambda(lambda _: None)
+
+    return _LLM()
+
+
+def _output(answer=ANSWER):
+    return {
+        "final_answer": answer,
+        "citations": [{"evidence_id": "ev_001"}, {"evidence_id": "ev_unknown"}],
+        "used_evidence_ids": ["ev_001"],
+        "followups": ["How do I tune retries?"],
+    }
+
+
+def _deltas(events):
+    return "".join(e["text"] for e in events if e["event"] == "answer_delta")
+
+
+class TestJSONStringDecoder:
+    @pytest.mark.parametrize("size", [1, 2, 5, 1000])
+    def test_matches_json_loads_for_any_chunking(self, size):
+        raw = json.dumps(ANSWER)  # ascii escapes incl. a surrogate pair
+        decoder = JSONStringDecoder()
+        text = "".join(decoder.feed(raw[:end]) for end in range(size, len(raw) + size, size))
+        assert text == ANSWER
+        assert decoder.closed
+
+    def test_ignores_text_after_closing_quote(self):
+        decoder = JSONStringDecoder()
+        assert decoder.feed('"ab\\') == "ab"
+        assert decoder.feed('"ab\\nc", "x"') == "\nc"
+        assert decoder.feed('"ab\\nc", "xyz"') == ""
+
+
+class TestAnswerTextFilter:
+    @pytest.mark.parametrize(
+        "text",
+        [
+            ANSWER,
+            "  ```a``` mid ``` b ```  end  ",
+            "keep `inline` and ``double`` ticks",
+            "before ```never closed",
+            "``````x",
+            "\n\n",
+        ],
+    )
+    @pytest.mark.parametrize("size", [1, 2, 3, 7])
+    def test_matches_postprocess_no_code(self, text, size):
+        text_filter = AnswerTextFilter(no_code=True)
+        streamed = "".join(text_filter.feed(piece) for piece in _chunks(text, size)) + text_filter.finish()
+        assert streamed == _CODE_FENCE_RE.sub("", text).strip()
+
+    def test_passthrough_without_no_code(self):
+        text_filter = AnswerTextFilter(no_code=False)
+        assert text_filter.feed(" ```x``` ") == " ```x``` "
+        assert text_filter.finish() == ""
+
+
+class TestStreamingComposeNode:
+    def test_same_update_as_blocking_composer(self, sample_answer_state):
+        llm = _streaming_llm(_output())
+        result = make_streaming_compose_answer_node(llm)({**sample_answer_state, "answer_mode": "answer"})
+
+        assert result["final_answer"] == ANSWER
+        assert [c["evidence_id"] for c in result["citations"]] == ["ev_001", "ev_unknown"]
+        assert result["followups"] == ["How do I tune retries?"]
+        assert result["answer_meta"]["used_evidence_ids"] == ["ev_001"]
+        assert result["answer_meta"]["streamed"] is True
+        assert llm.bound[1] == {"tool_choice": "ComposeAnswerModel"}
+
+    def test_truncated_stream_is_parse_error(self, sample_answer_state):
+        text = json.dumps(_output())[:-20]
+        result = make_streaming_compose_answer_node(_streaming_llm(text))(sample_answer_state)
+        assert result["errors"][0]["type"] == "model_output_parse"
+        assert result["errors"][0]["retryable"] is True
+
+    def test_async_variant(self, sample_answer_state):
+        node = make_streaming_compose_answer_node(_streaming_llm(_output()))
+        result = asyncio.run(node.afunc({**sample_answer_state, "answer_mode": "answer"}))
+        assert result["final_answer"] == ANSWER
+        assert result["answer_meta"]["streamed"] is True
+
+    def test_missing_messages(self, sample_answer_state):
+        result = make_streaming_compose_answer_node(_streaming_llm(_output()))({**sample_answer_state, "messages": []})
+        assert result["errors"][0]["type"] == "schema_validation"
+
+
+class TestStreamingAnswerGraph:
+    def test_events_stream_tokens_then_final(self, sample_answer_state):
+        state = {**sample_answer_state, "constraints": {**sample_answer_state["constraints"], "format": ["no_code"]}}
+        graph = make_answer_graph(_streaming_llm(_output()), streaming=True)
+
+        events = list(graph.stream(state, stream_mode="custom"))
+
+        assert sum(e["event"] == "answer_delta" for e in events) > 5
+        final = events[-1]
+        assert final["event"] == "answer_final"
+        assert _deltas(events) == final["final_answer"]
+        assert "```" not in final["final_answer"]
+        assert [c["evidence_id"] for c in final["citations"]] == ["ev_001"]
+        assert final["followups"] == ["How do I tune retries?"]
+
+    def test_invoke_result_unchanged(self, sample_answer_state):
+        state = {**sample_answer_state, "answer_mode": "answer"}
+        result = make_answer_graph(_streaming_llm(_output()), streaming=True).invoke(state)
+        assert result["final_answer"] == ANSWER
+        assert [c["evidence_id"] for c in result["citations"]] == ["ev_001"]
+
+    def test_invalid_output_resets_stream(self, sample_answer_state):
+        truncated = json.dumps(_output())[:-20]
+        graph = make_answer_graph(_streaming_llm(truncated), streaming=True, max_retries=1)
+        events = list(graph.stream(sample_answer_state, stream_mode="custom"))
+        assert {"event": "answer_reset", "reason": "model_output_parse"} in events
+
+    def test_stream_answer_events_through_subgraph(self, sample_answer_state, monkeypatch):
+        monkeypatch.setenv("ANSWER_STREAMING", "1")
+        outer = StateGraph(AnswerState)
+        outer.add_node("answer", make_answer_graph(_streaming_llm(_output())))
+        outer.add_edge(START, "answer")
+        outer.add_edge("answer", END)
+
+        events = list(stream_answer_events(outer.compile(), sample_answer_state))
+
+        assert [e["event"] for e in events].count("answer_final") == 1
+        assert _deltas(events) == ANSWER
@@ -0,0 +1,171 @@
+# tests/unit/answer/test_templates.py
+"""Unit tests for deterministic clarify/refuse templates and their agent-graph short circuits."""
+
+from unittest.mock import MagicMock
+
+import pytest
+from langchain_core.runnables import RunnableLambda
+
+from agentic_rag.answer.state import ComposeAnswerModel
+from agentic_rag.answer.templates import (
+    clarify_message,
+    clarifying_questions,
+    intake_short_circuit,
+    make_clarify_template_node,
+    make_refuse_template_node,
+    plan_short_circuit,
+    refusal_message,
+)
+from agentic_rag.graph import make_agent_graph
+from agentic_rag.intent.nodes.extract_signals import ExtractSignalsModel
+from agentic_rag.intent.nodes.normalize_gate import NormalizeModel
+from agentic_rag.planner.state import PlannerState
+
+
+@pytest.fixture
+def blocking_state():
+    """Intake output with a blocking ambiguous acronym."""
+    return {
+        "messages": [{"role": "user", "content": "How do I raise the PTU quota?"}],
+        "normalized_query": "raise the PTU quota",
+        "guardrails": {"sensitivity": "normal", "pii_present": False},
+        "clarification": {"needed": True, "blocking": True, "reasons": ["ambiguous_acronym", "missing_scope"]},
+        "signals": {"acronyms": [{"text": "PTU", "expansion": None, "confidence": "low"}], "entities": []},
+        "language": "en",
+    }
+
+
+class TestClarify:
+    """Tests for clarification templates."""
+
+    def test_questions_from_reasons(self, blocking_state):
+        """Test one question per reason, with the ambiguous acronym filled in."""
+        questions = clarifying_questions(blocking_state)
+        assert [q.reason for q in questions] == ["ambiguous_acronym", "missing_scope"]
+        assert "“PTU”" in questions[0].question
+        assert all(q.blocking for q in questions)
+
+    def test_localised(self, blocking_state):
+        """Test the detected language selects the strings, with English as fallback."""
+        assert "„PTU“" in clarify_message({**blocking_state, "language": "de"})
+        assert clarify_message({**blocking_state, "language": "ja"}) == clarify_message(blocking_state)
+
+    def test_plan_questions_win(self, blocking_state):
+        """Test planner-written questions are rendered verbatim when present."""
+        plan = {"clarifying_questions": [{"question": "Which subscription?", "reason": "missing_scope"}]}
+        assert clarify_message({**blocking_state, "plan": plan}).endswith("- Which subscription?")
+
+    def test_node_builds_plan(self, blocking_state):
+        """Test the node answers in clarify mode and records a clarify_then_retrieve plan."""
+        out = make_clarify_template_node()(blocking_state)
+        assert out["answer_mode"] == "clarify" and out["answer_meta"]["asked_clarification"] is True
+        assert out["citations"] == [] and out["final_answer"].startswith("Before I look into this")
+        plan = PlannerState.model_validate(out["plan"])
+        assert plan.strategy == "clarify_then_retrieve" and len(plan.clarifying_questions) == 2
+
+
+class TestRefuse:
+    """Tests for refusal templates."""
+
+    def test_restricted_vs_defer(self, blocking_state):
+        """Test guardrails pick the restricted message and add a PII note."""
+        restricted = {**blocking_state, "guardrails": {"sensitivity": "restricted", "pii_present": True}}
+        text = refusal_message(restricted)
+        assert "restricted information" in text and "personal data" in text
+        assert "responsible team" in refusal_message({**blocking_state, "plan": {"strategy": "defer_or_refuse"}})
+
+    def test_node(self, blocking_state):
+        """Test the node answers in refuse mode with a defer_or_refuse plan."""
+        out = make_refuse_template_node()({**blocking_state, "guardrails": {"sensitivity": "restricted"}})
+        assert out["answer_mode"] == "refuse" and out["answer_meta"]["refusal"] is True
+        assert out["plan"]["strategy"] == "defer_or_refuse"
+        assert out["plan"]["safety"]["sensitivity"] == "restricted"
+
+
+class TestRouting:
+    """Tests for the short-circuit predicates."""
+
+    def test_intake(self, blocking_state):
+        """Test blocking clarifications short-circuit, and intake errors never do."""
+        assert intake_short_circuit(blocking_state) == "clarify"
+        assert intake_short_circuit({**blocking_state, "clarification": {"blocking": False}}) is None
+        assert intake_short_circuit({**blocking_state, "errors": [{"node": "normalize_gate"}]}) is None
+
+    def test_intake_leaves_restricted_to_the_planner(self, blocking_state):
+        """Test a restricted intake is not refused before the planner runs."""
+        restricted = {**blocking_state, "guardrails": {"sensitivity": "restricted"}}
+        assert intake_short_circuit({**restricted, "clarification": {"blocking": False}}) is None
+        assert intake_short_circuit(restricted) == "clarify"
+
+    def test_plan(self):
+        """Test plan strategies that fix the answer mode."""
+        assert plan_short_circuit({"plan": {"strategy": "defer_or_refuse"}}) == "refuse"
+        assert plan_short_circuit({"plan": {"strategy": "clarify_then_retrieve"}}) == "clarify"
+        restricted = {"strategy": "retrieve_then_answer", "safety": {"sensitivity": "restricted"}}
+        assert plan_short_circuit({"plan": restricted}) == "refuse"
+        assert plan_short_circuit({"plan": {"strategy": "direct_answer"}}) is None
+
+
+class TestAgentGraphShortCircuits:
+    """Tests for the short circuits wired into make_agent_graph."""
+
+    @staticmethod
+    def _graph(llm, **kwargs):
+        adapters = {name: MagicMock() for name in ("retriever", "fusion", "reranker", "hyde", "grader")}
+        kwargs.setdefault("template_short_circuits", True)
+        return make_agent_graph(llm, max_retries=1, fused_intake=False, **adapters, **kwargs)
+
+    @pytest.fixture
+    def llm(self, blocking_state):
+        """LLM recording which structured-output schemas were invoked."""
+        normalize = NormalizeModel(
+            normalized_query=blocking_state["normalized_query"],
+            guardrails=blocking_state["guardrails"],
+            clarification=blocking_state["clarification"],
+            language="en",
+        )
+        extract = ExtractSignalsModel(
+            user_intent="lookup",
+            retrieval_intent="procedure",
+            answerability="internal_corpus",
+            signals={"acronyms": blocking_state["signals"]["acronyms"]},
+        )
+        planner = {"goal": "raise the PTU quota", "strategy": "clarify_then_retrieve"}
+        composed = ComposeAnswerModel(final_answer="LLM-written clarification")
+        results = {
+            NormalizeModel: normalize,
+            ExtractSignalsModel: extract,
+            PlannerState: planner,
+            ComposeAnswerModel: composed,
+        }
+
+        llm = MagicMock()
+        llm.calls = []
+
+        def with_structured_output(schema, **kwargs):
+            def invoke(_):
+                llm.calls.append(schema)
+                return results[schema]
+
+            return RunnableLambda(invoke)
+
+        llm.with_structured_output = MagicMock(side_effect=with_structured_output)
+        return llm
+
+    def test_blocking_clarification_skips_planner_and_composer(self, llm, blocking_state):
+        """Test only the intake LLM calls run and the answer comes from the template."""
+        result = self._graph(llm).invoke({"messages": blocking_state["messages"]})
+
+        assert llm.calls == [NormalizeModel, ExtractSignalsModel]
+        assert result["answer_mode"] == "clarify"
+        assert "“PTU”" in result["final_answer"]
+        assert result["plan"]["strategy"] == "clarify_then_retrieve"
+
+    @pytest.mark.parametrize("enabled", [False, None])
+    def test_disabled_uses_llms(self, llm, blocking_state, monkeypatch, enabled):
+        """Test short circuits are off by default and False keeps the original planner + composer path."""
+        monkeypatch.delenv("TEMPLATE_SHORT_CIRCUITS", raising=False)
+        result = self._graph(llm, template_short_circuits=enabled).invoke({"messages": blocking_state["messages"]})
+
+        assert PlannerState in llm.calls and ComposeAnswerModel in llm.calls
+        assert result["final_answer"] == "LLM-written clarification"
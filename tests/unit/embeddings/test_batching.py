@@ -0,0 +1,91 @@
+# tests/unit/embeddings/test_batching.py
+"""Unit tests for BatchingEmbeddings."""
+
+import threading
+
+import pytest
+
+from agentic_rag.embeddings import BatchingEmbeddings, EmbeddingAdapter, HashingEmbeddings
+from agentic_rag.embeddings.batching import split_batches
+
+
+class RecordingEmbeddings(HashingEmbeddings):
+    """HashingEmbeddings that records batch sizes."""
+
+    def __init__(self, fail=False):
+        super().__init__(dim=8)
+        self.batches = []
+        self.fail = fail
+
+    def embed_documents(self, texts):
+        self.batches.append(len(texts))
+        if self.fail:
+            raise RuntimeError("backend down")
+        return super().embed_documents(texts)
+
+
+class TestSplitBatches:
+    """Tests for split_batches."""
+
+    def test_size_and_token_limits(self):
+        """Test batches are cut at either limit and oversized texts stand alone."""
+        texts = ["a" * 40] * 5 + ["b" * 400] + ["c"]
+        batches = [list(r) for r in split_batches(texts, max_batch_size=2, max_batch_tokens=25)]
+        assert batches == [[0, 1], [2, 3], [4], [5], [6]]
+
+
+class TestBatchingEmbeddings:
+    """Tests for BatchingEmbeddings."""
+
+    def test_satisfies_protocol(self):
+        """Test wrappers satisfy EmbeddingAdapter."""
+        assert isinstance(BatchingEmbeddings(HashingEmbeddings(dim=8)), EmbeddingAdapter)
+        assert BatchingEmbeddings(HashingEmbeddings(dim=8)).model_id == "hashing-8"
+
+    def test_direct_mode_preserves_order(self):
+        """Test max_wait_ms=0 splits a call and returns vectors in input order."""
+        inner = RecordingEmbeddings()
+        emb = BatchingEmbeddings(inner, max_batch_size=3, max_wait_ms=0)
+        texts = [f"text {i}" for i in range(7)]
+        assert emb.embed_documents(texts) == HashingEmbeddings(dim=8).embed_documents(texts)
+        assert inner.batches == [3, 3, 1]
+
+    def test_coalesces_concurrent_callers(self):
+        """Test concurrent single-text calls are merged into few backend calls."""
+        inner = RecordingEmbeddings()
+        emb = BatchingEmbeddings(inner, max_batch_size=64, max_wait_ms=50)
+        results = {}
+        barrier = threading.Barrier(16)
+
+        def call(i):
+            barrier.wait()
+            results[i] = emb.embed_documents([f"query {i}"])[0]
+
+        threads = [threading.Thread(target=call, args=(i,)) for i in range(16)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        expected = HashingEmbeddings(dim=8)
+        assert all(results[i] == expected.embed_query(f"query {i}") for i in range(16))
+        assert sum(inner.batches) == 16
+        assert len(inner.batches) < 16
+
+    def test_batch_size_respected_when_coalescing(self):
+        """Test a large call is still cut at max_batch_size."""
+        inner = RecordingEmbeddings()
+        emb = BatchingEmbeddings(inner, max_batch_size=4, max_wait_ms=1)
+        assert len(emb.embed_documents([f"t{i}" for i in range(10)])) == 10
+        assert max(inner.batches) <= 4
+
+    def test_errors_propagate(self):
+        """Test backend errors reach the caller."""
+        emb = BatchingEmbeddings(RecordingEmbeddings(fail=True), max_wait_ms=1)
+        with pytest.raises(RuntimeError, match="backend down"):
+            emb.embed_documents(["x"])
+
+    def test_invalid_limits(self):
+        """Test limit validation."""
+        with pytest.raises(ValueError):
+            BatchingEmbeddings(HashingEmbeddings(dim=8), max_batch_size=0)
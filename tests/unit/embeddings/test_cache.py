@@ -0,0 +1,79 @@
+# tests/unit/embeddings/test_cache.py
+"""Unit tests for CachedEmbeddings and build_embeddings."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from agentic_rag.embeddings import CachedEmbeddings, HashingEmbeddings, build_embeddings
+from agentic_rag.embeddings.cache import cache_key
+
+
+class CountingEmbeddings(HashingEmbeddings):
+    """HashingEmbeddings that counts embedded texts."""
+
+    def __init__(self, dim=8):
+        super().__init__(dim=dim)
+        self.embedded = []
+
+    def embed_documents(self, texts):
+        self.embedded.extend(texts)
+        return super().embed_documents(texts)
+
+    def embed_query(self, text):
+        self.embedded.append(text)
+        return super().embed_query(text)
+
+
+class TestCachedEmbeddings:
+    """Tests for CachedEmbeddings."""
+
+    def test_hits_skip_backend_and_persist(self, tmp_path):
+        """Test repeated and duplicate texts are embedded once, across instances."""
+        inner = CountingEmbeddings()
+        cache = CachedEmbeddings(inner, tmp_path / "emb.sqlite")
+        first = cache.embed_documents(["a", "b", "a"])
+        assert inner.embedded == ["a", "b"]
+        assert first[0] == first[2]
+
+        reopened = CachedEmbeddings(inner, tmp_path / "emb.sqlite")
+        assert reopened.embed_documents(["b", "a", "c"]) == [first[1], first[0], reopened.embed_documents(["c"])[0]]
+        assert inner.embedded == ["a", "b", "c"]
+        assert reopened.hits == 3 and reopened.misses == 1
+        assert len(reopened) == 3
+
+    def test_queries_cached_separately(self, tmp_path):
+        """Test query embeddings use their own namespace."""
+        inner = CountingEmbeddings()
+        cache = CachedEmbeddings(inner, tmp_path / "emb.sqlite")
+        cache.embed_documents(["same text"])
+        cache.embed_query("same text")
+        cache.embed_query("same text")
+        assert inner.embedded == ["same text", "same text"]
+        assert cache.hit_rate == pytest.approx(1 / 3)
+
+    def test_model_id_namespaces(self, tmp_path):
+        """Test different models never share entries."""
+        path = tmp_path / "emb.sqlite"
+        CachedEmbeddings(HashingEmbeddings(dim=8), path).embed_documents(["x"])
+        other = CountingEmbeddings(dim=16)
+        assert len(CachedEmbeddings(other, path).embed_documents(["x"])[0]) == 16
+        assert other.embedded == ["x"]
+        assert cache_key("m1", "x") != cache_key("m2", "x")
+
+    def test_requires_model_id(self, tmp_path):
+        """Test clients without a model id need an explicit one."""
+        with pytest.raises(ValueError):
+            CachedEmbeddings(MagicMock(spec=["embed_documents", "embed_query"]), tmp_path / "e.sqlite")
+
+
+class TestBuildEmbeddings:
+    """Tests for build_embeddings."""
+
+    def test_stack(self, tmp_path):
+        """Test the spec builds batching + cache with the spec as model id."""
+        emb = build_embeddings("hashing:16", cache_path=tmp_path / "e.sqlite", max_wait_ms=0)
+        assert isinstance(emb, CachedEmbeddings)
+        assert emb.model_id == "hashing:16"
+        assert emb.embed_documents(["x"]) == emb.embed_documents(["x"])
+        assert emb.hits == 1
@@ -0,0 +1,38 @@
+# tests/unit/embeddings/test_hashing.py
+"""Unit tests for HashingEmbeddings and load_embeddings."""
+
+import numpy as np
+import pytest
+
+from agentic_rag.embeddings import HashingEmbeddings, load_embeddings
+
+
+class TestHashingEmbeddings:
+    """Tests for HashingEmbeddings."""
+
+    def test_deterministic_and_normalized(self):
+        """Test vectors are stable across instances and unit-length."""
+        a = HashingEmbeddings(dim=64).embed_query("rotate the certificate")
+        b = HashingEmbeddings(dim=64).embed_query("rotate the certificate")
+        assert a == b
+        assert len(a) == 64
+        assert np.linalg.norm(a) == pytest.approx(1.0)
+
+    def test_similar_texts_score_higher(self):
+        """Test shared terms produce higher cosine similarity."""
+        emb = HashingEmbeddings(dim=256)
+        q, near, far = emb.embed_documents(["certificate rotation", "rotation of a certificate", "pod liveness probe"])
+        assert np.dot(q, near) > np.dot(q, far)
+
+    def test_empty_text(self):
+        """Test empty text embeds to the zero vector."""
+        assert not any(HashingEmbeddings(dim=8).embed_query(""))
+
+
+class TestLoadEmbeddings:
+    """Tests for load_embeddings."""
+
+    def test_hashing_spec(self):
+        """Test the offline hashing spec with and without a dimension."""
+        assert load_embeddings("hashing").dim == 384
+        assert load_embeddings("hashing:32").dim == 32
@@ -0,0 +1,78 @@
+# tests/unit/executor/test_prefetch.py
+"""Unit tests for round-0 prefetch and its reuse by the executor nodes."""
+
+from agentic_rag.executor.nodes.prepare_round_queries import make_prepare_round_queries_node
+from agentic_rag.executor.nodes.run_retrieval import make_run_retrieval_node
+from agentic_rag.executor.prefetch import make_round_prefetcher
+from agentic_rag.executor.utils import prefetched_round
+
+
+def _prefetched(plan, candidates, normalized_query="test query"):
+    return {
+        "round": plan["retrieval_rounds"][0],
+        "literal_constraints": plan.get("literal_constraints") or {},
+        "normalized_query": normalized_query,
+        "round_queries": ["test query"],
+        "round_candidates_raw": candidates,
+    }
+
+
+class TestRoundPrefetcher:
+    def test_runs_prepare_and_retrieval(self, mock_retriever, mock_hyde, sample_plan, sample_candidate):
+        mock_retriever.search.return_value = [sample_candidate]
+        prefetch = make_round_prefetcher(mock_retriever, mock_hyde)
+
+        result = prefetch({"plan": sample_plan, "normalized_query": "test query"})
+
+        assert result["round_queries"] == ["Azure OpenAI configuration"]
+        assert result["round_candidates_raw"][0].round_id == 0
+        assert mock_retriever.search.called
+
+    def test_retrieval_error_returns_empty(self, mock_retriever, mock_hyde, sample_plan):
+        mock_retriever.search.side_effect = RuntimeError("down")
+        prefetch = make_round_prefetcher(mock_retriever, mock_hyde)
+        assert prefetch({"plan": sample_plan, "normalized_query": "test query"}) == {}
+
+
+class TestPrefetchReuse:
+    def test_nodes_reuse_matching_prefetch(self, mock_retriever, mock_hyde, sample_plan, sample_candidate):
+        state = {
+            "plan": sample_plan,
+            "normalized_query": "test query",
+            "current_round_index": 0,
+            "prefetched_round": _prefetched(sample_plan, [sample_candidate]),
+        }
+
+        prepared = make_prepare_round_queries_node(mock_hyde)(state)
+        retrieved = make_run_retrieval_node(mock_retriever)({**state, **prepared})
+
+        assert prepared == {"round_queries": ["test query"]}
+        assert retrieved == {"round_candidates_raw": [sample_candidate]}
+        assert not mock_retriever.search.called
+
+    def test_changed_round_is_not_reused(self, sample_plan, sample_candidate):
+        prefetch = _prefetched(sample_plan, [sample_candidate])
+        changed = {**sample_plan["retrieval_rounds"][0], "query_variants": ["something else"]}
+        plan = {**sample_plan, "retrieval_rounds": [changed]}
+
+        state = {"plan": sample_plan, "normalized_query": "test query", "prefetched_round": prefetch}
+        assert prefetched_round(state, 0) is prefetch
+        assert prefetched_round({**state, "plan": plan}, 0) is None
+
+    def test_only_round_zero_and_same_request(self, sample_plan, sample_candidate):
+        state = {
+            "plan": sample_plan,
+            "normalized_query": "test query",
+            "prefetched_round": _prefetched(sample_plan, [sample_candidate]),
+        }
+        assert prefetched_round(state, 1) is None
+        assert prefetched_round({**state, "normalized_query": "another question"}, 0) is None
+        assert prefetched_round({**state, "prefetched_round": None}, 0) is None
+
+    def test_changed_literal_constraints_are_not_reused(self, sample_plan, sample_candidate):
+        state = {
+            "plan": {**sample_plan, "literal_constraints": {"must_preserve_terms": ["E42"]}},
+            "normalized_query": "test query",
+            "prefetched_round": _prefetched(sample_plan, [sample_candidate]),
+        }
+        assert prefetched_round(state, 0) is None
@@ -215,3 +215,70 @@ class TestRunRetrieval:
 
         candidates = result["round_candidates_raw"]
         assert candidates == []
+
+    def test_run_retrieval_exact_bypasses_vector(self, mock_retriever, sample_plan, sample_candidate):
+        """Test must_match_exactly drops vector search and adds exact lookups per literal."""
+        plan = {**sample_plan}
+        plan["retrieval_rounds"][0]["retrieval_modes"] = [
+            {"type": "vector", "k": 10},
+            {"type": "hybrid", "k": 30, "alpha": 0.5},
+        ]
+        plan["literal_constraints"] = {"must_preserve_terms": ["ERR_42"], "must_match_exactly": True}
+
+        state = {
+            "plan": plan,
+            "current_round_index": 0,
+            "round_queries": ["fix ERR_42"],
+            "signals": {"literal_terms": ["ERR_42", "/etc/app.conf"]},
+        }
+
+        mock_retriever.search.return_value = [sample_candidate]
+
+        node = make_run_retrieval_node(mock_retriever)
+        result = node(state)
+
+        calls = [(c[1]["query"], c[1]["mode"], c[1]["k"]) for c in mock_retriever.search.call_args_list]
+        assert calls == [
+            ("fix ERR_42", "bm25", 30),
+            ("ERR_42", "exact", 20),
+            ("/etc/app.conf", "exact", 20),
+        ]
+        assert {c.mode for c in result["round_candidates_raw"]} == {"bm25", "exact"}
+
+    def test_run_retrieval_planned_exact_mode(self, mock_retriever, sample_plan, sample_candidate):
+        """Test an explicitly planned exact mode runs once per literal term, not per query."""
+        plan = {**sample_plan}
+        plan["retrieval_rounds"][0]["retrieval_modes"] = [
+            {"type": "hybrid", "k": 20, "alpha": 0.3},
+            {"type": "exact", "k": 5},
+        ]
+
+        state = {
+            "plan": plan,
+            "current_round_index": 0,
+            "round_queries": ["q1", "q2"],
+            "signals": {"literal_terms": ["INC-1"]},
+        }
+
+        node = make_run_retrieval_node(mock_retriever)
+        node(state)
+
+        calls = [(c[1]["query"], c[1]["mode"]) for c in mock_retriever.search.call_args_list]
+        assert calls == [("q1", "hybrid"), ("q2", "hybrid"), ("INC-1", "exact")]
+
+    def test_run_retrieval_exact_without_literals_is_skipped(self, mock_retriever, sample_plan):
+        """Test exact mode is a no-op when there are no literal terms."""
+        plan = {**sample_plan}
+        plan["retrieval_rounds"][0]["retrieval_modes"] = [{"type": "exact", "k": 5}]
+
+        state = {
+            "plan": plan,
+            "current_round_index": 0,
+            "round_queries": ["q1"],
+        }
+
+        node = make_run_retrieval_node(mock_retriever)
+        result = node(state)
+
+        assert mock_retriever.search.call_count == 0
+        assert result["round_candidates_raw"] == []
@@ -0,0 +1,69 @@
+# tests/unit/index/conftest.py
+"""Shared fixtures for index module unit tests."""
+
+import os
+
+import pytest
+
+from agentic_rag.executor.state import CandidateKey
+from agentic_rag.index.local import LocalIndex
+
+# Disable Langfuse for unit tests
+os.environ["LANGFUSE_ENABLED"] = "0"
+
+# Toy 3-d "embeddings": axis 0 = azure, axis 1 = kubernetes, axis 2 = compliance
+TOY_VECTORS = {
+    "azure": [1.0, 0.0, 0.0],
+    "kubernetes": [0.0, 1.0, 0.0],
+    "compliance": [0.0, 0.0, 1.0],
+}
+
+
+def toy_embed(text: str):
+    """Sum of toy axis vectors for known words."""
+    vec = [0.0, 0.0, 0.0]
+    for word, axis in TOY_VECTORS.items():
+        if word in text.lower():
+            vec = [a + b for a, b in zip(vec, axis)]
+    return vec
+
+
+@pytest.fixture
+def sample_chunks():
+    """(key, text, metadata) triples with filterable metadata."""
+    return [
+        (
+            CandidateKey("doc1", "c0"),
+            "Rotate the Azure certificate with az keyvault. Error AKV-1001 means access denied.",
+            {"doc_type": "runbook", "domain": ["azure", "security"], "date": "2024-03-10"},
+        ),
+        (
+            CandidateKey("doc2", "c0"),
+            "Kubernetes pods restart when the liveness probe fails.",
+            {"doc_type": "faq", "domain": "kubernetes", "date": "2023-06-01"},
+        ),
+        (
+            CandidateKey("doc3", "c0"),
+            "Compliance policy for certificate rotation on Azure requires 90 days.",
+            {
+                "doc_type": "policy",
+                "domains": ["compliance", "azure"],
+                "entities": ["Key Vault"],
+                "date": "2022-11-15",
+            },
+        ),
+        (
+            CandidateKey("doc4", "c0"),
+            "Undated kubernetes note about certificate rotation.",
+            {"doc_type": "faq", "domain": "kubernetes"},
+        ),
+    ]
+
+
+@pytest.fixture
+def local_index(sample_chunks):
+    """LocalIndex with toy vectors."""
+    index = LocalIndex(dim=3)
+    for key, text, meta in sample_chunks:
+        index.add(key, text, meta, vector=toy_embed(text))
+    return index
@@ -0,0 +1,81 @@
+# tests/unit/index/test_literal.py
+"""Unit tests for the exact-literal index."""
+
+import numpy as np
+import pytest
+
+from agentic_rag.executor.state import CandidateKey
+from agentic_rag.index.literal import LiteralIndex
+
+
+@pytest.fixture
+def literal_index():
+    """Small index with IDs, error codes and paths."""
+    index = LiteralIndex()
+    index.add(CandidateKey("doc1", "c0"), "Push fails with ERR_CONN_RESET when the proxy drops.", {"title": "Proxy"})
+    index.add(CandidateKey("doc1", "c1"), "ERR_CONN_RESET ERR_CONN_RESET repeated in /var/log/app.log")
+    index.add(CandidateKey("doc2", "c0"), "Ticket INC-10423 tracks the certificate rotation.")
+    index.add(CandidateKey("doc3", "c0"), "Nothing relevant here.")
+    return index
+
+
+class TestLiteralIndex:
+    """Tests for LiteralIndex."""
+
+    def test_lookup_finds_exact_substring(self, literal_index):
+        """Test that only chunks containing the literal are returned."""
+        hits = literal_index.lookup("INC-10423")
+        assert [literal_index.key(o) for o, _ in hits] == [CandidateKey("doc2", "c0")]
+
+    def test_lookup_ranks_by_occurrences(self, literal_index):
+        """Test that chunks with more occurrences rank first."""
+        hits = literal_index.lookup("ERR_CONN_RESET")
+        assert [o for o, _ in hits] == [1, 0]
+        assert hits[0][1] == 2
+
+    def test_lookup_rejects_ngram_false_positives(self):
+        """Test that sharing all n-grams is not enough; the substring must match."""
+        index = LiteralIndex()
+        index.add(CandidateKey("d", "c"), "abcd xbcdy")
+        assert index.lookup("abcdy") == []
+
+    def test_lookup_is_case_sensitive_by_default(self, literal_index):
+        """Test default case sensitivity."""
+        assert literal_index.lookup("err_conn_reset") == []
+
+    def test_case_insensitive_index(self):
+        """Test case folding when configured."""
+        index = LiteralIndex(case_sensitive=False)
+        index.add(CandidateKey("d", "c"), "Set MAX_RETRIES in config.")
+        assert len(index.lookup("max_retries")) == 1
+
+    def test_short_term_falls_back_to_scan(self, literal_index):
+        """Test terms shorter than n still resolve."""
+        hits = literal_index.lookup("/v")
+        assert [o for o, _ in hits] == [1]
+
+    def test_lookup_unknown_or_empty_term(self, literal_index):
+        """Test missing grams and empty input."""
+        assert literal_index.lookup("ZZZ-0000") == []
+        assert literal_index.lookup("") == []
+
+    def test_lookup_respects_k(self, literal_index):
+        """Test that k caps results."""
+        assert len(literal_index.lookup("ERR_CONN_RESET", k=1)) == 1
+
+    def test_search_returns_candidates(self, literal_index):
+        """Test Candidate construction with exact features."""
+        cands = literal_index.search("ERR_CONN_RESET", k=5)
+        assert [c.exact_rank for c in cands] == [1, 2]
+        assert cands[0].exact_score == 2.0
+        assert cands[1].metadata == {"title": "Proxy"}
+
+    def test_lookup_with_mask(self, literal_index):
+        """Test that masked-out ordinals are skipped."""
+        mask = np.array([False, True, True, True])
+        assert [o for o, _ in literal_index.lookup("ERR_CONN_RESET", mask=mask)] == [1]
+
+    def test_invalid_n(self):
+        """Test that n must be positive."""
+        with pytest.raises(ValueError):
+            LiteralIndex(n=0)
@@ -0,0 +1,110 @@
+# tests/unit/index/test_metadata.py
+"""Unit tests for metadata filter compilation and time_range parsing."""
+
+from datetime import date
+
+import pytest
+
+from agentic_rag.index.metadata import MetadataStore, TimeInterval, parse_time_range
+
+
+class TestParseTimeRange:
+    """Tests for parse_time_range."""
+
+    TODAY = date(2026, 10, 19)
+
+    @pytest.mark.parametrize(
+        "text,expected",
+        [
+            ("2023", TimeInterval(date(2023, 1, 1), date(2023, 12, 31))),
+            ("2024-02", TimeInterval(date(2024, 2, 1), date(2024, 2, 29))),
+            ("2024-02-10", TimeInterval(date(2024, 2, 10), date(2024, 2, 10))),
+            ("2024Q2", TimeInterval(date(2024, 4, 1), date(2024, 6, 30))),
+            ("2022-2024", TimeInterval(date(2022, 1, 1), date(2024, 12, 31))),
+            ("2023-01-01..2023-06-30", TimeInterval(date(2023, 1, 1), date(2023, 6, 30))),
+            ("2023-01 to 2023-03", TimeInterval(date(2023, 1, 1), date(2023, 3, 31))),
+            ("since 2022", TimeInterval(date(2022, 1, 1), None)),
+            ("after 2022", TimeInterval(date(2023, 1, 1), None)),
+            ("before 2024-03", TimeInterval(None, date(2024, 2, 29))),
+            ("until 2023", TimeInterval(None, date(2023, 12, 31))),
+            ("last 6 months", TimeInterval(date(2026, 4, 19), date(2026, 10, 19))),
+            ("past year", TimeInterval(date(2025, 10, 19), date(2026, 10, 19))),
+            ("Last 30 days", TimeInterval(date(2026, 9, 19), date(2026, 10, 19))),
+        ],
+    )
+    def test_supported_forms(self, text, expected):
+        """Test supported time_range expressions."""
+        assert parse_time_range(text, today=self.TODAY) == expected
+
+    @pytest.mark.parametrize("text", [None, "", "   ", "recently", "since forever"])
+    def test_unparseable(self, text):
+        """Test that unknown expressions return None."""
+        assert parse_time_range(text, today=self.TODAY) is None
+
+    @pytest.mark.parametrize(
+        "text", ["2023-13", "2023-0", "0000", "2023-02-30", "since 2023-00", "2023-13..2024-01", "0000-2024"]
+    )
+    def test_out_of_range_parts(self, text):
+        """Test that impossible months/days/years return None instead of raising."""
+        assert parse_time_range(text, today=self.TODAY) is None
+
+    @pytest.mark.parametrize(
+        "text",
+        ["last 3000 years", "last 99999999 days", "past 99999999 weeks", "after 9999-12-31", "before 0001-01-01"],
+    )
+    def test_spans_off_the_calendar(self, text):
+        """Test that relative and open-ended spans past the date limits return None instead of raising."""
+        assert parse_time_range(text, today=self.TODAY) is None
+
+
+class TestMetadataStore:
+    """Tests for MetadataStore.compile."""
+
+    def test_no_filters_returns_none(self, local_index):
+        """Test that empty filters do not restrict."""
+        assert local_index.metadata.compile({}) is None
+        assert local_index.metadata.compile({"doc_types": [], "domains": [], "time_range": None}) is None
+
+    def test_values_or_within_field(self, local_index):
+        """Test OR semantics within a field (case-insensitive)."""
+        mask = local_index.metadata.compile({"doc_types": ["Runbook", "policy"]})
+        assert mask.tolist() == [True, False, True, False]
+
+    def test_fields_and_across(self, local_index):
+        """Test AND semantics across fields, with domain/domains aliases."""
+        mask = local_index.metadata.compile({"domains": ["azure"], "doc_types": ["policy"]})
+        assert mask.tolist() == [False, False, True, False]
+
+    def test_entities(self, local_index):
+        """Test entity filter."""
+        mask = local_index.metadata.compile({"entities": ["key vault"]})
+        assert mask.tolist() == [False, False, True, False]
+
+    def test_unknown_value_matches_nothing(self, local_index):
+        """Test that unknown values yield an empty mask."""
+        mask = local_index.metadata.compile({"domains": ["langgraph"]})
+        assert not mask.any()
+
+    def test_time_range_excludes_undated(self, local_index):
+        """Test time_range compilation; undated chunks never match."""
+        mask = local_index.metadata.compile({"time_range": "since 2023"})
+        assert mask.tolist() == [True, True, False, False]
+
+    def test_unparseable_time_range_is_ignored(self, local_index):
+        """Test that a bad time_range does not restrict."""
+        assert local_index.metadata.compile({"time_range": "recently"}) is None
+        assert local_index.metadata.compile({"time_range": "2023-13"}) is None
+
+    def test_add_out_of_order(self):
+        """Test ordinals must be contiguous."""
+        store = MetadataStore()
+        with pytest.raises(ValueError):
+            store.add(1, {})
+
+    def test_recompile_after_add(self):
+        """Test that frozen arrays refresh after new writes."""
+        store = MetadataStore()
+        store.add(0, {"doc_type": "faq"})
+        assert store.compile({"doc_types": ["faq"]}).tolist() == [True]
+        store.add(1, {"doc_type": "faq"})
+        assert store.compile({"doc_types": ["faq"]}).tolist() == [True, True]
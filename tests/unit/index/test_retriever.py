@@ -0,0 +1,140 @@
+# tests/unit/index/test_retriever.py
+"""Unit tests for LocalRetriever and the BM25/vector indexes it drives."""
+
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from agentic_rag.executor.state import CandidateKey
+from agentic_rag.index.bm25 import BM25Index
+from agentic_rag.index.local import LocalIndex
+from agentic_rag.index.retriever import LocalRetriever
+from agentic_rag.index.vector import VectorIndex
+
+from .conftest import toy_embed
+
+
+class TestBM25Index:
+    """Tests for BM25Index."""
+
+    def test_ranks_matching_docs(self):
+        """Test that documents with query terms are ranked by BM25."""
+        index = BM25Index()
+        index.add(0, "certificate rotation")
+        index.add(1, "pods restart")
+        index.add(2, "certificate certificate rotation policy")
+        hits = index.search("certificate", k=5)
+        assert [o for o, _ in hits] == [2, 0]
+
+    def test_mask_restricts_before_scoring(self):
+        """Test that masked ordinals are never scored."""
+        index = BM25Index()
+        index.add(0, "certificate")
+        index.add(1, "certificate")
+        hits = index.search("certificate", k=5, mask=np.array([False, True]))
+        assert [o for o, _ in hits] == [1]
+
+    def test_empty(self):
+        """Test empty index and no-match query."""
+        index = BM25Index()
+        assert index.search("anything", k=5) == []
+        index.add(0, "hello")
+        assert index.search("world", k=5) == []
+
+
+class TestVectorIndex:
+    """Tests for VectorIndex."""
+
+    def test_cosine_ranking_and_mask(self):
+        """Test cosine ranking and masking."""
+        index = VectorIndex(dim=2)
+        index.add(0, [1.0, 0.0])
+        index.add(1, [0.7, 0.7])
+        index.add(2, [0.0, 1.0])
+        assert [o for o, _ in index.search([1.0, 0.1], k=2)] == [0, 1]
+        assert [o for o, _ in index.search([1.0, 0.1], k=2, mask=np.array([False, True, True]))] == [1, 2]
+
+    def test_dim_mismatch(self):
+        """Test that wrong-sized vectors are rejected."""
+        index = VectorIndex(dim=2)
+        with pytest.raises(ValueError):
+            index.add(0, [1.0, 0.0, 0.0])
+
+
+class TestLocalRetriever:
+    """Tests for LocalRetriever."""
+
+    def test_exact_mode(self, local_index):
+        """Test exact mode is served from the literal index."""
+        retriever = LocalRetriever(local_index, embed_query=toy_embed)
+        cands = retriever.search(query="AKV-1001", mode="exact", k=5, alpha=None, filters={})
+        assert [c.key for c in cands] == [CandidateKey("doc1", "c0")]
+
+    def test_bm25_with_filters(self, local_index):
+        """Test BM25 with filter pushdown."""
+        retriever = LocalRetriever(local_index)
+        unfiltered = retriever.search(query="certificate rotation", mode="bm25", k=5, alpha=None, filters={})
+        filtered = retriever.search(
+            query="certificate rotation", mode="bm25", k=5, alpha=None, filters={"domains": ["kubernetes"]}
+        )
+        assert len(unfiltered) == 3
+        assert [c.key.doc_id for c in filtered] == ["doc4"]
+        assert filtered[0].bm25_rank == 1 and filtered[0].bm25_score > 0
+
+    def test_vector_mode(self, local_index):
+        """Test vector mode ranks by cosine and sets vector features."""
+        retriever = LocalRetriever(local_index, embed_query=toy_embed)
+        cands = retriever.search(query="kubernetes", mode="vector", k=2, alpha=None, filters={})
+        assert cands[0].key.doc_id in ("doc2", "doc4")
+        assert cands[0].vector_rank == 1 and cands[0].bm25_score is None
+
+    def test_hybrid_mode_with_time_range(self, local_index):
+        """Test hybrid fuses both sides and honours time_range."""
+        retriever = LocalRetriever(local_index, embed_query=toy_embed)
+        cands = retriever.search(
+            query="azure certificate", mode="hybrid", k=5, alpha=0.5, filters={"time_range": "2024"}
+        )
+        assert [c.key.doc_id for c in cands] == ["doc1"]
+        assert cands[0].bm25_score is not None and cands[0].vector_score is not None
+
+    def test_hybrid_without_vectors_serves_bm25(self, sample_chunks):
+        """Test hybrid degrades to BM25 when the index has no vectors."""
+        index = LocalIndex()
+        for key, text, meta in sample_chunks:
+            index.add(key, text, meta)
+        retriever = LocalRetriever(index)
+        cands = retriever.search(query="pods", mode="hybrid", k=5, alpha=0.5, filters={})
+        assert [c.key.doc_id for c in cands] == ["doc2"]
+
+    def test_vector_without_embeddings_uses_fallback(self, sample_chunks):
+        """Test vector/hybrid delegate to fallback when local vectors are unavailable."""
+        index = LocalIndex()
+        for key, text, meta in sample_chunks:
+            index.add(key, text, meta)
+        fallback = MagicMock()
+        fallback.search.return_value = []
+        retriever = LocalRetriever(index, fallback=fallback)
+
+        retriever.search(query="pods", mode="vector", k=5, alpha=None, filters={"domains": ["azure"]})
+
+        assert fallback.search.call_args[1]["filters"] == {"domains": ["azure"]}
+
+    def test_vector_without_embeddings_or_fallback_raises(self, sample_chunks):
+        """Test missing vector support is reported."""
+        index = LocalIndex()
+        retriever = LocalRetriever(index)
+        with pytest.raises(NotImplementedError):
+            retriever.search(query="pods", mode="vector", k=5, alpha=None, filters={})
+
+    def test_unknown_mode(self, local_index):
+        """Test unknown modes are rejected."""
+        retriever = LocalRetriever(local_index, embed_query=toy_embed)
+        with pytest.raises(ValueError):
+            retriever.search(query="x", mode="sparse", k=5, alpha=None, filters={})
+
+    def test_index_requires_vectors_when_dim_set(self):
+        """Test LocalIndex refuses chunks without vectors when built with dim."""
+        index = LocalIndex(dim=3)
+        with pytest.raises(ValueError):
+            index.add(CandidateKey("d", "c"), "text")
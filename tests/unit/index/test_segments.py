@@ -0,0 +1,201 @@
+# tests/unit/index/test_segments.py
+"""Unit tests for SegmentedIndex upserts, deletes, snapshots and compaction."""
+
+import threading
+
+import pytest
+
+from agentic_rag.index import segments
+from agentic_rag.index.retriever import LocalRetriever
+from agentic_rag.index.segments import SegmentedIndex
+
+from .conftest import toy_embed
+
+
+def _chunks(*texts, meta=None):
+    return [(f"c{i}", t, dict(meta or {}), toy_embed(t)) for i, t in enumerate(texts)]
+
+
+def _doc_ids(candidates):
+    return [c.key.doc_id for c in candidates]
+
+
+@pytest.fixture
+def seg_index(local_index):
+    """SegmentedIndex seeded with the shared sample chunks as its first segment."""
+    return SegmentedIndex.from_index(local_index, auto_compact=False)
+
+
+class TestUpsertDelete:
+    """Tests for doc-level writes."""
+
+    def test_upsert_replaces_doc(self, seg_index):
+        """Test upsert tombstones old chunks and the new version is searchable."""
+        retriever = LocalRetriever(seg_index, embed_query=toy_embed)
+        seg_index.upsert("doc2", _chunks("Kubernetes ingress controller notes."))
+
+        assert len(seg_index.snapshot().segments) == 2
+        assert retriever.search(query="liveness", mode="bm25", k=5, alpha=None, filters={}) == []
+        hits = retriever.search(query="ingress", mode="bm25", k=5, alpha=None, filters={})
+        assert _doc_ids(hits) == ["doc2"]
+        assert len(seg_index) == 4
+
+    def test_delete_and_unknown_doc(self, seg_index):
+        """Test delete removes a doc from every mode; unknown ids are a no-op."""
+        retriever = LocalRetriever(seg_index, embed_query=toy_embed)
+        seg_index.delete("doc1")
+        seg_index.delete("nope")
+
+        assert "doc1" not in seg_index
+        assert retriever.search(query="AKV-1001", mode="exact", k=5, alpha=None, filters={}) == []
+        vector = retriever.search(query="azure", mode="vector", k=5, alpha=None, filters={})
+        assert "doc1" not in _doc_ids(vector)
+        assert len(seg_index) == 3
+
+    def test_filters_and_tombstones_combine(self, seg_index):
+        """Test filter pushdown still applies across segments."""
+        retriever = LocalRetriever(seg_index, embed_query=toy_embed)
+        seg_index.upsert("doc5", _chunks("Azure certificate expiry alert.", meta={"doc_type": "runbook"}))
+        hits = retriever.search(query="certificate", mode="hybrid", k=5, alpha=0.5, filters={"doc_types": ["runbook"]})
+        assert sorted(_doc_ids(hits)) == ["doc1", "doc5"]
+
+    def test_batch_apply(self, seg_index):
+        """Test a batch writes a single segment."""
+        seg_index.apply(upserts={"a": _chunks("alpha"), "b": _chunks("beta")}, deletes=["doc3"])
+        snap = seg_index.snapshot()
+        assert len(snap.segments) == 2
+        assert seg_index.doc_ids() == ["a", "b", "doc1", "doc2", "doc4"]
+
+
+class TestSnapshots:
+    """Tests for snapshot isolation."""
+
+    def test_snapshot_is_stable_across_writes(self, seg_index):
+        """Test a held snapshot does not see later writes."""
+        before = seg_index.snapshot()
+        seg_index.delete("doc1")
+        seg_index.upsert("doc9", _chunks("new"))
+        assert len(before) == 4
+        assert len(before.segments) == 1
+        assert not before.segments[0].tombstones.any()
+
+    def test_concurrent_queries_during_writes(self, seg_index):
+        """Test queries always see exactly one live version of a doc while it is rewritten."""
+        retriever = LocalRetriever(seg_index, embed_query=toy_embed)
+        errors = []
+
+        def reader():
+            for _ in range(200):
+                hits = retriever.search(query="marker", mode="bm25", k=10, alpha=None, filters={})
+                if len(hits) != 1:
+                    errors.append(len(hits))
+
+        seg_index.upsert("hot", _chunks("marker v0"))
+        t = threading.Thread(target=reader)
+        t.start()
+        for v in range(1, 50):
+            seg_index.upsert("hot", _chunks(f"marker v{v}"))
+            if v % 10 == 0:
+                seg_index.compact()
+        t.join()
+        assert errors == []
+
+
+class TestCompaction:
+    """Tests for compaction."""
+
+    def test_compact_drops_tombstones(self, seg_index):
+        """Test compaction merges segments and physically removes deleted chunks."""
+        seg_index.upsert("doc2", _chunks("Kubernetes ingress"))
+        seg_index.delete("doc3")
+        seg_index.compact()
+
+        snap = seg_index.snapshot()
+        assert len(snap.segments) == 1
+        assert len(snap.segments[0].index) == 3
+        assert not snap.segments[0].tombstones.any()
+        assert seg_index.doc_ids() == ["doc1", "doc2", "doc4"]
+
+    def test_auto_compaction_in_background(self, local_index):
+        """Test exceeding max_segments schedules a background merge."""
+        index = SegmentedIndex.from_index(local_index, max_segments=2)
+        for i in range(3):
+            index.upsert(f"n{i}", _chunks(f"note {i}"))
+        index.close()  # waits for the scheduled merge
+        # n2 may land before or during the merge; either way at most one segment is left over
+        assert len(index.snapshot().segments) <= 2
+        assert len(index) == 7
+
+    def test_writes_during_compaction_survive(self, seg_index, monkeypatch):
+        """Test deletes and new segments that land mid-merge are kept after install."""
+        original_add = type(seg_index.snapshot().segments[0].index).add
+        fired = []
+
+        def add_and_write(self_, *args, **kwargs):
+            if not fired:
+                fired.append(True)
+                seg_index.delete("doc4")
+                seg_index.upsert("late", _chunks("late arrival"))
+            return original_add(self_, *args, **kwargs)
+
+        seg_index.delete("doc3")
+        monkeypatch.setattr("agentic_rag.index.local.LocalIndex.add", add_and_write)
+        seg_index.compact()
+        monkeypatch.undo()
+
+        assert fired
+        assert "doc4" not in seg_index
+        assert "late" in seg_index
+        assert len(seg_index) == 3
+
+
+class TestPersistence:
+    """Tests for on-disk segments."""
+
+    def test_reopen_after_writes_and_compaction(self, local_index, tmp_path):
+        """Test the commit point restores segments, tombstones and cleans orphans."""
+        path = tmp_path / "seg"
+        index = SegmentedIndex.from_index(local_index, path, auto_compact=False)
+        index.upsert("doc2", _chunks("Kubernetes ingress"))
+        index.delete("doc1")
+
+        reopened = SegmentedIndex.open(path, auto_compact=False)
+        assert reopened.doc_ids() == ["doc2", "doc3", "doc4"]
+        assert len(reopened.snapshot().segments) == 2
+
+        reopened.compact()
+        assert sorted(p.name for p in path.iterdir() if p.is_dir()) == ["seg-000003"]
+        again = SegmentedIndex.open(path)
+        assert again.doc_ids() == ["doc2", "doc3", "doc4"]
+        hits = LocalRetriever(again, embed_query=toy_embed).search(
+            query="ingress", mode="bm25", k=5, alpha=None, filters={}
+        )
+        assert _doc_ids(hits) == ["doc2"]
+
+    def test_write_while_merged_segment_is_saved(self, local_index, tmp_path, monkeypatch):
+        """Test writers are not blocked by saving the merged segment, which survives their commits."""
+        path = tmp_path / "seg"
+        index = SegmentedIndex.from_index(local_index, path, auto_compact=False)
+        index.delete("doc1")
+        original_save = segments.save_index
+        fired = []
+
+        def save_and_write(idx, seg_path):
+            original_save(idx, seg_path)
+            if not fired:
+                fired.append(True)
+                index.upsert("late", _chunks("late arrival"))
+
+        monkeypatch.setattr(segments, "save_index", save_and_write)
+        index.compact()
+        monkeypatch.undo()
+
+        assert fired
+        reopened = SegmentedIndex.open(path, auto_compact=False)
+        assert reopened.doc_ids() == ["doc2", "doc3", "doc4", "late"]
+        assert len(reopened) == len(index)
+
+    def test_open_missing(self, tmp_path):
+        """Test opening a directory without a commit point fails."""
+        with pytest.raises(FileNotFoundError):
+            SegmentedIndex.open(tmp_path)
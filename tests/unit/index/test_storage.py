@@ -0,0 +1,41 @@
+# tests/unit/index/test_storage.py
+"""Unit tests for index persistence."""
+
+import numpy as np
+
+from agentic_rag.index.bm25 import BM25Index
+from agentic_rag.index.storage import load_index, save_index
+
+
+class TestStorageRoundTrip:
+    """Tests for save_index/load_index."""
+
+    def test_round_trip(self, local_index, tmp_path):
+        """Test a saved LocalIndex loads back with identical search results."""
+        save_index(local_index, tmp_path / "idx")
+        loaded = load_index(tmp_path / "idx")
+
+        assert len(loaded) == len(local_index)
+        assert loaded.bm25.search("certificate", k=5) == local_index.bm25.search("certificate", k=5)
+        assert loaded.vectors.search([1.0, 0.0, 0.0], k=2) == local_index.vectors.search([1.0, 0.0, 0.0], k=2)
+        assert loaded.metadata.compile({"domains": ["azure"]}).tolist() == [True, False, True, False]
+
+    def test_vectors_stay_memory_mapped(self, local_index, tmp_path):
+        """Test loaded vectors are searched in place, not copied into memory."""
+        save_index(local_index, tmp_path / "idx")
+        loaded = load_index(tmp_path / "idx")
+
+        loaded.vectors.search([1.0, 0.0, 0.0], k=2)
+        assert isinstance(loaded.vectors.to_matrix(), np.memmap)
+
+    def test_bm25_terms_as_utf8_blob(self):
+        """Test terms persist as variable-length UTF-8, including non-ASCII terms."""
+        bm25 = BM25Index()
+        bm25.add(0, "Zürich datacenter failover")
+        bm25.add(1, "ERR_CONN_RESET during failover")
+        arrays = bm25.to_arrays()
+
+        assert all(a.dtype.kind != "U" for a in arrays.values())
+        assert arrays["term_bytes"].nbytes == sum(len(t.encode("utf-8")) for t in bm25._postings)
+        restored = BM25Index.from_arrays(arrays)
+        assert restored.search("zürich failover", k=2) == bm25.search("zürich failover", k=2)
@@ -0,0 +1,36 @@
+# tests/unit/ingest/conftest.py
+"""Shared fixtures for ingest module unit tests."""
+
+import json
+import os
+
+import pytest
+
+# Disable Langfuse for unit tests
+os.environ["LANGFUSE_ENABLED"] = "0"
+
+
+@pytest.fixture
+def corpus_dir(tmp_path):
+    """Small markdown corpus on disk."""
+    root = tmp_path / "corpus"
+    (root / "runbooks").mkdir(parents=True)
+    (root / "runbooks" / "aks.md").write_text(
+        "# AKS certificate rotation\n\nRun az aks rotate-certs. Error AKS-409 means a rotation is in progress.\n",
+        encoding="utf-8",
+    )
+    (root / "faq.txt").write_text("Pods restart when the liveness probe fails.\n", encoding="utf-8")
+    (root / "ignored.bin").write_bytes(b"\x00\x01")
+    return root
+
+
+@pytest.fixture
+def corpus_jsonl(tmp_path):
+    """Small JSONL corpus."""
+    path = tmp_path / "docs.jsonl"
+    records = [
+        {"doc_id": f"kb-{i}", "text": f"Knowledge base article {i} about topic {i % 3}.", "doc_type": "kb"}
+        for i in range(10)
+    ]
+    path.write_text("\n".join(json.dumps(r) for r in records) + "\n", encoding="utf-8")
+    return path
@@ -0,0 +1,85 @@
+# tests/unit/ingest/test_chunking.py
+"""Unit tests for document loading and chunking."""
+
+import pytest
+
+from agentic_rag.ingest.chunking import chunk_document
+from agentic_rag.ingest.loaders import Document, iter_documents
+
+
+class TestLoaders:
+    """Tests for iter_documents."""
+
+    def test_directory_is_sorted_and_filtered(self, corpus_dir):
+        """Test directory walk order, suffix filtering and metadata."""
+        docs = list(iter_documents(corpus_dir))
+        assert [d.doc_id for d in docs] == ["faq.txt", "runbooks/aks.md"]
+        assert docs[1].metadata["title"] == "AKS certificate rotation"
+        assert "updated_at" in docs[1].metadata
+
+    def test_jsonl(self, corpus_jsonl):
+        """Test JSONL records map to documents with remaining keys as metadata."""
+        docs = list(iter_documents(corpus_jsonl))
+        assert len(docs) == 10
+        assert docs[0].doc_id == "kb-0"
+        assert docs[0].metadata == {"doc_type": "kb"}
+
+    def test_jsonl_defaults_and_skips(self, tmp_path):
+        """Test default doc_id and records without text."""
+        path = tmp_path / "x.jsonl"
+        path.write_text('{"content": "hello"}\n\n{"id": 7}\n', encoding="utf-8")
+        docs = list(iter_documents(path))
+        assert [d.doc_id for d in docs] == ["x:1"]
+
+    def test_unsupported_source(self, tmp_path):
+        """Test unsupported sources are rejected."""
+        with pytest.raises(ValueError):
+            iter_documents(tmp_path / "missing.csv")
+
+
+class TestChunkDocument:
+    """Tests for chunk_document."""
+
+    def test_short_document_single_chunk(self):
+        """Test a short document yields one chunk with stable key and offsets."""
+        doc = Document(doc_id="d1", text="  Hello world.  ", metadata={"source": "s"})
+        chunks = chunk_document(doc)
+        assert len(chunks) == 1
+        assert chunks[0].key.doc_id == "d1" and chunks[0].key.chunk_id == "c0000"
+        assert chunks[0].text == "Hello world."
+        meta = chunks[0].metadata
+        assert doc.text[meta["char_start"] : meta["char_end"]] == "Hello world."
+        assert meta["source"] == "s"
+
+    def test_long_document_offsets_and_boundaries(self):
+        """Test windows respect max_chars, map back to the source and prefer paragraph breaks."""
+        paragraphs = [f"Paragraph {i} " + "word " * 30 for i in range(10)]
+        doc = Document(doc_id="d", text="\n\n".join(paragraphs))
+        chunks = chunk_document(doc, max_chars=400, overlap=50)
+
+        assert len(chunks) > 1
+        for c in chunks:
+            assert len(c.text) <= 400
+            assert doc.text[c.metadata["char_start"] : c.metadata["char_end"]] == c.text
+        assert [c.key.chunk_id for c in chunks] == [f"c{i:04d}" for i in range(len(chunks))]
+        assert (
+            chunks[1].text.startswith("Paragraph") or chunks[1].metadata["char_start"] < chunks[0].metadata["char_end"]
+        )
+
+    def test_chunking_is_deterministic(self):
+        """Test identical input gives identical chunks."""
+        doc = Document(doc_id="d", text="alpha beta gamma. " * 200)
+        a = chunk_document(doc, max_chars=300, overlap=40)
+        b = chunk_document(doc, max_chars=300, overlap=40)
+        assert [(c.key, c.text) for c in a] == [(c.key, c.text) for c in b]
+
+    def test_unbroken_text(self):
+        """Test text without boundaries is hard-split and always progresses."""
+        doc = Document(doc_id="d", text="x" * 1000)
+        chunks = chunk_document(doc, max_chars=300, overlap=50)
+        assert "".join(c.text for c in chunks).count("x") >= 1000
+
+    def test_invalid_max_chars(self):
+        """Test max_chars validation."""
+        with pytest.raises(ValueError):
+            chunk_document(Document(doc_id="d", text="x"), max_chars=0)
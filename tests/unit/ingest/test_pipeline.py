@@ -0,0 +1,115 @@
+# tests/unit/ingest/test_pipeline.py
+"""Unit tests for the ingestion pipeline, writer checkpoints and index round-trip."""
+
+import json
+
+import pytest
+
+from agentic_rag.embeddings.cache import CachedEmbeddings
+from agentic_rag.embeddings.hashing import HashingEmbeddings
+from agentic_rag.index.retriever import LocalRetriever
+from agentic_rag.index.storage import load_index
+from agentic_rag.ingest import pipeline
+from agentic_rag.ingest.cli import main
+from agentic_rag.ingest.loaders import iter_documents
+from agentic_rag.ingest.pipeline import IngestConfig, run_ingest
+
+
+class TestRunIngest:
+    """Tests for run_ingest."""
+
+    def test_inline_build_is_searchable(self, corpus_dir, tmp_path):
+        """Test an inline build produces a loadable, searchable index."""
+        out = tmp_path / "idx"
+        report = run_ingest(IngestConfig(source=str(corpus_dir), out=str(out), embedder="hashing:64"))
+
+        assert report.docs == 2 and report.chunks == 2 and report.dim == 64
+        index = load_index(out)
+        retriever = LocalRetriever(index, embed_query=HashingEmbeddings(dim=64).embed_query)
+
+        exact = retriever.search(query="AKS-409", mode="exact", k=5, alpha=None, filters={})
+        assert [c.key.doc_id for c in exact] == ["runbooks/aks.md"]
+        hybrid = retriever.search(query="liveness probe", mode="hybrid", k=1, alpha=0.5, filters={})
+        assert hybrid[0].key.doc_id == "faq.txt"
+
+    def test_without_embedder(self, corpus_jsonl, tmp_path):
+        """Test a BM25/literal-only build."""
+        out = tmp_path / "idx"
+        report = run_ingest(IngestConfig(source=str(corpus_jsonl), out=str(out), embedder=None, batch_docs=3))
+        assert report.dim is None
+        index = load_index(out)
+        assert index.vectors is None
+        assert len(index.metadata.compile({"doc_types": ["kb"]}).nonzero()[0]) == 10
+
+    def test_process_pool_matches_inline(self, corpus_jsonl, tmp_path):
+        """Test that a multi-process build is identical to an inline build."""
+        inline, pooled = tmp_path / "inline", tmp_path / "pooled"
+        run_ingest(IngestConfig(source=str(corpus_jsonl), out=str(inline), embedder="hashing:32", batch_docs=3))
+        run_ingest(
+            IngestConfig(
+                source=str(corpus_jsonl),
+                out=str(pooled),
+                embedder="hashing:32",
+                batch_docs=3,
+                workers=2,
+                max_in_flight=2,
+            )
+        )
+        assert (inline / "chunks.jsonl").read_bytes() == (pooled / "chunks.jsonl").read_bytes()
+        assert (inline / "vectors.f32").read_bytes() == (pooled / "vectors.f32").read_bytes()
+
+    def test_resume_after_interruption(self, corpus_jsonl, tmp_path):
+        """Test a crashed build resumes from its checkpoint without duplicating chunks."""
+        out = tmp_path / "idx"
+        config = IngestConfig(source=str(corpus_jsonl), out=str(out), embedder="hashing:32", batch_docs=3)
+
+        def flaky_docs():
+            for i, doc in enumerate(iter_documents(corpus_jsonl)):
+                if i == 7:
+                    raise RuntimeError("simulated crash")
+                yield doc
+
+        with pytest.raises(RuntimeError):
+            run_ingest(config, documents=flaky_docs())
+        checkpoint = json.loads((out / "checkpoint.json").read_text())
+        assert checkpoint["docs_done"] == 6 and checkpoint["complete"] is False
+
+        config.resume = True
+        report = run_ingest(config)
+
+        assert report.skipped_docs == 6 and report.docs == 10
+        index = load_index(out)
+        assert [index.literal.key(o).doc_id for o in range(len(index))] == [f"kb-{i}" for i in range(10)]
+        assert len(index.vectors) == 10
+
+    def test_reingest_uses_embedding_cache(self, corpus_jsonl, tmp_path):
+        """Test a rebuild of an unchanged corpus is served entirely from the embedding cache."""
+        cache_path = tmp_path / "emb.sqlite"
+        for out in ("a", "b"):
+            run_ingest(
+                IngestConfig(
+                    source=str(corpus_jsonl),
+                    out=str(tmp_path / out),
+                    embedder="hashing:32",
+                    embed_cache=str(cache_path),
+                )
+            )
+        # inline builds keep the worker client in this process
+        assert pipeline._WORKER_EMBEDDINGS.hits == 10 and pipeline._WORKER_EMBEDDINGS.misses == 0
+        cache = CachedEmbeddings(HashingEmbeddings(dim=32), cache_path, model_id="hashing:32")
+        assert len(cache) == 10
+        assert (tmp_path / "a" / "vectors.f32").read_bytes() == (tmp_path / "b" / "vectors.f32").read_bytes()
+
+    def test_resume_rejects_changed_params(self, corpus_jsonl, tmp_path):
+        """Test resuming with different build params is refused."""
+        out = tmp_path / "idx"
+        run_ingest(IngestConfig(source=str(corpus_jsonl), out=str(out), embedder="hashing:32"))
+        with pytest.raises(ValueError):
+            run_ingest(IngestConfig(source=str(corpus_jsonl), out=str(out), embedder="hashing:64", resume=True))
+
+    def test_cli(self, corpus_dir, tmp_path, capsys):
+        """Test the CLI entry point."""
+        out = tmp_path / "idx"
+        main(["--source", str(corpus_dir), "--out", str(out), "--embedder", "none", "--log-level", "WARNING"])
+        assert "Indexed 2 docs" in capsys.readouterr().out
+        assert (out / "manifest.json").exists()
@@ -0,0 +1,154 @@
+# tests/unit/intent/test_artifacts.py
+"""Unit tests for the deterministic artifact/literal-term pre-extractor."""
+
+import time
+from unittest.mock import MagicMock
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+from agentic_rag.intent.artifacts import (
+    compact_messages,
+    detect_artifact_flags,
+    extract_literal_terms,
+    scan_messages,
+    truncate_stacktraces,
+)
+from agentic_rag.intent.nodes.extract_signals import ExtractSignalsLiteModel, make_extract_signals_node
+
+PY_TRACE = (
+    "My job fails:\nTraceback (most recent call last):\n"
+    + "".join(f'  File "/app/mod{i}.py", line {i}, in f{i}\n    call_{i}()\n' for i in range(30))
+    + "KeyError: 'AZURE_OPENAI_KEY'"
+)
+
+JAVA_TRACE = (
+    "java.lang.NullPointerException\n"
+    "\tat com.acme.Billing.charge(Billing.java:42)\n"
+    "\tat com.acme.Main.main(Main.java:7)"
+)
+
+
+class TestArtifactFlags:
+    """Tests for detect_artifact_flags."""
+
+    def test_plain_question_has_no_flags(self):
+        """Test ordinary prose raises nothing."""
+        assert detect_artifact_flags("How do I configure Azure OpenAI for production, e.g. in v1.2?") == []
+
+    def test_each_flag(self):
+        """Test every ArtifactFlag is detected from a typical snippet."""
+        assert detect_artifact_flags("```python\nprint(1)\n```") == ["has_code"]
+        assert "has_stacktrace" in detect_artifact_flags(PY_TRACE)
+        assert "has_stacktrace" in detect_artifact_flags(JAVA_TRACE)
+        assert detect_artifact_flags("see OPS-1234") == ["has_ids"]
+        assert detect_artifact_flags("edit /etc/nginx/nginx.conf") == ["has_paths"]
+        assert detect_artifact_flags("docs at https://example.com/a/b") == ["has_urls"]
+        assert detect_artifact_flags("| a | b |\n|---|---|\n| 1 | 2 |") == ["has_table"]
+        assert detect_artifact_flags('what does "blue green" mean') == ["has_quoted_strings"]
+
+    def test_apostrophes_are_not_quotes(self):
+        """Test contractions and possessives do not look like quoted strings."""
+        assert detect_artifact_flags("It's Bob's team's idea, isn't it") == []
+
+
+class TestLiteralTerms:
+    """Tests for extract_literal_terms."""
+
+    def test_terms_in_order_without_urls(self):
+        """Test ids, keys, paths and quoted phrases are kept verbatim in order of appearance."""
+        text = (
+            "Ticket OPS-1234: set `spark.executor.memory` per https://docs.example.com/x.html, "
+            "error ERR_CONN_RESET in /var/log/app/server.log (id 123e4567-e89b-12d3-a456-426614174000)."
+        )
+        assert extract_literal_terms(text) == [
+            "OPS-1234",
+            "spark.executor.memory",
+            "ERR_CONN_RESET",
+            "/var/log/app/server.log",
+            "123e4567-e89b-12d3-a456-426614174000",
+        ]
+
+    def test_exception_names_and_dedup(self):
+        """Test exception classes are extracted once and stack frames add no noise."""
+        assert extract_literal_terms(JAVA_TRACE + "\n" + JAVA_TRACE) == ["java.lang.NullPointerException"]
+
+    def test_dotted_text_is_linear(self):
+        """Test long dotted lowercase runs do not backtrack quadratically."""
+        started = time.perf_counter()
+        assert extract_literal_terms("a." * 20000) == []
+        assert time.perf_counter() - started < 1
+
+    def test_max_terms(self):
+        """Test the term list is capped."""
+        text = " ".join(f"OPS-{i}" for i in range(50))
+        assert len(extract_literal_terms(text, max_terms=5)) == 5
+
+
+class TestTruncateStacktraces:
+    """Tests for truncate_stacktraces / compact_messages."""
+
+    def test_long_trace_keeps_both_ends(self):
+        """Test the middle of a deep trace is replaced by a marker."""
+        short = truncate_stacktraces(PY_TRACE, head=4, tail=4)
+        assert len(short) < len(PY_TRACE) / 3
+        assert "Traceback (most recent call last):" in short
+        assert 'File "/app/mod0.py"' in short and 'File "/app/mod29.py"' in short
+        assert "[52 trace lines omitted]" in short
+        assert short.endswith("KeyError: 'AZURE_OPENAI_KEY'")
+
+    def test_short_trace_unchanged(self):
+        """Test traces within the budget are returned as-is."""
+        assert truncate_stacktraces(JAVA_TRACE) is JAVA_TRACE
+
+    def test_compact_messages_copies(self):
+        """Test message objects and dicts are copied, not mutated."""
+        human = HumanMessage(content=PY_TRACE)
+        as_dict = {"role": "user", "content": PY_TRACE}
+        compacted = compact_messages([human, as_dict, AIMessage(content="ok")])
+        assert "omitted" in compacted[0].content and "omitted" in compacted[1]["content"]
+        assert human.content == PY_TRACE and as_dict["content"] == PY_TRACE
+
+    def test_scan_ignores_assistant_turns(self):
+        """Test only user messages contribute artifacts."""
+        scan = scan_messages([AIMessage(content="see OPS-1"), HumanMessage(content="thanks")])
+        assert scan.artifact_flags == [] and scan.literal_terms == []
+
+
+class TestDeterministicExtractSignals:
+    """Tests for make_extract_signals_node(deterministic=True)."""
+
+    @staticmethod
+    def _llm(raw):
+        llm = MagicMock()
+        llm.with_structured_output.return_value.invoke.return_value = raw
+        return llm
+
+    def test_lite_schema_and_merged_signals(self, mock_normalize_output):
+        """Test the LLM fills the lite schema and deterministic fields are merged in."""
+        llm = self._llm(
+            {
+                "user_intent": "troubleshoot",
+                "retrieval_intent": "evidence",
+                "answerability": "internal_corpus",
+                "complexity_flags": [],
+                "signals": {"entities": [], "acronyms": []},
+            }
+        )
+        node = make_extract_signals_node(llm, deterministic=True)
+        result = node({"messages": [HumanMessage(content=PY_TRACE)], **mock_normalize_output})
+
+        assert llm.with_structured_output.call_args[0][0] is ExtractSignalsLiteModel
+        assert result["signals"]["artifact_flags"] == ["has_stacktrace", "has_ids", "has_paths", "has_quoted_strings"]
+        assert "AZURE_OPENAI_KEY" in result["signals"]["literal_terms"]
+
+        prompt_val = llm.with_structured_output.return_value.invoke.call_args[0][0]
+        sent = prompt_val.to_messages()
+        assert "trace lines omitted" in sent[-2].content
+        assert "AZURE_OPENAI_KEY" in sent[-1].content  # literal_terms shown to the model as context
+
+    def test_echoed_artifact_fields_are_tolerated(self, mock_extract_signals_output):
+        """Test a model that still returns artifact_flags/literal_terms validates, with ours winning."""
+        node = make_extract_signals_node(self._llm(mock_extract_signals_output), deterministic=True)
+        result = node({"messages": [{"role": "user", "content": "plain question"}]})
+        assert "errors" not in result
+        assert result["signals"]["artifact_flags"] == [] and result["signals"]["literal_terms"] == []
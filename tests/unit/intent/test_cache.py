@@ -0,0 +1,207 @@
+# tests/unit/intent/test_cache.py
+"""Unit tests for the intake result cache."""
+
+from unittest.mock import MagicMock
+
+import pytest
+from langchain_core.messages import HumanMessage
+
+from agentic_rag.intent.cache import IntakeCache, IntakeConfig, intake_cache_key
+from agentic_rag.intent.graph import make_intake_graph
+from agentic_rag.intent.nodes.extract_signals import ExtractSignalsModel
+from agentic_rag.intent.nodes.intake_fused import IntakeFusedModel
+from agentic_rag.intent.nodes.normalize_gate import NormalizeModel
+
+
+class FakeClock:
+    """Manually advanced clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _user(text):
+    return [{"role": "user", "content": text}]
+
+
+class TestIntakeCacheKey:
+    """Tests for intake_cache_key canonicalisation."""
+
+    def test_near_identical_questions_share_a_key(self):
+        """Test case, whitespace and trailing punctuation are folded."""
+        a = intake_cache_key(_user("How do I rotate the AKS cert?"))
+        b = intake_cache_key(_user("  how do i   rotate the AKS cert "))
+        c = intake_cache_key([HumanMessage(content="How do I rotate the AKS cert")])
+        assert a == b == c
+
+    @pytest.mark.parametrize(
+        "a, b",
+        [
+            ("Why does `getUser` fail?", "why does `GETUSER` fail?"),
+            ("error ERR_CONN_RESET on login", "error err_conn_reset on login"),
+            ("see /var/log/App.log", "see /var/log/app.log"),
+        ],
+    )
+    def test_literal_casing_is_kept(self, a, b):
+        """Test case is not folded when the text carries literals or artifacts."""
+        assert intake_cache_key(_user(a)) != intake_cache_key(_user(b))
+
+    def test_whitespace_kept_inside_code_blocks(self):
+        """Test indentation inside fenced code matters while prose whitespace around it is folded."""
+        code = "```\nif ready:\n    start()\n```"
+        base = intake_cache_key(_user(f"Why does this hang?\n{code}"))
+        assert intake_cache_key(_user(f"Why  does this   hang?\n\n{code}")) == base
+        assert intake_cache_key(_user(f"Why does this hang?\n{code.replace('    ', '  ')}")) != base
+
+    def test_inputs_that_change_the_key(self):
+        """Test content, user context, path and window all matter."""
+        base = intake_cache_key(_user("rotate the AKS cert"))
+        assert intake_cache_key(_user("rotate the EKS cert")) != base
+        assert intake_cache_key(_user("rotate the AKS cert"), {"team": "sre"}) != base
+        assert intake_cache_key(_user("rotate the AKS cert"), config=IntakeConfig(fused=True)) != base
+
+        history = [{"role": "assistant", "content": "hi"}] + _user("rotate the AKS cert")
+        assert intake_cache_key(history, last_n=1) == base
+        assert intake_cache_key(history, last_n=2) != base
+
+    @pytest.mark.parametrize(
+        "config",
+        [
+            IntakeConfig(prepass=True),
+            IntakeConfig(deterministic_signals=True),
+            IntakeConfig(classifier_threshold=0.85),
+            IntakeConfig(fused=True),
+        ],
+    )
+    def test_intake_config_changes_the_key(self, config):
+        """Test each output-changing intake setting gets its own entries."""
+        assert intake_cache_key(_user("x"), config=config) != intake_cache_key(_user("x"))
+
+    def test_classifier_threshold_matters(self):
+        """Test a different fast-path threshold does not reuse entries."""
+        a = intake_cache_key(_user("x"), config=IntakeConfig(classifier_threshold=0.85))
+        assert intake_cache_key(_user("x"), config=IntakeConfig(classifier_threshold=0.9)) != a
+
+    def test_two_step_flags_ignored_on_fused_path(self):
+        """Test prepass/classifier settings do not split fused-path entries."""
+        fused = intake_cache_key(_user("x"), config=IntakeConfig(fused=True))
+        config = IntakeConfig(fused=True, prepass=True, classifier_threshold=0.85)
+        assert intake_cache_key(_user("x"), config=config) == fused
+
+    def test_lite_and_prepass_prompt_versions_in_key(self, monkeypatch):
+        """Test bumping the prepass or lite prompt version invalidates only entries that used it."""
+        config = IntakeConfig(prepass=True, deterministic_signals=True)
+        base, with_config = intake_cache_key(_user("x")), intake_cache_key(_user("x"), config=config)
+        for name in ("NORMALIZE_PREPASS_PROMPT_VERSION", "EXTRACT_SIGNALS_LITE_PROMPT_VERSION"):
+            with monkeypatch.context() as m:
+                m.setattr(f"agentic_rag.intent.cache.{name}", "bumped")
+                assert intake_cache_key(_user("x"), config=config) != with_config
+                assert intake_cache_key(_user("x")) == base
+
+    def test_conversation_summary_changes_the_key(self):
+        """Test the summary of older turns is part of what intake sees."""
+        base = intake_cache_key(_user("and the EKS one?"))
+        a = intake_cache_key(_user("and the EKS one?"), conversation_summary="Rotating AKS certs.", summarized_turns=2)
+        b = intake_cache_key(_user("and the EKS one?"), conversation_summary="Scaling AKS nodes.", summarized_turns=2)
+        assert len({base, a, b}) == 3
+
+    def test_user_context_key_order_irrelevant(self):
+        """Test user_context_info is hashed canonically."""
+        assert intake_cache_key(_user("x"), {"a": 1, "b": 2}) == intake_cache_key(_user("x"), {"b": 2, "a": 1})
+
+
+class TestIntakeCache:
+    """Tests for IntakeCache."""
+
+    def test_hit_miss_and_copy(self):
+        """Test lookups record stats and return independent copies."""
+        cache = IntakeCache()
+        assert cache.get("k") is None
+        cache.put("k", {"normalized_query": "q", "constraints": {"format": []}, "messages": ["ignored"]})
+
+        first = cache.get("k")
+        assert first == {"normalized_query": "q", "constraints": {"format": []}}
+        first["constraints"]["format"].append("no_code")
+        assert cache.get("k")["constraints"] == {"format": []}
+        assert cache.stats.hits == 2 and cache.stats.misses == 1
+        assert cache.stats.hit_rate == pytest.approx(2 / 3)
+
+    def test_ttl(self):
+        """Test entries expire after ttl_s."""
+        clock = FakeClock()
+        cache = IntakeCache(ttl_s=10, clock=clock)
+        cache.put("k", {"normalized_query": "q"})
+        clock.now = 10
+        assert cache.get("k") is not None
+        clock.now = 10.5
+        assert cache.get("k") is None
+        assert cache.stats.expired == 1 and len(cache) == 0
+
+    def test_lru_bound(self):
+        """Test the least recently used entry is evicted first."""
+        cache = IntakeCache(max_size=2)
+        cache.put("a", {"normalized_query": "a"})
+        cache.put("b", {"normalized_query": "b"})
+        cache.get("a")
+        cache.put("c", {"normalized_query": "c"})
+        assert cache.get("b") is None
+        assert cache.get("a") is not None and cache.get("c") is not None
+        assert cache.stats.evicted == 1
+
+
+class TestIntakeGraphWithCache:
+    """Tests for the cache nodes wired into make_intake_graph."""
+
+    @pytest.fixture
+    def llm(self, mock_normalize_output, mock_extract_signals_output):
+        """LLM mock counting structured-output invocations."""
+        results = {
+            NormalizeModel: NormalizeModel(**mock_normalize_output),
+            ExtractSignalsModel: ExtractSignalsModel(**mock_extract_signals_output),
+            IntakeFusedModel: IntakeFusedModel(**mock_normalize_output, **mock_extract_signals_output),
+        }
+        llm = MagicMock()
+        llm.calls = []
+
+        def with_structured_output(schema, **kwargs):
+            chain = MagicMock()
+
+            def invoke(_):
+                llm.calls.append(schema)
+                return results[schema]
+
+            chain.invoke.side_effect = invoke
+            return chain
+
+        llm.with_structured_output = MagicMock(side_effect=with_structured_output)
+        return llm
+
+    @pytest.mark.parametrize("fused", [False, True])
+    def test_second_request_skips_llm(self, llm, fused):
+        """Test a repeated question is served from the cache with identical intake fields."""
+        cache = IntakeCache()
+        graph = make_intake_graph(llm, max_retries=1, fused=fused, cache=cache)
+
+        first = graph.invoke({"messages": _user("How do I configure Azure OpenAI for production?")})
+        calls = len(llm.calls)
+        second = graph.invoke({"messages": _user("how do I configure azure openai for production")})
+
+        assert len(llm.calls) == calls
+        assert first["intake_cache_hit"] is False and second["intake_cache_hit"] is True
+        for key in ("normalized_query", "constraints", "guardrails", "user_intent", "signals", "intake_version"):
+            assert second[key] == first[key]
+        assert cache.stats.hits == 1 and cache.stats.misses == 1
+
+    def test_errors_are_not_cached(self, sample_messages):
+        """Test failed intake runs are not stored."""
+        llm = MagicMock()
+        llm.with_structured_output.return_value.invoke.side_effect = RuntimeError("boom")
+        cache = IntakeCache()
+        graph = make_intake_graph(llm, max_retries=1, cache=cache)
+
+        result = graph.invoke({"messages": sample_messages})
+        assert result["errors"]
+        assert len(cache) == 0
@@ -0,0 +1,203 @@
+# tests/unit/intent/test_classifier.py
+"""Unit tests for the local intent classifier fast path."""
+
+import json
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from agentic_rag.intent.classifier import (
+    Example,
+    IntentClassifier,
+    featurize,
+    load_case_examples,
+    load_logged_examples,
+    make_classify_signals_node,
+)
+from agentic_rag.intent.graph import make_intake_graph
+from agentic_rag.intent.nodes.extract_signals import ExtractSignalsModel
+from agentic_rag.intent.nodes.normalize_gate import NormalizeModel
+
+EVAL_DIR = Path(__file__).resolve().parents[2] / "intent_eval"
+
+_HOWTO = {
+    "user_intent": "lookup",
+    "retrieval_intent": "procedure",
+    "answerability": "internal_corpus",
+    "complexity_flags": [],
+}
+_ERROR = {
+    "user_intent": "troubleshoot",
+    "retrieval_intent": "evidence",
+    "answerability": "internal_corpus",
+    "complexity_flags": ["requires_synthesis"],
+}
+
+
+def _examples():
+    howto = ["how do I configure {}", "steps to set up {}", "how to install {}", "procedure to enable {}"]
+    errors = ["{} fails with error 500", "{} crashes on startup", "getting an exception from {}", "{} is broken"]
+    things = ["the gateway", "azure openai", "the vpn client", "kafka", "the billing service"]
+    out = [Example(text=t.format(x), labels=dict(_HOWTO)) for t in howto for x in things]
+    out += [Example(text=t.format(x), labels=dict(_ERROR)) for t in errors for x in things]
+    return out
+
+
+@pytest.fixture(scope="module")
+def classifier():
+    return IntentClassifier(dim=2**12).fit(_examples(), epochs=300)
+
+
+def _user(text):
+    return [{"role": "user", "content": text}]
+
+
+class TestFeaturize:
+    """Tests for the hashed feature vector."""
+
+    def test_deterministic_and_normalised(self):
+        """Test hashing is stable across calls and the vector has unit norm."""
+        i1, v1 = featurize("Rotate the AKS cert", dim=1024)
+        i2, v2 = featurize("rotate the aks cert", dim=1024)
+        assert np.array_equal(i1, i2) and np.allclose(v1, v2)
+        assert np.linalg.norm(v1) == pytest.approx(1.0, abs=1e-5)
+        assert i1.max() < 1024
+
+
+class TestIntentClassifier:
+    """Tests for fitting, prediction and persistence."""
+
+    def test_fit_predict(self, classifier):
+        """Test the trained heads separate the two synthetic intents."""
+        pred = classifier.predict("how do I configure the gateway")
+        assert pred.labels["user_intent"] == "lookup"
+        assert pred.labels["complexity_flags"] == []
+
+        pred = classifier.predict("kafka fails with error 500")
+        assert pred.labels["user_intent"] == "troubleshoot"
+        assert pred.labels["complexity_flags"] == ["requires_synthesis"]
+        assert set(pred.confidence) == {"user_intent", "retrieval_intent", "answerability", "complexity_flags"}
+
+    def test_untrained_fields_are_skipped(self):
+        """Test heads without labelled examples are not predicted."""
+        clf = IntentClassifier(dim=256).fit([Example("hello", {"user_intent": "other"})], epochs=5)
+        assert clf.fields == ["user_intent"]
+        assert set(clf.predict("hello").labels) == {"user_intent"}
+
+    def test_save_load_round_trip(self, classifier, tmp_path):
+        """Test a saved model predicts identically after loading."""
+        path = tmp_path / "clf.npz"
+        classifier.save(path)
+        loaded = IntentClassifier.load(path)
+        text = "steps to set up kafka"
+        assert loaded.dim == classifier.dim
+        assert loaded.predict(text).labels == classifier.predict(text).labels
+        assert loaded.predict(text).confidence == pytest.approx(classifier.predict(text).confidence)
+
+
+class TestTrainingData:
+    """Tests for the example loaders."""
+
+    def test_load_case_examples(self):
+        """Test intent_eval cases pair with their expected labels."""
+        examples = load_case_examples(EVAL_DIR / "cases" / "intake_v1", EVAL_DIR / "expected" / "intake_v1")
+        assert examples
+        for ex in examples:
+            assert ex.text
+            # expected files label complexity_flags as a subset, never as a full target
+            assert "complexity_flags" not in ex.labels
+
+    def test_load_logged_examples(self, tmp_path):
+        """Test JSON and JSONL logs load, skipping errored and fast-path records."""
+        good = {"messages": _user("how to install kafka"), **_HOWTO}
+        (tmp_path / "one.json").write_text(json.dumps(good))
+        lines = [
+            good,
+            {**good, "errors": [{"node": "extract_signals"}]},
+            {**good, "intake_fast_path": True},
+            {**good, "user_intent": "not-a-label"},
+        ]
+        (tmp_path / "log.jsonl").write_text("\n".join(json.dumps(r) for r in lines) + "\n")
+
+        examples = load_logged_examples([str(tmp_path / "*.json*")])
+        assert len(examples) == 3
+        assert sum(ex.labels == _HOWTO for ex in examples) == 2
+        assert sum("user_intent" not in ex.labels for ex in examples) == 1
+
+
+class TestClassifySignalsNode:
+    """Tests for make_classify_signals_node."""
+
+    def test_confident_prediction_takes_fast_path(self, classifier):
+        """Test labels are filled and signals left empty above the threshold."""
+        node = make_classify_signals_node(classifier, threshold=0.5)
+        result = node({"messages": _user("how do I configure the gateway")})
+        assert result["intake_fast_path"] is True
+        assert result["user_intent"] == "lookup"
+        assert result["signals"]["entities"] == []
+
+    def test_fast_path_fills_artifacts_deterministically(self, classifier):
+        """Test artifact_flags/literal_terms come from the regex pre-extractor on the fast path."""
+        node = make_classify_signals_node(classifier, threshold=0.0)
+        result = node({"messages": _user("how to install kafka, see OPS-42")})
+        assert result["signals"]["artifact_flags"] == ["has_ids"]
+        assert result["signals"]["literal_terms"] == ["OPS-42"]
+
+    def test_below_threshold_falls_back(self, classifier):
+        """Test an unreachable threshold defers to the LLM."""
+        node = make_classify_signals_node(classifier, threshold=1.01)
+        assert node({"messages": _user("how do I configure the gateway")}) == {"intake_fast_path": False}
+
+    def test_partially_trained_model_falls_back(self):
+        """Test a model missing any head never takes the fast path."""
+        clf = IntentClassifier(dim=256).fit([Example("hello", {"user_intent": "other"})], epochs=5)
+        node = make_classify_signals_node(clf, threshold=0.0)
+        assert node({"messages": _user("hello")}) == {"intake_fast_path": False}
+
+
+class TestIntakeGraphWithClassifier:
+    """Tests for classify_signals wired into make_intake_graph."""
+
+    @pytest.fixture
+    def llm(self, mock_normalize_output, mock_extract_signals_output):
+        """LLM mock recording which schemas were invoked."""
+        results = {
+            NormalizeModel: NormalizeModel(**mock_normalize_output),
+            ExtractSignalsModel: ExtractSignalsModel(**mock_extract_signals_output),
+        }
+        llm = MagicMock()
+        llm.calls = []
+
+        def with_structured_output(schema, **kwargs):
+            chain = MagicMock()
+
+            def invoke(_):
+                llm.calls.append(schema)
+                return results[schema]
+
+            chain.invoke.side_effect = invoke
+            return chain
+
+        llm.with_structured_output = MagicMock(side_effect=with_structured_output)
+        return llm
+
+    def test_fast_path_skips_extract_signals(self, llm, classifier):
+        """Test a confident prediction ends intake after normalize_gate."""
+        graph = make_intake_graph(llm, max_retries=1, fused=False, classifier=classifier, classifier_threshold=0.5)
+        result = graph.invoke({"messages": _user("how do I configure the gateway")})
+
+        assert llm.calls == [NormalizeModel]
+        assert result["intake_fast_path"] is True
+        assert result["user_intent"] == "lookup"
+        assert result["normalized_query"]
+
+    def test_low_confidence_calls_llm(self, llm, classifier, mock_extract_signals_output):
+        """Test the LLM extract_signals node runs when the classifier is unsure."""
+        graph = make_intake_graph(llm, max_retries=1, fused=False, classifier=classifier, classifier_threshold=1.01)
+        result = graph.invoke({"messages": _user("how do I configure the gateway")})
+
+        assert llm.calls == [NormalizeModel, ExtractSignalsModel]
+        assert result["intake_fast_path"] is False
+        assert result["user_intent"] == mock_extract_signals_output["user_intent"]
@@ -0,0 +1,112 @@
+# tests/unit/intent/test_intake_fused.py
+"""Unit tests for the fused intake node and the intake graph switch."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from agentic_rag.intent.graph import make_intake_graph
+from agentic_rag.intent.nodes.extract_signals import ExtractSignalsModel, make_extract_signals_node
+from agentic_rag.intent.nodes.intake_fused import IntakeFusedModel, make_intake_fused_node
+from agentic_rag.intent.nodes.normalize_gate import NormalizeModel, make_normalize_gate_node
+
+
+@pytest.fixture
+def fused_result(mock_normalize_output, mock_extract_signals_output):
+    """IntakeFusedModel equivalent to the two-step mock outputs."""
+    return IntakeFusedModel(**mock_normalize_output, **mock_extract_signals_output)
+
+
+def _llm_returning(results):
+    """Mock LLM whose structured-output chain returns results[schema]."""
+    llm = MagicMock()
+
+    def with_structured_output(schema, **kwargs):
+        chain = MagicMock()
+        chain.invoke.return_value = results[schema]
+        return chain
+
+    llm.with_structured_output = MagicMock(side_effect=with_structured_output)
+    return llm
+
+
+class TestIntakeFusedModel:
+    """Tests for IntakeFusedModel."""
+
+    def test_covers_both_schemas(self):
+        """Test the fused schema is exactly the union of both node schemas."""
+        assert set(IntakeFusedModel.model_fields) == set(NormalizeModel.model_fields) | set(
+            ExtractSignalsModel.model_fields
+        )
+
+    def test_split(self, fused_result, mock_normalize_output, mock_extract_signals_output):
+        """Test split returns the per-node models."""
+        normalize, extract = fused_result.split()
+        assert normalize.normalized_query == mock_normalize_output["normalized_query"]
+        assert extract.user_intent == mock_extract_signals_output["user_intent"]
+        assert extract.signals.entities[0].text == "Azure OpenAI"
+
+
+class TestIntakeFusedNode:
+    """Tests for the intake_fused node."""
+
+    def test_same_updates_as_two_step(self, sample_state, fused_result, mock_normalize_output):
+        """Test the fused node writes exactly what normalize_gate + extract_signals write."""
+        normalize, extract = fused_result.split()
+        llm = _llm_returning({NormalizeModel: normalize, ExtractSignalsModel: extract, IntakeFusedModel: fused_result})
+
+        two_step = make_normalize_gate_node(llm)(sample_state)
+        two_step.update(make_extract_signals_node(llm)({**sample_state, **mock_normalize_output}))
+        fused = make_intake_fused_node(llm)(sample_state)
+
+        assert fused == two_step
+
+    def test_accepts_dict_output(self, sample_state, fused_result):
+        """Test raw dict output is validated."""
+        llm = _llm_returning({IntakeFusedModel: fused_result.model_dump()})
+        assert make_intake_fused_node(llm)(sample_state)["user_intent"] == "plan"
+
+    def test_missing_messages(self, mock_llm):
+        """Test error handling when messages are missing."""
+        result = make_intake_fused_node(mock_llm)({})
+        assert result["errors"][0]["node"] == "intake_fused"
+        assert result["errors"][0]["type"] == "schema_validation"
+
+    def test_invalid_output(self, sample_state):
+        """Test schema violations surface as model_output_parse errors."""
+        llm = _llm_returning({IntakeFusedModel: {"normalized_query": "x", "user_intent": "bogus"}})
+        result = make_intake_fused_node(llm)(sample_state)
+        assert result["errors"][0]["type"] == "model_output_parse"
+
+    def test_runtime_error(self, sample_state):
+        """Test transport errors are reported as retryable runtime errors."""
+        llm = MagicMock()
+        llm.with_structured_output.return_value.invoke.side_effect = RuntimeError("boom")
+        result = make_intake_fused_node(llm)(sample_state)
+        assert result["errors"][0]["type"] == "runtime_error"
+        assert result["errors"][0]["retryable"] is True
+
+
+class TestIntakeGraphSwitch:
+    """Tests for make_intake_graph(fused=...)."""
+
+    def test_fused_graph_single_call(self, fused_result):
+        """Test the fused graph makes one structured-output call and fills all intake fields."""
+        llm = _llm_returning({IntakeFusedModel: fused_result})
+        graph = make_intake_graph(llm, max_retries=1, fused=True)
+        result = graph.invoke({"messages": [{"role": "user", "content": "test"}]})
+
+        assert "intake_fused" in graph.nodes and "normalize_gate" not in graph.nodes
+        assert llm.with_structured_output.call_count == 1
+        assert result["normalized_query"] == "configure Azure OpenAI for production"
+        assert result["user_intent"] == "plan"
+        assert result["signals"]["entities"][0]["text"] == "Azure OpenAI"
+        assert result["intake_version"] == "intake_v1"
+
+    def test_env_switch(self, mock_llm, monkeypatch):
+        """Test INTAKE_FUSED selects the default path."""
+        monkeypatch.setenv("INTAKE_FUSED", "1")
+        assert "intake_fused" in make_intake_graph(mock_llm).nodes
+        monkeypatch.setenv("INTAKE_FUSED", "0")
+        assert "normalize_gate" in make_intake_graph(mock_llm).nodes
+        assert "normalize_gate" in make_intake_graph(mock_llm, fused=False).nodes
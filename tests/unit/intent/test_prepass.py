@@ -0,0 +1,146 @@
+# tests/unit/intent/test_prepass.py
+"""Unit tests for the local PII / language pre-pass."""
+
+from unittest.mock import MagicMock
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+
+from agentic_rag.intent.nodes.normalize_gate import NormalizeLiteModel, make_normalize_gate_node
+from agentic_rag.intent.prepass import detect_language, detect_pii, locale_for, run_prepass, run_prepass_batch
+
+
+class TestDetectPII:
+    """Tests for detect_pii."""
+
+    def test_each_kind(self):
+        """Test emails, IBANs, card numbers, SSNs and phone numbers are found."""
+        text = (
+            "mail jane.doe@example.com, IBAN DE89 3704 0044 0532 0130 00, card 4111 1111 1111 1111, "
+            "ssn 123-45-6789, call (555) 123-4567 or +49 30 1234567"
+        )
+        assert [p.kind for p in detect_pii(text)] == ["email", "iban", "card", "ssn", "phone", "phone"]
+        assert detect_pii(text)[0].text == "jane.doe@example.com"
+
+    def test_checksums_reject_lookalikes(self):
+        """Test IBAN mod-97 and Luhn checks reject near misses."""
+        assert detect_pii("IBAN DE89 3704 0044 0532 0130 01") == []
+        assert [p.kind for p in detect_pii("card 4111 1111 1111 1112")] != ["card"]
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            "version 1.2.3",
+            "released 2024-05-01",
+            "ticket 1234567890",
+            "host 10.0.0.1",
+            "port 8080 and 443",
+            "logs from 2024 03 15 10 30",
+            "failed at 2024-03-15 10 30",
+        ],
+    )
+    def test_no_false_positives(self, text):
+        """Test versions, dates, timestamps, bare numbers and IPs are not PII."""
+        assert detect_pii(text) == []
+
+
+class TestDetectLanguage:
+    """Tests for detect_language / locale_for."""
+
+    @pytest.mark.parametrize(
+        "lang,text",
+        [
+            ("en", "How should we structure an intake subgraph for agentic RAG?"),
+            ("de", "Wie kann ich die Verbindung zur Datenbank zurücksetzen?"),
+            ("fr", "Quelle est la procédure pour demander un congé?"),
+            ("es", "¿Dónde encuentro la guía de incorporación para nuevos empleados?"),
+            ("it", "Qual è la procedura per richiedere un nuovo portatile aziendale?"),
+            ("pt", "Onde posso encontrar o manual de segurança da empresa?"),
+            ("nl", "Waar kan ik de handleiding voor het nieuwe systeem vinden?"),
+            ("pl", "Gdzie mogę znaleźć instrukcję dotyczącą nowego systemu?"),
+            ("ja", "本番環境でサービスを設定する方法を教えてください"),
+            ("ru", "Как настроить сервис для продакшена?"),
+        ],
+    )
+    def test_languages(self, lang, text):
+        """Test Latin-script languages via trigrams and others via script."""
+        assert detect_language(text).language == lang
+
+    def test_too_short_is_unknown(self):
+        """Test short or letterless input is not guessed."""
+        assert detect_language("RAG?").language is None
+        assert detect_language("1234 5678 9012 !!").language is None
+
+    def test_locale(self):
+        """Test locale comes from user context only."""
+        assert locale_for("de") is None
+        assert locale_for("de", {"country": "at"}) == "de-AT"
+        assert locale_for("en", {"locale": "en_GB"}) == "en-GB"
+
+
+class TestRunPrepass:
+    """Tests for run_prepass / run_prepass_batch."""
+
+    def test_messages(self):
+        """Test PII spans all user turns while language follows the last user turn."""
+        messages = [
+            HumanMessage(content="Mein Kontakt ist max@example.de"),
+            AIMessage(content="call +1 555 123 4567"),
+            HumanMessage(content="How do I reset the password for the build server?"),
+        ]
+        result = run_prepass(messages, {"country": "US"})
+        assert result.pii_present and result.pii_kinds == ["email"]
+        assert result.language == "en" and result.locale == "en-US"
+
+    def test_batch(self):
+        """Test the batch API accepts text, message lists and case dicts, in order."""
+        results = run_prepass_batch(
+            [
+                "Wie kann ich die Verbindung zur Datenbank zurücksetzen?",
+                [{"role": "user", "content": "write to ops@example.com about the outage"}],
+                {
+                    "messages": [{"role": "user", "content": "Quelle est la procédure pour un congé?"}],
+                    "user_context_info": {"locale": "fr-CA"},
+                },
+            ]
+        )
+        assert [r.language for r in results] == ["de", "en", "fr"]
+        assert [r.pii_present for r in results] == [False, True, False]
+        assert results[2].to_dict()["locale"] == "fr-CA"
+
+
+class TestNormalizeGateWithPrepass:
+    """Tests for make_normalize_gate_node(prepass=True)."""
+
+    def test_prefilled_fields_override_llm(self, mock_normalize_output):
+        """Test the lite schema is requested and local detections win."""
+        llm = MagicMock()
+        llm.with_structured_output.return_value.invoke.return_value = {
+            **mock_normalize_output,
+            "guardrails": {**mock_normalize_output["guardrails"], "pii_present": False},
+        }
+        node = make_normalize_gate_node(llm, prepass=True)
+        result = node(
+            {
+                "messages": [
+                    {"role": "user", "content": "Wie erreiche ich max.mustermann@example.de wegen des Zugangs?"}
+                ],
+                "user_context_info": {"country": "DE"},
+            }
+        )
+
+        assert llm.with_structured_output.call_args[0][0] is NormalizeLiteModel
+        assert result["guardrails"]["pii_present"] is True
+        assert result["guardrails"]["sensitivity"] == "normal"
+        assert result["language"] == "de" and result["locale"] == "de-DE"
+
+        sent = llm.with_structured_output.return_value.invoke.call_args[0][0].to_messages()
+        assert "detected locally" in sent[0].content
+        assert '"pii_present": true' in sent[-1].content  # trailing inputs message
+
+    def test_unknown_language_is_omitted(self, mock_normalize_output):
+        """Test an undetectable language leaves language/locale out of the update."""
+        llm = MagicMock()
+        llm.with_structured_output.return_value.invoke.return_value = mock_normalize_output
+        result = make_normalize_gate_node(llm, prepass=True)({"messages": [{"role": "user", "content": "RAG?"}]})
+        assert "language" not in result and "locale" not in result
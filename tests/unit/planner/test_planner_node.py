@@ -165,10 +165,10 @@ class TestPlannerNode:
         """Test planner node handles validation error from LLM output."""
         # Mock chain that returns invalid output
         mock_chain = MagicMock()
-        # Return a dict that will fail PlannerState validation
+        # Return a dict that fails PlannerState validation beyond local repair
         mock_chain.invoke.return_value = {
-            "goal": "x",  # Too short (< 5 chars)
-            "strategy": "direct_answer",
+            "goal": "x",  # Too short (< 5 chars); repairable from normalized_query
+            # strategy missing: required, no fallback -> escalates
         }
 
         mock_llm.with_structured_output.return_value = mock_chain
@@ -84,6 +84,12 @@ class TestRetrievalModeSpec:
         assert mode.k == 30
         assert mode.alpha is None
 
+    def test_retrieval_mode_exact(self):
+        """Test exact-literal retrieval mode."""
+        mode = RetrievalModeSpec(type="exact", k=10)
+        assert mode.type == "exact"
+        assert mode.alpha is None
+
     def test_retrieval_mode_vector(self):
         """Test vector retrieval mode."""
         mode = RetrievalModeSpec(type="vector", k=20)
@@ -0,0 +1,233 @@
+# tests/unit/planner/test_streaming.py
+"""Unit tests for the streaming planner and its partial JSON scanner."""
+
+import asyncio
+import json
+import threading
+
+import pytest
+from langchain_core.messages import AIMessageChunk
+from langchain_core.runnables import RunnableLambda
+
+from agentic_rag.planner.graph import make_planner_graph
+from agentic_rag.planner.state import PlannerState
+from agentic_rag.planner.streaming import (
+    PartialJSONScanner,
+    StreamingPlannerStats,
+    first_round,
+    make_streaming_planner_node,
+)
+
+
+def _validated(plan):
+    return PlannerState.model_validate(plan).model_dump()
+
+
+def _chunks(text, size):
+    return [text[i : i + size] for i in range(0, len(text), size)]
+
+
+def _streaming_llm(args_text, size=7, on_chunk=None):
+    """Mock LLM whose bound tool call streams ``args_text`` in ``size``-char pieces."""
+
+    def stream(_prompt_value):
+        for i, piece in enumerate(_chunks(args_text, size)):
+            if on_chunk is not None:
+                on_chunk(i, piece)
+            yield AIMessageChunk(
+                content="",
+                tool_call_chunks=[
+                    {"name": "PlannerState" if i == 0 else None, "args": piece, "id": "call_1", "index": 0}
+                ],
+            )
+
+    async def astream(prompt_value):
+        for chunk in stream(prompt_value):
+            yield chunk
+
+    class _LLM:
+        def bind_tools(self, tools, **kwargs):
+            self.bound = (tools, kwargs)
+            return RunnableLambda(stream, afunc=astream)
+
+    return _LLM()
+
+
+class TestPartialJSONScanner:
+    @pytest.mark.parametrize("size", [1, 3, 17, 10_000])
+    def test_values_match_full_parse_for_any_chunking(self, sample_planner_output, size):
+        text = json.dumps(sample_planner_output)
+        scanner = PartialJSONScanner()
+        for piece in _chunks(text, size):
+            scanner.feed(piece)
+
+        assert scanner.done
+        assert scanner.keys() == list(sample_planner_output)
+        for key, value in sample_planner_output.items():
+            assert scanner.value(key) == value
+        assert scanner.items("retrieval_rounds") == sample_planner_output["retrieval_rounds"]
+        assert scanner.parse() == sample_planner_output
+
+    def test_array_items_available_before_array_closes(self):
+        scanner = PartialJSONScanner()
+        scanner.feed('{"goal": "x", "retrieval_rounds": [{"round_id": 0, "q": ["a, ]"]}, {"round_id"')
+
+        assert scanner.value("goal") == "x"
+        assert not scanner.has("retrieval_rounds")
+        assert scanner.items("retrieval_rounds") == [{"round_id": 0, "q": ["a, ]"]}]
+
+        scanner.feed(": 1}]}")
+        assert [r["round_id"] for r in scanner.items("retrieval_rounds")] == [0, 1]
+        assert scanner.done
+
+    def test_escaped_quotes_and_braces_in_strings(self):
+        scanner = PartialJSONScanner()
+        scanner.feed('{"goal": "say \\"hi\\" {not} [json]", "n": 3')
+        assert scanner.value("goal") == 'say "hi" {not} [json]'
+        assert not scanner.has("n")  # scalar completes at the next , or }
+        scanner.feed("}")
+        assert scanner.value("n") == 3
+
+    def test_incomplete_value_is_missing(self):
+        scanner = PartialJSONScanner()
+        scanner.feed('{"literal_constraints": {"must_preserve_terms": ["ORA-')
+        assert scanner.value("literal_constraints", None) is None
+        with pytest.raises(KeyError):
+            scanner.value("literal_constraints")
+        with pytest.raises(json.JSONDecodeError):
+            scanner.parse()
+
+
+class TestFirstRound:
+    def test_needs_strategy_round_and_literal_constraints(self, sample_planner_output):
+        text = json.dumps(sample_planner_output)
+        cut = text.index('"acceptance_criteria"')
+        scanner = PartialJSONScanner()
+        scanner.feed(text[: text.index('"literal_constraints"')])
+        assert first_round(scanner) is None
+
+        scanner.feed(text[len(scanner.text) : cut])
+        round_0, literal_constraints = first_round(scanner)
+        assert round_0 == _validated(sample_planner_output)["retrieval_rounds"][0]
+        assert literal_constraints == sample_planner_output["literal_constraints"]
+
+    def test_not_for_other_strategies(self, sample_planner_output):
+        scanner = PartialJSONScanner()
+        scanner.feed(json.dumps({**sample_planner_output, "strategy": "direct_answer"}))
+        assert first_round(scanner) is None
+
+    def test_invalid_round_is_not_prefetched(self, sample_planner_output):
+        bad = {**sample_planner_output, "retrieval_rounds": [{"round_id": 0, "purpose": "nope"}]}
+        scanner = PartialJSONScanner()
+        scanner.feed(json.dumps(bad))
+        assert first_round(scanner) is None
+
+
+class TestStreamingPlannerNode:
+    def test_prefetch_overlaps_with_decoding(self, sample_intake_state, sample_planner_output):
+        text = json.dumps(sample_planner_output)
+        tail_start = text.index('"acceptance_criteria"')
+        prefetch_started = threading.Event()
+        seen_before_tail = []
+
+        def on_chunk(i, piece):
+            # Hold the stream (bounded) in the tail until the prefetch has started
+            if i * 7 >= tail_start and not seen_before_tail:
+                seen_before_tail.append(prefetch_started.wait(timeout=5))
+
+        def prefetch(state):
+            prefetch_started.set()
+            assert state["plan"]["retrieval_rounds"] == _validated(sample_planner_output)["retrieval_rounds"]
+            return {"round_queries": ["q"], "round_candidates_raw": ["cand"]}
+
+        stats = StreamingPlannerStats()
+        llm = _streaming_llm(text, on_chunk=on_chunk)
+        node = make_streaming_planner_node(llm, prefetch=prefetch, stats=stats)
+        result = node(sample_intake_state)
+
+        assert seen_before_tail == [True]
+        assert result["plan"] == _validated(sample_planner_output)
+        prefetched = result["prefetched_round"]
+        assert prefetched["round"] == result["plan"]["retrieval_rounds"][0]
+        assert prefetched["literal_constraints"] == sample_planner_output["literal_constraints"]
+        assert prefetched["normalized_query"] == sample_intake_state["normalized_query"]
+        assert prefetched["round_candidates_raw"] == ["cand"]
+        assert prefetched["lead_ms"] >= 0
+        assert (stats.streamed, stats.prefetched) == (1, 1)
+        assert llm.bound[1] == {"tool_choice": "PlannerState"}
+
+    def test_async_variant_awaits_prefetch(self, sample_intake_state, sample_planner_output):
+        class Prefetch:
+            def __call__(self, state):
+                raise AssertionError("sync prefetch under afunc")
+
+            async def acall(self, state):
+                return {"round_queries": ["q"], "round_candidates_raw": ["cand"]}
+
+        node = make_streaming_planner_node(_streaming_llm(json.dumps(sample_planner_output)), prefetch=Prefetch())
+        result = asyncio.run(node.afunc(sample_intake_state))
+
+        assert result["plan"] == _validated(sample_planner_output)
+        assert result["prefetched_round"]["round_candidates_raw"] == ["cand"]
+
+    def test_no_prefetch_for_direct_answer(self, sample_intake_state, sample_planner_output):
+        plan = {**sample_planner_output, "strategy": "direct_answer"}
+        calls = []
+        node = make_streaming_planner_node(_streaming_llm(json.dumps(plan)), prefetch=calls.append)
+        result = node(sample_intake_state)
+
+        assert calls == []
+        assert result["prefetched_round"] is None
+        assert result["plan"]["retrieval_rounds"] == []  # same invariants as the blocking planner
+
+    def test_failed_prefetch_is_dropped(self, sample_intake_state, sample_planner_output):
+        def prefetch(state):
+            raise RuntimeError("search down")
+
+        node = make_streaming_planner_node(_streaming_llm(json.dumps(sample_planner_output)), prefetch=prefetch)
+        result = node(sample_intake_state)
+
+        assert result["plan"] == _validated(sample_planner_output)
+        assert result["prefetched_round"] is None
+
+    def test_truncated_stream_is_parse_error(self, sample_intake_state, sample_planner_output):
+        text = json.dumps(sample_planner_output)[:-10]
+        result = make_streaming_planner_node(_streaming_llm(text))(sample_intake_state)
+        assert result["errors"][0]["type"] == "model_output_parse"
+        assert result["errors"][0]["retryable"] is True
+
+    def test_failed_plan_does_not_wait_for_prefetch(self, sample_intake_state, sample_planner_output):
+        started, release, finished = threading.Event(), threading.Event(), threading.Event()
+
+        def prefetch(state):
+            started.set()
+            release.wait(timeout=5)  # e.g. a slow HyDE call
+            finished.set()
+            return {"round_queries": [], "round_candidates_raw": []}
+
+        # Truncated after round 0 and the literal constraints, so the prefetch has started
+        text = json.dumps(sample_planner_output)[:-10]
+        try:
+            result = make_streaming_planner_node(_streaming_llm(text), prefetch=prefetch)(sample_intake_state)
+            assert started.wait(timeout=5) and not finished.is_set()
+            assert result["errors"][0]["type"] == "model_output_parse"
+        finally:
+            release.set()
+
+    def test_invalid_plan_is_validation_error(self, sample_intake_state):
+        text = json.dumps({"goal": "configure it", "strategy": "guess"})
+        result = make_streaming_planner_node(_streaming_llm(text))(sample_intake_state)
+        assert result["errors"][0]["type"] == "model_output_parse"
+        assert "validation_errors" in result["errors"][0]["details"]
+
+    def test_missing_messages(self, sample_intake_state):
+        node = make_streaming_planner_node(_streaming_llm("{}"))
+        result = node({**sample_intake_state, "messages": []})
+        assert result["errors"][0]["type"] == "schema_validation"
+
+    def test_planner_graph_streaming_switch(self, sample_intake_state, sample_planner_output, monkeypatch):
+        monkeypatch.setenv("PLANNER_STREAMING", "1")
+        graph = make_planner_graph(_streaming_llm(json.dumps(sample_planner_output)))
+        result = graph.invoke(sample_intake_state)
+        assert result["plan"] == _validated(sample_planner_output)
+        assert result["prefetched_round"] is None
@@ -0,0 +1,135 @@
+# tests/unit/planner/test_templates.py
+"""Unit tests for the template planner fast path."""
+
+from unittest.mock import MagicMock
+
+import pytest
+from langchain_core.runnables import RunnableLambda
+
+from agentic_rag.planner.graph import make_planner_graph
+from agentic_rag.planner.state import PlannerState
+from agentic_rag.planner.templates import TemplatePlanner, make_template_planner_node
+
+
+@pytest.fixture
+def lookup_state(sample_intake_state):
+    """A routine lookup + definition request."""
+    return {
+        **sample_intake_state,
+        "normalized_query": "define provisioned throughput units",
+        "user_intent": "lookup",
+        "retrieval_intent": "definition",
+        "complexity_flags": [],
+    }
+
+
+class TestTemplatePlanner:
+    """Tests for TemplatePlanner.plan."""
+
+    def test_definition_template(self, lookup_state):
+        """Test lookup + definition gets one hybrid recall round with rerank."""
+        plan = TemplatePlanner().plan(lookup_state)
+
+        assert isinstance(plan, PlannerState)
+        assert plan.strategy == "retrieve_then_answer"
+        assert plan.goal == "define provisioned throughput units"
+        [round0] = plan.retrieval_rounds
+        assert round0.round_id == 0 and round0.purpose == "recall"
+        assert round0.query_variants == ["define provisioned throughput units"]
+        assert [(m.type, m.k, m.alpha) for m in round0.retrieval_modes] == [("hybrid", 20, 0.5)]
+        assert round0.rerank.enabled and not round0.use_hyde
+        assert plan.stop_conditions.max_rounds == 1
+        assert plan.planner_meta.rationale_tags == ["template:definition"]
+
+    def test_literal_terms_switch_to_exact(self, lookup_state):
+        """Test literal terms are preserved, exact mode added and hybrid biased to bm25."""
+        state = {**lookup_state, "signals": {**lookup_state["signals"], "literal_terms": ["ERR_QUOTA_429"]}}
+        plan = TemplatePlanner().plan(state)
+
+        assert plan.literal_constraints.must_preserve_terms == ["ERR_QUOTA_429"]
+        assert plan.literal_constraints.must_match_exactly is True
+        modes = plan.retrieval_rounds[0].retrieval_modes
+        assert [m.type for m in modes] == ["hybrid", "exact"] and modes[0].alpha <= 0.4
+
+    def test_direct_answer_template(self, lookup_state):
+        """Test requests needing no retrieval get a direct_answer plan without rounds."""
+        plan = TemplatePlanner().plan({**lookup_state, "retrieval_intent": "none", "answerability": "reasoning_only"})
+        assert plan.strategy == "direct_answer" and plan.retrieval_rounds == []
+
+    def test_constraints_and_safety_carried_over(self, lookup_state):
+        """Test answer format constraints flow into answer_requirements."""
+        state = {**lookup_state, "constraints": {**lookup_state["constraints"], "format": ["no_code"]}}
+        assert TemplatePlanner().plan(state).answer_requirements.format == ["no_code"]
+
+    @pytest.mark.parametrize(
+        "overrides",
+        [
+            {"user_intent": "plan"},
+            {"retrieval_intent": "evidence"},
+            {"complexity_flags": ["requires_synthesis"]},
+            {"answerability": "mixed"},
+            {"clarification": {"needed": True, "blocking": False, "reasons": ["missing_scope"]}},
+            {"guardrails": {"sensitivity": "elevated"}},
+            {"signals": {"artifact_flags": ["has_stacktrace"], "literal_terms": []}},
+            {"errors": [{"node": "extract_signals"}]},
+            {"normalized_query": "PTU"},
+        ],
+    )
+    def test_falls_back_to_llm(self, lookup_state, overrides):
+        """Test anything outside the well-understood combinations defers to the LLM planner."""
+        assert TemplatePlanner().plan({**lookup_state, **overrides}) is None
+
+    def test_long_query_still_templated(self, lookup_state):
+        """Test long_query alone does not block a template."""
+        assert TemplatePlanner().plan({**lookup_state, "complexity_flags": ["long_query"]}) is not None
+
+    def test_bypass_rate(self, lookup_state):
+        """Test stats count template hits per template and the overall bypass rate."""
+        templates = TemplatePlanner()
+        templates.plan(lookup_state)
+        templates.plan({**lookup_state, "retrieval_intent": "procedure"})
+        templates.plan({**lookup_state, "user_intent": "compare"})
+        templates.plan({**lookup_state, "user_intent": "compare"})
+
+        assert templates.stats.planned == 4 and templates.stats.bypassed == 2
+        assert templates.stats.bypass_rate == pytest.approx(0.5)
+        assert templates.stats.by_template == {"definition": 1, "procedure": 1}
+
+    def test_node(self, lookup_state):
+        """Test the node emits a plan dict and the fast-path flag."""
+        node = make_template_planner_node(TemplatePlanner())
+        out = node(lookup_state)
+        assert out["planner_fast_path"] is True
+        assert PlannerState.model_validate(out["plan"]).strategy == "retrieve_then_answer"
+        assert node({**lookup_state, "user_intent": "compare"}) == {"planner_fast_path": False}
+
+
+class TestPlannerGraphWithTemplates:
+    """Tests for make_planner_graph(templates=...)."""
+
+    @pytest.fixture
+    def llm(self, sample_planner_output):
+        """LLM whose structured-output runnable counts planner calls."""
+        llm = MagicMock()
+        llm.calls = 0
+
+        def plan(_):
+            llm.calls += 1
+            return sample_planner_output
+
+        llm.with_structured_output.return_value = RunnableLambda(plan)
+        return llm
+
+    def test_template_skips_llm(self, llm, lookup_state):
+        """Test a templated request never calls the LLM planner."""
+        result = make_planner_graph(llm, max_retries=1, templates=TemplatePlanner()).invoke(lookup_state)
+        assert llm.calls == 0
+        assert result["planner_fast_path"] is True
+        assert result["plan"]["planner_meta"]["rationale_tags"] == ["template:definition"]
+
+    def test_fallback_calls_llm(self, llm, sample_intake_state, sample_planner_output):
+        """Test unmatched requests still go through the LLM planner."""
+        result = make_planner_graph(llm, max_retries=1, templates=TemplatePlanner()).invoke(sample_intake_state)
+        assert llm.calls == 1
+        assert result["planner_fast_path"] is False
+        assert result["plan"]["goal"] == sample_planner_output["goal"]
@@ -0,0 +1,230 @@
+# tests/unit/test_aio.py
+"""Unit tests for the shared sync/async node execution and the async agent graph."""
+
+import asyncio
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+from langchain_core.runnables import RunnableLambda
+
+from agentic_rag.aio import Call, adapter_call, dual_node, run_async, run_sync, with_async
+from agentic_rag.answer.state import ComposeAnswerModel
+from agentic_rag.executor.adapters import NoOpCoverageGrader
+from agentic_rag.executor.nodes.run_retrieval import make_run_retrieval_node
+from agentic_rag.executor.state import Candidate, CandidateKey
+from agentic_rag.graph import make_agent_graph
+from agentic_rag.intent.nodes.extract_signals import ExtractSignalsModel
+from agentic_rag.intent.nodes.normalize_gate import NormalizeModel
+from agentic_rag.planner.state import PlannerState
+
+
+def _steps(calls, log):
+    try:
+        first = yield calls[0]
+        log.append(("ok", first))
+        both = yield calls[1:]
+        log.append(("ok", both))
+    except ValueError as e:
+        log.append(("caught", str(e)))
+        return {"error": str(e)}
+    return {"done": True}
+
+
+class TestDrivers:
+    def test_sync_and_async_drive_the_same_body(self):
+        calls = [Call(lambda: 1), Call(lambda: 2), Call(lambda: 3)]
+        sync_log, async_log = [], []
+
+        assert run_sync(_steps(calls, sync_log)) == {"done": True}
+        assert asyncio.run(run_async(_steps(calls, async_log))) == {"done": True}
+        assert sync_log == async_log == [("ok", 1), ("ok", [2, 3])]
+
+    def test_call_errors_are_thrown_into_the_body(self):
+        def boom():
+            raise ValueError("backend down")
+
+        log = []
+        assert asyncio.run(run_async(_steps([Call(boom)], log))) == {"error": "backend down"}
+        assert log == [("caught", "backend down")]
+
+    def test_list_of_calls_runs_concurrently(self):
+        async def slow(x):
+            await asyncio.sleep(0.05)
+            return x
+
+        def body():
+            return (yield [Call(lambda x: x, slow, (i,)) for i in range(5)])
+
+        started = time.perf_counter()
+        assert asyncio.run(run_async(body())) == [0, 1, 2, 3, 4]
+        assert time.perf_counter() - started < 0.2
+
+    def test_adapter_call_prefers_native_async(self):
+        class Adapter:
+            def search(self, **kwargs):
+                return "sync"
+
+            async def asearch(self, **kwargs):
+                return "async"
+
+        assert adapter_call(Adapter(), "search", query="q").run() == "sync"
+        assert asyncio.run(adapter_call(Adapter(), "search", query="q").arun()) == "async"
+
+    def test_sync_only_adapter_runs_in_worker_thread(self):
+        mock = MagicMock()  # MagicMock.asearch is not a coroutine function
+        mock.search.side_effect = lambda **kwargs: threading.current_thread().name
+        thread_name = asyncio.run(adapter_call(mock, "search", query="q").arun())
+        assert thread_name != threading.main_thread().name
+
+    def test_dual_node(self):
+        def node(state):
+            return {"mode": "sync"}
+
+        async def anode(state):
+            return {"mode": "async"}
+
+        assert dual_node(node) is node
+        runnable = dual_node(with_async(node, anode))
+        assert runnable.invoke({}) == {"mode": "sync"}
+        assert asyncio.run(runnable.ainvoke({})) == {"mode": "async"}
+
+
+class TestAsyncExecutorNodes:
+    def test_async_retrieval_matches_sync(self):
+        plan = {
+            "retrieval_rounds": [
+                {"round_id": 0, "retrieval_modes": [{"type": "bm25", "k": 5}, {"type": "vector", "k": 5}]}
+            ]
+        }
+        state = {"plan": plan, "round_queries": ["a", "b"], "current_round_index": 0}
+
+        class Retriever:
+            def search(self, *, query, mode, k, alpha, filters):
+                return [Candidate(key=CandidateKey(doc_id=f"{query}-{mode}", chunk_id="c"), text="t")]
+
+            async def asearch(self, **kwargs):
+                await asyncio.sleep(0)
+                return self.search(**kwargs)
+
+        node = make_run_retrieval_node(Retriever())
+        sync_out = node(state)["round_candidates_raw"]
+        async_out = asyncio.run(node.afunc(state))["round_candidates_raw"]
+
+        assert [c.key.doc_id for c in async_out] == [c.key.doc_id for c in sync_out]
+        assert [c.key.doc_id for c in sync_out] == ["a-bm25", "a-vector", "b-bm25", "b-vector"]
+
+    def test_async_node_error_handling(self):
+        retriever = MagicMock()
+        retriever.search.side_effect = RuntimeError("search down")
+        state = {"plan": {"retrieval_rounds": [{"round_id": 0}]}, "round_queries": ["a"]}
+
+        out = asyncio.run(make_run_retrieval_node(retriever).afunc(state))
+
+        assert out["errors"][0]["node"] == "run_retrieval"
+        assert out["errors"][0]["type"] == "runtime_error"
+
+
+class TestAsyncAgentGraph:
+    """make_agent_graph(...).ainvoke awaits LLM and adapter calls end to end."""
+
+    @staticmethod
+    def _llm(used):
+        results = {
+            NormalizeModel: NormalizeModel(normalized_query="configure azure openai"),
+            ExtractSignalsModel: ExtractSignalsModel(
+                user_intent="lookup", retrieval_intent="procedure", answerability="internal_corpus"
+            ),
+            PlannerState: {
+                "goal": "configure azure openai",
+                "strategy": "retrieve_then_answer",
+                "retrieval_rounds": [{"round_id": 0, "purpose": "recall", "query_variants": ["azure openai"]}],
+            },
+            ComposeAnswerModel: ComposeAnswerModel(final_answer="Set the endpoint and key."),
+        }
+
+        def with_structured_output(schema, **kwargs):
+            def invoke(_):
+                used.append(("sync", schema.__name__))
+                return results[schema]
+
+            async def ainvoke(_):
+                used.append(("async", schema.__name__))
+                return results[schema]
+
+            return RunnableLambda(invoke, afunc=ainvoke)
+
+        llm = MagicMock()
+        llm.with_structured_output = MagicMock(side_effect=with_structured_output)
+        return llm
+
+    @staticmethod
+    def _adapters(used):
+        hit = Candidate(key=CandidateKey(doc_id="d1", chunk_id="c1"), text="Set AZURE_OPENAI_ENDPOINT.")
+
+        class Retriever:
+            def search(self, **kwargs):
+                used.append(("sync", "search"))
+                return [hit]
+
+            async def asearch(self, **kwargs):
+                used.append(("async", "search"))
+                return [hit]
+
+        class Reranker:
+            def rerank(self, *, candidates, top_k, **kwargs):
+                used.append(("sync", "rerank"))
+                return list(candidates)[:top_k]
+
+            async def arerank(self, *, candidates, top_k, **kwargs):
+                used.append(("async", "rerank"))
+                return list(candidates)[:top_k]
+
+        class Grader(NoOpCoverageGrader):
+            async def agrade(self, **kwargs):
+                used.append(("async", "grade"))
+                return {**self.grade(**kwargs), "confidence": 0.9}
+
+        fusion = MagicMock()
+        fusion.rrf.side_effect = lambda *, ranked_lists, **kwargs: [c for lst in ranked_lists for c in lst]
+        return {
+            "retriever": Retriever(),
+            "fusion": fusion,
+            "reranker": Reranker(),
+            "hyde": MagicMock(),
+            "grader": Grader(),
+        }
+
+    @pytest.fixture
+    def graph_and_log(self):
+        used = []
+        graph = make_agent_graph(
+            self._llm(used), max_retries=1, fused_intake=False, template_short_circuits=False, **self._adapters(used)
+        )
+        return graph, used
+
+    def test_ainvoke_is_async_end_to_end(self, graph_and_log):
+        graph, used = graph_and_log
+        inputs = {"messages": [{"role": "user", "content": "How to configure Azure OpenAI?"}]}
+        result = asyncio.run(graph.ainvoke(inputs))
+
+        assert result["final_answer"] == "Set the endpoint and key."
+        assert result["final_evidence"]
+        assert {mode for mode, _ in used} == {"async"}
+        assert {name for _, name in used} >= {
+            "NormalizeModel",
+            "ExtractSignalsModel",
+            "PlannerState",
+            "ComposeAnswerModel",
+            "search",
+            "rerank",
+            "grade",
+        }
+
+    def test_invoke_still_sync(self, graph_and_log):
+        graph, used = graph_and_log
+        result = graph.invoke({"messages": [{"role": "user", "content": "How to configure Azure OpenAI?"}]})
+
+        assert result["final_answer"] == "Set the endpoint and key."
+        assert ("async", "search") not in used and ("sync", "search") in used
@@ -0,0 +1,178 @@
+# tests/unit/test_context.py
+"""Unit tests for conversation windowing and incremental summarisation."""
+
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+from langchain_core.runnables import RunnableLambda
+
+from agentic_rag.context import (
+    SUMMARY_HEADER,
+    ConversationSummarizer,
+    make_summarize_context_node,
+    node_token_cap,
+    split_turns,
+    window_messages,
+)
+from agentic_rag.graph import make_agent_graph
+from agentic_rag.planner.nodes.planner import planner_payload
+
+
+def _conversation(turns):
+    messages = []
+    for i in range(turns):
+        messages += [{"role": "user", "content": f"question {i}"}, {"role": "assistant", "content": f"answer {i}"}]
+    return messages[:-1]  # the last turn awaits its answer
+
+
+class _SummaryLLM:
+    """Records summariser inputs; the summary names how many new turns it received."""
+
+    def __init__(self, fail=False):
+        self.inputs = []
+        self.fail = fail
+
+    def _call(self, prompt_value):
+        if self.fail:
+            raise RuntimeError("llm down")
+        text = prompt_value.to_messages()[-1].content
+        self.inputs.append(text)
+        return AIMessage(content=f"summary after {text.count('user: ')} new turns")
+
+    async def _acall(self, prompt_value):
+        return self._call(prompt_value)
+
+    def runnable(self):
+        return RunnableLambda(self._call, afunc=self._acall)
+
+
+class TestWindowing:
+    def test_split_turns(self):
+        messages = [SystemMessage(content="sys"), HumanMessage(content="a"), AIMessage(content="b")]
+        messages.append({"role": "user", "content": "c"})
+        assert [len(t) for t in split_turns(messages)] == [1, 2, 1]
+
+    def test_short_conversation_unchanged(self):
+        messages = _conversation(3)
+        assert window_messages({"messages": messages}, "planner") == messages
+
+    def test_token_cap_keeps_newest_from_a_user_message(self, monkeypatch):
+        monkeypatch.setenv("CONTEXT_TOKEN_CAPS", "planner=40")
+        long = "x" * 60
+        messages = [
+            {"role": "user", "content": long},
+            {"role": "assistant", "content": long},
+            {"role": "user", "content": "short follow-up"},
+        ]
+        window = window_messages({"messages": messages}, "planner")
+        assert window == messages[2:]
+
+    def test_last_message_always_kept(self, monkeypatch):
+        monkeypatch.setenv("CONTEXT_TOKEN_CAPS", "compose_answer=1")
+        messages = [{"role": "user", "content": "y" * 500}]
+        assert window_messages({"messages": messages}, "compose_answer") == messages
+
+    def test_summary_replaces_covered_turns(self):
+        messages = _conversation(5)
+        state = {"messages": messages, "conversation_summary": "User set up Azure.", "summarized_turns": 2}
+        window = window_messages(state, "normalize_gate")
+        assert isinstance(window[0], SystemMessage)
+        assert window[0].content == f"{SUMMARY_HEADER}\nUser set up Azure."
+        assert window[1:] == messages[4:]
+
+    def test_summary_never_covers_current_turn(self):
+        messages = _conversation(2)
+        state = {"messages": messages, "conversation_summary": "s", "summarized_turns": 5}
+        assert window_messages(state, "planner")[1:] == messages[2:]
+
+    def test_external_summary_keeps_all_messages(self):
+        messages = _conversation(2)
+        window = window_messages({"messages": messages, "conversation_summary": "background"}, "planner")
+        assert window[1:] == messages
+
+    def test_env_caps(self, monkeypatch):
+        monkeypatch.setenv("CONTEXT_TOKEN_CAPS", "planner=123, bad=x")
+        assert node_token_cap("planner") == 123
+        assert node_token_cap("compose_answer") == 6000
+
+    def test_nodes_use_window(self):
+        messages = _conversation(4)
+        state = {"messages": messages, "conversation_summary": "s", "summarized_turns": 3}
+        assert planner_payload(state)["messages"][1:] == messages[6:]
+
+
+class TestConversationSummarizer:
+    def test_no_update_while_conversation_fits(self):
+        llm = _SummaryLLM()
+        summarizer = ConversationSummarizer(llm.runnable(), keep_turns=3)
+        assert make_summarize_context_node(summarizer)({"messages": _conversation(3)}) == {}
+        assert llm.inputs == []
+
+    def test_incremental_update_sends_only_new_turns(self):
+        llm = _SummaryLLM()
+        node = make_summarize_context_node(ConversationSummarizer(llm.runnable(), keep_turns=2))
+
+        first = node({"messages": _conversation(4)})
+        assert first == {"conversation_summary": "summary after 2 new turns", "summarized_turns": 2}
+
+        second = node({"messages": _conversation(5), **first})
+        assert second["summarized_turns"] == 3
+        assert "question 2" in llm.inputs[-1] and "question 1" not in llm.inputs[-1]
+        assert "summary after 2 new turns" in llm.inputs[-1]
+
+        assert node({"messages": _conversation(5), **second}) == {}
+        assert len(llm.inputs) == 2
+
+    def test_cache_serves_stateless_replays(self):
+        llm = _SummaryLLM()
+        summarizer = ConversationSummarizer(llm.runnable(), keep_turns=2)
+        node = make_summarize_context_node(summarizer)
+
+        node({"messages": _conversation(4)})
+        assert node({"messages": _conversation(4)})["summarized_turns"] == 2
+        assert summarizer.stats.cache_hits == 1
+
+        # Without state, the next update resumes from the cached 2-turn prefix
+        out = node({"messages": _conversation(5)})
+        assert out["summarized_turns"] == 3
+        assert summarizer.stats.resumed == 1
+        assert "question 1" not in llm.inputs[-1]
+
+    def test_external_summary_is_folded_in_but_not_cached(self):
+        llm = _SummaryLLM()
+        summarizer = ConversationSummarizer(llm.runnable(), keep_turns=1)
+        node = make_summarize_context_node(summarizer)
+        node({"messages": _conversation(2), "conversation_summary": "earlier session"})
+        assert "earlier session" in llm.inputs[-1]
+        assert len(summarizer) == 0
+
+    def test_summary_is_clipped(self):
+        summarizer = ConversationSummarizer(
+            RunnableLambda(lambda _: AIMessage(content="word " * 500)), keep_turns=1, max_summary_tokens=10
+        )
+        out = make_summarize_context_node(summarizer)({"messages": _conversation(2)})
+        assert len(out["conversation_summary"]) <= 50
+
+    def test_failure_keeps_previous_summary(self):
+        summarizer = ConversationSummarizer(_SummaryLLM(fail=True).runnable(), keep_turns=1)
+        state = {"messages": _conversation(3), "conversation_summary": "Earlier: VPN setup.", "summarized_turns": 1}
+        assert make_summarize_context_node(summarizer)(state) == {}
+        assert summarizer.stats.failures == 1
+
+    def test_async_variant(self):
+        llm = _SummaryLLM()
+        node = make_summarize_context_node(ConversationSummarizer(llm.runnable(), keep_turns=2))
+        out = asyncio.run(node.afunc({"messages": _conversation(4)}))
+        assert out["summarized_turns"] == 2
+
+    def test_rejects_empty_window(self):
+        with pytest.raises(ValueError):
+            ConversationSummarizer(_SummaryLLM().runnable(), keep_turns=0)
+
+    def test_agent_graph_runs_summarizer_before_intake(self):
+        adapters = {name: MagicMock() for name in ("retriever", "fusion", "reranker", "hyde", "grader")}
+        summarizer = ConversationSummarizer(_SummaryLLM().runnable())
+        graph = make_agent_graph(MagicMock(), summarizer=summarizer, **adapters).get_graph()
+        assert ("summarize_context", "intake") in {(e.source, e.target) for e in graph.edges}
@@ -0,0 +1,85 @@
+# tests/unit/test_llm_cache.py
+"""Unit tests for the persistent LLM response cache."""
+
+import asyncio
+
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from agentic_rag.llm_cache import ResponseCache, bypass_response_cache, with_response_cache
+
+
+def _model(cache, responses=("first", "second", "third")):
+    return with_response_cache(FakeListChatModel(responses=list(responses)), cache)
+
+
+class TestResponseCache:
+    def test_repeated_call_served_from_cache(self, tmp_path):
+        cache = ResponseCache(tmp_path / "llm.sqlite")
+        model = _model(cache)
+        assert model.invoke("hello").content == "first"
+        assert model.invoke("hello").content == "first"
+        assert model.invoke("other").content == "second"
+        assert cache.stats.hits == 1 and cache.stats.misses == 2
+        assert len(cache) == 2
+
+    def test_persists_across_instances(self, tmp_path):
+        _model(ResponseCache(tmp_path / "llm.sqlite")).invoke("hello")
+        reopened = ResponseCache(tmp_path / "llm.sqlite")
+        # Same model parameters (responses are part of llm_string); only the hit proves persistence
+        assert _model(reopened).invoke("hello").content == "first"
+        assert reopened.stats.hits == 1 and reopened.stats.misses == 0
+
+    def test_params_and_tools_are_part_of_the_key(self, tmp_path):
+        cache = ResponseCache(tmp_path / "llm.sqlite")
+        model = _model(cache)
+        model.invoke("hello")
+        assert model.bind(tool_choice="PlannerState").invoke("hello").content == "second"
+        assert cache.stats.hits == 0
+
+    def test_async_path_uses_cache(self, tmp_path):
+        cache = ResponseCache(tmp_path / "llm.sqlite")
+        model = _model(cache)
+        model.invoke("hello")
+        assert asyncio.run(model.ainvoke("hello")).content == "first"
+        assert cache.stats.hits == 1
+
+    def test_bypass_refreshes_entry(self, tmp_path):
+        cache = ResponseCache(tmp_path / "llm.sqlite")
+        model = _model(cache)
+        model.invoke("hello")
+        with bypass_response_cache():
+            assert model.invoke("hello").content == "second"
+        assert model.invoke("hello").content == "second"
+        assert cache.stats.bypassed == 1
+
+    def test_bypass_env_switch(self, tmp_path, monkeypatch):
+        cache = ResponseCache(tmp_path / "llm.sqlite")
+        model = _model(cache)
+        model.invoke("hello")
+        monkeypatch.setenv("LLM_RESPONSE_CACHE_BYPASS", "1")
+        assert model.invoke("hello").content == "second"
+
+    def test_lru_eviction_bounds_entries(self, tmp_path):
+        cache = ResponseCache(tmp_path / "llm.sqlite", max_entries=10)
+        model = _model(cache, responses=[f"r{i}" for i in range(30)])
+        for i in range(30):
+            model.invoke(f"prompt {i}")
+        assert len(cache) <= 10
+        assert cache.stats.evicted >= 20
+        assert model.invoke("prompt 29").content == "r29"  # the newest entry survives
+
+    def test_byte_bound(self, tmp_path):
+        cache = ResponseCache(tmp_path / "llm.sqlite", max_bytes=1)
+        model = _model(cache)
+        model.invoke("a")
+        model.invoke("b")
+        assert len(cache) == 1
+
+    def test_non_zero_temperature_not_cached(self, tmp_path):
+        model = type("HotModel", (), {"temperature": 0.7})()
+        assert with_response_cache(model, ResponseCache(tmp_path / "llm.sqlite")) is model
+
+    def test_invalid_bounds(self, tmp_path):
+        with pytest.raises(ValueError):
+            ResponseCache(tmp_path / "llm.sqlite", max_entries=0)
@@ -0,0 +1,180 @@
+# tests/unit/test_llm_clients.py
+"""Unit tests for the shared LLM client manager (agentic_rag/llm_clients.py)."""
+
+import asyncio
+import json
+import threading
+import time
+
+import httpx
+import pytest
+
+from agentic_rag.llm_clients import (
+    BATCH,
+    INTERACTIVE,
+    Endpoint,
+    LLMClientManager,
+    RequestScheduler,
+    current_lane,
+    llm_priority,
+    openai_compatible,
+    request_tokens,
+)
+
+CHAT_URL = "https://api.openai.com/v1/chat/completions"
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _chat_request(max_tokens=100, content="hello"):
+    body = {"model": "gpt-4.1", "max_tokens": max_tokens, "messages": [{"role": "user", "content": content}]}
+    return httpx.Request("POST", CHAT_URL, json=body, headers={"authorization": "Bearer configured"})
+
+
+class TestRequestScheduler:
+    def test_round_robin_across_endpoints(self):
+        scheduler = RequestScheduler([Endpoint("a"), Endpoint("b")])
+        assert [scheduler.try_acquire().name for _ in range(4)] == ["a", "b", "a", "b"]
+
+    def test_rpm_bucket_refills_over_time(self):
+        clock = _Clock()
+        scheduler = RequestScheduler([Endpoint("a", rpm=2)], batch_headroom=0.0, clock=clock)
+        assert scheduler.try_acquire() and scheduler.try_acquire()
+        assert scheduler.try_acquire() is None
+        clock.now += 30.0  # one request's worth at 2 rpm
+        assert scheduler.try_acquire() is not None
+
+    def test_tpm_counts_request_tokens(self):
+        clock = _Clock()
+        scheduler = RequestScheduler([Endpoint("a", tpm=1000)], clock=clock)
+        assert scheduler.try_acquire(600) is not None
+        assert scheduler.try_acquire(600) is None
+        clock.now += 12.0  # 200 tokens refilled
+        assert scheduler.try_acquire(600) is not None
+
+    def test_full_endpoint_skipped(self):
+        scheduler = RequestScheduler([Endpoint("a", rpm=1), Endpoint("b")], clock=_Clock())
+        assert [scheduler.try_acquire().name for _ in range(3)] == ["a", "b", "b"]
+
+    def test_batch_leaves_headroom_to_interactive(self):
+        scheduler = RequestScheduler([Endpoint("a", rpm=10)], batch_headroom=0.2, clock=_Clock())
+        assert sum(scheduler.try_acquire(lane=BATCH) is not None for _ in range(10)) == 8
+        assert scheduler.try_acquire(lane=INTERACTIVE) is not None
+
+    def test_penalized_endpoint_paused(self):
+        clock = _Clock()
+        scheduler = RequestScheduler([Endpoint("a"), Endpoint("b")], clock=clock)
+        scheduler.penalize(Endpoint("a"), 5.0)
+        assert [scheduler.try_acquire().name for _ in range(2)] == ["b", "b"]
+        clock.now += 5.0
+        assert {scheduler.try_acquire().name for _ in range(2)} == {"a", "b"}
+        assert scheduler.stats.throttled == 1
+
+    def test_interactive_waiter_served_before_earlier_batch_waiter(self):
+        scheduler = RequestScheduler([Endpoint("a", rpm=600)], batch_headroom=0.0)
+        while scheduler.try_acquire() is not None:
+            pass
+        order = []
+
+        def waiter(lane):
+            scheduler.acquire(lane=lane)
+            order.append(lane)
+
+        batch = threading.Thread(target=waiter, args=(BATCH,))
+        batch.start()
+        time.sleep(0.02)
+        interactive = threading.Thread(target=waiter, args=(INTERACTIVE,))
+        interactive.start()
+        batch.join(5)
+        interactive.join(5)
+        assert order == [INTERACTIVE, BATCH]
+        assert scheduler.stats.delayed == 2
+
+    def test_async_acquire(self):
+        scheduler = RequestScheduler([Endpoint("a")])
+        assert asyncio.run(scheduler.aacquire()).name == "a"
+
+
+class TestLanes:
+    def test_context_overrides_env(self, monkeypatch):
+        monkeypatch.setenv("LLM_PRIORITY", BATCH)
+        assert current_lane() == BATCH
+        with llm_priority(INTERACTIVE):
+            assert current_lane() == INTERACTIVE
+
+    def test_unknown_lane_rejected(self):
+        with pytest.raises(ValueError):
+            with llm_priority("urgent"):
+                pass
+
+
+class TestClientManager:
+    def _manager(self, endpoints, seen, status=200, headers=None):
+        def handler(request):
+            seen.append(request)
+            return httpx.Response(status, json={"ok": True}, headers=headers or {})
+
+        return LLMClientManager(endpoints, transport=httpx.MockTransport(handler))
+
+    def test_requests_rotate_keys_and_origins(self):
+        seen = []
+        manager = self._manager(
+            [Endpoint("a", api_key="key-a"), Endpoint("b", api_key="key-b", base_url="https://eu.example.com")], seen
+        )
+        for _ in range(2):
+            manager.http_client.send(_chat_request())
+        assert [r.headers["authorization"] for r in seen] == ["Bearer key-a", "Bearer key-b"]
+        assert [r.url.host for r in seen] == ["api.openai.com", "eu.example.com"]
+        assert seen[1].url.path == "/v1/chat/completions"
+
+    def test_azure_api_key_header_replaced(self):
+        seen = []
+        manager = self._manager([Endpoint("a", api_key="key-a")], seen)
+        url = "https://r.openai.azure.com/openai/deployments/d/chat/completions"
+        manager.http_client.post(url, headers={"api-key": "x"})
+        assert seen[0].headers["api-key"] == "key-a" and "authorization" not in seen[0].headers
+
+    def test_async_client_shares_scheduler(self):
+        seen = []
+        manager = self._manager([Endpoint("a"), Endpoint("b")], seen)
+        asyncio.run(manager.http_async_client.send(_chat_request()))
+        manager.http_client.send(_chat_request())
+        assert dict(manager.scheduler.stats.by_endpoint) == {"a": 1, "b": 1}
+
+    def test_429_pauses_endpoint(self):
+        seen = []
+        manager = self._manager([Endpoint("a"), Endpoint("b")], seen, status=429, headers={"retry-after": "30"})
+        manager.http_client.send(_chat_request())
+        assert manager.scheduler.stats.throttled == 1
+        assert manager.scheduler.try_acquire().name == "b"
+        assert manager.scheduler.try_acquire().name == "b"
+
+    def test_from_env_pairs_keys_and_urls(self, monkeypatch):
+        monkeypatch.setenv("LLM_API_KEYS", "k1, k2")
+        monkeypatch.setenv("LLM_BASE_URLS", "https://one.example.com")
+        monkeypatch.setenv("LLM_RPM", "500")
+        manager = LLMClientManager.from_env()
+        assert [(e.api_key, e.base_url, e.rpm) for e in manager.endpoints] == [
+            ("k1", "https://one.example.com", 500),
+            ("k2", "https://one.example.com", 500),
+        ]
+        assert manager.chat_model_kwargs()["api_key"] == "k1"
+
+
+def test_request_tokens_include_output_cap():
+    request = _chat_request(max_tokens=500, content="x" * 400)
+    assert request_tokens(request) >= 600
+    assert json.loads(request.content)["max_tokens"] == 500
+
+
+def test_openai_compatible():
+    assert openai_compatible("gpt-4.1-mini")
+    assert openai_compatible("azure_openai:my-deployment")
+    assert not openai_compatible("anthropic:claude-x")
+    assert not openai_compatible("my-model", "ollama")
@@ -0,0 +1,117 @@
+# tests/unit/test_model.py
+"""Unit tests for per-role model routing (agentic_rag/model.py)."""
+
+import json
+from unittest.mock import MagicMock
+
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+
+from agentic_rag.model import (
+    DEFAULT_MODEL_SPECS,
+    DEFAULT_TIER,
+    FAST_TIER,
+    ModelRegistry,
+    ModelSpec,
+    routed_chains,
+    select_tier,
+)
+from agentic_rag.planner.nodes.planner import make_planner_node
+
+VALID_PLAN = {
+    "goal": "Answer the user's question",
+    "strategy": "direct_answer",
+    "retrieval_rounds": [],
+}
+
+
+class _FakeModel:
+    """Chat model stand-in that records which spec served each structured call."""
+
+    def __init__(self, spec, calls):
+        self.spec = spec
+        self.calls = calls
+
+    def with_structured_output(self, schema, **kwargs):
+        def _call(prompt_value):
+            self.calls.append(self.spec.model)
+            return {"raw": AIMessage(content=""), "parsed": dict(VALID_PLAN), "parsing_error": None}
+
+        return RunnableLambda(_call)
+
+
+def _registry(calls=None):
+    calls = [] if calls is None else calls
+    return ModelRegistry(factory=lambda spec: _FakeModel(spec, calls)), calls
+
+
+def _state(**extra):
+    return {"messages": [{"role": "user", "content": "hi"}], "normalized_query": "hi", **extra}
+
+
+class TestSelectTier:
+    def test_default_without_flags(self):
+        assert select_tier({}) == DEFAULT_TIER
+        assert select_tier({"constraints": {"nonfunctional": ["privacy_high"]}}) == DEFAULT_TIER
+
+    def test_fast_for_low_latency_or_low_cost(self):
+        assert select_tier({"constraints": {"nonfunctional": ["low_latency"]}}) == FAST_TIER
+        assert select_tier({"constraints": {"nonfunctional": ["low_cost"]}}) == FAST_TIER
+
+    def test_explicit_tier_wins(self):
+        state = {"model_tier": DEFAULT_TIER, "constraints": {"nonfunctional": ["low_cost"]}}
+        assert select_tier(state) == DEFAULT_TIER
+
+
+class TestModelRegistry:
+    def test_roles_have_own_caps(self):
+        registry, _ = _registry()
+        assert registry.spec("intake").max_tokens < registry.spec("composer").max_tokens
+        assert registry.spec("hyde") == DEFAULT_MODEL_SPECS[DEFAULT_TIER]["hyde"]
+
+    def test_missing_tier_role_falls_back_to_default(self):
+        registry = ModelRegistry({DEFAULT_TIER: {"planner": ModelSpec("big", 4000)}})
+        assert registry.spec("planner", FAST_TIER) == ModelSpec("big", 4000)
+
+    def test_models_shared_per_spec(self):
+        factory = MagicMock(side_effect=lambda spec: object())
+        registry = ModelRegistry({DEFAULT_TIER: {"a": ModelSpec("m", 100), "b": ModelSpec("m", 100)}}, factory=factory)
+        assert registry.model("a") is registry.model("b")
+        assert factory.call_count == 1
+
+    def test_config_file_and_env_overrides(self, tmp_path, monkeypatch):
+        path = tmp_path / "models.json"
+        path.write_text(json.dumps({"default": {"planner": {"model": "from-file", "max_tokens": 1234}}}))
+        monkeypatch.setenv("MODEL_CONFIG", str(path))
+        monkeypatch.setenv("MODEL_COMPOSER_MAX_TOKENS", "777")
+        monkeypatch.setenv("MODEL_FAST_GRADER", "tiny")
+
+        registry = ModelRegistry.from_env()
+
+        assert registry.spec("planner") == ModelSpec("from-file", 1234)
+        assert registry.spec("composer").max_tokens == 777
+        assert registry.spec("composer").model == DEFAULT_MODEL_SPECS[DEFAULT_TIER]["composer"].model
+        assert registry.spec("grader", FAST_TIER).model == "tiny"
+
+    def test_incomplete_new_spec_is_ignored(self, tmp_path, monkeypatch):
+        path = tmp_path / "models.json"
+        path.write_text(json.dumps({"default": {"custom": {"model": "m"}}}))
+        monkeypatch.setenv("MODEL_CONFIG", str(path))
+        assert "custom" not in ModelRegistry.from_env().specs[DEFAULT_TIER]
+
+
+class TestRoutedChains:
+    def test_plain_model_built_once(self):
+        build = MagicMock(return_value="chain")
+        chains = routed_chains("llm", "planner", build)
+        assert chains.for_state({"constraints": {"nonfunctional": ["low_latency"]}}) == "chain"
+        build.assert_called_once_with("llm")
+
+    def test_planner_node_routes_by_constraints(self):
+        registry, calls = _registry()
+        node = make_planner_node(registry)
+
+        node(_state())
+        node(_state(constraints={"nonfunctional": ["low_latency"]}))
+
+        assert calls == [registry.spec("planner").model, registry.spec("planner", FAST_TIER).model]
@@ -0,0 +1,109 @@
+# tests/unit/test_prompt_layout.py
+"""Unit tests for the prefix-cache friendly prompt layout (agentic_rag/prompt_layout.py)."""
+
+import json
+
+import pytest
+from langchain_core.prompts import ChatPromptTemplate
+
+from agentic_rag.answer.nodes.compose_answer import COMPOSE_INPUTS, compose_payload
+from agentic_rag.answer.prompts.compose_answer import COMPOSE_ANSWER_PROMPT
+from agentic_rag.answer.prompts.map_evidence import MAP_EVIDENCE_PROMPT
+from agentic_rag.intent.prompts import (
+    EXTRACT_SIGNALS_LITE_PROMPT,
+    EXTRACT_SIGNALS_PROMPT,
+    INTAKE_FUSED_PROMPT,
+    NORMALIZE_PREPASS_PROMPT,
+    NORMALIZE_PROMPT,
+)
+from agentic_rag.planner.nodes.planner import PLANNER_INPUTS, planner_payload
+from agentic_rag.planner.prompts.planner import PLANNER_PROMPT
+from agentic_rag.prompt_layout import INPUTS_HEADER, prefix_cached_messages, render_inputs, static_system_prompt
+
+HISTORY = [
+    {"role": "user", "content": "What is HyDE?"},
+    {"role": "assistant", "content": "Hypothetical document embeddings."},
+    {"role": "user", "content": "How do I enable it for ERR_CONN_RESET searches?"},
+]
+
+
+def _rendered(system, inputs, payload):
+    return ChatPromptTemplate.from_messages(prefix_cached_messages(system, inputs)).invoke(payload).to_messages()
+
+
+def _planner_state(**overrides):
+    return {
+        "messages": HISTORY,
+        "normalized_query": "Enable HyDE for ERR_CONN_RESET searches",
+        "constraints": {"format": ["bullet_points"]},
+        "signals": {"literal_terms": ["ERR_CONN_RESET"]},
+        **overrides,
+    }
+
+
+class TestStaticPrefix:
+    @pytest.mark.parametrize(
+        "prompt",
+        [
+            NORMALIZE_PROMPT,
+            NORMALIZE_PREPASS_PROMPT,
+            EXTRACT_SIGNALS_PROMPT,
+            EXTRACT_SIGNALS_LITE_PROMPT,
+            INTAKE_FUSED_PROMPT,
+            PLANNER_PROMPT,
+            COMPOSE_ANSWER_PROMPT,
+            MAP_EVIDENCE_PROMPT,
+        ],
+    )
+    def test_system_prompts_have_no_variables(self, prompt):
+        assert static_system_prompt(prompt)
+
+    def test_variables_rejected(self):
+        with pytest.raises(ValueError):
+            static_system_prompt("Query: {normalized_query}")
+
+    def test_escaped_braces_rendered_once(self):
+        assert static_system_prompt("{{evidence_id}}") == "{evidence_id}"
+
+    def test_planner_prefix_is_byte_stable_across_requests(self):
+        a = _rendered(PLANNER_PROMPT, PLANNER_INPUTS, planner_payload(_planner_state()))
+        b = _rendered(
+            PLANNER_PROMPT,
+            PLANNER_INPUTS,
+            planner_payload(_planner_state(constraints={"prohibitions": ["no_code"]}, signals={}, locale="de-DE")),
+        )
+        assert a[0].content == b[0].content == static_system_prompt(PLANNER_PROMPT)
+        assert [m.content for m in a[:-1]] == [m.content for m in b[:-1]]  # system + conversation
+        assert a[-1].content != b[-1].content
+
+    def test_compose_prefix_is_byte_stable_across_evidence(self):
+        def state(text):
+            return {
+                "messages": HISTORY,
+                "normalized_query": "Enable HyDE",
+                "final_evidence": [{"evidence_id": "ev_000", "doc_id": "d", "text": text}],
+                "coverage": {"confidence": 0.8},
+            }
+
+        a = _rendered(COMPOSE_ANSWER_PROMPT, COMPOSE_INPUTS, compose_payload(state("Set use_hyde=true.")))
+        b = _rendered(COMPOSE_ANSWER_PROMPT, COMPOSE_INPUTS, compose_payload(state("HyDE is off by default.")))
+        assert [m.content for m in a[:-1]] == [m.content for m in b[:-1]]
+        assert "use_hyde" not in "".join(m.content for m in a[:-1])
+
+
+class TestInputsMessage:
+    def test_inputs_come_last_as_json(self):
+        sent = _rendered(PLANNER_PROMPT, PLANNER_INPUTS, planner_payload(_planner_state()))
+        header, body = sent[-1].content.split("\n", 1)
+        assert header == INPUTS_HEADER
+        inputs = json.loads(body)
+        assert set(inputs) == set(PLANNER_INPUTS)
+        assert inputs["signals"] == {"literal_terms": ["ERR_CONN_RESET"]}
+        assert sent[-2].content == HISTORY[-1]["content"]
+
+    def test_rendering_is_deterministic(self):
+        assert render_inputs({"b": {"y": 1, "x": 2}, "a": None}) == render_inputs({"a": None, "b": {"x": 2, "y": 1}})
+
+    def test_no_inputs_no_trailing_message(self):
+        sent = _rendered(NORMALIZE_PROMPT, (), {"messages": HISTORY})
+        assert len(sent) == 1 + len(HISTORY)
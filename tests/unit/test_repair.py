@@ -0,0 +1,167 @@
+# tests/unit/test_repair.py
+"""Unit tests for local structured-output repair."""
+
+from unittest.mock import MagicMock
+
+import pytest
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+from pydantic import ValidationError
+
+from agentic_rag.answer.state import ComposeAnswerModel
+from agentic_rag.intent.nodes.extract_signals import ExtractSignalsModel
+from agentic_rag.intent.nodes.normalize_gate import NormalizeModel, make_normalize_gate_node
+from agentic_rag.planner.nodes.planner import validate_plan
+from agentic_rag.planner.state import PlannerState
+from agentic_rag.repair import RepairStats, structured_data, validate_with_repair
+
+
+@pytest.fixture
+def stats():
+    return RepairStats()
+
+
+def _plan(**overrides):
+    plan = {
+        "goal": "configure Azure OpenAI for production",
+        "strategy": "retrieve_then_answer",
+        "retrieval_rounds": [
+            {
+                "round_id": 0,
+                "purpose": "recall",
+                "query_variants": ["Azure OpenAI production"],
+                "retrieval_modes": [{"type": "hybrid", "k": 20, "alpha": 0.5}],
+            }
+        ],
+    }
+    plan.update(overrides)
+    return plan
+
+
+class TestValidateWithRepair:
+    """Tests for the repair rules."""
+
+    def test_valid_output_untouched(self, stats):
+        """Test valid data and model instances pass straight through."""
+        plan = PlannerState.model_validate(_plan())
+        assert validate_with_repair(PlannerState, plan, node="planner", stats=stats) is plan
+        assert validate_with_repair(PlannerState, _plan(), node="planner", stats=stats) == plan
+        assert stats.validated == 2 and not stats.repaired and not stats.escalated
+
+    def test_clamps_and_enum_mapping(self, stats):
+        """Test out-of-range numbers are clamped and near-miss enum values mapped."""
+        raw = _plan(strategy="Retrieve-Then-Answer", stop_conditions={"max_rounds": 7, "max_total_docs": 0})
+        raw["retrieval_rounds"][0]["retrieval_modes"][0].update(k=500, alpha=1.5)
+        raw["retrieval_rounds"][0]["rerank"] = {"rerank_top_k": 2}
+
+        plan = validate_with_repair(PlannerState, raw, node="planner", stats=stats)
+
+        assert plan.strategy == "retrieve_then_answer"
+        mode = plan.retrieval_rounds[0].retrieval_modes[0]
+        assert (mode.k, mode.alpha) == (200, 1.0)
+        assert plan.retrieval_rounds[0].rerank.rerank_top_k == 5
+        assert (plan.stop_conditions.max_rounds, plan.stop_conditions.max_total_docs) == (3, 1)
+        assert stats.repaired["planner"] == 1
+        assert stats.fixes["less_than_equal"] == 3 and stats.fixes["literal_error"] == 1
+
+    def test_unknown_enum_maps_to_other_or_is_dropped(self, stats):
+        """Test list items fall back to "other" when allowed; otherwise bad items/fields are dropped."""
+        raw = {
+            "normalized_query": "rotate keys",
+            "constraints": {"domain": ["aws", "azure"], "format": "no_code"},
+            "guardrails": {"sensitivity": "medium", "pii_present": False},
+        }
+        result = validate_with_repair(NormalizeModel, raw, node="normalize_gate", stats=stats)
+
+        assert result.constraints == {"domain": ["other", "azure"], "format": ["no_code"]}
+        assert result.guardrails == {"sensitivity": "restricted", "pii_present": False}
+
+    @pytest.mark.parametrize("value", ["high", "confidential", None])
+    def test_unknown_plan_sensitivity_escalates_to_restricted(self, stats, value):
+        """Test a safety field never falls back to its permissive default ("normal")."""
+        raw = _plan(safety={"sensitivity": value})
+        plan = validate_with_repair(PlannerState, raw, node="planner", stats=stats)
+        assert plan.safety.sensitivity == "restricted"
+
+    def test_near_miss_sensitivity_still_mapped(self, stats):
+        """Test a recognisable sensitivity value keeps its meaning."""
+        raw = _plan(safety={"sensitivity": "Elevated"})
+        plan = validate_with_repair(PlannerState, raw, node="planner", stats=stats)
+        assert plan.safety.sensitivity == "elevated"
+
+    def test_invalid_list_elements_dropped(self, stats):
+        """Test an element that cannot be repaired is removed instead of failing the whole plan."""
+        raw = _plan()
+        raw["retrieval_rounds"][0]["retrieval_modes"].append({"type": "semantic", "k": 10})
+        plan = validate_with_repair(PlannerState, raw, node="planner", stats=stats)
+        assert [m.type for m in plan.retrieval_rounds[0].retrieval_modes] == ["hybrid"]
+
+    def test_none_and_extra_keys(self, stats):
+        """Test None falls back to the default and forbidden extra keys are removed."""
+        raw = {"final_answer": "Done.", "citations": None, "confidence": 0.9}
+        out = validate_with_repair(ComposeAnswerModel, raw, node="compose_answer", stats=stats)
+        assert out.citations == [] and out.final_answer == "Done."
+
+    def test_unrepairable_escalates_with_original_error(self, stats):
+        """Test a missing required field re-raises the original ValidationError."""
+        with pytest.raises(ValidationError) as exc:
+            validate_with_repair(ExtractSignalsModel, {"user_intent": "lookup"}, node="extract_signals", stats=stats)
+        assert {e["loc"] for e in exc.value.errors()} == {("retrieval_intent",), ("answerability",)}
+        assert stats.escalated["extract_signals"] == 1
+        assert stats.repair_rate == 0.0
+
+
+class TestPlannerFallbacks:
+    """Tests for the planner-specific fallbacks."""
+
+    def test_empty_query_variants_use_goal(self):
+        """Test an empty query_variants list is filled from the goal."""
+        raw = _plan()
+        raw["retrieval_rounds"][0]["query_variants"] = []
+        plan = validate_plan(raw, {"normalized_query": "azure openai prod config"})
+        assert plan.retrieval_rounds[0].query_variants == ["configure Azure OpenAI for production"]
+
+    def test_short_goal_uses_normalized_query(self):
+        """Test a too-short goal falls back to the normalized query."""
+        plan = validate_plan(_plan(goal="cfg"), {"normalized_query": "azure openai prod config"})
+        assert plan.goal == "azure openai prod config"
+
+
+class TestStructuredData:
+    """Tests for unwrapping include_raw=True results."""
+
+    def test_parsed_and_passthrough(self):
+        parsed = NormalizeModel(normalized_query="x")
+        assert structured_data({"raw": AIMessage(content=""), "parsed": parsed, "parsing_error": None}) is parsed
+        assert structured_data(parsed) is parsed
+        assert structured_data({"normalized_query": "x"}) == {"normalized_query": "x"}
+
+    def test_failed_parse_returns_tool_args(self):
+        call = {"name": "NormalizeModel", "args": {"normalized_query": ""}, "id": "1"}
+        raw = AIMessage(content="", tool_calls=[call])
+        result = {"raw": raw, "parsed": None, "parsing_error": ValueError("bad")}
+        assert structured_data(result) == {"normalized_query": ""}
+
+    def test_failed_json_mode_parse_returns_content(self):
+        result = {"raw": AIMessage(content='{"normalized_query": ""}'), "parsed": None, "parsing_error": ValueError()}
+        assert structured_data(result) == {"normalized_query": ""}
+
+    def test_no_tool_call_raises_parsing_error(self):
+        with pytest.raises(ValueError, match="bad"):
+            structured_data({"raw": AIMessage(content="hi"), "parsed": None, "parsing_error": ValueError("bad")})
+
+
+def test_node_repairs_instead_of_erroring():
+    """Test a node repairs an include_raw parsing failure without reporting a retryable error."""
+    args = {"normalized_query": "rotate keys", "guardrails": {"sensitivity": "Normal"}}
+    raw = AIMessage(content="", tool_calls=[{"name": "NormalizeModel", "args": args, "id": "1"}])
+    llm = MagicMock()
+    llm.with_structured_output = MagicMock(
+        return_value=RunnableLambda(lambda _: {"raw": raw, "parsed": None, "parsing_error": ValueError("enum")})
+    )
+
+    out = make_normalize_gate_node(llm)({"messages": [{"role": "user", "content": "rotate keys"}]})
+
+    assert "errors" not in out
+    assert out["guardrails"] == {"sensitivity": "normal"}
+    assert llm.with_structured_output.call_args.kwargs["include_raw"] is True
@@ -0,0 +1,122 @@
+# tests/unit/test_usage.py
+"""Unit tests for token and cost accounting (agentic_rag/usage.py)."""
+
+import asyncio
+
+import pytest
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+
+from agentic_rag.aio import with_async
+from agentic_rag.usage import (
+    UsageReport,
+    add_ledger,
+    budget_remaining,
+    cost_usd,
+    ledger_totals,
+    with_usage,
+)
+
+
+def _model(input_tokens=100, output_tokens=20, model_name="gpt-4.1-2025-04-14", calls=3, cached_tokens=0):
+    usage = {
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "total_tokens": input_tokens + output_tokens,
+    }
+    if cached_tokens:
+        usage["input_token_details"] = {"cache_read": cached_tokens}
+    metadata = {"model_name": model_name}
+    messages = [AIMessage(content="ok", usage_metadata=usage, response_metadata=metadata) for _ in range(calls)]
+    return GenericFakeChatModel(messages=iter(messages))
+
+
+def _entry(node, total):
+    return {"id": f"{node}-{total}", "node": node, "input_tokens": total, "output_tokens": 0, "total_tokens": total}
+
+
+class TestLedger:
+    def test_add_ledger_dedupes_by_id(self):
+        a, b = _entry("planner", 10), _entry("compose_answer", 20)
+        assert add_ledger([a], [a, b]) == [a, b]
+        assert add_ledger(None, None) == []
+
+    def test_cost_matches_dated_snapshots(self):
+        assert cost_usd("gpt-4.1-2025-04-14", 1_000_000, 0) == pytest.approx(2.0)
+        assert cost_usd("gpt-4.1-mini", 0, 1_000_000) == pytest.approx(1.6)
+        assert cost_usd("unknown-model", 10, 10) is None
+
+    def test_budget_counts_post_plan_nodes_only(self):
+        state = {
+            "plan": {"budget": {"max_tokens": 1000}},
+            "token_ledger": [_entry("normalize_gate", 500), _entry("planner", 400), _entry("grade_coverage", 300)],
+        }
+        assert budget_remaining(state) == 700
+        assert budget_remaining({"token_ledger": state["token_ledger"]}) is None
+
+
+class TestWithUsage:
+    def test_records_each_llm_call(self):
+        model = _model()
+
+        def node(state):
+            model.invoke("a")
+            model.invoke("b")
+            return {"final_answer": "x"}
+
+        out = with_usage(node, "compose_answer")({})
+        assert out["final_answer"] == "x"
+        assert [e["node"] for e in out["token_ledger"]] == ["compose_answer", "compose_answer"]
+        assert ledger_totals(out["token_ledger"])["total_tokens"] == 240
+        assert out["token_ledger"][0]["cost_usd"] == pytest.approx((100 * 2.0 + 20 * 8.0) / 1_000_000)
+
+    def test_prefix_cached_tokens_recorded_and_discounted(self):
+        model = _model(input_tokens=2000, cached_tokens=1536)
+
+        def node(state):
+            model.invoke("a")
+            return {}
+
+        entry = with_usage(node, "planner")({})["token_ledger"][0]
+        assert entry["cached_tokens"] == 1536
+        assert entry["cost_usd"] == pytest.approx((464 * 2.0 + 1536 * 0.5 + 20 * 8.0) / 1_000_000)
+
+        report = UsageReport()
+        report.add([entry])
+        assert report.summary()["nodes"]["planner"]["prefix_cache_rate"] == pytest.approx(0.768)
+
+    def test_async_twin_is_metered(self):
+        model = _model()
+
+        def node(state):
+            return {}
+
+        async def anode(state):
+            await model.ainvoke("a")
+            return {"plan": {}}
+
+        wrapped = with_usage(with_async(node, anode), "planner")
+        out = asyncio.run(wrapped.afunc({}))
+        assert [e["node"] for e in out["token_ledger"]] == ["planner"]
+
+    def test_no_llm_calls_leave_update_unchanged(self):
+        assert with_usage(lambda state: {"a": 1}, "planner")({}) == {"a": 1}
+
+    def test_calls_outside_node_not_recorded(self):
+        model = _model()
+        node = with_usage(lambda state: {}, "planner")
+        model.invoke("outside")
+        assert node({}) == {}
+
+
+class TestUsageReport:
+    def test_percentiles_per_node(self):
+        report = UsageReport()
+        for total in (100, 200, 300):
+            report.add({"token_ledger": [_entry("planner", total), _entry("compose_answer", 10)]})
+        summary = report.summary()
+        assert summary["requests"] == 3
+        assert summary["nodes"]["planner"]["calls"] == 3
+        assert summary["nodes"]["planner"]["input_p50"] == pytest.approx(200)
+        assert summary["request_tokens_p95"] == pytest.approx(300, rel=0.1)
+        assert "planner" in report.format()